@@ -1,392 +1,57 @@
 #!/usr/bin/env python3
 """
-Recovery script for lost links from the broken cache=True run.
+Recovery for links lost by the broken cache=True run.
 
-Flow: Pre-load cached links → Phase 1 re-search (adds more) → Phase 2 scrapes all.
+Flow: queue cached links → re-search the recovery queries (queues more) →
+scrape everything pending into output/recovery_restaurants.json.
+
+This is a thin wrapper around `gmaps-scraper worklist`, kept so the
+watchdog and status plugin still recognise the process by its name.
 
 Usage:
     cd us-restaurant-scraper
     PYTHONPATH=src python3 -u ../recovery_search.py \
-        --query-file ../m1_recovery_queries.json \
+        --query-file ../m1_recovery_queries.keys \
         --links-file ../m1_recovery_links.json
+
+The query file is either a JSON list of query strings or a .keys file of
+64-bit query keys (see gmaps_scraper.geo.query_codec); query text is only
+rendered for the batch being searched.
 """
 
 import argparse
-import json
-import os
-import re
-import signal
-import subprocess
-import time
-from datetime import datetime
+import sys
 
 # Must run from us-restaurant-scraper/ with PYTHONPATH=src
-from gmaps_scraper.config import Config
-from gmaps_scraper.deduplication import DeduplicationManager
-from gmaps_scraper.extractors import scrape_searches, scrape_places
-
-
-# --- Chrome process management ---
-MAX_HEALTHY_CHROME = 60  # 5 browsers × ~10 processes each + buffer
-
-def count_chrome_processes() -> int:
-    """Count running Chrome processes spawned by botasaurus."""
-    try:
-        result = subprocess.run(
-            ["pgrep", "-f", "Google Chrome.*bota"],
-            capture_output=True, text=True, timeout=5,
-        )
-        return len(result.stdout.strip().split("\n")) if result.stdout.strip() else 0
-    except Exception:
-        return 0
+from gmaps_scraper.cli import main as cli_main
 
-def kill_stale_chrome():
-    """Kill all botasaurus Chrome processes."""
-    try:
-        subprocess.run(
-            ["pkill", "-9", "-f", "Google Chrome.*bota"],
-            capture_output=True, timeout=10,
-        )
-        time.sleep(2)
-        remaining = count_chrome_processes()
-        print(f"  Chrome cleanup: {remaining} processes remaining")
-    except Exception as e:
-        print(f"  Chrome cleanup error: {e}")
-
-def check_chrome_health(phase: str):
-    """Check Chrome process count and clean up if bloated."""
-    count = count_chrome_processes()
-    if count > MAX_HEALTHY_CHROME:
-        print(f"\n  WARNING: {count} Chrome processes detected (max healthy: {MAX_HEALTHY_CHROME})")
-        print(f"  Cleaning up stale Chrome processes...")
-        kill_stale_chrome()
-        return False  # caller should know cleanup happened
-    return True
-
-# --- Paths (relative to us-restaurant-scraper/) ---
 RECOVERY_CHECKPOINT_DIR = "checkpoints_recovery"
-RECOVERY_OUTPUT = "output/recovery_restaurants.json"
-MAIN_SEEN_PLACES = os.path.join(Config.CHECKPOINT_DIR, "seen_places.json")
-
-# Recovery checkpoint files
-RECOVERY_PROGRESS = os.path.join(RECOVERY_CHECKPOINT_DIR, "progress.json")
-RECOVERY_COMPLETED_SEARCHES = os.path.join(RECOVERY_CHECKPOINT_DIR, "completed_searches.json")
-RECOVERY_PENDING_LINKS = os.path.join(RECOVERY_CHECKPOINT_DIR, "pending_links.json")
-
-
-def load_json(path, default=None):
-    if os.path.exists(path):
-        try:
-            with open(path) as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            pass
-    return default if default is not None else []
-
-
-def save_json(path, data):
-    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
-    with open(path, "w") as f:
-        json.dump(data, f)
-
-
-def query_str_to_dict(query_str: str) -> dict:
-    """Convert 'Chinese restaurants near 11229' to a query dict."""
-    match = re.search(r"near\s+(\d{5})$", query_str)
-    zip_code = match.group(1) if match else ""
-    cuisine_match = re.match(r"^(.+?)\s+restaurants\s+near", query_str)
-    cuisine = cuisine_match.group(1) if cuisine_match else ""
-    return {"query": query_str, "zip_code": zip_code, "type": "cuisine_zip", "cuisine": cuisine}
-
-
-def preload_links(links_file: str, dedup: DeduplicationManager):
-    """Pre-load cached recovery links into pending_links before Phase 1."""
-    existing = set(load_json(RECOVERY_PENDING_LINKS, []))
-
-    with open(links_file) as f:
-        cached_links = json.load(f)
-
-    # Only add links not already in pending
-    added = 0
-    for link in cached_links:
-        if link not in existing:
-            existing.add(link)
-            added += 1
-
-    save_json(RECOVERY_PENDING_LINKS, list(existing))
-    print(f"Pre-loaded {added} cached links (total pending: {len(existing)})")
-
-
-def run_phase1(query_file: str, dedup: DeduplicationManager):
-    """Phase 1: Re-run search queries to find additional unseen links."""
-    with open(query_file) as f:
-        query_strings = json.load(f)
-
-    completed = set(load_json(RECOVERY_COMPLETED_SEARCHES, []))
-    remaining_strs = [q for q in query_strings if q not in completed]
-
-    # Load existing pending links (includes pre-loaded cached links)
-    pending_links = set(load_json(RECOVERY_PENDING_LINKS, []))
-
-    print(f"\n{'='*60}")
-    print("RECOVERY PHASE 1: Re-search for additional lost links")
-    print(f"{'='*60}")
-    print(f"Total queries: {len(query_strings)}")
-    print(f"Already completed: {len(completed)}")
-    print(f"Remaining: {len(remaining_strs)}")
-    print(f"Pre-existing pending links: {len(pending_links)}")
-    print(f"{'='*60}\n")
-
-    if not remaining_strs:
-        print("All recovery searches already completed!")
-        return
-
-    batch_size = Config.SEARCH_BATCH_SIZE
-    total_new_links = 0
-    start_time = time.time()
-    consecutive_error_batches = 0
-    MAX_CONSECUTIVE_ERROR_BATCHES = 5
-    ERROR_RATE_THRESHOLD = 0.8  # halt if 80%+ errors in a batch
-
-    for i in range(0, len(remaining_strs), batch_size):
-        batch_strs = remaining_strs[i : i + batch_size]
-        batch_num = (i // batch_size) + 1
-        total_batches = (len(remaining_strs) + batch_size - 1) // batch_size
-
-        batch_dicts = [query_str_to_dict(q) for q in batch_strs]
-
-        print(f"\n--- Search Batch {batch_num}/{total_batches} ({len(batch_dicts)} queries) ---")
-
-        try:
-            results = scrape_searches(batch_dicts, parallel=True)
-        except Exception as e:
-            print(f"  Batch error: {e}")
-            consecutive_error_batches += 1
-            if consecutive_error_batches >= MAX_CONSECUTIVE_ERROR_BATCHES:
-                print(f"\n  HALTING: {MAX_CONSECUTIVE_ERROR_BATCHES} consecutive batch errors.")
-                print("  Check browser connections and network.")
-                break
-            continue
-
-        batch_new = 0
-        batch_errors = 0
-        for result in results:
-            query = result.get("search_data", {}).get("query", "")
-
-            if result and result.get("place_links"):
-                links = result["place_links"]
-                new_links = dedup.filter_unseen_links(links)
-                for link in new_links:
-                    if link not in pending_links:
-                        pending_links.add(link)
-                        batch_new += 1
-                if new_links:
-                    print(f"  {query}: {len(links)} links ({len(new_links)} unseen)")
-            else:
-                error = result.get("error") if result else "No result"
-                print(f"  {query}: 0 links ({error})")
-                if error and "Connection refused" in str(error):
-                    batch_errors += 1
-
-            completed.add(query)
+RECOVERY_OUTPUT = "recovery_restaurants"
 
-        total_new_links += batch_new
 
-        # Error rate monitoring
-        error_rate = batch_errors / len(batch_strs) if batch_strs else 0
-        if error_rate >= ERROR_RATE_THRESHOLD:
-            consecutive_error_batches += 1
-            print(f"  WARNING: {error_rate:.0%} error rate in batch! "
-                  f"({consecutive_error_batches}/{MAX_CONSECUTIVE_ERROR_BATCHES} consecutive)")
-            if consecutive_error_batches >= MAX_CONSECUTIVE_ERROR_BATCHES:
-                print(f"\n  HALTING: {MAX_CONSECUTIVE_ERROR_BATCHES} consecutive high-error batches.")
-                print("  Browsers are likely failing. Check cache/reuse_driver settings.")
-                break
-        else:
-            consecutive_error_batches = 0
-
-        # Save checkpoint every batch
-        save_json(RECOVERY_COMPLETED_SEARCHES, list(completed))
-        save_json(RECOVERY_PENDING_LINKS, list(pending_links))
-
-        elapsed = time.time() - start_time
-        rate = (i + len(batch_strs)) / (elapsed / 60) if elapsed > 0 else 0
-        actual_remaining = len(remaining_strs) - (i + len(batch_strs))
-        eta_min = actual_remaining / rate if rate > 0 else 0
-
-        print(f"\n  Batch {batch_num}: +{batch_new} new links | "
-              f"Total pending: {len(pending_links)} | "
-              f"Searches done: {len(completed)}/{len(query_strings)} | "
-              f"Rate: {rate:.1f} q/min | ETA: {eta_min/60:.1f} hrs")
-
-        save_json(RECOVERY_PROGRESS, {
-            "phase": "search",
-            "completed_searches": len(completed),
-            "total_queries": len(query_strings),
-            "pending_links": len(pending_links),
-            "total_new_links": total_new_links,
-            "last_update": datetime.now().isoformat(),
-        })
-
-        if i + batch_size < len(remaining_strs):
-            # Check Chrome health every 10 batches
-            if batch_num % 10 == 0:
-                check_chrome_health("Phase 1")
-            time.sleep(Config.BATCH_DELAY)
-
-    print(f"\n{'='*60}")
-    print(f"RECOVERY PHASE 1 COMPLETE")
-    print(f"Searches completed: {len(completed)}")
-    print(f"New links from re-search: {total_new_links}")
-    print(f"Total pending links: {len(pending_links)}")
-    print(f"{'='*60}\n")
-
-
-def run_phase2(dedup: DeduplicationManager):
-    """Phase 2: Scrape details from all pending links."""
-    pending_links = load_json(RECOVERY_PENDING_LINKS, [])
-
-    print(f"\n{'='*60}")
-    print("RECOVERY PHASE 2: Scrape details from recovered links")
-    print(f"{'='*60}")
-    print(f"Pending links: {len(pending_links)}")
-    print(f"{'='*60}\n")
-
-    if not pending_links:
-        print("No pending links to process!")
-        return
-
-    # Load existing recovery results
-    os.makedirs(os.path.dirname(RECOVERY_OUTPUT), exist_ok=True)
-    all_results = load_json(RECOVERY_OUTPUT, [])
-    print(f"Existing recovery results: {len(all_results)}")
-
-    # Mark existing results as seen
-    for r in all_results:
-        dedup.mark_seen(r)
-
-    batch_size = Config.DETAILS_BATCH_SIZE
-    batch_num = 0
-    consecutive_empty = 0
-    consecutive_high_error = 0
-    MAX_CONSECUTIVE_EMPTY = 5
-    MAX_CONSECUTIVE_HIGH_ERROR = 5
-    ERROR_RATE_THRESHOLD = 0.8  # halt if 80%+ of batch returns None
-    total_processed = 0
-    total_errors = 0
-
-    while pending_links:
-        batch = pending_links[:batch_size]
-        batch_num += 1
-
-        print(f"\n--- Detail Batch {batch_num} ({len(batch)} places) ---")
-
-        try:
-            results = scrape_places(batch, parallel=True)
-            valid = [r for r in results if r is not None]
-            failed_count = len(batch) - len(valid)
-            unique = dedup.filter_unique(valid)
-
-            total_processed += len(batch)
-            total_errors += failed_count
-
-            if unique:
-                all_results.extend(unique)
-                print(f"  Saved {len(unique)} restaurants (total: {len(all_results)})")
-                consecutive_empty = 0
-            else:
-                consecutive_empty += 1
-                print(f"  0 new results ({consecutive_empty}/{MAX_CONSECUTIVE_EMPTY} consecutive empty)")
-
-            # Error rate monitoring per batch
-            error_rate = failed_count / len(batch) if batch else 0
-            if error_rate >= ERROR_RATE_THRESHOLD:
-                consecutive_high_error += 1
-                print(f"  WARNING: {error_rate:.0%} error rate ({failed_count}/{len(batch)} failed)! "
-                      f"({consecutive_high_error}/{MAX_CONSECUTIVE_HIGH_ERROR} consecutive)")
-            else:
-                consecutive_high_error = 0
-                if failed_count > 0:
-                    print(f"  {failed_count}/{len(batch)} failed ({error_rate:.0%})")
-
-            # Halt conditions
-            if consecutive_empty >= MAX_CONSECUTIVE_EMPTY:
-                print(f"\n  HALTING: {MAX_CONSECUTIVE_EMPTY} consecutive empty batches.")
-                break
-            if consecutive_high_error >= MAX_CONSECUTIVE_HIGH_ERROR:
-                print(f"\n  HALTING: {MAX_CONSECUTIVE_HIGH_ERROR} consecutive batches with {ERROR_RATE_THRESHOLD:.0%}+ errors.")
-                print(f"  Overall error rate: {total_errors}/{total_processed} ({total_errors/total_processed:.0%})")
-                print("  Browsers are likely broken. Check cache/reuse_driver settings.")
-                break
-
-        except Exception as e:
-            print(f"  Error: {e}")
-
-        pending_links = pending_links[batch_size:]
-
-        # Save incrementally every batch
-        save_json(RECOVERY_PENDING_LINKS, pending_links)
-        save_json(RECOVERY_OUTPUT, all_results)
-        dedup.save_checkpoint()
-
-        save_json(RECOVERY_PROGRESS, {
-            "phase": "details",
-            "completed_details": batch_num * batch_size,
-            "pending_links": len(pending_links),
-            "total_restaurants_saved": len(all_results),
-            "last_update": datetime.now().isoformat(),
-        })
-
-        print(f"  Remaining: {len(pending_links)} links")
-
-        if pending_links:
-            # Check Chrome health every 5 batches
-            if batch_num % 5 == 0:
-                check_chrome_health("Phase 2")
-            time.sleep(Config.BATCH_DELAY)
-
-    print(f"\n{'='*60}")
-    print(f"RECOVERY PHASE 2 COMPLETE")
-    print(f"Total restaurants recovered: {len(all_results)}")
-    print(f"Output: {RECOVERY_OUTPUT}")
-    print(f"{'='*60}\n")
-
-
-def main():
+def main() -> int:
     parser = argparse.ArgumentParser(description="Recovery search for lost links")
-    parser.add_argument("--query-file", help="JSON file with query strings for Phase 1 re-search")
-    parser.add_argument("--links-file", help="JSON file with cached URLs to pre-load into pending")
-    parser.add_argument("--skip-search", action="store_true", help="Skip Phase 1, only run Phase 2")
-    parser.add_argument("--search-only", action="store_true", help="Only run Phase 1, skip Phase 2")
+    parser.add_argument("--query-file", help="JSON list or .keys file of queries to re-search")
+    parser.add_argument("--links-file", help="JSON file with cached URLs to queue")
+    parser.add_argument("--skip-search", action="store_true", help="Skip the re-search, only scrape")
+    parser.add_argument("--search-only", action="store_true", help="Only re-search, skip scraping")
     args = parser.parse_args()
 
-    os.makedirs(RECOVERY_CHECKPOINT_DIR, exist_ok=True)
+    if not args.skip_search and not args.query_file:
+        print("ERROR: --query-file required for the re-search (or pass --skip-search)")
+        return 2
 
-    # Clean up stale Chrome before starting
-    chrome_count = count_chrome_processes()
-    if chrome_count > 0:
-        print(f"Cleaning up {chrome_count} stale Chrome processes before start...")
-        kill_stale_chrome()
-
-    # Use the MAIN seen_places.json for dedup
-    dedup = DeduplicationManager(MAIN_SEEN_PLACES)
-    print(f"Dedup loaded: {dedup.place_id_count} place_ids, {len(dedup.seen_hashes)} hashes")
-
-    # Pre-load cached links if provided
+    argv = ["worklist", "--checkpoint-dir", RECOVERY_CHECKPOINT_DIR, "--output", RECOVERY_OUTPUT]
+    if args.query_file:
+        argv += ["--queries", args.query_file]
     if args.links_file:
-        preload_links(args.links_file, dedup)
-
-    # Phase 1: Re-search to find additional links
-    if not args.skip_search:
-        if not args.query_file:
-            print("ERROR: --query-file required for Phase 1")
-            return
-        run_phase1(args.query_file, dedup)
-
-    # Phase 2: Scrape all pending links
-    if not args.search_only:
-        run_phase2(dedup)
+        argv += ["--links", args.links_file]
+    if args.skip_search:
+        argv.append("--skip-search")
+    if args.search_only:
+        argv.append("--search-only")
+    return cli_main(argv)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
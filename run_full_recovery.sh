@@ -11,6 +11,8 @@ MACHINE="${1:?Usage: $0 m1|m2}"
 cd "$(dirname "$0")/us-restaurant-scraper"
 PYTHON=".venv/bin/python3"
 export PYTHONPATH=src
+# Browser parallelism is sized per machine; host_profiles/<machine>.json overrides it
+export GMAPS_HOST_PROFILE="${GMAPS_HOST_PROFILE:-$MACHINE}"
 
 echo "=========================================="
 echo "FULL RECOVERY PIPELINE — $MACHINE"
@@ -28,6 +30,12 @@ fi
 # --- Step 1: Recovery (pre-load cached links → Phase 1 re-search → Phase 2 scrape) ---
 LINKS_FILE="../${MACHINE}_recovery_links.json"
 QUERY_FILE="../${MACHINE}_recovery_queries.json"
+QUERY_KEYS="../${MACHINE}_recovery_queries.keys"
+
+# The first run converts the query list to compact 64-bit query keys
+if [ -f "$QUERY_KEYS" ]; then
+    QUERY_FILE="$QUERY_KEYS"
+fi
 
 ARGS=""
 if [ -f "$LINKS_FILE" ]; then
@@ -11,6 +11,7 @@ BASE_DIR = "/Users/donosclawdbot/repos/restaurant-scraper"
 SCRAPER_DIR = os.path.join(BASE_DIR, "us-restaurant-scraper")
 MAIN_CHECKPOINT_DIR = os.path.join(SCRAPER_DIR, "checkpoints")
 RECOVERY_CHECKPOINT_DIR = os.path.join(SCRAPER_DIR, "checkpoints_recovery")
+RESCRAPE_CHECKPOINT_DIR = os.path.join(SCRAPER_DIR, "checkpoints_rescrape")
 STALE_THRESHOLD_MINUTES = 30
 
 
@@ -121,16 +122,11 @@ def _recovery_status() -> str:
 
 
 def _rescrape_status() -> str:
-    """Status for rescrape_rejected.py."""
-    done_data = _read_json(os.path.join(MAIN_CHECKPOINT_DIR, "rescrape_done.json"))
-    done_count = len(done_data) if isinstance(done_data, list) else 0
-
-    # Check for place_ids files to get total
-    total = 0
-    for name in ["m1_rescrape_place_ids.json", "m2_rescrape_place_ids.json"]:
-        data = _read_json(os.path.join(BASE_DIR, name))
-        if isinstance(data, list):
-            total = max(total, len(data))
+    """Status for rescrape_rejected.py (a place id work list)."""
+    progress = _read_json(os.path.join(RESCRAPE_CHECKPOINT_DIR, "progress.json")) or {}
+    done_count = progress.get("completed_details", 0)
+    saved = progress.get("total_restaurants_saved", 0)
+    total = done_count + progress.get("pending_links", 0)
 
     scraper_type = _find_running_scraper()
     status = "Running" if scraper_type == "rescrape" else "Stopped"
@@ -147,6 +143,7 @@ def _rescrape_status() -> str:
         f"Chrome:      {chrome} processes",
         f"{'─' * 40}",
         f"Done:        {done_count:,} / {total:,} ({pct:.1f}%)",
+        f"Saved:       {saved:,} restaurants (all_restaurants.json)",
         f"{'═' * 40}",
         "```",
     ]
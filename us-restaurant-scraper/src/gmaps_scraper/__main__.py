@@ -0,0 +1,7 @@
+"""Allow running the package with `python -m gmaps_scraper`."""
+
+import sys
+
+from gmaps_scraper.cli import main
+
+sys.exit(main())
@@ -1,9 +1,25 @@
-"""Checkpoint management for resumable scraping operations."""
+"""Checkpoint management for resumable scraping operations.
 
+Pending link changes are appended to pending_links.journal ("+link" /
+"-link" lines) and folded into pending_links.json.
+"""
+
+import glob
 import json
 import os
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Iterable, Iterator, Optional
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.geo.query_codec import (
+    LocationTable,
+    QueryCodec,
+    QueryKeySet,
+    read_key_counts,
+    read_keys,
+    write_key_counts,
+    write_keys,
+)
 
 
 class CheckpointManager:
@@ -13,22 +29,48 @@ class CheckpointManager:
     Tracks:
     - Current phase (search, details, complete)
     - Completed searches
+    - Partially completed searches (interrupted mid-scroll) and their depth
+    - Follow-up queries planned from earlier results (refinements, split tiles)
+    - Result counts of completed searches
     - Pending place links
+    - Search cards harvested for pending links
     - Failed items for retry
     """
 
-    def __init__(self, checkpoint_dir: str = "checkpoints"):
+    def __init__(self, checkpoint_dir: str = "checkpoints", query_locations_file: Optional[str] = None):
+        """
+        Args:
+            checkpoint_dir: Directory the checkpoint files live in
+            query_locations_file: Location table for query keys (defaults to
+                one in checkpoint_dir); runs whose completed searches are
+                shared with another checkpoint must use that checkpoint's table
+        """
         self.checkpoint_dir = checkpoint_dir
         os.makedirs(checkpoint_dir, exist_ok=True)
 
         self._progress_file = os.path.join(checkpoint_dir, "progress.json")
         self._pending_links_file = os.path.join(checkpoint_dir, "pending_links.json")
+        self._pending_journal_file = os.path.join(checkpoint_dir, "pending_links.journal")
         self._failed_items_file = os.path.join(checkpoint_dir, "failed_items.json")
-        self._completed_searches_file = os.path.join(checkpoint_dir, "completed_searches.json")
+        self._completed_searches_file = os.path.join(checkpoint_dir, "completed_searches.keys")
+        self._legacy_completed_searches_file = os.path.join(checkpoint_dir, "completed_searches.json")
+        self._query_locations_file = query_locations_file or os.path.join(checkpoint_dir, "query_locations.json")
+        self._link_cards_file = os.path.join(checkpoint_dir, "link_cards.json")
+        self._partial_searches_file = os.path.join(checkpoint_dir, "partial_searches.json")
+        self._followup_queries_file = os.path.join(checkpoint_dir, "followup_queries.json")
+        self._search_counts_file = os.path.join(checkpoint_dir, "search_counts.bin")
+        self._legacy_search_counts_file = os.path.join(checkpoint_dir, "search_counts.json")
 
         # In-memory cache
-        self._completed_searches: Optional[set[str]] = None
+        self._completed_searches: Optional[QueryKeySet] = None
+        self._codec: Optional[QueryCodec] = None
         self._pending_links: Optional[list[str]] = None
+        self._pending_journal_entries = 0
+        self._link_cards: Optional[dict[str, dict]] = None
+        self._link_cards_dirty = False
+        self._partial_searches: Optional[dict[int, dict]] = None
+        self._followup_queries: Optional[list[dict]] = None
+        self._search_counts: Optional[dict[int, int]] = None
 
     def get_progress(self) -> dict:
         """Load current progress."""
@@ -58,22 +100,52 @@ class CheckpointManager:
         except IOError as e:
             print(f"Warning: Could not save progress: {e}")
 
-    def _load_completed_searches(self) -> set[str]:
-        """Load completed searches from disk."""
+    def get_query_codec(self) -> QueryCodec:
+        """Query key codec backed by this checkpoint's location table."""
+        if self._codec is None:
+            self._codec = QueryCodec(LocationTable(self._query_locations_file))
+        return self._codec
+
+    def _load_shared_completed_searches(self) -> set[int]:
+        """Keys completed by other runs (Config.SHARED_COMPLETED_SEARCHES)."""
+        shared: set[int] = set()
+        for path in Config.SHARED_COMPLETED_SEARCHES:
+            if os.path.abspath(path) == os.path.abspath(self._completed_searches_file) or not os.path.exists(path):
+                continue
+            try:
+                shared.update(read_keys(path))
+            except IOError as e:
+                print(f"Warning: Could not load shared completed searches {path}: {e}")
+        return shared
+
+    def _load_completed_searches(self) -> QueryKeySet:
+        """Load completed search keys from disk, migrating a query-text checkpoint."""
+        completed = QueryKeySet(self.get_query_codec(), shared=self._load_shared_completed_searches())
         if os.path.exists(self._completed_searches_file):
             try:
-                with open(self._completed_searches_file, "r") as f:
-                    return set(json.load(f))
+                completed.keys.update(read_keys(self._completed_searches_file))
+            except IOError as e:
+                print(f"Warning: Could not load completed searches: {e}")
+        elif os.path.exists(self._legacy_completed_searches_file):
+            try:
+                with open(self._legacy_completed_searches_file, "r") as f:
+                    queries = json.load(f)
             except (json.JSONDecodeError, IOError):
-                pass
-        return set()
+                return completed
+            for query in queries:
+                completed.add(query)
+            self._completed_searches = completed
+            self._save_completed_searches()
+            os.replace(self._legacy_completed_searches_file, f"{self._legacy_completed_searches_file}.migrated")
+            print(f"Migrated {len(queries):,} completed searches to query keys")
+        return completed
 
     def _save_completed_searches(self) -> None:
-        """Save completed searches to disk."""
+        """Save completed search keys (and any new query locations) to disk."""
         if self._completed_searches is not None:
             try:
-                with open(self._completed_searches_file, "w") as f:
-                    json.dump(list(self._completed_searches), f)
+                self.get_query_codec().locations.save()
+                write_keys(self._completed_searches_file, self._completed_searches.keys)
             except IOError as e:
                 print(f"Warning: Could not save completed searches: {e}")
 
@@ -84,13 +156,13 @@ class CheckpointManager:
         self._completed_searches.add(query)
 
     def is_search_completed(self, query: str) -> bool:
-        """Check if a search query has been completed."""
+        """Check if a search has been completed, under any query spelling, mode or shared run."""
         if self._completed_searches is None:
             self._completed_searches = self._load_completed_searches()
         return query in self._completed_searches
 
-    def get_completed_searches(self) -> set[str]:
-        """Get the set of completed search query strings."""
+    def get_completed_searches(self) -> QueryKeySet:
+        """Get the completed searches (membership and iteration by query string)."""
         if self._completed_searches is None:
             self._completed_searches = self._load_completed_searches()
         return self._completed_searches
@@ -101,25 +173,155 @@ class CheckpointManager:
             self._completed_searches = self._load_completed_searches()
         return len(self._completed_searches)
 
+    def get_partial_searches(self) -> dict[int, dict]:
+        """Get searches that broke off mid-scroll, keyed by query key."""
+        if self._partial_searches is None:
+            self._partial_searches = {}
+            if os.path.exists(self._partial_searches_file):
+                try:
+                    with open(self._partial_searches_file, "r") as f:
+                        stored = json.load(f)
+                except (json.JSONDecodeError, IOError):
+                    stored = {}
+                # Files written before query keys are keyed by query text
+                codec = self.get_query_codec()
+                self._partial_searches = {
+                    int(query) if query.isdigit() else codec.key(query): entry
+                    for query, entry in stored.items()
+                }
+        return self._partial_searches
+
+    def get_partial_search(self, query: str) -> Optional[dict]:
+        """Get the partial-search record for a query, if it broke off before."""
+        key = self.get_query_codec().key(query, intern=False)
+        return self.get_partial_searches().get(key) if key is not None else None
+
+    def mark_search_partial(self, query: str, depth: int, links_found: int, error: str) -> None:
+        """Record that a search broke off at a scroll depth (kept at the deepest seen)."""
+        partial = self.get_partial_searches()
+        key = self.get_query_codec().key(query)
+        previous = partial.get(key, {})
+        partial[key] = {
+            "depth": max(depth, previous.get("depth", 0)),
+            "links_found": previous.get("links_found", 0) + links_found,
+            "attempts": previous.get("attempts", 0) + 1,
+            "error": error,
+            "updated_at": datetime.now().isoformat(),
+        }
+        self._save_partial_searches()
+
+    def clear_partial_search(self, query: str) -> None:
+        """Forget a partial search once it has completed."""
+        key = self.get_query_codec().key(query, intern=False)
+        if key is not None and self.get_partial_searches().pop(key, None) is not None:
+            self._save_partial_searches()
+
+    def _save_partial_searches(self) -> None:
+        """Persist partial searches (and any new query locations) to disk."""
+        try:
+            self.get_query_codec().locations.save()
+            with open(self._partial_searches_file, "w") as f:
+                json.dump({str(key): entry for key, entry in self._partial_searches.items()}, f, indent=2)
+        except IOError as e:
+            print(f"Warning: Could not save partial searches: {e}")
+
+    def _get_search_counts(self) -> dict[int, int]:
+        """Load result counts of completed searches, migrating a query-text file."""
+        if self._search_counts is None:
+            self._search_counts = {}
+            if os.path.exists(self._search_counts_file):
+                try:
+                    self._search_counts = read_key_counts(self._search_counts_file)
+                except IOError as e:
+                    print(f"Warning: Could not load search counts: {e}")
+            elif os.path.exists(self._legacy_search_counts_file):
+                try:
+                    with open(self._legacy_search_counts_file, "r") as f:
+                        counts = json.load(f)
+                except (json.JSONDecodeError, IOError):
+                    return self._search_counts
+                codec = self.get_query_codec()
+                self._search_counts = {codec.key(query): count for query, count in counts.items()}
+                self._save_search_counts()
+                os.replace(self._legacy_search_counts_file, f"{self._legacy_search_counts_file}.migrated")
+        return self._search_counts
+
+    def record_search_count(self, query: str, count: int) -> None:
+        """Record how many place links a completed search returned."""
+        self._get_search_counts()[self.get_query_codec().key(query)] = count
+
+    def get_search_count(self, query: str) -> Optional[int]:
+        """Get a completed search's result count, under any query spelling (None if not recorded)."""
+        key = self.get_query_codec().key(query, intern=False)
+        return self._get_search_counts().get(key) if key is not None else None
+
+    def _save_search_counts(self) -> None:
+        """Persist search result counts (and any new query locations) to disk."""
+        if self._search_counts is None:
+            return
+        try:
+            self.get_query_codec().locations.save()
+            write_key_counts(self._search_counts_file, self._search_counts)
+        except IOError as e:
+            print(f"Warning: Could not save search counts: {e}")
+
+    def get_followup_queries(self) -> list[dict]:
+        """Get follow-up queries planned from earlier search results."""
+        if self._followup_queries is None:
+            self._followup_queries = []
+            if os.path.exists(self._followup_queries_file):
+                try:
+                    with open(self._followup_queries_file, "r") as f:
+                        self._followup_queries = json.load(f)
+                except (json.JSONDecodeError, IOError):
+                    pass
+        return self._followup_queries
+
+    def add_followup_queries(self, queries: list[dict]) -> list[dict]:
+        """Add follow-up queries. Returns the ones not already planned."""
+        followups = self.get_followup_queries()
+        codec = self.get_query_codec()
+        existing = {codec.key(q.get("query", "")) for q in followups}
+        new_queries = []
+        for q in queries:
+            key = codec.key(q.get("query", ""))
+            if key not in existing:
+                existing.add(key)
+                new_queries.append(q)
+        if new_queries:
+            followups.extend(new_queries)
+            self._save_followup_queries()
+        return new_queries
+
+    def _save_followup_queries(self) -> None:
+        """Persist follow-up queries to disk."""
+        try:
+            with open(self._followup_queries_file, "w") as f:
+                json.dump(self._followup_queries, f)
+        except IOError as e:
+            print(f"Warning: Could not save follow-up queries: {e}")
+
     def get_remaining_searches(self, all_queries: list[dict]) -> list[dict]:
         """Get search queries that haven't been completed."""
+        return list(self.iter_remaining_searches(all_queries))
+
+    def iter_remaining_searches(self, all_queries: Iterable[dict]) -> Iterator[dict]:
+        """Lazily filter a query stream down to searches that haven't been completed."""
         if self._completed_searches is None:
             self._completed_searches = self._load_completed_searches()
-        return [q for q in all_queries if q.get("query") not in self._completed_searches]
+        for q in all_queries:
+            if q.get("query") not in self._completed_searches:
+                yield q
 
     def add_pending_links(self, links: list[str]) -> int:
         """Add links to pending queue. Returns number of new links added."""
-        existing = set(self.get_pending_links())
-        new_links = [link for link in links if link not in existing]
+        pending = self.get_pending_links()
+        existing = set(pending)
+        new_links = list(dict.fromkeys(link for link in links if link not in existing))
 
         if new_links:
-            combined = list(existing) + new_links
-            try:
-                with open(self._pending_links_file, "w") as f:
-                    json.dump(combined, f)
-                self._pending_links = combined
-            except IOError as e:
-                print(f"Warning: Could not save pending links: {e}")
+            pending.extend(new_links)
+            self._journal_pending_links("+", new_links)
 
         return len(new_links)
 
@@ -128,17 +330,72 @@ class CheckpointManager:
         if self._pending_links is not None:
             return self._pending_links
 
+        self._pending_links = []
         if os.path.exists(self._pending_links_file):
             try:
                 with open(self._pending_links_file, "r") as f:
                     self._pending_links = json.load(f)
-                    return self._pending_links
             except (json.JSONDecodeError, IOError):
                 pass
-
-        self._pending_links = []
+        self._replay_pending_journal()
         return self._pending_links
 
+    def _replay_pending_journal(self) -> None:
+        """Apply the changes journaled since pending_links.json was written."""
+        if not os.path.exists(self._pending_journal_file):
+            return
+        removed: set[str] = set()
+        torn = False
+        try:
+            with open(self._pending_journal_file, "r") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        torn = True  # interrupted mid-append
+                        break
+                    op, link = line[0], line[1:-1]
+                    self._pending_journal_entries += 1
+                    if op == "-":
+                        removed.add(link)
+                        continue
+                    if removed:
+                        self._pending_links = [link for link in self._pending_links if link not in removed]
+                        removed = set()
+                    self._pending_links.append(link)
+        except IOError as e:
+            print(f"Warning: Could not read pending links journal: {e}")
+        if removed:
+            self._pending_links = [link for link in self._pending_links if link not in removed]
+        if torn:
+            self._save_pending_links()
+
+    def _journal_pending_links(self, op: str, links: Iterable[str]) -> None:
+        """Append pending link changes, folding the journal into the JSON file once it outgrows it."""
+        lines = [f"{op}{link}\n" for link in links]
+        self._pending_journal_entries += len(lines)
+        if self._pending_journal_entries > max(len(self.get_pending_links()), Config.PENDING_JOURNAL_MIN_ENTRIES):
+            self._save_pending_links()
+            return
+        try:
+            with open(self._pending_journal_file, "a") as f:
+                f.writelines(lines)
+        except IOError as e:
+            print(f"Warning: Could not save pending links: {e}")
+
+    def _save_pending_links(self) -> None:
+        """Rewrite pending_links.json (atomically) and clear the journal."""
+        tmp_file = f"{self._pending_links_file}.tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(self.get_pending_links(), f)
+            os.replace(tmp_file, self._pending_links_file)
+            if os.path.exists(self._pending_journal_file):
+                os.remove(self._pending_journal_file)
+            self._pending_journal_entries = 0
+        except IOError as e:
+            print(f"Warning: Could not save pending links: {e}")
+        if self._link_cards_dirty:
+            self._save_link_cards()
+
     def get_pending_links_count(self) -> int:
         """Get count of pending links."""
         return len(self.get_pending_links())
@@ -146,22 +403,62 @@ class CheckpointManager:
     def remove_processed_links(self, links: list[str]) -> None:
         """Remove processed links from pending."""
         links_set = set(links)
-        pending = self.get_pending_links()
-        remaining = [link for link in pending if link not in links_set]
+        # Written with the next fold: a stale card left on disk only belongs
+        # to a link that is no longer pending, which compact() drops
+        cards = self.get_link_cards()
+        for link in links_set:
+            if cards.pop(link, None) is not None:
+                self._link_cards_dirty = True
 
+        pending = self.get_pending_links()
+        removed = links_set.intersection(pending)
+        if removed:
+            self._pending_links = [link for link in pending if link not in removed]
+            self._journal_pending_links("-", removed)
+
+    def get_link_cards(self) -> dict[str, dict]:
+        """Get search cards (partial records) keyed by pending link."""
+        if self._link_cards is None:
+            self._link_cards = {}
+            if os.path.exists(self._link_cards_file):
+                try:
+                    with open(self._link_cards_file, "r") as f:
+                        self._link_cards = json.load(f)
+                except (json.JSONDecodeError, IOError):
+                    pass
+        return self._link_cards
+
+    def get_link_card(self, link: str) -> Optional[dict]:
+        """Get the search card harvested for a link, if any."""
+        return self.get_link_cards().get(link)
+
+    def add_link_cards(self, cards: dict[str, dict]) -> None:
+        """Store search cards for links (existing cards are kept)."""
+        stored = self.get_link_cards()
+        new_cards = {link: card for link, card in cards.items() if link not in stored}
+        if new_cards:
+            stored.update(new_cards)
+            self._save_link_cards()
+
+    def _save_link_cards(self) -> None:
+        """Persist link cards to disk."""
         try:
-            with open(self._pending_links_file, "w") as f:
-                json.dump(remaining, f)
-            self._pending_links = remaining
+            with open(self._link_cards_file, "w") as f:
+                json.dump(self._link_cards, f)
+            self._link_cards_dirty = False
         except IOError as e:
-            print(f"Warning: Could not update pending links: {e}")
+            print(f"Warning: Could not save link cards: {e}")
 
     def get_next_batch(self, batch_size: int) -> list[str]:
         """Get next batch of links to process."""
         return self.get_pending_links()[:batch_size]
 
     def record_failure(self, item: Any, error: str) -> None:
-        """Record a failed item for retry."""
+        """Record a failed item for retry.
+
+        An item that failed before keeps its one entry, updated with the
+        latest error and the number of attempts.
+        """
         failures = []
         if os.path.exists(self._failed_items_file):
             try:
@@ -170,11 +467,13 @@ class CheckpointManager:
             except (json.JSONDecodeError, IOError):
                 pass
 
-        failures.append({
-            "item": item,
-            "error": error,
-            "timestamp": datetime.now().isoformat(),
-        })
+        entry = next((f for f in failures if f.get("item") == item), None)
+        if entry is None:
+            entry = {"item": item, "attempts": 0}
+            failures.append(entry)
+        entry["error"] = error
+        entry["timestamp"] = datetime.now().isoformat()
+        entry["attempts"] = entry.get("attempts", 1) + 1
 
         try:
             with open(self._failed_items_file, "w") as f:
@@ -211,6 +510,56 @@ class CheckpointManager:
     def save_all(self) -> None:
         """Save all checkpoint data to disk."""
         self._save_completed_searches()
+        self._save_search_counts()
+        if self._link_cards_dirty:
+            self._save_link_cards()
+
+    def compact(self) -> dict:
+        """
+        Rewrite checkpoint files without redundant entries.
+
+        Drops duplicate pending links, search cards for links that are no
+        longer pending, and partial / follow-up entries for searches that
+        have since completed, then rewrites the completed-search keys.
+
+        Returns:
+            Number of entries dropped per file
+        """
+        dropped = {}
+
+        pending = self.get_pending_links()
+        unique = list(dict.fromkeys(pending))
+        dropped["pending_links"] = len(pending) - len(unique)
+        self._pending_links = unique
+        self._save_pending_links()
+
+        cards = self.get_link_cards()
+        pending_set = set(unique)
+        orphans = [link for link in cards if link not in pending_set]
+        dropped["link_cards"] = len(orphans)
+        if orphans or self._link_cards_dirty:
+            for link in orphans:
+                del cards[link]
+            self._save_link_cards()
+
+        completed = self.get_completed_searches()
+        partial = self.get_partial_searches()
+        finished = [key for key in partial if key in completed.keys or key in completed.shared]
+        dropped["partial_searches"] = len(finished)
+        if finished:
+            for key in finished:
+                del partial[key]
+            self._save_partial_searches()
+
+        followups = self.get_followup_queries()
+        remaining = self.get_remaining_searches(followups)
+        dropped["followup_queries"] = len(followups) - len(remaining)
+        if dropped["followup_queries"]:
+            self._followup_queries = remaining
+            self._save_followup_queries()
+
+        self._save_completed_searches()
+        return dropped
 
     def get_stats(self) -> dict:
         """Get checkpoint statistics."""
@@ -222,20 +571,38 @@ class CheckpointManager:
             "total_links_found": progress.get("total_links_found", 0),
             "total_restaurants_saved": progress.get("total_restaurants_saved", 0),
             "failures": len(self.get_failures()),
+            "partial_searches": len(self.get_partial_searches()),
             "last_update": progress.get("last_update"),
             "started_at": progress.get("started_at"),
         }
 
     def reset(self) -> None:
         """Reset all checkpoint data."""
-        self._completed_searches = set()
+        self._completed_searches = QueryKeySet(self.get_query_codec())
         self._pending_links = []
+        self._pending_journal_entries = 0
+        self._link_cards = {}
+        self._link_cards_dirty = False
+        self._partial_searches = {}
+        self._followup_queries = []
+        self._search_counts = {}
 
         files_to_remove = [
             self._progress_file,
             self._pending_links_file,
+            self._pending_journal_file,
             self._failed_items_file,
             self._completed_searches_file,
+            self._legacy_completed_searches_file,
+            self._link_cards_file,
+            self._partial_searches_file,
+            self._followup_queries_file,
+            self._search_counts_file,
+            self._legacy_search_counts_file,
+            # Coverage estimates describe this run's searches (scroll history is kept)
+            os.path.join(self.checkpoint_dir, "coverage_incidence.json"),
+            # Plan completion bitmaps (the compiled plans themselves stay valid)
+            *glob.glob(os.path.join(self.checkpoint_dir, "query_plan_*.bin.done")),
         ]
 
         for filepath in files_to_remove:
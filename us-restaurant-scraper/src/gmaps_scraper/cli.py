@@ -1,8 +1,25 @@
-"""Command-line interface for Google Maps Scraper."""
+"""Command-line interface for Google Maps Scraper.
+
+Subcommands:
+    run      Search and scrape (the default when no subcommand is given)
+    plan     Show query counts for a mode without scraping
+    status   Checkpoint progress and cached query plans
+    stats    Counts of the saved restaurants (from output/results_index.bin)
+    export   Write the saved restaurants as CSV or JSON lines
+    compact  Rewrite checkpoint files without redundant entries
+    worklist Search and scrape an explicit list of queries, links or place ids
+    setops   Difference / intersection / union of the place ids in files
+
+Only `run` and `worklist` import the browser stack (botasaurus), so the
+planning and inspection commands start in a fraction of a second.
+"""
 
 import argparse
+import csv
+import json
 import os
 import sys
+from typing import Optional
 
 # Load environment variables from .env file
 from pathlib import Path
@@ -18,14 +35,18 @@ if env_file.exists():
 from gmaps_scraper.config import Config
 from gmaps_scraper.checkpoint import CheckpointManager
 from gmaps_scraper.deduplication import DeduplicationManager
-from gmaps_scraper.scraper import run_scraper
+from gmaps_scraper.extractors.http_search import SEARCH_BACKENDS
+from gmaps_scraper.extractors.profiles import FIELD_PROFILES
+from gmaps_scraper.geo.zip_cover import ZIP_SELECTIONS
+from gmaps_scraper.machine import apply_machine_profile, describe_machine_profile, profile_machine
+from gmaps_scraper.results_index import INDEXED_FIELDS, load_results_index
+from gmaps_scraper.setops import SET_OPERATIONS, place_key_set_operation
 
+COMMANDS = ("run", "plan", "status", "stats", "export", "compact", "worklist", "setops")
 
-def main() -> int:
-    """Entry point for the CLI."""
-    parser = argparse.ArgumentParser(
-        description="Scrape US restaurant data from Google Maps"
-    )
+
+def _add_plan_arguments(parser: argparse.ArgumentParser) -> None:
+    """Arguments that select which queries are planned (shared by run and plan)."""
     parser.add_argument(
         "--test",
         action="store_true",
@@ -37,6 +58,63 @@ def main() -> int:
         default=5,
         help="Number of queries in test mode (default: 5)",
     )
+    parser.add_argument(
+        "--cities-csv",
+        type=str,
+        help="Path to cities CSV file",
+    )
+    parser.add_argument(
+        "--zip-codes-csv",
+        type=str,
+        help="Path to zip codes CSV file",
+    )
+    parser.add_argument(
+        "--fill-gaps",
+        action="store_true",
+        help="Search all remaining zip codes not yet queried (exhaustive coverage)",
+    )
+    parser.add_argument(
+        "--cuisine-expansion",
+        action="store_true",
+        help="Enable cuisine-specific queries for comprehensive coverage",
+    )
+    parser.add_argument(
+        "--cuisine-min-population",
+        type=int,
+        default=100_000,
+        help="Min city population for cuisine expansion (default: 100000)",
+    )
+    parser.add_argument(
+        "--zip-selection",
+        choices=ZIP_SELECTIONS,
+        default=None,
+        help=f"How zip queries are picked per city: evenly by list position, or the fewest "
+             f"zips whose search radius covers the city, weighted by restaurants seen in "
+             f"earlier runs (needs --zip-codes-csv; default: {Config.ZIP_SELECTION})",
+    )
+    parser.add_argument(
+        "--rebuild-plan",
+        action="store_true",
+        help="Rebuild the cached query plan (checkpoints/query_plan_*.bin) even if the "
+             "CSVs and settings it was built from are unchanged",
+    )
+    parser.add_argument(
+        "--no-refine",
+        action="store_true",
+        help="Do not refine searches that hit the result cap into cuisine / sub-area queries "
+             "or split saturated tiles (--cuisine-expansion then runs the full static "
+             "cuisine cross product)",
+    )
+    parser.add_argument(
+        "--tiles",
+        action="store_true",
+        help="Search map viewports over a tile grid seeded from city centroids, splitting "
+             "tiles that hit the result cap, instead of city/zip/cuisine text queries",
+    )
+
+
+def _add_run_arguments(parser: argparse.ArgumentParser) -> None:
+    """Arguments that only apply when scraping."""
     parser.add_argument(
         "--skip-search",
         action="store_true",
@@ -48,44 +126,248 @@ def main() -> int:
         help="Skip details phase (only collect links)",
     )
     parser.add_argument(
-        "--cities-csv",
-        type=str,
-        help="Path to cities CSV file",
+        "--reset",
+        action="store_true",
+        help="Reset all checkpoints and start fresh",
     )
     parser.add_argument(
-        "--zip-codes-csv",
-        type=str,
-        help="Path to zip codes CSV file",
+        "--dry-run",
+        action="store_true",
+        help="Only show query counts, don't scrape (same as the plan command)",
     )
     parser.add_argument(
-        "--reset",
+        "--profile",
+        choices=list(FIELD_PROFILES),
+        default=None,
+        help=f"Details extraction profile (default: {Config.DETAILS_PROFILE})",
+    )
+    parser.add_argument(
+        "--enrich",
         action="store_true",
-        help="Reset all checkpoints and start fresh",
+        help="Revisit places with missing review counts / partial hours after the main pass",
     )
     parser.add_argument(
-        "--fill-gaps",
+        "--browser-pool",
         action="store_true",
-        help="Search all remaining zip codes not yet queried (exhaustive coverage)",
+        default=None,
+        help=f"Reuse health-checked Chrome drivers across places instead of one Chrome per URL "
+             f"(default: {Config.USE_BROWSER_POOL})",
     )
     parser.add_argument(
-        "--dry-run",
+        "--tabs-per-browser",
+        type=int,
+        default=None,
+        help=f"Places loaded concurrently in tabs of each pooled Chrome "
+             f"(default: {Config.TABS_PER_BROWSER}; >1 implies --browser-pool)",
+    )
+    parser.add_argument(
+        "--prefetch",
         action="store_true",
-        help="Only show query counts, don't scrape",
+        default=None,
+        help="Load the next pending place in a background tab while extracting the current one "
+             "(uses the browser pool)",
     )
     parser.add_argument(
-        "--cuisine-expansion",
+        "--search-backend",
+        choices=SEARCH_BACKENDS,
+        default=None,
+        help=f"Search backend: scroll the results feed in Chrome, or page the search data "
+             f"over HTTP with Chrome as fallback (default: {Config.SEARCH_BACKEND})",
+    )
+    parser.add_argument(
+        "--light",
         action="store_true",
-        help="Enable cuisine-specific queries for comprehensive coverage",
+        help="Emit card-level records (name, rating, reviews, category, price, address "
+             "snippet) from search results without visiting place pages",
     )
     parser.add_argument(
-        "--cuisine-min-population",
+        "--http-details",
+        action="store_true",
+        default=None,
+        help="Fetch place pages over keep-alive HTTP and use Chrome only for pages that fail "
+             "to parse or hit a consent/challenge page",
+    )
+    parser.add_argument(
+        "--no-auto-size",
+        action="store_true",
+        help="Keep the configured browser parallelism and batch sizes instead of sizing them "
+             "from this machine's cores, RAM and a sample Chrome (host_profiles/ still apply)",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with one subparser per command."""
+    parser = argparse.ArgumentParser(
+        description="Scrape US restaurant data from Google Maps",
+        epilog="Without a subcommand, arguments are passed to `run`.",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="{" + ",".join(COMMANDS) + "}")
+
+    run = commands.add_parser("run", help="Search and scrape (default)")
+    _add_plan_arguments(run)
+    _add_run_arguments(run)
+
+    plan = commands.add_parser("plan", help="Show query counts for a mode without scraping")
+    _add_plan_arguments(plan)
+
+    commands.add_parser("status", help="Show checkpoint progress and cached query plans")
+
+    stats = commands.add_parser(
+        "stats",
+        help="Count saved restaurants by state, city, cuisine, rating and field completeness",
+    )
+    stats.add_argument("--state", help="Only count restaurants in this state (e.g. TX)")
+    stats.add_argument("--city", help="Only count restaurants whose \"City, ST\" contains this text")
+    stats.add_argument("--cuisine", help="Only count restaurants whose cuisine type contains this text")
+    stats.add_argument("--min-rating", type=float, default=None, help="Only count restaurants rated at least this")
+    stats.add_argument(
+        "--missing",
+        choices=INDEXED_FIELDS,
+        default=None,
+        help="Only count restaurants without a value for this field",
+    )
+    stats.add_argument(
+        "--top",
         type=int,
-        default=100_000,
-        help="Min city population for cuisine expansion (default: 100000)",
+        default=10,
+        help="Number of states / cities / cuisines to list (default: 10)",
+    )
+    stats.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="Rebuild output/results_index.bin from all_restaurants.json",
+    )
+
+    export = commands.add_parser("export", help="Write the saved restaurants as CSV or JSON lines")
+    export.add_argument("output", help="Output file path")
+    export.add_argument(
+        "--format",
+        choices=("csv", "jsonl"),
+        default=None,
+        help="Output format (default: from the output file extension, else csv)",
+    )
+
+    commands.add_parser("compact", help="Rewrite checkpoint files without redundant entries")
+
+    worklist = commands.add_parser(
+        "worklist",
+        help="Search and scrape an explicit list of queries, links or place ids",
     )
+    sources = worklist.add_mutually_exclusive_group()
+    sources.add_argument(
+        "--queries",
+        metavar="FILE",
+        help="JSON list of query strings, or a .keys file of query keys, to search",
+    )
+    sources.add_argument(
+        "--place-ids",
+        metavar="FILE",
+        help="JSON list or place key file (.pk) of place ids to visit, even if seen before",
+    )
+    worklist.add_argument("--links", metavar="FILE", help="JSON list of place URLs to scrape")
+    worklist.add_argument(
+        "--checkpoint-dir",
+        default=None,
+        help=f"Checkpoint directory of the work list (default: {Config.WORKLIST_CHECKPOINT_DIR}, "
+             f"{Config.RESCRAPE_CHECKPOINT_DIR} for --place-ids)",
+    )
+    worklist.add_argument(
+        "--output",
+        default="all_restaurants",
+        help="Results file in the output directory, without .json (default: all_restaurants)",
+    )
+    worklist.add_argument("--skip-search", action="store_true", help="Only scrape already pending links")
+    worklist.add_argument("--search-only", action="store_true", help="Only search, leaving links pending")
+    worklist.add_argument("--food-trucks", action="store_true", help="Also write food_trucks.json from the results")
+    worklist.add_argument(
+        "--no-auto-size",
+        action="store_true",
+        help="Keep the configured browser counts instead of sizing them to this machine",
+    )
+
+    setops = commands.add_parser(
+        "setops",
+        help="Difference / intersection / union of the place ids in checkpoint and output files",
+    )
+    setops.add_argument(
+        "op",
+        choices=SET_OPERATIONS,
+        help="diff: in the first source and none of the others; intersect: in all; union: in any",
+    )
+    setops.add_argument(
+        "sources",
+        nargs="+",
+        metavar="SOURCE",
+        help="Place key files (.pk), pending_links.json, results files or any file listing place ids",
+    )
+    setops.add_argument(
+        "-o", "--output",
+        default=None,
+        help="Write the result as a place key file (.pk) or a JSON list of place ids (.json)",
+    )
+    setops.add_argument(
+        "--run-keys",
+        type=int,
+        default=None,
+        help=f"Place keys sorted in memory per run (default: {Config.SETOPS_RUN_KEYS:,})",
+    )
+    return parser
+
+
+def _load_restaurants() -> list[dict]:
+    """Load output/all_restaurants.json (empty if it does not exist yet)."""
+    path = os.path.join(Config.OUTPUT_DIR, "all_restaurants.json")
+    if not os.path.exists(path):
+        print(f"No results yet ({path} not found)")
+        return []
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def cmd_plan(args: argparse.Namespace) -> int:
+    """Print the number of planned and remaining queries for the selected mode."""
+    from gmaps_scraper.geo import get_test_queries, plan_tile_queries
+    from gmaps_scraper.plan_cache import load_query_plan
+
+    refine = Config.REFINE_SEARCHES and not args.no_refine
+    zip_selection = args.zip_selection or Config.ZIP_SELECTION
+    if args.fill_gaps or args.cuisine_expansion or not (args.tiles or args.test):
+        checkpoint = CheckpointManager(Config.CHECKPOINT_DIR)
+        plan = load_query_plan(
+            checkpoint,
+            fill_gaps=args.fill_gaps,
+            cuisine_expansion=args.cuisine_expansion,
+            cuisine_min_population=args.cuisine_min_population,
+            cities_csv=args.cities_csv,
+            zip_codes_csv=args.zip_codes_csv,
+            zip_selection=zip_selection,
+            refine=refine,
+            rebuild=args.rebuild_plan,
+        )
+        plan.sync(checkpoint.get_completed_searches())
+        remaining = len(plan) - plan.done_count()
+        if args.fill_gaps:
+            mode = "Fill-gaps"
+        elif args.cuisine_expansion:
+            mode = "Cuisine expansion"
+        else:
+            mode = "Production"
+        print(f"\n{mode} mode: {len(plan):,} total queries ({remaining:,} remaining)")
+        if refine:
+            followups = checkpoint.get_remaining_searches(checkpoint.get_followup_queries())
+            print(f"Refinement queries from earlier runs: {len(followups):,}")
+    elif args.tiles:
+        queries = plan_tile_queries(cities_csv=args.cities_csv, zip_codes_csv=args.zip_codes_csv)
+        if args.test:
+            queries = queries[:args.test_limit]
+        print(f"\nTile mode: {len(queries):,} seed viewport queries")
+    else:
+        print(f"\nTest mode: {len(get_test_queries(args.test_limit))} test queries")
+    return 0
 
-    args = parser.parse_args()
 
+def cmd_run(args: argparse.Namespace) -> int:
+    """Run the scraper."""
     # Reset if requested
     if args.reset:
         print("Resetting all checkpoints...")
@@ -97,7 +379,20 @@ def main() -> int:
         dedup.clear()
         print("Reset complete!")
 
-    # Run scraper
+    if args.dry_run:
+        cmd_plan(args)
+        print("\nDry run -- no scraping performed.")
+        return 0
+
+    # Sized before the scraper is imported: the browser decorators read Config at import
+    previous = CheckpointManager(Config.CHECKPOINT_DIR).get_progress().get("machine")
+    machine_profile = profile_machine(previous, auto=False if args.no_auto_size else None)
+    apply_machine_profile(machine_profile)
+    print(f"Machine profile: {describe_machine_profile(machine_profile)}")
+
+    # Imported here: the scraper pulls in the browser stack
+    from gmaps_scraper.scraper import run_scraper
+
     run_scraper(
         test_mode=args.test,
         test_limit=args.test_limit,
@@ -106,13 +401,189 @@ def main() -> int:
         cities_csv=args.cities_csv,
         zip_codes_csv=args.zip_codes_csv,
         fill_gaps=args.fill_gaps,
-        dry_run=args.dry_run,
         cuisine_expansion=args.cuisine_expansion,
         cuisine_min_population=args.cuisine_min_population,
+        profile=args.profile,
+        enrich=args.enrich,
+        browser_pool=args.browser_pool,
+        tabs_per_browser=args.tabs_per_browser,
+        prefetch=args.prefetch,
+        http_first=args.http_details,
+        search_backend=args.search_backend,
+        light=args.light,
+        tiles=args.tiles,
+        refine=False if args.no_refine else None,
+        zip_selection=args.zip_selection,
+        rebuild_plan=args.rebuild_plan,
+        machine_profile=machine_profile,
+    )
+    return 0
+
+
+def cmd_status(args: argparse.Namespace) -> int:
+    """Print checkpoint statistics and the progress of cached query plans."""
+    from gmaps_scraper.plan_cache import QueryPlanCache
+
+    checkpoint = CheckpointManager(Config.CHECKPOINT_DIR)
+    stats = checkpoint.get_stats()
+    print(f"Checkpoint: {Config.CHECKPOINT_DIR}")
+    print(f"  Phase: {stats['phase']}")
+    print(f"  Started: {stats['started_at'] or '-'}")
+    print(f"  Last update: {stats['last_update'] or '-'}")
+    print(f"  Completed searches: {stats['completed_searches']:,}")
+    print(f"  Partial searches: {stats['partial_searches']:,}")
+    print(f"  Follow-up queries: {len(checkpoint.get_followup_queries()):,}")
+    print(f"  Pending links: {stats['pending_links']:,}")
+    print(f"  Links found: {stats['total_links_found']:,}")
+    print(f"  Restaurants saved: {stats['total_restaurants_saved']:,}")
+    print(f"  Failures: {stats['failures']:,}")
+    machine = checkpoint.get_progress().get("machine")
+    if machine:
+        print(f"  Machine: {describe_machine_profile(machine)}")
+
+    summaries = QueryPlanCache(Config.CHECKPOINT_DIR).summaries()
+    if summaries:
+        print("\nQuery plans:")
+        for summary in summaries:
+            print(f"  {summary['mode']:<12} {summary['done']:>10,} / {summary['queries']:<10,} done "
+                  f"({os.path.basename(summary['file'])})")
+    return 0
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    """Print a summary of the saved restaurants."""
+    index = load_results_index(rebuild=args.rebuild_index)
+    filters = {
+        "state": args.state,
+        "city": args.city,
+        "cuisine": args.cuisine,
+        "min_rating": args.min_rating,
+        "missing": args.missing,
+    }
+    rows = list(index.rows(**filters)) if any(v is not None for v in filters.values()) else None
+    total = len(index) if rows is None else len(rows)
+
+    applied = ", ".join(f"{name}={value}" for name, value in filters.items() if value is not None)
+    print(f"Restaurants: {total:,}" + (f" ({applied})" if applied else ""))
+    if not total:
+        return 0
+
+    print("\nRating:")
+    for label, count in index.rating_buckets(rows).items():
+        print(f"  {label:<10} {count:>10,}")
+    print("\nFields present:")
+    for field, count in index.completeness(rows).items():
+        print(f"  {field:<20} {count:>10,}  ({count / total:.0%})")
+    for dimension in ("state", "city", "cuisine"):
+        print(f"\nTop {args.top} by {dimension}:")
+        for value, count in index.counts_by(dimension, rows).most_common(args.top):
+            print(f"  {value or '?':<30} {count:>10,}")
+    return 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    """Write the saved restaurants to a CSV or JSON lines file."""
+    fmt = args.format or ("jsonl" if args.output.endswith((".jsonl", ".ndjson")) else "csv")
+    restaurants = _load_restaurants()
+
+    with open(args.output, "w", newline="", encoding="utf-8") as f:
+        if fmt == "jsonl":
+            for restaurant in restaurants:
+                f.write(json.dumps(restaurant, ensure_ascii=False) + "\n")
+        else:
+            fields = list(dict.fromkeys(field for r in restaurants for field in r))
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            for restaurant in restaurants:
+                # Nested values (hours, photos) as JSON text
+                writer.writerow({
+                    field: json.dumps(value, ensure_ascii=False) if isinstance(value, (list, dict)) else value
+                    for field, value in restaurant.items()
+                })
+
+    print(f"Exported {len(restaurants):,} restaurants to {args.output} ({fmt})")
+    return 0
+
+
+def cmd_compact(args: argparse.Namespace) -> int:
+    """Drop redundant checkpoint entries."""
+    dropped = CheckpointManager(Config.CHECKPOINT_DIR).compact()
+    for name, count in dropped.items():
+        print(f"  {name}: {count:,} dropped")
+    print("Compaction complete!")
+    return 0
+
+
+def cmd_worklist(args: argparse.Namespace) -> int:
+    """Search and scrape a work list."""
+    if not (args.queries or args.links or args.place_ids or args.skip_search):
+        print("Error: worklist needs --queries, --links or --place-ids (or --skip-search to drain pending links)")
+        return 2
+
+    # Imported here: the work list runner pulls in the browser stack
+    from gmaps_scraper.worklist import count_chrome_processes, kill_stale_chrome, run_worklist
+
+    chrome_count = count_chrome_processes()
+    if chrome_count:
+        print(f"Cleaning up {chrome_count} stale Chrome processes before start...")
+        kill_stale_chrome()
+
+    checkpoint_dir = args.checkpoint_dir or (
+        Config.RESCRAPE_CHECKPOINT_DIR if args.place_ids else Config.WORKLIST_CHECKPOINT_DIR
+    )
+    previous = CheckpointManager(checkpoint_dir).get_progress().get("machine")
+    machine_profile = profile_machine(previous, auto=False if args.no_auto_size else None)
+    apply_machine_profile(machine_profile)
+    print(f"Machine profile: {describe_machine_profile(machine_profile)}")
+
+    run_worklist(
+        query_file=args.queries,
+        links_file=args.links,
+        place_ids_file=args.place_ids,
+        checkpoint_dir=checkpoint_dir,
+        output_name=args.output,
+        search=not args.skip_search,
+        details=not args.search_only,
+        food_trucks=args.food_trucks,
+        machine_profile=machine_profile,
     )
+    return 0
+
 
+def cmd_setops(args: argparse.Namespace) -> int:
+    """Combine the place ids of source files."""
+    try:
+        count = place_key_set_operation(args.op, args.sources, output=args.output, run_keys=args.run_keys)
+    except FileNotFoundError as e:
+        print(f"Error: No such source: {e}")
+        return 1
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    print(f"{args.op}: {count:,} place ids" + (f" written to {args.output}" if args.output else ""))
     return 0
 
 
+def main(argv: Optional[list[str]] = None) -> int:
+    """Entry point for the CLI."""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # `gmaps-scraper --fill-gaps` keeps working: no subcommand means run
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv.insert(0, "run")
+
+    args = build_parser().parse_args(argv)
+    handlers = {
+        "run": cmd_run,
+        "plan": cmd_plan,
+        "status": cmd_status,
+        "stats": cmd_stats,
+        "export": cmd_export,
+        "compact": cmd_compact,
+        "worklist": cmd_worklist,
+        "setops": cmd_setops,
+    }
+    return handlers[args.command](args)
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -39,12 +39,72 @@ class Config:
     # Browser settings
     HEADLESS = True  # Production mode
 
-    # Parallelization
-    MAX_PARALLEL_BROWSERS = 8  # M2 can handle 8; M1 uses 5
+    # Details extraction profile (see extractors/profiles.py): core, full, hours-only
+    DETAILS_PROFILE = "full"
+
+    # Parallelization (sized per machine at startup unless AUTO_SIZE is off, see machine.py)
+    MAX_PARALLEL_BROWSERS = 8  # Details browsers
+    SEARCH_PARALLEL_BROWSERS = None  # Search browsers (None: MAX_PARALLEL_BROWSERS)
+    MAX_HEALTHY_CHROME = 60  # Chrome processes above this are leaked browsers to clean up
+
+    # Machine profiling: pick parallelism, batch sizes and MAX_HEALTHY_CHROME from
+    # cores, RAM, load and a sample Chrome; host_profiles/<host>.json overrides them
+    AUTO_SIZE = True
+    HOST_PROFILE_DIR = "host_profiles"  # <host> is $GMAPS_HOST_PROFILE, else the hostname
+    MACHINE_RESERVE_MB = 2048  # RAM kept free for the OS and the scraper process
+    MAX_AUTO_BROWSERS = 12  # Upper bound for auto-sized parallelism
+    CHROME_DEFAULT_RSS_MB = 400  # Assumed Chrome footprint when no sample could be taken
+    CHROME_PAGE_RSS_FACTOR = 2.0  # A Chrome with a Maps page loaded, relative to the idle sample
+    CHROME_SLOW_LAUNCH_SECONDS = 5.0  # Slower sample launches scale parallelism down
+    CHROME_PROCESSES_PER_BROWSER = 10  # Floor for the processes one browser runs (renderers, GPU, ...)
+    CHROME_PROCESS_BUFFER = 10  # Extra processes allowed before MAX_HEALTHY_CHROME trips
+    CHROME_SAMPLE_MAX_AGE_HOURS = 24  # Reuse the sample recorded in progress.json this long
+
+    # Browser pool (reuses health-checked drivers instead of one Chrome per task)
+    USE_BROWSER_POOL = False
+    BROWSER_POOL_MAX_PAGES = 50  # Recycle each Chrome after this many pages
+    BROWSER_PROBE_TIMEOUT = 5  # Seconds for the liveness probe before each task
+
+    # Place page loading
+    PLACE_SETTLE_SECONDS = 4  # Wait after the page loads before extracting
+    TABS_PER_BROWSER = 1  # >1 loads several places concurrently in one Chrome (needs the pool)
+    TAB_HANG_TIMEOUT = 30  # Drop a tab that has not settled after this many seconds
+    PREFETCH_NEXT_PLACE = False  # Load the next pending place in a background tab while extracting
+
+    # HTTP fast path for place pages (browser only for parse failures / challenge pages)
+    DETAILS_HTTP_FIRST = False
+    HTTP_WORKERS = 16  # Concurrent keep-alive connections
+    HTTP_TIMEOUT = 15  # Socket timeout in seconds
+    HTTP_CHALLENGE_LIMIT = 5  # Challenge pages per batch before the rest go to the browser
+    HTTP_BASE_URL = None  # Override scheme://host (e.g. a local stand-in server)
+
+    # Enrichment pass (revisits places with missing review counts / partial hours)
+    ENRICHMENT_PARALLEL_BROWSERS = 2  # Separate budget so the main pass keeps its browsers
+    ENRICHMENT_BATCH_SIZE = 50
+    ENRICHMENT_MAX_ATTEMPTS = 2
+    ENRICHMENT_JOURNAL_MIN_ENTRIES = 1000  # Journaled queue changes before enrichment_queue.json is rewritten
 
     # Output settings
     OUTPUT_DIR = "output"
     CHECKPOINT_DIR = "checkpoints"
+    PENDING_JOURNAL_MIN_ENTRIES = 1000  # Journaled pending-link changes before pending_links.json is rewritten
+    # Completed-search key files of other runs (recovery) whose searches count as done here
+    SHARED_COMPLETED_SEARCHES = [os.path.join("checkpoints_recovery", "completed_searches.keys")]
+
+    # Work lists (`gmaps-scraper worklist`, see worklist.py)
+    WORKLIST_CHECKPOINT_DIR = "checkpoints_recovery"  # Query and link work lists
+    RESCRAPE_CHECKPOINT_DIR = "checkpoints_rescrape"  # Place id work lists
+    WORKLIST_ERROR_RATE = 0.8  # A batch with this share of failed items counts as bad
+    WORKLIST_MAX_BAD_BATCHES = 5  # Halt after this many consecutive bad batches
+    CHROME_HEALTH_CHECK_BATCHES = 5  # Clean up leaked Chrome (above MAX_HEALTHY_CHROME) every N batches
+
+    # Place id set operations (`gmaps-scraper setops`, see setops.py)
+    SETOPS_RUN_KEYS = 500_000  # Place keys sorted in memory per run of the external sort (~50 MB)
+
+    # Zip selection: "spread" picks evenly by list position (every zip for --fill-gaps),
+    # "cover" picks the fewest zips whose search radius covers each city (geo/zip_cover.py)
+    ZIP_SELECTION = "spread"
+    ZIP_SEARCH_RADIUS_KM = 3.0  # Area one "restaurants near <zip>" search is assumed to cover
 
     # Zip code query tiers (population threshold -> max zip queries per city)
     ZIP_TIERS = {
@@ -57,7 +117,51 @@ class Config:
 
     # Scroll settings for search results
     MAX_SCROLLS = 7  # Most queries finish in 1-5 scrolls
-    SCROLL_DELAY = 0.2  # Faster scrolling
+    SCROLL_DELAY = 0.2  # Faster scrolling (fallback scroller only)
+    SCROLL_MAX_WAIT = 2.0  # Longest wait for new cards after a scroll
+    SCROLL_SETTLE = 0.15  # Extra wait once cards start arriving, for the rest of the burst
+    MAX_EMPTY_SCROLLS = 3  # Stop after this many scrolls that waited out SCROLL_MAX_WAIT with no cards
+
+    # Scroll policy (learned per query type and area, see extractors/scroll_policy.py)
+    SCROLL_POLICY_MIN_SAMPLES = 5  # Searches of history before an area's budget is adapted
+    SCROLL_MIN_MARGINAL_LINKS = 1.0  # Scrolls predicted to add fewer new links are not worth it
+    SCROLL_EXTEND_RATE = 0.3  # Extend the budget when this share of searches still yields at the cap
+    SCROLL_EXTEND_STEP = 3  # Scrolls added per extension
+    MAX_SCROLLS_EXTENDED = 20  # Hard ceiling for extended budgets
+
+    # Search backend: "browser" scrolls the feed, "http" pages the search data directly
+    SEARCH_BACKEND = "browser"
+    HTTP_SEARCH_PAGE_SIZE = 20  # Results per tbm=map request
+    HTTP_SEARCH_MAX_RESULTS = 120  # Same cap as the browser results feed
+
+    # Viewport tile planner (see geo/tiles.py)
+    TILE_BASE_ZOOM = 10  # Seed tiles (~30 km across in the US)
+    TILE_MAX_ZOOM = 16  # Never split below this (~500 m across)
+    TILE_SPLIT_AT = 100  # Results at or above this mean the ~120 result cap cut the tile off
+    TILE_VIEWPORT_ZOOM_OFFSET = 2  # Map zoom for a tile's viewport, relative to the tile zoom
+    TILE_MIN_POPULATION = 1_000  # Cities below this do not seed a tile
+
+    # Skip details visits for links whose search card shows a low rating or non-restaurant category
+    CARD_PREFILTER = True
+
+    # Query refinement (see refinement.py): only searches that hit the result cap
+    # are expanded, to cuisine variants and then to sub-area viewports
+    REFINE_SEARCHES = True
+    REFINE_SATURATION_AT = 100  # Results at or above this mean the ~120 result cap truncated the search
+    REFINE_MAX_DEPTH = 2  # Cuisine, then sub-area (tiles keep splitting down to TILE_MAX_ZOOM)
+    REFINE_SUB_AREA_ZOOM = 12  # Tile around an area centre (~8 km across) whose quadrants are searched
+
+    # Coverage estimate (see coverage.py): stop querying a zip once enough of its
+    # estimated restaurants have been found
+    COVERAGE_STOP_THRESHOLD = 0.95  # None or 0 disables the stopping rule
+    COVERAGE_MIN_QUERIES = 3  # Queries a zip needs before its estimate can stop it
+
+    # Per-region cuisine vocabulary learned from results (see cuisine_vocab.py)
+    LEARNED_CUISINES = True  # Off: every zip gets the full CUISINE_TYPES list
+    CUISINES_PER_ZIP = 12  # Cuisine queries per zip, best expected yield first
+    CUISINE_MIN_SHARE = 0.01  # Skip cuisines expected to be under 1% of a region's places
+    CUISINE_VOCAB_MIN_PLACES = 50  # Places a region needs before its own counts are trusted
+    CUISINE_VOCAB_PRIOR_WEIGHT = 20  # Pseudo-places of national shares mixed into each region
 
     # Cuisine expansion settings - search with cuisine-specific queries
     # for comprehensive coverage in high-population areas
@@ -0,0 +1,104 @@
+"""Capture-recapture estimate of how many restaurants a zip code holds.
+
+Per-zip query -> place_id incidence is kept in checkpoints/coverage_incidence.json.
+"""
+
+import json
+import os
+from collections import Counter
+from typing import Optional
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.extractors.cards import place_id_from_link
+
+
+def estimate_total(samples: list[set[str]]) -> Optional[dict]:
+    """
+    Estimate the number of distinct places from overlapping samples.
+
+    Args:
+        samples: One set of place ids per query
+
+    Returns:
+        Dict with 'observed', 'estimated_total', 'coverage' and 'method',
+        or None with fewer than two non-empty samples
+    """
+    samples = [s for s in samples if s]
+    if len(samples) < 2:
+        return None
+
+    observed = len(set().union(*samples))
+    if len(samples) == 2:
+        n1, n2 = len(samples[0]), len(samples[1])
+        recaptured = len(samples[0] & samples[1])
+        estimated = (n1 + 1) * (n2 + 1) / (recaptured + 1) - 1
+        method = "chapman"
+    else:
+        m = len(samples)
+        frequencies = Counter(Counter(pid for s in samples for pid in s).values())
+        q1, q2 = frequencies.get(1, 0), frequencies.get(2, 0)
+        estimated = observed + (m - 1) / m * q1 * (q1 - 1) / (2 * (q2 + 1))
+        method = "chao2"
+
+    estimated = max(estimated, observed)
+    return {
+        "observed": observed,
+        "estimated_total": round(estimated, 1),
+        "coverage": round(observed / estimated, 3) if estimated else 1.0,
+        "method": method,
+    }
+
+
+class CoverageEstimator:
+    """Per-zip query incidence and the coverage estimated from it."""
+
+    def __init__(self, checkpoint_dir: str = "checkpoints"):
+        self.checkpoint_dir = checkpoint_dir
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        self._incidence_file = os.path.join(checkpoint_dir, "coverage_incidence.json")
+        self._incidence: dict[str, dict[str, list[str]]] = self._load()
+
+    def _load(self) -> dict[str, dict[str, list[str]]]:
+        """Load incidence from disk."""
+        if os.path.exists(self._incidence_file):
+            try:
+                with open(self._incidence_file, "r") as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, IOError):
+                pass
+        return {}
+
+    def save(self) -> None:
+        """Persist incidence to disk."""
+        try:
+            with open(self._incidence_file, "w") as f:
+                json.dump(self._incidence, f)
+        except IOError as e:
+            print(f"Warning: Could not save coverage incidence: {e}")
+
+    def record(self, search_data: dict, place_links: list[str]) -> None:
+        """Add a completed query's place ids to its zip's incidence (zip queries only)."""
+        zip_code = search_data.get("zip_code")
+        if not zip_code:
+            return
+        place_ids = sorted({pid for pid in map(place_id_from_link, place_links) if pid})
+        self._incidence.setdefault(str(zip_code), {})[search_data.get("query", "")] = place_ids
+
+    def estimate(self, zip_code: str) -> Optional[dict]:
+        """Estimate total restaurants and coverage for a zip (None until two queries ran)."""
+        queries = self._incidence.get(str(zip_code), {})
+        result = estimate_total([set(ids) for ids in queries.values()])
+        if result is not None:
+            result["queries"] = len(queries)
+        return result
+
+    def is_covered(self, zip_code: Optional[str]) -> bool:
+        """Check whether a zip's estimated coverage has passed the stop threshold."""
+        if not zip_code or not Config.COVERAGE_STOP_THRESHOLD:
+            return False
+        estimate = self.estimate(zip_code)
+        return bool(
+            estimate
+            and estimate["queries"] >= Config.COVERAGE_MIN_QUERIES
+            and estimate["coverage"] >= Config.COVERAGE_STOP_THRESHOLD
+        )
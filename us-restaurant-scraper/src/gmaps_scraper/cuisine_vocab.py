@@ -0,0 +1,129 @@
+"""Per-region cuisine vocabulary learned from the categories of saved places."""
+
+import json
+import os
+import re
+from collections import Counter
+from typing import Iterable, Optional
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.cuisines import canonical_cuisine
+from gmaps_scraper.extractors.cards import is_non_restaurant
+
+# Maps categories that name no cuisine; searching them adds nothing over the generic query
+_GENERIC_CATEGORIES = frozenset({"restaurant", "food", "meal takeaway", "meal delivery", "food court"})
+
+
+def cuisine_term(cuisine_type: Optional[str]) -> Optional[str]:
+    """Turn a Maps category into a cuisine search term ("Thai restaurant" -> "Thai")."""
+    if not cuisine_type or is_non_restaurant(cuisine_type):
+        return None
+    category = cuisine_type.strip()
+    if category.lower() in _GENERIC_CATEGORIES:
+        return None
+    term = re.sub(r"\s+restaurant$", "", category, flags=re.IGNORECASE).strip()
+    return canonical_cuisine(term) if term else None
+
+
+def _region_keys(zip_code: Optional[str], state: Optional[str]) -> list[str]:
+    """Region keys from most to least specific."""
+    keys = []
+    if zip_code:
+        keys.append(f"zip3:{str(zip_code)[:3]}")
+    if state:
+        keys.append(f"state:{state}")
+    return keys
+
+
+class CuisineVocabulary:
+    """Cuisine term counts per region, and per-zip rankings drawn from them."""
+
+    def __init__(self, counts: Optional[dict[str, dict[str, int]]] = None):
+        self.counts: dict[str, Counter] = {
+            region: Counter(terms) for region, terms in (counts or {}).items()
+        }
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "CuisineVocabulary":
+        """Build the table from place records (cuisine_type, zip_code, state)."""
+        vocabulary = cls()
+        for record in records:
+            term = cuisine_term(record.get("cuisine_type"))
+            if not term:
+                continue
+            for region in _region_keys(record.get("zip_code"), record.get("state")) + ["all"]:
+                vocabulary.counts.setdefault(region, Counter())[term] += 1
+        return vocabulary
+
+    @property
+    def total_places(self) -> int:
+        """Places with a usable cuisine term."""
+        return sum(self.counts.get("all", Counter()).values())
+
+    def rank(self, zip_code: Optional[str], state: Optional[str], limit: Optional[int] = None) -> list[tuple[str, float]]:
+        """
+        Rank cuisine terms for a zip by expected share of its restaurants.
+
+        Args:
+            zip_code: Zip code being expanded
+            state: Its state (fallback region)
+            limit: Keep at most this many terms (defaults to Config.CUISINES_PER_ZIP)
+
+        Returns:
+            [(term, expected share)] best first, excluding terms below
+            Config.CUISINE_MIN_SHARE
+        """
+        if limit is None:
+            limit = Config.CUISINES_PER_ZIP
+
+        national = self.counts.get("all", Counter())
+        national_total = sum(national.values())
+        if not national_total:
+            return []
+
+        local = Counter()
+        for region in _region_keys(zip_code, state):
+            local = self.counts.get(region, Counter())
+            if sum(local.values()) >= Config.CUISINE_VOCAB_MIN_PLACES:
+                break
+        local_total = sum(local.values())
+
+        # Local counts smoothed towards the national shares
+        prior = Config.CUISINE_VOCAB_PRIOR_WEIGHT
+        scores = {
+            term: (local.get(term, 0) + prior * count / national_total) / (local_total + prior)
+            for term, count in national.items()
+        }
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(term, round(share, 4)) for term, share in ranked if share >= Config.CUISINE_MIN_SHARE][:limit]
+
+
+def load_cuisine_vocabulary(output_dir: Optional[str] = None) -> Optional[CuisineVocabulary]:
+    """
+    Build the vocabulary from output/all_restaurants.json.
+
+    Returns:
+        The vocabulary, or None if Config.LEARNED_CUISINES is off or there
+        are too few results yet (callers then use the fixed CUISINE_TYPES)
+    """
+    if not Config.LEARNED_CUISINES:
+        return None
+    if output_dir is None:
+        output_dir = Config.OUTPUT_DIR
+    results_file = os.path.join(output_dir, "all_restaurants.json")
+    if not os.path.exists(results_file):
+        return None
+
+    try:
+        with open(results_file) as f:
+            records = json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Warning: Could not load results for cuisine vocabulary: {e}")
+        return None
+
+    vocabulary = CuisineVocabulary.from_records(records if isinstance(records, list) else [])
+    if vocabulary.total_places < Config.CUISINE_VOCAB_MIN_PLACES:
+        return None
+    print(f"Cuisine vocabulary: {len(vocabulary.counts.get('all', {}))} cuisines "
+          f"from {vocabulary.total_places:,} places")
+    return vocabulary
@@ -58,3 +58,11 @@ CUISINE_TYPES = [
     "Bakery",
     "Cafe",
 ]
+
+_CUISINE_SPELLINGS = {cuisine.casefold(): cuisine for cuisine in CUISINE_TYPES}
+
+
+def canonical_cuisine(name: str) -> str:
+    """One spelling per cuisine: CUISINE_TYPES' own ("soul food" -> "Soul food"), else capitalized."""
+    name = " ".join(name.split())
+    return _CUISINE_SPELLINGS.get(name.casefold()) or name[:1].upper() + name[1:]
@@ -0,0 +1,262 @@
+"""Enrichment queue for filling missing or partial fields after the main pass.
+
+Queue changes are journaled to enrichment_queue.journal ([place_id, entry]
+lines, entry null once dropped) and folded into enrichment_queue.json.
+"""
+
+import glob
+import json
+import os
+from datetime import datetime
+from typing import Optional
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.extractors.profiles import field_keys, missing_profile_fields
+
+PLACE_URL_TEMPLATE = "https://www.google.com/maps/place/data=!4m2!3m1!1s{}"
+
+
+def is_partial_hours(hours: Optional[dict]) -> bool:
+    """Check whether hours only cover part of the week (or are missing)."""
+    if not hours:
+        return True
+    return len(hours) < 7
+
+
+def find_enrichable_fields(record: dict) -> list[str]:
+    """Return the fields of a record that an enrichment visit should fill.
+
+    Includes fields skipped by a cheaper extraction profile, plus fields
+    that were extracted but came back empty or partial.
+    """
+    fields = missing_profile_fields(record, "full")
+
+    if "review_count" in record and record.get("review_count") is None:
+        fields.append("review_count")
+    if "hours_of_operation" in record and is_partial_hours(record.get("hours_of_operation")):
+        fields.append("hours_of_operation")
+
+    return fields
+
+
+def merge_enrichment(record: dict, enriched: dict) -> bool:
+    """Merge enriched field values into a record in place.
+
+    Only non-empty values are merged, and partial hours never replace a
+    fuller hours table. Returns True if the record changed.
+    """
+    changed = False
+    for key, value in enriched.items():
+        if key in ("place_id", "enriched_at") or value is None:
+            continue
+        if key == "hours_of_operation":
+            current = record.get(key) or {}
+            if len(value) <= len(current):
+                continue
+        if record.get(key) != value:
+            record[key] = value
+            changed = True
+
+    if changed:
+        record["enriched_at"] = enriched.get("enriched_at", datetime.now().isoformat())
+    return changed
+
+
+class EnrichmentQueue:
+    """
+    Persistent queue of place_ids with missing or partial fields.
+
+    Each entry tracks the fields to fill and how many visits were attempted.
+    Entries that reach Config.ENRICHMENT_MAX_ATTEMPTS stay on disk as
+    exhausted so they are not queued again on the next pass.
+    """
+
+    def __init__(self, checkpoint_dir: str = "checkpoints"):
+        self.checkpoint_dir = checkpoint_dir
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        self._queue_file = os.path.join(checkpoint_dir, "enrichment_queue.json")
+        self._journal_file = os.path.join(checkpoint_dir, "enrichment_queue.journal")
+        self._journal_entries = 0
+        self._changed: set[str] = set()
+        self._journal_torn = False
+        self._entries: dict[str, dict] = self._load()
+        if self._journal_torn:
+            # Fold, so the next append does not land on the torn line
+            self._save_queue()
+
+    def _load(self) -> dict[str, dict]:
+        """Load queue entries from disk and apply the changes journaled since."""
+        entries: dict[str, dict] = {}
+        if os.path.exists(self._queue_file):
+            try:
+                with open(self._queue_file, "r") as f:
+                    entries = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                pass
+        if not os.path.exists(self._journal_file):
+            return entries
+        try:
+            with open(self._journal_file, "r") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        self._journal_torn = True  # interrupted mid-append
+                        break
+                    place_id, entry = json.loads(line)
+                    self._journal_entries += 1
+                    if entry is None:
+                        entries.pop(place_id, None)
+                    else:
+                        entries[place_id] = entry
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Warning: Could not read enrichment queue journal: {e}")
+        return entries
+
+    def save(self) -> None:
+        """Journal the entries changed since the last save, folding the journal once it outgrows the queue."""
+        if not self._changed:
+            return
+        lines = [json.dumps([place_id, self._entries.get(place_id)]) + "\n" for place_id in self._changed]
+        self._changed = set()
+        self._journal_entries += len(lines)
+        if self._journal_entries > max(len(self._entries), Config.ENRICHMENT_JOURNAL_MIN_ENTRIES):
+            self._save_queue()
+            return
+        try:
+            with open(self._journal_file, "a") as f:
+                f.writelines(lines)
+        except IOError as e:
+            print(f"Warning: Could not save enrichment queue: {e}")
+
+    def _save_queue(self) -> None:
+        """Rewrite enrichment_queue.json (atomically) and clear the journal."""
+        tmp_file = f"{self._queue_file}.tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_file, self._queue_file)
+            if os.path.exists(self._journal_file):
+                os.remove(self._journal_file)
+            self._journal_entries = 0
+        except IOError as e:
+            print(f"Warning: Could not save enrichment queue: {e}")
+
+    def add(self, place_id: str, fields: list[str], url: Optional[str] = None) -> bool:
+        """Queue fields of a place for enrichment. Returns True if newly queued."""
+        if not place_id or not fields:
+            return False
+
+        entry = self._entries.get(place_id)
+        if entry is not None:
+            if entry.get("exhausted"):
+                return False
+            merged = sorted(set(entry["fields"]) | set(fields))
+            if merged != entry["fields"]:
+                entry["fields"] = merged
+                self._changed.add(place_id)
+            return False
+
+        self._changed.add(place_id)
+        self._entries[place_id] = {
+            "fields": sorted(set(fields)),
+            "url": url or PLACE_URL_TEMPLATE.format(place_id),
+            "attempts": 0,
+        }
+        return True
+
+    def queue_incomplete(self, records: list[dict]) -> int:
+        """Queue every record with enrichable gaps. Returns number newly queued."""
+        added = 0
+        for record in records:
+            place_id = record.get("place_id")
+            fields = find_enrichable_fields(record)
+            if place_id and fields and self.add(place_id, fields, record.get("google_maps_url")):
+                added += 1
+        return added
+
+    def get_batch(self, batch_size: int) -> list[dict]:
+        """Get the next batch of enrichment tasks."""
+        batch = []
+        for place_id, entry in self._entries.items():
+            if entry.get("exhausted"):
+                continue
+            batch.append({"place_id": place_id, "url": entry["url"], "fields": entry["fields"]})
+            if len(batch) >= batch_size:
+                break
+        return batch
+
+    def record_result(self, place_id: str, enriched: Optional[dict]) -> None:
+        """Update a queue entry after an enrichment visit.
+
+        Filled fields are removed; the entry is dropped once nothing is left,
+        or marked exhausted after too many attempts.
+        """
+        entry = self._entries.get(place_id)
+        if entry is None:
+            return
+
+        self._changed.add(place_id)
+        entry["attempts"] += 1
+        if enriched:
+            entry["fields"] = [
+                f for f in entry["fields"]
+                if any(enriched.get(key) is None for key in field_keys(f))
+                or (f == "hours_of_operation" and is_partial_hours(enriched.get(f)))
+            ]
+
+        if not entry["fields"]:
+            del self._entries[place_id]
+        elif entry["attempts"] >= Config.ENRICHMENT_MAX_ATTEMPTS:
+            entry["exhausted"] = True
+
+    @property
+    def pending_count(self) -> int:
+        """Number of places still waiting for enrichment."""
+        return sum(1 for e in self._entries.values() if not e.get("exhausted"))
+
+    def get_stats(self) -> dict:
+        """Get enrichment queue statistics."""
+        by_field: dict[str, int] = {}
+        for entry in self._entries.values():
+            if entry.get("exhausted"):
+                continue
+            for field in entry["fields"]:
+                by_field[field] = by_field.get(field, 0) + 1
+        return {
+            "pending": self.pending_count,
+            "exhausted": len(self._entries) - self.pending_count,
+            "by_field": by_field,
+        }
+
+
+def merge_enrichment_batches(
+    output_dir: str,
+    records: list[dict],
+    batch_files: Optional[list[str]] = None,
+) -> tuple[int, list[str]]:
+    """Fold saved enrichment batch files into records, matched by place_id.
+
+    Merges `batch_files`, or every batch file in output_dir when not given.
+    Returns the number of records updated and the merged batch files, which
+    the caller removes once the merged records are written out.
+    """
+    if batch_files is None:
+        batch_files = sorted(glob.glob(os.path.join(output_dir, "enrichment_batch_*.json")))
+    if not batch_files:
+        return 0, []
+
+    by_place_id = {r["place_id"]: r for r in records if r.get("place_id")}
+    updated = 0
+    for batch_file in batch_files:
+        try:
+            with open(batch_file) as f:
+                enriched_batch = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Warning: Could not read {batch_file}: {e}")
+            continue
+
+        for enriched in enriched_batch:
+            record = by_place_id.get(enriched.get("place_id"))
+            if record is not None and merge_enrichment(record, enriched):
+                updated += 1
+
+    return updated, batch_files
@@ -1,17 +1,39 @@
-"""Data extractors for Google Maps scraping."""
+"""Data extractors for Google Maps scraping.
 
-from gmaps_scraper.extractors.search import (
-    scrape_search_results,
-    scrape_searches,
-)
-from gmaps_scraper.extractors.details import (
-    scrape_place_details,
-    scrape_places,
-)
+The browser extractors are imported on first attribute access.
+"""
 
-__all__ = [
-    "scrape_search_results",
-    "scrape_searches",
-    "scrape_place_details",
-    "scrape_places",
-]
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from gmaps_scraper.extractors.search import (
+        scrape_search_results,
+        scrape_searches,
+    )
+    from gmaps_scraper.extractors.details import (
+        close_details_pool,
+        enrich_places,
+        scrape_place_details,
+        scrape_places,
+    )
+
+_EXPORTS = {
+    "scrape_search_results": "gmaps_scraper.extractors.search",
+    "scrape_searches": "gmaps_scraper.extractors.search",
+    "scrape_place_details": "gmaps_scraper.extractors.details",
+    "scrape_places": "gmaps_scraper.extractors.details",
+    "enrich_places": "gmaps_scraper.extractors.details",
+    "close_details_pool": "gmaps_scraper.extractors.details",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,381 @@
+"""Pool of reusable, health-checked Chrome drivers for batch scraping."""
+
+import atexit
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from botasaurus.browser import Driver
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.extractors.tabs import LoadingTab, PrefetchPipeline, TabMultiplexer, WorkQueue
+
+# Substrings of errors raised when the driver's DevTools connection is gone
+_CONNECTION_ERROR_MARKERS = (
+    "connection refused",
+    "connectionrefused",
+    "connection reset",
+    "connection closed",
+    "websocket",
+    "no close frame",
+    "broken pipe",
+    "target closed",
+    "browser has disconnected",
+)
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """Check whether an exception means the driver connection is dead."""
+    if isinstance(error, (ConnectionError, BrokenPipeError)):
+        return True
+    text = f"{type(error).__name__} {error}".lower()
+    return any(marker in text for marker in _CONNECTION_ERROR_MARKERS)
+
+
+def _child_pids(pid: int) -> set[int]:
+    """Return all descendant PIDs of a process (Chrome helpers, renderers)."""
+    descendants: set[int] = set()
+    frontier = [pid]
+    while frontier:
+        parent = frontier.pop()
+        try:
+            result = subprocess.run(
+                ["pgrep", "-P", str(parent)],
+                capture_output=True, text=True, timeout=5,
+            )
+        except Exception:
+            continue
+        for line in result.stdout.split():
+            child = int(line)
+            if child not in descendants:
+                descendants.add(child)
+                frontier.append(child)
+    return descendants
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process still exists."""
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+class PooledBrowser:
+    """A single reusable Chrome driver with page accounting and PID tracking."""
+
+    def __init__(self, block_images: bool = False, headless: bool = True, proxy: Optional[str] = None):
+        self.block_images = block_images
+        self.headless = headless
+        self.proxy = proxy
+        self.driver: Optional[Driver] = None
+        self.pages = 0
+        self.launches = 0
+        self.pids: set[int] = set()
+        self.prefetched: Optional[LoadingTab] = None
+
+    def start(self) -> Driver:
+        """Launch a fresh Chrome and record its process tree."""
+        self.driver = Driver(
+            headless=self.headless,
+            block_images=self.block_images,
+            proxy=self.proxy,
+        )
+        self.pages = 0
+        self.launches += 1
+        self.refresh_pids()
+        return self.driver
+
+    def refresh_pids(self) -> None:
+        """Record the main Chrome PID and all of its current descendants."""
+        if self.driver is None:
+            return
+        main_pid = getattr(self.driver._browser, "_process_pid", None)
+        if main_pid:
+            self.pids |= {main_pid} | _child_pids(main_pid)
+
+    def is_alive(self) -> bool:
+        """Probe the driver: process running and DevTools answering JS."""
+        if self.driver is None:
+            return False
+        try:
+            if self.driver._browser.stopped:
+                return False
+            return self.driver.run_js("return 1", timeout=Config.BROWSER_PROBE_TIMEOUT) == 1
+        except Exception:
+            return False
+
+    def needs_recycle(self) -> bool:
+        """Check whether the driver has served its page budget."""
+        return self.pages >= Config.BROWSER_POOL_MAX_PAGES
+
+    def close(self) -> None:
+        """Close the driver, then kill any of its tracked processes still alive."""
+        self.refresh_pids()
+        self.prefetched = None
+        if self.driver is not None:
+            try:
+                self.driver.close()
+            except Exception:
+                pass
+            self.driver = None
+
+        deadline = time.time() + 3
+        while time.time() < deadline and any(_pid_alive(pid) for pid in self.pids):
+            time.sleep(0.2)
+
+        for pid in self.pids:
+            if _pid_alive(pid):
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except (ProcessLookupError, PermissionError):
+                    pass
+        self.pids.clear()
+
+
+class BrowserPool:
+    """
+    Pool of health-checked, reusable Chrome drivers.
+
+    Drivers survive across map() calls, so consecutive batches do not pay the
+    Chrome startup cost again. Call close() (also registered at exit) to tear
+    down every tracked Chrome process.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        block_images: bool = False,
+        headless: bool = Config.HEADLESS,
+        proxy: Optional[str] = None,
+    ):
+        self.size = max(1, size)
+        self._slots = [PooledBrowser(block_images, headless, proxy) for _ in range(self.size)]
+        self.stats = {
+            "tasks": 0, "launches": 0, "recycled": 0, "stale_detected": 0, "prefetch_hits": 0,
+        }
+        self._stats_lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _bump(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _ensure_ready(self, slot: PooledBrowser) -> Driver:
+        """Return a live driver for the slot, relaunching stale or worn-out ones."""
+        if slot.driver is not None:
+            if slot.needs_recycle():
+                self._bump("recycled")
+                slot.close()
+            elif not slot.is_alive():
+                print("  Browser pool: stale driver detected, relaunching Chrome")
+                self._bump("stale_detected")
+                slot.close()
+
+        if slot.driver is None:
+            slot.start()
+            self._bump("launches")
+        return slot.driver
+
+    def _run_one(self, slot: PooledBrowser, fn: Callable[[Driver, Any], Any], item: Any) -> Any:
+        """Run one task, relaunching and retrying once if the driver died under it.
+
+        The scraping functions swallow their own exceptions and return None,
+        so an empty result is followed by a liveness probe: a dead driver
+        there means the None came from a stale connection, not the page.
+        """
+        for attempt in range(2):
+            driver = self._ensure_ready(slot)
+            try:
+                result = fn(driver, item)
+                slot.pages += 1
+                if result is None and not slot.is_alive():
+                    print("  Browser pool: driver died during task, retrying on a fresh Chrome")
+                    self._bump("stale_detected")
+                    slot.close()
+                    continue
+                return result
+            except Exception as e:
+                if not is_connection_error(e):
+                    print(f"  Browser pool task error: {e}")
+                    slot.pages += 1
+                    return None
+                print(f"  Browser pool: connection error ({e}), recycling driver")
+                self._bump("stale_detected")
+                slot.close()
+        return None
+
+    def map(self, fn: Callable[[Driver, Any], Any], items: list) -> list:
+        """
+        Run fn(driver, item) for every item across the pooled drivers.
+
+        Args:
+            fn: Undecorated scraping function taking (driver, item)
+            items: Work items
+
+        Returns:
+            Results aligned with items (None for failed tasks)
+        """
+        results: list = [None] * len(items)
+        work: "queue.Queue[tuple[int, Any]]" = queue.Queue()
+        for index, item in enumerate(items):
+            work.put((index, item))
+
+        def worker(slot: PooledBrowser) -> None:
+            while True:
+                try:
+                    index, item = work.get_nowait()
+                except queue.Empty:
+                    return
+                results[index] = self._run_one(slot, fn, item)
+                self._bump("tasks")
+                slot.refresh_pids()
+
+        threads = [
+            threading.Thread(target=worker, args=(slot,), daemon=True)
+            for slot in self._slots[: min(self.size, len(items))]
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def map_tabs(
+        self,
+        extract_fn: Callable[[Driver, Any], Any],
+        items: list,
+        url_of: Callable[[Any], str],
+        tabs_per_browser: int,
+    ) -> list:
+        """
+        Run items with several tabs in flight per pooled browser.
+
+        Each browser loads up to `tabs_per_browser` pages concurrently and
+        calls extract_fn(driver, item) with the driver switched to a tab
+        once its page has settled.
+
+        Args:
+            extract_fn: Function extracting from an already-loaded page
+            items: Work items
+            url_of: Maps a work item to the URL to load
+            tabs_per_browser: Concurrent tabs per Chrome process
+
+        Returns:
+            Results aligned with items (None for failed or hung tabs)
+        """
+        results: list = [None] * len(items)
+        work = WorkQueue(items, url_of)
+
+        def worker(slot: PooledBrowser) -> None:
+            relaunches = 0
+            while not work.empty() and relaunches <= 2:
+                driver = self._ensure_ready(slot)
+                mux = TabMultiplexer(driver, extract_fn, url_of, tabs_per_browser)
+                try:
+                    mux.run(work, results)
+                except Exception as e:
+                    print(f"  Browser pool: tab worker lost its browser ({e}), relaunching")
+                    self._bump("stale_detected")
+                    slot.close()
+                    relaunches += 1
+                finally:
+                    slot.pages += mux.pages
+                    with self._stats_lock:
+                        self.stats["tasks"] += mux.pages
+                    slot.refresh_pids()
+
+        browsers = max(1, min(self.size, -(-len(items) // max(1, tabs_per_browser))))
+        threads = [
+            threading.Thread(target=worker, args=(slot,), daemon=True)
+            for slot in self._slots[:browsers]
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def map_prefetch(
+        self,
+        extract_fn: Callable[[Driver, Any], Any],
+        items: list,
+        url_of: Callable[[Any], str],
+        lookahead: Optional[list] = None,
+    ) -> list:
+        """
+        Run items in order per browser, loading the next page while extracting.
+
+        Each pooled browser claims item N+1 from the shared queue and starts
+        it in a background tab before extracting item N, so only the part of
+        the settle wait not already covered by extraction is spent idle.
+        When the batch is drained, browsers prefetch items from `lookahead`
+        (the head of the pending queue) and keep them loading until the next
+        map_prefetch call claims them.
+
+        Args:
+            extract_fn: Function extracting from an already-loaded page
+            items: Work items
+            url_of: Maps a work item to the URL to load
+            lookahead: Items expected at the start of the next batch
+
+        Returns:
+            Results aligned with items (None for failed or hung tabs)
+        """
+        results: list = [None] * len(items)
+        work = WorkQueue(items, url_of)
+        upcoming = WorkQueue(lookahead, url_of) if lookahead else None
+
+        def worker(slot: PooledBrowser) -> None:
+            relaunches = 0
+            while (not work.empty() or slot.prefetched is not None) and relaunches <= 2:
+                carried = slot.prefetched
+                driver = self._ensure_ready(slot)
+                if slot.prefetched is None:
+                    carried = None  # driver was recycled, the tab died with it
+                slot.prefetched = None
+                pipeline = PrefetchPipeline(driver, extract_fn, url_of, carried=carried)
+                try:
+                    pipeline.run(work, results, upcoming)
+                    slot.prefetched = pipeline.carried
+                    return
+                except Exception as e:
+                    print(f"  Browser pool: prefetch worker lost its browser ({e}), relaunching")
+                    self._bump("stale_detected")
+                    slot.close()
+                    relaunches += 1
+                finally:
+                    slot.pages += pipeline.pages
+                    with self._stats_lock:
+                        self.stats["tasks"] += pipeline.pages
+                        self.stats["prefetch_hits"] += pipeline.prefetch_hits
+                    slot.refresh_pids()
+
+        busy = [slot for slot in self._slots if slot.prefetched is not None]
+        idle = [slot for slot in self._slots if slot.prefetched is None]
+        slots = (busy + idle)[: max(len(busy), min(self.size, len(items)))]
+        threads = [threading.Thread(target=worker, args=(slot,), daemon=True) for slot in slots]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def close(self) -> None:
+        """Tear down every pooled driver and its tracked processes."""
+        for slot in self._slots:
+            slot.close()
+
+    def get_stats(self) -> dict:
+        """Get pool statistics (tasks run, Chrome launches, recycles, stale drivers)."""
+        return dict(self.stats)
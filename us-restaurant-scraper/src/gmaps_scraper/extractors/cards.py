@@ -0,0 +1,140 @@
+"""Search result cards: the partial record each feed entry already shows."""
+
+import re
+from datetime import datetime
+from typing import Optional
+
+from gmaps_scraper.config import Config
+
+# Non-restaurant Google Maps categories that occasionally appear in search results
+NON_RESTAURANT_TYPES = frozenset({
+    "postal code", "neighborhood", "locality", "route", "city",
+    "county", "state", "country", "sublocality", "premise",
+    "transit station", "bus station", "train station", "airport",
+    "parking", "park", "school", "hospital", "church",
+})
+
+_PLACE_ID_PATTERN = re.compile(r"!1s(0x[0-9a-f]+:0x[0-9a-f]+)")
+
+# Reads every feed card in one pass: the link, its aria-label (the name),
+# the rating and review count spans, and the text of each info row.
+CARD_HARVEST_JS = """
+return Array.from(document.querySelectorAll('[role="feed"] > div > div > a')).map(a => {
+    const card = a.parentElement;
+    const text = sel => { const el = card.querySelector(sel); return el ? el.textContent : null; };
+    const rating = card.querySelector('span[role="img"]');
+    return {
+        href: a.href,
+        name: a.getAttribute('aria-label'),
+        rating_text: text('.MW4etd'),
+        reviews_text: text('.UY7F9'),
+        rating_label: rating ? rating.getAttribute('aria-label') : null,
+        info_rows: Array.from(card.querySelectorAll('.W4Efsd > .W4Efsd')).map(r => r.textContent),
+    };
+});
+"""
+
+
+def is_non_restaurant(cuisine_type: Optional[str]) -> bool:
+    """Check if the cuisine type indicates a non-restaurant Google Maps result."""
+    if not cuisine_type:
+        return False
+    return cuisine_type.lower().strip() in NON_RESTAURANT_TYPES
+
+
+def place_id_from_link(link: str) -> Optional[str]:
+    """Extract the 0x...:0x... place id from a place link."""
+    match = _PLACE_ID_PATTERN.search(link)
+    return match.group(1) if match else None
+
+
+def _clean(text: Optional[str]) -> str:
+    """Collapse whitespace and strip the invisible characters Maps pads text with."""
+    if not text:
+        return ""
+    text = re.sub(r"[\u200b-\u200f\u202a-\u202e]", "", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def parse_card(raw: dict) -> dict:
+    """
+    Parse one harvested feed card into partial record fields.
+
+    Args:
+        raw: Dict returned by CARD_HARVEST_JS for one card
+
+    Returns:
+        Dict with name, rating, review_count, category, price_level and
+        address_snippet (None for anything the card did not show)
+    """
+    rating = None
+    rating_match = re.search(r"(\d[.,]\d)", _clean(raw.get("rating_text")) or _clean(raw.get("rating_label")))
+    if rating_match:
+        rating = float(rating_match.group(1).replace(",", "."))
+
+    review_count = None
+    reviews_match = re.search(r"\(?([\d,]+)\)?", _clean(raw.get("reviews_text")))
+    if reviews_match:
+        review_count = int(reviews_match.group(1).replace(",", ""))
+    else:
+        label_match = re.search(r"([\d,]+)\s+[Rr]eviews?", _clean(raw.get("rating_label")))
+        if label_match:
+            review_count = int(label_match.group(1).replace(",", ""))
+
+    category = price_level = address_snippet = None
+    for row in raw.get("info_rows") or []:
+        parts = [p.strip() for p in _clean(row).split("·") if p.strip()]
+        for part in parts:
+            if re.fullmatch(r"\${1,4}", part):
+                price_level = price_level or part
+            elif re.fullmatch(r"\$\d+[–-]\d+|\$100\+", part):
+                continue
+            elif category is None and not re.search(r"\d", part):
+                category = part
+            elif address_snippet is None and category is not None and re.search(r"\d", part):
+                address_snippet = part
+        if category is not None and address_snippet is not None:
+            break
+
+    return {
+        "name": _clean(raw.get("name")) or None,
+        "rating": rating,
+        "review_count": review_count,
+        "category": category,
+        "price_level": price_level,
+        "address_snippet": address_snippet,
+    }
+
+
+def card_rejection_reason(card: Optional[dict]) -> Optional[str]:
+    """Return why a card's place would be rejected by the details phase, if it would.
+
+    Unknown ratings are not rejected; only a rating the card actually shows.
+    """
+    if not card:
+        return None
+    rating = card.get("rating")
+    if rating is not None and rating < Config.MIN_RATING:
+        return f"rating {rating} below {Config.MIN_RATING}"
+    if is_non_restaurant(card.get("category")):
+        return f"non-restaurant ({card['category']})"
+    return None
+
+
+def card_to_record(link: str, card: dict) -> dict:
+    """Build a light, card-level place record (no details visit)."""
+    category = card.get("category")
+    is_food_truck = bool(category and "food truck" in category.lower())
+    return {
+        "place_id": place_id_from_link(link),
+        "name": card.get("name"),
+        "business_type": "food_truck" if is_food_truck else "restaurant",
+        "cuisine_type": category,
+        "address": card.get("address_snippet"),
+        "rating": card.get("rating"),
+        "review_count": card.get("review_count"),
+        "price_level": card.get("price_level"),
+        "google_maps_url": link,
+        "scraped_at": datetime.now().isoformat(),
+        "extraction_profile": "card",
+    }
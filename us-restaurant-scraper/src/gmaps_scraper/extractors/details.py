@@ -1,13 +1,23 @@
 """Place detail scraper for Google Maps - extracts detailed restaurant information."""
 
 import re
+import threading
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 
 from botasaurus.browser import browser, Driver
 
 from gmaps_scraper.config import Config
+from gmaps_scraper.extractors.browser_pool import BrowserPool
+from gmaps_scraper.extractors.cards import (
+    NON_RESTAURANT_TYPES as _NON_RESTAURANT_TYPES,
+    is_non_restaurant as _is_non_restaurant,
+)
+from gmaps_scraper.extractors.http_client import KeepAliveClient
+from gmaps_scraper.extractors.http_details import fetch_place_page, is_blocked
+from gmaps_scraper.extractors.profiles import get_profile_fields
 
 
 def _get_element_or_none(driver: Driver, selector: str):
@@ -233,22 +243,6 @@ def _extract_cuisine_type(driver: Driver) -> Optional[str]:
     return None
 
 
-# Non-restaurant Google Maps categories that occasionally appear in search results
-_NON_RESTAURANT_TYPES = frozenset({
-    "postal code", "neighborhood", "locality", "route", "city",
-    "county", "state", "country", "sublocality", "premise",
-    "transit station", "bus station", "train station", "airport",
-    "parking", "park", "school", "hospital", "church",
-})
-
-
-def _is_non_restaurant(cuisine_type: Optional[str]) -> bool:
-    """Check if the cuisine type indicates a non-restaurant Google Maps result."""
-    if not cuisine_type:
-        return False
-    return cuisine_type.lower().strip() in _NON_RESTAURANT_TYPES
-
-
 def _extract_phone(driver: Driver) -> Optional[str]:
     """Extract phone number from data-item-id attribute."""
     try:
@@ -422,30 +416,36 @@ def _parse_hours_table(html: str) -> dict[str, dict[str, str]]:
     for day_name, time_text in table_matches:
         day_lower = day_name.lower()
         if day_lower in days:
-            time_text = _normalize_text(time_text)
             time_text = re.sub(
-                r",?\s*Copy open hours.*$", "", time_text, flags=re.IGNORECASE
+                r",?\s*Copy open hours.*$", "", _normalize_text(time_text), flags=re.IGNORECASE
             )
-
-            if "closed" in time_text.lower():
-                hours_dict[day_lower] = {"open": "closed", "close": "closed"}
-            elif "open 24" in time_text.lower():
-                hours_dict[day_lower] = {"open": "00:00", "close": "23:59"}
-            else:
-                time_match = re.search(
-                    r"(\d{1,2}(?::\d{2})?\s*(?:AM|PM)?)\s*(?:to|–|-)\s*"
-                    r"(\d{1,2}(?::\d{2})?\s*(?:AM|PM)?)",
-                    time_text,
-                    re.IGNORECASE,
-                )
-                if time_match:
-                    open_time = _parse_time_to_24h(time_match.group(1))
-                    close_time = _parse_time_to_24h(time_match.group(2))
-                    hours_dict[day_lower] = {"open": open_time, "close": close_time}
+            day_hours = _parse_hours_text(time_text)
+            if day_hours:
+                hours_dict[day_lower] = day_hours
 
     return hours_dict
 
 
+def _parse_hours_text(time_text: str) -> Optional[dict[str, str]]:
+    """Parse one day's hours text like '11 AM–10 PM', 'Closed' or 'Open 24 hours'."""
+    if "closed" in time_text.lower():
+        return {"open": "closed", "close": "closed"}
+    if "open 24" in time_text.lower():
+        return {"open": "00:00", "close": "23:59"}
+
+    time_match = re.search(
+        r"(\d{1,2}(?::\d{2})?\s*(?:AM|PM)?)\s*(?:to|–|-)\s*"
+        r"(\d{1,2}(?::\d{2})?\s*(?:AM|PM)?)",
+        time_text,
+        re.IGNORECASE,
+    )
+    if time_match:
+        open_time = _parse_time_to_24h(time_match.group(1))
+        close_time = _parse_time_to_24h(time_match.group(2))
+        return {"open": open_time, "close": close_time}
+    return None
+
+
 def _extract_hours(driver: Driver) -> Optional[dict[str, dict[str, str]]]:
     """Extract hours of operation and return as structured dict.
 
@@ -571,6 +571,19 @@ def _convert_price_range_to_level(low: int, high: int) -> str:
     return "$$$$"
 
 
+def _parse_price_text(price_text: Optional[str]) -> Optional[str]:
+    """Normalize a price label ('$$', '$10–20', '$100+') to $ symbols."""
+    if not price_text:
+        return None
+    if re.search(r"\$100\+", price_text):
+        return "$$$$"
+    price_range = re.search(r"\$(\d+)\s*[–-]\s*(\d+)", price_text)
+    if price_range:
+        return _convert_price_range_to_level(int(price_range.group(1)), int(price_range.group(2)))
+    symbols = re.match(r"\s*(\${1,4})\s*$", price_text)
+    return symbols.group(1) if symbols else None
+
+
 def _extract_price_level(driver: Driver) -> Optional[str]:
     """Extract price level ($, $$, $$$, $$$$)."""
     try:
@@ -652,6 +665,75 @@ def _extract_website(driver: Driver) -> Optional[str]:
     return None
 
 
+# Optional field extractors, keyed by the field names in extractors/profiles.py
+_FIELD_EXTRACTORS = {
+    "cuisine_type": _extract_cuisine_type,
+    "address": _extract_address,
+    "coordinates": lambda driver: _extract_coordinates(driver.current_url),
+    "review_count": _extract_review_count,
+    "website": _extract_website,
+    "phone": _extract_phone,
+    "hours_of_operation": _extract_hours,
+    "price_level": _extract_price_level,
+    "primary_photo_url": _extract_primary_photo,
+}
+
+
+def _unpack_place_task(data) -> tuple[str, str]:
+    """Unpack a details task: a place URL or a {"url", "profile"} dict."""
+    if isinstance(data, dict):
+        return data.get("url", ""), data.get("profile") or Config.DETAILS_PROFILE
+    return data, Config.DETAILS_PROFILE
+
+
+def _build_place_record(
+    place_id: Optional[str],
+    name: str,
+    rating: float,
+    fields: dict,
+    place_url: str,
+    profile: str,
+) -> dict:
+    """Assemble a place record containing only the extracted fields.
+
+    Fields outside the profile are left out entirely (not set to None) so a
+    later enrichment pass can tell "not extracted" from "not on the page".
+    """
+    result: dict = {"place_id": place_id, "name": name}
+
+    if "cuisine_type" in fields:
+        cuisine_type = fields["cuisine_type"]
+        is_food_truck = bool(cuisine_type and "food truck" in cuisine_type.lower())
+        result["business_type"] = "food_truck" if is_food_truck else "restaurant"
+        result["cuisine_type"] = cuisine_type
+
+    if "address" in fields:
+        address = fields["address"]
+        addr_components = _parse_address_components(address)
+        result["address"] = address
+        result["city"] = addr_components["city"]
+        result["state"] = addr_components["state"]
+        result["zip_code"] = addr_components["zip_code"]
+
+    if "coordinates" in fields:
+        result["latitude"], result["longitude"] = fields["coordinates"]
+
+    for field in ("phone", "website"):
+        if field in fields:
+            result[field] = fields[field]
+
+    result["rating"] = rating
+
+    for field in ("review_count", "price_level", "hours_of_operation", "primary_photo_url"):
+        if field in fields:
+            result[field] = fields[field]
+
+    result["google_maps_url"] = place_url
+    result["scraped_at"] = datetime.now().isoformat()
+    result["extraction_profile"] = profile
+    return result
+
+
 @browser(
     block_images=False,
     cache=False,
@@ -661,111 +743,128 @@ def _extract_website(driver: Driver) -> Optional[str]:
     close_on_crash=True,
     proxy=Config.PROXY_LIST[0] if Config.PROXY_LIST else None,
 )
-def scrape_place_details(driver: Driver, place_url: str) -> Optional[dict]:
+def scrape_place_details(driver: Driver, place_task) -> Optional[dict]:
     """
     Scrape detailed information from a Google Maps place page.
 
     Args:
         driver: Botasaurus browser driver
-        place_url: URL to the place page
+        place_task: URL to the place page, or a dict with 'url' and an
+            optional extraction 'profile' (see extractors/profiles.py)
 
     Returns:
         Dict with place details or None if skipped/failed
     """
+    place_url, profile = _unpack_place_task(place_task)
     if not place_url:
         return None
 
     print(f"\nScraping: {place_url[:80]}...")
 
     try:
+        get_profile_fields(profile)
+
         driver.get(place_url)
-        driver.sleep(4)
+        driver.sleep(Config.PLACE_SETTLE_SECONDS)
 
         _handle_cookie_consent(driver)
 
         if "consent.google.com" in driver.current_url:
             driver.get(place_url)
-            driver.sleep(4)
+            driver.sleep(Config.PLACE_SETTLE_SECONDS)
 
-        place_id = _extract_place_id(place_url)
+        return _extract_loaded_place(driver, place_url, profile)
 
-        # Extract name
-        name = None
-        try:
-            name = driver.get_text("h1")
-            if name:
-                name = _normalize_text(name)
-        except Exception:
-            pass
+    except Exception as e:
+        print(f"  Error scraping place: {e}")
+        return None
 
-        if not name:
-            print("  Warning: Could not extract name, skipping")
-            return None
 
-        # Extract rating and apply filter
-        rating_text = None
-        try:
-            rating_text = driver.get_text("div.F7nice > span")
-        except Exception:
-            pass
+def extract_place_from_tab(driver: Driver, place_task) -> Optional[dict]:
+    """
+    Extract a place from a tab that has already loaded and settled.
 
-        rating = _parse_rating(rating_text)
+    Used by multi-tab mode, where the browser pool loads pages in background
+    tabs and switches the driver to each tab once it is ready.
 
-        if rating is None or rating < Config.MIN_RATING:
-            print(f"  Skipping: Rating {rating} is below minimum {Config.MIN_RATING}")
-            return None
+    Args:
+        driver: Botasaurus driver switched to the loaded tab
+        place_task: URL to the place page, or a dict with 'url' and 'profile'
 
-        # Extract review count (uses aria-label, not broken CSS selector)
-        review_count = _extract_review_count(driver)
+    Returns:
+        Dict with place details or None if skipped/failed
+    """
+    place_url, profile = _unpack_place_task(place_task)
+    if not place_url:
+        return None
 
-        # Extract cuisine and filter non-restaurant types
-        cuisine_type = _extract_cuisine_type(driver)
-        if _is_non_restaurant(cuisine_type):
-            print(f"  Skipping non-restaurant: {name} (type: {cuisine_type})")
-            return None
+    print(f"\nScraping (tab): {place_url[:80]}...")
 
-        website = _extract_website(driver)
-        phone = _extract_phone(driver)
-        address = _extract_address(driver)
-        lat, lng = _extract_coordinates(driver.current_url)
+    try:
+        if "consent.google.com" in driver.current_url:
+            _handle_cookie_consent(driver)
+            if "consent.google.com" in driver.current_url:
+                print("  Consent page did not clear, leaving place for retry")
+                return None
 
-        hours = _extract_hours(driver)
-        price_level = _extract_price_level(driver)
-        photo_url = _extract_primary_photo(driver)
+        return _extract_loaded_place(driver, place_url, profile)
 
-        addr_components = _parse_address_components(address)
+    except Exception as e:
+        print(f"  Error scraping place: {e}")
+        return None
 
-        is_food_truck = bool(cuisine_type and "food truck" in cuisine_type.lower())
 
-        result = {
-            "place_id": place_id,
-            "name": name,
-            "business_type": "food_truck" if is_food_truck else "restaurant",
-            "cuisine_type": cuisine_type,
-            "address": address,
-            "city": addr_components["city"],
-            "state": addr_components["state"],
-            "zip_code": addr_components["zip_code"],
-            "latitude": lat,
-            "longitude": lng,
-            "phone": phone,
-            "website": website,
-            "rating": rating,
-            "review_count": review_count,
-            "price_level": price_level,
-            "hours_of_operation": hours,
-            "primary_photo_url": photo_url,
-            "google_maps_url": place_url,
-            "scraped_at": datetime.now().isoformat(),
-        }
-
-        print(f"  Extracted: {name} ({rating} stars, {review_count} reviews)")
-        return result
+def _extract_loaded_place(driver: Driver, place_url: str, profile: str) -> Optional[dict]:
+    """Extract the profile's fields from the place page currently shown by the driver."""
+    fields_to_extract = get_profile_fields(profile)
+    place_id = _extract_place_id(place_url)
 
-    except Exception as e:
-        print(f"  Error scraping place: {e}")
+    # Extract name
+    name = None
+    try:
+        name = driver.get_text("h1")
+        if name:
+            name = _normalize_text(name)
+    except Exception:
+        pass
+
+    if not name:
+        print("  Warning: Could not extract name, skipping")
+        return None
+
+    # Extract rating and apply filter
+    rating_text = None
+    try:
+        rating_text = driver.get_text("div.F7nice > span")
+    except Exception:
+        pass
+
+    rating = _parse_rating(rating_text)
+
+    if rating is None or rating < Config.MIN_RATING:
+        print(f"  Skipping: Rating {rating} is below minimum {Config.MIN_RATING}")
+        return None
+
+    # Extract cuisine first so non-restaurant types skip the remaining fields,
+    # whether or not the profile stores it
+    cuisine_type = _extract_cuisine_type(driver)
+    if _is_non_restaurant(cuisine_type):
+        print(f"  Skipping non-restaurant: {name} (type: {cuisine_type})")
         return None
 
+    fields: dict = {}
+    if "cuisine_type" in fields_to_extract:
+        fields["cuisine_type"] = cuisine_type
+
+    for field in fields_to_extract:
+        if field not in fields:
+            fields[field] = _FIELD_EXTRACTORS[field](driver)
+
+    result = _build_place_record(place_id, name, rating, fields, place_url, profile)
+
+    print(f"  Extracted: {name} ({rating} stars, {result.get('review_count')} reviews)")
+    return result
+
 
 @browser(
     block_images=False,
@@ -778,23 +877,186 @@ def scrape_place_details(driver: Driver, place_url: str) -> Optional[dict]:
     reuse_driver=False,
     proxy=Config.PROXY_LIST[0] if Config.PROXY_LIST else None,
 )
-def _scrape_place_details_parallel(driver: Driver, place_url: str) -> Optional[dict]:
+def _scrape_place_details_parallel(driver: Driver, place_task) -> Optional[dict]:
     """Parallel version of scrape_place_details for batch processing."""
-    return scrape_place_details.__wrapped__(driver, place_url)
+    return scrape_place_details.__wrapped__(driver, place_task)
 
 
-def _validate_browser_settings():
-    """Validate critical browser decorator settings at import time.
+def _enrich_review_count(driver: Driver) -> Optional[int]:
+    """Open the Reviews tab, where the total count is rendered far more often.
+
+    The overview panel hides the count from most headless sessions, but the
+    reviews tab header ("1,234 reviews") usually shows it.
+    """
+    count = _extract_review_count(driver)
+    if count:
+        return count
+
+    try:
+        clicked = driver.run_js("""
+            var tabs = document.querySelectorAll("button[role='tab']");
+            for (var i = 0; i < tabs.length; i++) {
+                var label = (tabs[i].getAttribute('aria-label') || tabs[i].innerText || '');
+                if (label.toLowerCase().indexOf('review') !== -1) {
+                    tabs[i].click();
+                    return true;
+                }
+            }
+            return false;
+        """)
+        if not clicked:
+            return None
+        driver.sleep(2)
+    except Exception:
+        return None
+
+    count = _extract_review_count(driver)
+    if count:
+        return count
+
+    try:
+        match = re.search(r"([\d,]+)\s+reviews?\b", driver.page_text or "", re.IGNORECASE)
+        if match:
+            return int(match.group(1).replace(",", ""))
+    except Exception:
+        pass
+    return None
+
+
+def _enrich_hours(driver: Driver) -> Optional[dict[str, dict[str, str]]]:
+    """Force the weekly hours table open, retrying the expansion with longer waits.
+
+    The main pass settles for today's hours from the dropdown text; here we
+    retry the expansion until all seven day rows render.
+    """
+    for _ in range(2):
+        try:
+            _expand_hours_table(driver)
+            if _count_hours_rows(driver.page_html) >= 7:
+                break
+            driver.sleep(2)
+        except Exception:
+            continue
+
+    hours = _parse_hours_table(driver.page_html)
+    if hours:
+        return hours
+    return _extract_hours(driver)
+
+
+# Targeted strategies for fields the main pass often leaves empty or partial
+_ENRICHMENT_STRATEGIES = {
+    "review_count": _enrich_review_count,
+    "hours_of_operation": _enrich_hours,
+}
+
+
+@browser(
+    block_images=True,
+    cache=False,
+    max_retry=2,
+    retry_wait=5,
+    headless=Config.HEADLESS,
+    close_on_crash=True,
+    proxy=Config.PROXY_LIST[0] if Config.PROXY_LIST else None,
+)
+def scrape_place_enrichment(driver: Driver, task: dict) -> Optional[dict]:
+    """
+    Revisit a place page to fill specific missing fields.
+
+    Args:
+        driver: Botasaurus browser driver
+        task: Dict with 'place_id', 'url' and the 'fields' to fill
+
+    Returns:
+        Dict with place_id and the enriched field values, or None on failure
+    """
+    place_url = task.get("url")
+    if not place_url:
+        return None
+
+    print(f"\nEnriching {', '.join(task.get('fields', []))}: {place_url[:80]}...")
+
+    try:
+        driver.get(place_url)
+        driver.sleep(Config.PLACE_SETTLE_SECONDS)
+
+        _handle_cookie_consent(driver)
+
+        if "consent.google.com" in driver.current_url:
+            driver.get(place_url)
+            driver.sleep(Config.PLACE_SETTLE_SECONDS)
+
+        # Confirm the place page actually loaded before extracting anything
+        try:
+            if not driver.get_text("h1"):
+                return None
+        except Exception:
+            return None
+
+        enriched: dict = {"place_id": task.get("place_id")}
+        for field in task.get("fields", []):
+            if field in _ENRICHMENT_STRATEGIES:
+                enriched[field] = _ENRICHMENT_STRATEGIES[field](driver)
+            elif field == "coordinates":
+                enriched["latitude"], enriched["longitude"] = _extract_coordinates(driver.current_url)
+            elif field == "address":
+                address = _extract_address(driver)
+                enriched["address"] = address
+                if address:
+                    enriched.update(_parse_address_components(address))
+            elif field in _FIELD_EXTRACTORS:
+                enriched[field] = _FIELD_EXTRACTORS[field](driver)
+
+        enriched["enriched_at"] = datetime.now().isoformat()
+        return enriched
+
+    except Exception as e:
+        print(f"  Error enriching place: {e}")
+        return None
+
+
+@browser(
+    block_images=True,
+    cache=False,
+    max_retry=2,
+    retry_wait=5,
+    headless=Config.HEADLESS,
+    close_on_crash=True,
+    parallel=Config.ENRICHMENT_PARALLEL_BROWSERS,
+    reuse_driver=False,
+    proxy=Config.PROXY_LIST[0] if Config.PROXY_LIST else None,
+)
+def _scrape_place_enrichment_parallel(driver: Driver, task: dict) -> Optional[dict]:
+    """Parallel version of scrape_place_enrichment, with its own browser budget."""
+    return scrape_place_enrichment.__wrapped__(driver, task)
+
+
+_browser_settings_validated = False
+
+
+def validate_browser_settings():
+    """Validate critical browser decorator settings before the first browser run.
 
     cache=True causes Connection refused errors after drivers go stale.
     reuse_driver=True causes stale driver connections and silent empty exceptions.
-    Both MUST be False for reliable scraping.
+    Both MUST be False for reliable scraping. Driver reuse goes through
+    BrowserPool instead, which probes and recycles drivers.
+
+    Reading the decorated sources is slow, so this runs once, when scraping
+    starts (run_scraper, scrape_places, enrich_places) rather than at import:
+    planning and status commands never pay for it.
     """
+    global _browser_settings_validated
+    if _browser_settings_validated:
+        return
     import inspect
 
     for fn_name, fn in [
         ("scrape_place_details", scrape_place_details),
         ("_scrape_place_details_parallel", _scrape_place_details_parallel),
+        ("scrape_place_enrichment", scrape_place_enrichment),
+        ("_scrape_place_enrichment_parallel", _scrape_place_enrichment_parallel),
     ]:
         source = inspect.getsource(fn)
         if "cache=True" in source:
@@ -807,28 +1069,248 @@ def _validate_browser_settings():
                 f"FATAL: {fn_name} has reuse_driver=True. This WILL cause stale driver errors. "
                 f"Set reuse_driver=False."
             )
+    _browser_settings_validated = True
+
+
+_details_pool: Optional[BrowserPool] = None
+
+
+def _get_details_pool() -> BrowserPool:
+    """Get the shared details browser pool, creating it on first use."""
+    global _details_pool
+    if _details_pool is None:
+        _details_pool = BrowserPool(
+            Config.MAX_PARALLEL_BROWSERS or 4,
+            block_images=False,
+            headless=Config.HEADLESS,
+            proxy=Config.PROXY_LIST[0] if Config.PROXY_LIST else None,
+        )
+    return _details_pool
+
+
+def close_details_pool() -> None:
+    """Tear down the shared details browser pool, if one was started."""
+    global _details_pool
+    if _details_pool is not None:
+        print(f"Browser pool stats: {_details_pool.get_stats()}")
+        _details_pool.close()
+        _details_pool = None
+
+
+_http_client: Optional[KeepAliveClient] = None
+
 
+def _get_http_client() -> KeepAliveClient:
+    """Get the shared keep-alive HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        _http_client = KeepAliveClient()
+    return _http_client
 
-_validate_browser_settings()
 
+def _record_from_http_page(page: dict, place_url: str, profile: str) -> tuple[Optional[dict], bool]:
+    """Build a place record from fields parsed out of a server-rendered page.
 
-def scrape_places(place_urls: list[str], parallel: bool = True) -> list[dict]:
+    Applies the same rating and non-restaurant filters as the browser path.
+
+    Returns:
+        (record, needs_browser). needs_browser is True when the payload is
+        missing the name or rating, so the place should be retried in Chrome.
+    """
+    name = _normalize_text(page.get("name") or "")
+    rating = page.get("rating")
+    if not name or not isinstance(rating, (int, float)):
+        return None, True
+
+    rating = float(rating)
+    if rating < Config.MIN_RATING:
+        print(f"  Skipping: Rating {rating} is below minimum {Config.MIN_RATING}")
+        return None, False
+
+    fields_to_extract = get_profile_fields(profile)
+    if _is_non_restaurant(page.get("cuisine_type")):
+        print(f"  Skipping non-restaurant: {name} (type: {page.get('cuisine_type')})")
+        return None, False
+
+    hours = None
+    if page.get("hours_text"):
+        hours = {}
+        for day, text in page["hours_text"].items():
+            day_hours = _parse_hours_text(text)
+            if day_hours:
+                hours[day] = day_hours
+
+    available = {
+        "cuisine_type": page.get("cuisine_type"),
+        "address": page.get("address"),
+        "coordinates": (page.get("latitude"), page.get("longitude")),
+        "review_count": page.get("review_count"),
+        "website": page.get("website"),
+        "phone": page.get("phone"),
+        "hours_of_operation": hours or None,
+        "price_level": _parse_price_text(page.get("price_text")),
+        "primary_photo_url": page.get("primary_photo_url"),
+    }
+    fields = {field: available[field] for field in fields_to_extract}
+
+    place_id = page.get("place_id") or _extract_place_id(place_url)
+    return _build_place_record(place_id, name, rating, fields, place_url, profile), False
+
+
+def _scrape_places_http(tasks: list) -> tuple[list[Optional[dict]], list[int]]:
+    """
+    Fetch places over HTTP, collecting the ones that need the browser.
+
+    After Config.HTTP_CHALLENGE_LIMIT consent/challenge pages or 429s in one
+    batch, the remaining places go straight to the browser instead of hitting
+    the block again. Blocks are counted by the fetching threads as they
+    happen, so fetches still queued see the limit.
+
+    Returns:
+        (results aligned with tasks, indices of tasks to retry in the browser)
+    """
+    client = _get_http_client()
+    results: list[Optional[dict]] = [None] * len(tasks)
+    fallback: list[int] = []
+    challenges = 0
+    lock = threading.Lock()
+
+    def fetch(task) -> tuple[Optional[dict], Optional[str]]:
+        nonlocal challenges
+        place_url, _ = _unpack_place_task(task)
+        with lock:
+            if challenges >= Config.HTTP_CHALLENGE_LIMIT:
+                return None, "fast path paused after repeated challenges"
+        page, reason = fetch_place_page(client, place_url)
+        if is_blocked(reason):
+            with lock:
+                challenges += 1
+        return page, reason
+
+    with ThreadPoolExecutor(max_workers=Config.HTTP_WORKERS) as executor:
+        pages = executor.map(fetch, tasks)
+        for index, (task, (page, _)) in enumerate(zip(tasks, pages)):
+            place_url, profile = _unpack_place_task(task)
+            if page is not None:
+                results[index], needs_browser = _record_from_http_page(page, place_url, profile)
+                if not needs_browser:
+                    continue
+            fallback.append(index)
+
+    print(f"  HTTP fast path: {len(tasks) - len(fallback)}/{len(tasks)} places, "
+          f"{len(fallback)} sent to the browser")
+    return results, fallback
+
+
+def scrape_places(
+    place_urls: list[str],
+    parallel: bool = True,
+    profile: Optional[str] = None,
+    use_pool: Optional[bool] = None,
+    tabs_per_browser: Optional[int] = None,
+    prefetch: Optional[bool] = None,
+    lookahead: Optional[list[str]] = None,
+    http_first: Optional[bool] = None,
+    aligned: bool = False,
+) -> list[Optional[dict]]:
     """
     Scrape multiple place URLs.
 
     Args:
         place_urls: List of Google Maps place URLs
         parallel: Whether to run in parallel
+        profile: Extraction profile name (defaults to Config.DETAILS_PROFILE)
+        use_pool: Reuse pooled drivers across tasks and batches
+            (defaults to Config.USE_BROWSER_POOL)
+        tabs_per_browser: Places loaded concurrently per pooled Chrome
+            (defaults to Config.TABS_PER_BROWSER; >1 implies use_pool)
+        prefetch: Load the next place in a background tab while extracting
+            the current one (defaults to Config.PREFETCH_NEXT_PLACE; implies use_pool)
+        lookahead: URLs at the head of the pending queue after this batch;
+            with prefetch, they start loading before the next call claims them
+        http_first: Fetch place pages over HTTP and use the browser only for
+            pages that fail to parse or hit a consent/challenge page
+            (defaults to Config.DETAILS_HTTP_FIRST)
+        aligned: Keep None for places that failed or were filtered out, so
+            results[i] corresponds to place_urls[i]
 
     Returns:
-        List of place details (None values filtered out)
+        List of place details (None values filtered out unless aligned)
     """
-    if parallel:
-        results = _scrape_place_details_parallel(place_urls)
+    validate_browser_settings()
+    if use_pool is None:
+        use_pool = Config.USE_BROWSER_POOL
+    if tabs_per_browser is None:
+        tabs_per_browser = Config.TABS_PER_BROWSER
+    if prefetch is None:
+        prefetch = Config.PREFETCH_NEXT_PLACE
+    if http_first is None:
+        http_first = Config.DETAILS_HTTP_FIRST
+
+    if profile is None:
+        tasks = place_urls
+        upcoming = lookahead
+    else:
+        get_profile_fields(profile)  # fail fast on unknown profile names
+        tasks = [{"url": url, "profile": profile} for url in place_urls]
+        upcoming = [{"url": url, "profile": profile} for url in lookahead or []]
+
+    if http_first:
+        http_results, fallback = _scrape_places_http(tasks)
+        if fallback:
+            browser_results = scrape_places(
+                [_unpack_place_task(tasks[i])[0] for i in fallback],
+                parallel=parallel,
+                profile=profile,
+                use_pool=use_pool,
+                tabs_per_browser=tabs_per_browser,
+                prefetch=prefetch,
+                lookahead=lookahead,
+                http_first=False,
+                aligned=True,
+            )
+            for index, result in zip(fallback, browser_results):
+                http_results[index] = result
+        results = http_results
+    elif parallel and tabs_per_browser > 1:
+        results = _get_details_pool().map_tabs(
+            extract_place_from_tab,
+            tasks,
+            url_of=lambda task: _unpack_place_task(task)[0],
+            tabs_per_browser=tabs_per_browser,
+        )
+    elif parallel and prefetch:
+        results = _get_details_pool().map_prefetch(
+            extract_place_from_tab,
+            tasks,
+            url_of=lambda task: _unpack_place_task(task)[0],
+            lookahead=upcoming,
+        )
+    elif parallel and use_pool:
+        results = _get_details_pool().map(scrape_place_details.__wrapped__, tasks)
+    elif parallel:
+        results = _scrape_place_details_parallel(tasks)
     else:
         results = []
-        for url in place_urls:
-            result = scrape_place_details(url)
+        for task in tasks:
+            result = scrape_place_details(task)
             results.append(result)
 
-    return [r for r in results if r is not None]
+    return results if aligned else [r for r in results if r is not None]
+
+
+def enrich_places(tasks: list[dict], parallel: bool = True) -> list[Optional[dict]]:
+    """
+    Run enrichment visits for a batch of tasks.
+
+    Args:
+        tasks: List of dicts with 'place_id', 'url' and 'fields'
+        parallel: Whether to run in parallel (Config.ENRICHMENT_PARALLEL_BROWSERS)
+
+    Returns:
+        One entry per task: the enriched fields, or None if the visit failed
+    """
+    validate_browser_settings()
+    if parallel:
+        return _scrape_place_enrichment_parallel(tasks)
+    return [scrape_place_enrichment(task) for task in tasks]
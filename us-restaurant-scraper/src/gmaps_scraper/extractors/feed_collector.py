@@ -0,0 +1,121 @@
+"""In-page incremental link collector for the search results feed."""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from botasaurus.browser import Driver
+
+from gmaps_scraper.config import Config
+
+FEED_SELECTOR = '[role="feed"]'
+LINK_SELECTOR = '[role="feed"] > div > div > a'
+END_SELECTOR = "p.fontBodyMedium > span > span"
+
+_INSTALL_JS = """
+if (window.__feedCollector) return true;
+const feed = document.querySelector('FEED');
+if (!feed) return false;
+const state = {seen: new Set(), pending: [], ended: false, wake: null};
+const notify = () => { if (state.wake) { const wake = state.wake; state.wake = null; wake(); } };
+const take = a => {
+    if (a.matches('LINK') && a.href.includes('/maps/place/') && !state.seen.has(a.href)) {
+        state.seen.add(a.href);
+        state.pending.push(a.href);
+        return true;
+    }
+    return false;
+};
+const scan = root => {
+    let added = false;
+    if (root.tagName === 'A') added = take(root);
+    root.querySelectorAll('a').forEach(a => { added = take(a) || added; });
+    if (!state.ended && (root.matches('END') || root.querySelector('END'))) { state.ended = true; added = true; }
+    return added;
+};
+new MutationObserver(mutations => {
+    let added = false;
+    for (const m of mutations) {
+        for (const node of m.addedNodes) {
+            if (node.nodeType === 1) added = scan(node) || added;
+        }
+    }
+    if (added) notify();
+}).observe(feed, {childList: true, subtree: true});
+scan(feed);
+window.__feedCollector = state;
+return true;
+""".replace("FEED", FEED_SELECTOR).replace("LINK", LINK_SELECTOR).replace("END", END_SELECTOR)
+
+# Scroll, wait for the first new card (or the end marker, or the timeout),
+# give the rest of the burst SETTLE_MS to land, then hand back the delta.
+_STEP_JS = """
+const state = window.__feedCollector;
+if (!state) return null;
+const feed = document.querySelector('FEED');
+const started = Date.now();
+if (feed && SCROLL) feed.scrollBy({top: feed.clientHeight * 2});
+return new Promise(resolve => {
+    if (state.pending.length || state.ended) return resolve(true);
+    state.wake = () => resolve(true);
+    setTimeout(() => { state.wake = null; resolve(false); }, MAX_WAIT_MS);
+}).then(arrived => new Promise(resolve => setTimeout(() => resolve(arrived), arrived ? SETTLE_MS : 0)))
+  .then(() => ({
+      links: state.pending.splice(0),
+      ended: state.ended,
+      total: state.seen.size,
+      waited_ms: Date.now() - started,
+  }));
+""".replace("FEED", FEED_SELECTOR)
+
+
+@dataclass
+class FeedDelta:
+    """Links added to the feed since the previous step."""
+
+    links: list[str] = field(default_factory=list)
+    ended: bool = False
+    total: int = 0
+    waited_ms: int = 0
+
+
+class FeedCollector:
+    """
+    Collects feed links incrementally through an injected observer script.
+
+    Args:
+        driver: Botasaurus driver on a search results page
+        max_wait: Longest wait for new cards after a scroll, in seconds
+            (defaults to Config.SCROLL_MAX_WAIT)
+        settle: Extra wait once cards start arriving, in seconds
+            (defaults to Config.SCROLL_SETTLE)
+    """
+
+    def __init__(self, driver: Driver, max_wait: Optional[float] = None, settle: Optional[float] = None):
+        self.driver = driver
+        self.max_wait = max_wait if max_wait is not None else Config.SCROLL_MAX_WAIT
+        self.settle = settle if settle is not None else Config.SCROLL_SETTLE
+
+    def install(self) -> bool:
+        """Inject the observer. Returns False if the page has no feed."""
+        return bool(self.driver.run_js(_INSTALL_JS))
+
+    def step(self, scroll: bool = True) -> Optional[FeedDelta]:
+        """Scroll once (optionally) and return the links that appeared.
+
+        Returns None if the collector is not installed on the current page.
+        """
+        script = (
+            _STEP_JS.replace("SCROLL", "true" if scroll else "false")
+            .replace("MAX_WAIT_MS", str(int(self.max_wait * 1000)))
+            .replace("SETTLE_MS", str(int(self.settle * 1000)))
+        )
+        timeout = self.max_wait + self.settle + Config.BROWSER_PROBE_TIMEOUT
+        result = self.driver.run_js(script, timeout=timeout)
+        if not result:
+            return None
+        return FeedDelta(
+            links=result.get("links") or [],
+            ended=bool(result.get("ended")),
+            total=result.get("total", 0),
+            waited_ms=result.get("waited_ms", 0),
+        )
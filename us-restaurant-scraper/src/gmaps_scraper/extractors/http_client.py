@@ -0,0 +1,142 @@
+"""Keep-alive HTTP client for fetching Google Maps pages (standard library only)."""
+
+import gzip
+import http.client
+import threading
+import urllib.parse
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+from gmaps_scraper.config import Config
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate",
+    # Pre-accepted consent cookie; without it EU-routed requests get the consent page
+    "Cookie": "CONSENT=YES+",
+}
+
+_MAX_REDIRECTS = 5
+
+
+@dataclass
+class HttpResponse:
+    """A fetched page after redirects."""
+
+    status: int
+    url: str
+    text: str
+
+
+def _decode_body(body: bytes, encoding: Optional[str]) -> str:
+    """Decompress and decode a response body."""
+    if encoding == "gzip":
+        body = gzip.decompress(body)
+    elif encoding == "deflate":
+        body = zlib.decompress(body)
+    return body.decode("utf-8", errors="replace")
+
+
+class KeepAliveClient:
+    """
+    Thread-safe HTTP client with one persistent connection per host per thread.
+
+    Args:
+        base_url: Send every request to this scheme://host instead of the
+            URL's own host (defaults to Config.HTTP_BASE_URL; used to point
+            the scraper at a local stand-in server)
+        timeout: Socket timeout in seconds (defaults to Config.HTTP_TIMEOUT)
+    """
+
+    def __init__(self, base_url: Optional[str] = None, timeout: Optional[float] = None):
+        self.base_url = base_url if base_url is not None else Config.HTTP_BASE_URL
+        self.timeout = timeout if timeout is not None else Config.HTTP_TIMEOUT
+        self._local = threading.local()
+        self._all_connections: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def _rewrite(self, url: str) -> urllib.parse.SplitResult:
+        """Split a URL, swapping in the base URL's scheme and host if configured."""
+        parts = urllib.parse.urlsplit(url)
+        if self.base_url:
+            base = urllib.parse.urlsplit(self.base_url)
+            parts = parts._replace(scheme=base.scheme, netloc=base.netloc)
+        return parts
+
+    def _connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        """Get this thread's connection to a host, opening it on first use."""
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+
+        key = (scheme, netloc)
+        conn = connections.get(key)
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = conn_class(netloc, timeout=self.timeout)
+            connections[key] = conn
+            with self._lock:
+                self._all_connections.append(conn)
+                self.connections_opened += 1
+        return conn
+
+    def _drop_connection(self, scheme: str, netloc: str) -> None:
+        """Close and forget this thread's connection to a host."""
+        conn = getattr(self._local, "connections", {}).pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def _request_once(self, parts: urllib.parse.SplitResult) -> tuple[int, dict, bytes]:
+        """Send one GET, retrying once if the kept-alive connection went stale."""
+        path = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        for attempt in range(2):
+            conn = self._connection(parts.scheme, parts.netloc)
+            try:
+                conn.request("GET", path, headers=DEFAULT_HEADERS)
+                response = conn.getresponse()
+                body = response.read()
+                headers = {k.lower(): v for k, v in response.getheaders()}
+                if headers.get("connection", "").lower() == "close":
+                    self._drop_connection(parts.scheme, parts.netloc)
+                return response.status, headers, body
+            except (http.client.HTTPException, ConnectionError, OSError):
+                self._drop_connection(parts.scheme, parts.netloc)
+                if attempt == 1:
+                    raise
+        raise RuntimeError("unreachable")
+
+    def get(self, url: str) -> HttpResponse:
+        """
+        Fetch a URL, following redirects.
+
+        Returns:
+            HttpResponse with the final status, final URL (on the original
+            host, even when a base URL is configured) and decoded body
+
+        Raises:
+            OSError / http.client.HTTPException: If the host cannot be reached
+        """
+        for _ in range(_MAX_REDIRECTS + 1):
+            parts = self._rewrite(url)
+            status, headers, body = self._request_once(parts)
+            location = headers.get("location")
+            if status in (301, 302, 303, 307, 308) and location:
+                url = urllib.parse.urljoin(url, location)
+                continue
+            return HttpResponse(status, url, _decode_body(body, headers.get("content-encoding")))
+
+        return HttpResponse(status, url, "")
+
+    def close(self) -> None:
+        """Close every connection opened by any thread."""
+        with self._lock:
+            for conn in self._all_connections:
+                conn.close()
+            self._all_connections.clear()
@@ -0,0 +1,167 @@
+"""Browserless place page fetcher, parsing the payload embedded in the page."""
+
+import json
+import re
+import urllib.parse
+from typing import Any, Optional
+
+from gmaps_scraper.extractors.http_client import HttpResponse, KeepAliveClient
+
+# Paths into the place array (payload[6]). Google reshuffles these now and
+# then; when it does, parsing fails and every place falls back to the browser.
+_PLACE_PATHS = {
+    "name": (11,),
+    "place_id": (10,),
+    "rating": (4, 7),
+    "review_count": (4, 8),
+    "price_text": (4, 2),
+    "website": (7, 0),
+    "latitude": (9, 2),
+    "longitude": (9, 3),
+    "categories": (13,),
+    "address": (39,),
+    "hours": (34, 1),
+    "phone": (178, 0, 0),
+    "primary_photo_url": (72, 0, 1, 6, 0),
+}
+
+_XSSI_PREFIX = ")]}'"
+
+_CHALLENGE_URL_MARKERS = ("consent.google.com", "/sorry/")
+_CHALLENGE_BODY_MARKERS = (
+    "our systems have detected unusual traffic",
+    'action="https://consent.google.com',
+)
+
+
+def _dig(data: Any, path: tuple[int, ...]) -> Any:
+    """Follow a path of list indices, returning None if any step is missing."""
+    for index in path:
+        if not isinstance(data, list) or index >= len(data):
+            return None
+        data = data[index]
+    return data
+
+
+def detect_challenge(response: HttpResponse) -> Optional[str]:
+    """Return why a response is a consent/challenge page, or None if it is not."""
+    if response.status == 429:
+        return "rate limited (429)"
+    for marker in _CHALLENGE_URL_MARKERS:
+        if marker in response.url:
+            return f"challenge page ({marker})"
+    body = response.text[:20000].lower()
+    for marker in _CHALLENGE_BODY_MARKERS:
+        if marker in body:
+            return "challenge page (body)"
+    if response.status >= 400:
+        return f"HTTP {response.status}"
+    return None
+
+
+def is_blocked(reason: Optional[str]) -> bool:
+    """Check whether a fallback reason means Google is blocking the fast path."""
+    return bool(reason) and reason.startswith(("rate limited", "challenge page"))
+
+
+def _iter_payloads(state: Any):
+    """Yield every XSSI-prefixed JSON payload nested in the init state."""
+    if isinstance(state, list):
+        for value in state:
+            yield from _iter_payloads(value)
+    elif isinstance(state, str) and state.startswith(_XSSI_PREFIX):
+        try:
+            yield json.loads(state[len(_XSSI_PREFIX):].lstrip())
+        except json.JSONDecodeError:
+            return
+
+
+def _find_place_array(page_html: str) -> Optional[list]:
+    """Locate the place array inside APP_INITIALIZATION_STATE."""
+    match = re.search(
+        r"window\.APP_INITIALIZATION_STATE\s*=\s*(.*?);\s*window\.APP_FLAGS", page_html, re.DOTALL
+    )
+    if not match:
+        return None
+    try:
+        state = json.loads(match.group(1))
+    except json.JSONDecodeError:
+        return None
+
+    for payload in _iter_payloads(state):
+        place = _dig(payload, (6,))
+        if isinstance(_dig(place, _PLACE_PATHS["name"]), str):
+            return place
+    return None
+
+
+def _parse_hours(raw_hours: Any) -> Optional[dict[str, str]]:
+    """Turn the hours array into {day: "11 AM–10 PM"} text entries."""
+    if not isinstance(raw_hours, list):
+        return None
+    hours: dict[str, str] = {}
+    for entry in raw_hours:
+        day = _dig(entry, (0,))
+        text = _dig(entry, (3, 0, 0)) or _dig(entry, (1, 0))
+        if isinstance(day, str) and isinstance(text, str):
+            hours[day.lower()] = text
+    return hours or None
+
+
+def parse_place_page(page_html: str) -> Optional[dict]:
+    """
+    Parse raw field values from a server-rendered place page.
+
+    Returns:
+        Dict with name, place_id, rating, review_count, cuisine_type,
+        address, latitude, longitude, website, phone, price_text,
+        hours_text ({day: text}) and primary_photo_url, or None if the page
+        has no recognizable place data
+    """
+    place = _find_place_array(page_html)
+    if place is None:
+        return None
+
+    categories = _dig(place, _PLACE_PATHS["categories"])
+    website = _dig(place, _PLACE_PATHS["website"])
+    if isinstance(website, str) and website.startswith("/url?"):
+        website = urllib.parse.parse_qs(urllib.parse.urlsplit(website).query).get("q", [website])[0]
+
+    return {
+        "name": _dig(place, _PLACE_PATHS["name"]),
+        "place_id": _dig(place, _PLACE_PATHS["place_id"]),
+        "rating": _dig(place, _PLACE_PATHS["rating"]),
+        "review_count": _dig(place, _PLACE_PATHS["review_count"]),
+        "cuisine_type": categories[0] if isinstance(categories, list) and categories else None,
+        "address": _dig(place, _PLACE_PATHS["address"]),
+        "latitude": _dig(place, _PLACE_PATHS["latitude"]),
+        "longitude": _dig(place, _PLACE_PATHS["longitude"]),
+        "website": website,
+        "phone": _dig(place, _PLACE_PATHS["phone"]),
+        "price_text": _dig(place, _PLACE_PATHS["price_text"]),
+        "hours_text": _parse_hours(_dig(place, _PLACE_PATHS["hours"])),
+        "primary_photo_url": _dig(place, _PLACE_PATHS["primary_photo_url"]),
+    }
+
+
+def fetch_place_page(client: KeepAliveClient, place_url: str) -> tuple[Optional[dict], Optional[str]]:
+    """
+    Fetch and parse a place page over HTTP.
+
+    Returns:
+        (parsed fields, None) on success, or (None, reason) when the place
+        should be retried in the browser
+    """
+    try:
+        response = client.get(place_url)
+    except Exception as e:
+        return None, f"request failed ({e})"
+
+    reason = detect_challenge(response)
+    if reason:
+        return None, reason
+
+    parsed = parse_place_page(response.text)
+    if parsed is None:
+        return None, "no embedded place data"
+    return parsed, None
@@ -0,0 +1,175 @@
+"""Browserless search backend paging through a query's tbm=map results."""
+
+import json
+import urllib.parse
+from typing import Any, Optional
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.extractors.http_client import KeepAliveClient
+from gmaps_scraper.extractors.http_details import _PLACE_PATHS, _XSSI_PREFIX, _dig, detect_challenge
+from gmaps_scraper.geo.tiles import viewport_span_m
+
+SEARCH_BACKENDS = ("browser", "http")
+
+SEARCH_URL = "https://www.google.com/search?tbm=map&authuser=0&hl=en&gl=us&q={query}&pb={pb}"
+
+# Viewport (span in metres, centre) plus page size and offset. Text queries
+# name the area, so they use a wide span over the centre of the contiguous US;
+# tile queries (geo/tiles.py) pass their own viewport.
+_SEARCH_PB = (
+    "!4m8!1m3!1d{span}!2d{lng}!3d{lat}!3m2!1i1024!2i768!4f13.1"
+    "!7i{page_size}!8i{offset}!10b1"
+)
+_US_VIEWPORT = {"span": 5000000, "lat": 39.8283, "lng": -98.5795}
+
+PLACE_LINK_TEMPLATE = "https://www.google.com/maps/place/{name}/data=!4m5!3m4!1s{place_id}!8m2!3d{lat}!4d{lng}"
+
+
+def build_search_url(
+    query: str,
+    offset: int = 0,
+    page_size: Optional[int] = None,
+    viewport: Optional[dict] = None,
+) -> str:
+    """Build the tbm=map URL for one page of a query's results.
+
+    Args:
+        query: Search text
+        offset: Index of the first result on the page
+        page_size: Results per page (defaults to Config.HTTP_SEARCH_PAGE_SIZE)
+        viewport: Optional {lat, lng, zoom} to search within instead of the whole US
+    """
+    if page_size is None:
+        page_size = Config.HTTP_SEARCH_PAGE_SIZE
+    view = _US_VIEWPORT
+    if viewport:
+        view = {"span": int(viewport_span_m(viewport)), "lat": viewport["lat"], "lng": viewport["lng"]}
+    pb = _SEARCH_PB.format(page_size=page_size, offset=offset, **view)
+    return SEARCH_URL.format(query=urllib.parse.quote_plus(query), pb=urllib.parse.quote(pb, safe="!"))
+
+
+def _load_search_payload(text: str) -> Optional[list]:
+    """Decode a tbm=map response, which may be wrapped in {"d": ...}."""
+    text = text.strip()
+    if text.endswith('/*""*/'):
+        text = text[: -len('/*""*/')]
+    try:
+        if text.startswith("{"):
+            text = json.loads(text).get("d", "")
+        if text.startswith(_XSSI_PREFIX):
+            text = text[len(_XSSI_PREFIX):]
+        payload = json.loads(text)
+    except (json.JSONDecodeError, AttributeError):
+        return None
+    return payload if isinstance(payload, list) else None
+
+
+def _place_link(place: list) -> Optional[str]:
+    """Build a place URL (the same form the browser feed yields) from a place array."""
+    place_id = _dig(place, _PLACE_PATHS["place_id"])
+    name = _dig(place, _PLACE_PATHS["name"])
+    if not isinstance(place_id, str) or not place_id.startswith("0x") or not name:
+        return None
+    return PLACE_LINK_TEMPLATE.format(
+        name=urllib.parse.quote_plus(name),
+        place_id=place_id,
+        lat=_dig(place, _PLACE_PATHS["latitude"]),
+        lng=_dig(place, _PLACE_PATHS["longitude"]),
+    )
+
+
+def _place_card(place: list) -> dict:
+    """Build the search card fields (see extractors/cards.py) from a place array."""
+    categories = _dig(place, _PLACE_PATHS["categories"])
+    price = _dig(place, _PLACE_PATHS["price_text"])
+    return {
+        "name": _dig(place, _PLACE_PATHS["name"]),
+        "rating": _dig(place, _PLACE_PATHS["rating"]),
+        "review_count": _dig(place, _PLACE_PATHS["review_count"]),
+        "category": categories[0] if isinstance(categories, list) and categories else None,
+        "price_level": price if isinstance(price, str) and set(price) == {"$"} else None,
+        "address_snippet": _dig(place, _PLACE_PATHS["address"]),
+    }
+
+
+def parse_search_page(text: str) -> Optional[dict[str, dict]]:
+    """
+    Extract place links and their cards from one tbm=map response page.
+
+    Returns:
+        {link: card} in result order (possibly empty at the end of the
+        results), or None if the response has no recognizable structure
+    """
+    payload = _load_search_payload(text)
+    if payload is None:
+        return None
+
+    entries: Any = _dig(payload, (0, 1))
+    if entries is None:
+        return None if _dig(payload, (0,)) is None else {}
+
+    cards = {}
+    for entry in entries:
+        place = _dig(entry, (14,))
+        link = _place_link(place) if isinstance(place, list) else None
+        if link:
+            cards[link] = _place_card(place)
+    return cards
+
+
+def fetch_search_results(
+    client: KeepAliveClient,
+    search_data: dict,
+    max_results: Optional[int] = None,
+) -> tuple[Optional[dict], Optional[str]]:
+    """
+    Page through a query's results over HTTP.
+
+    Args:
+        client: Keep-alive HTTP client
+        search_data: Dict containing 'query' and optional metadata
+        max_results: Stop after this many links (defaults to
+            Config.HTTP_SEARCH_MAX_RESULTS, the browser feed's cap)
+
+    Returns:
+        (result dict, None) on success, or (None, reason) when the query
+        should be retried with the browser scroller. A page that fails after
+        the first also hands the query over, since stopping there would
+        record a truncated count as the query's complete results.
+    """
+    if max_results is None:
+        max_results = Config.HTTP_SEARCH_MAX_RESULTS
+    query = search_data.get("query", "")
+    search_text = search_data.get("search_term") or query
+    viewport = search_data.get("viewport")
+    page_size = Config.HTTP_SEARCH_PAGE_SIZE
+
+    collected: dict[str, dict] = {}
+    offset = 0
+    while offset < max_results:
+        try:
+            response = client.get(build_search_url(search_text, offset, page_size, viewport))
+        except Exception as e:
+            reason = f"request failed ({e})"
+        else:
+            reason = detect_challenge(response)
+
+        cards = None if reason else parse_search_page(response.text)
+        if cards is None:
+            reason = reason or "no parseable results"
+            return None, reason if offset == 0 else f"{reason} at offset {offset}"
+
+        before = len(collected)
+        collected.update(cards)
+        if len(cards) < page_size or len(collected) == before:
+            break
+        offset += page_size
+
+    place_links = list(collected)[:max_results]
+    return {
+        "search_data": search_data,
+        "place_links": place_links,
+        "place_cards": {link: collected[link] for link in place_links},
+        "count": len(place_links),
+        "error": None,
+    }, None
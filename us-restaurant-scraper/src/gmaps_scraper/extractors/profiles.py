@@ -0,0 +1,84 @@
+"""Field extraction profiles: the optional fields a details visit extracts, and their cost."""
+
+from typing import Optional
+
+from gmaps_scraper.config import Config
+
+# Estimated cost per field, in seconds. Hours is by far the most expensive
+# because it clicks the dropdown and waits for the weekly table to render.
+FIELD_COSTS: dict[str, float] = {
+    "cuisine_type": 0.0,  # Read on every visit for the non-restaurant filter
+    "address": 0.5,
+    "coordinates": 0.0,
+    "review_count": 1.5,
+    "website": 0.5,
+    "phone": 0.5,
+    "hours_of_operation": 6.0,
+    "price_level": 0.3,
+    "primary_photo_url": 1.0,
+}
+
+# Base cost of every visit: navigation, readiness sleep, name, rating and category.
+BASE_VISIT_COST = 4.7
+
+FIELD_PROFILES: dict[str, tuple[str, ...]] = {
+    "core": ("cuisine_type", "address", "coordinates"),
+    "full": tuple(FIELD_COSTS),
+    "hours-only": ("hours_of_operation",),
+}
+
+# Columns of a full-profile record, in the order the CSV files are written
+RECORD_COLUMNS: tuple[str, ...] = (
+    "place_id", "name", "business_type", "cuisine_type", "address", "city", "state",
+    "zip_code", "latitude", "longitude", "phone", "website", "rating", "review_count",
+    "price_level", "hours_of_operation", "primary_photo_url", "google_maps_url",
+    "scraped_at", "extraction_profile",
+)
+
+
+def get_profile_fields(profile: Optional[str] = None) -> tuple[str, ...]:
+    """Return the optional fields extracted by a profile.
+
+    Raises:
+        ValueError: If the profile name is not registered
+    """
+    if profile is None:
+        profile = Config.DETAILS_PROFILE
+    if profile not in FIELD_PROFILES:
+        raise ValueError(
+            f"Unknown extraction profile '{profile}'. "
+            f"Choose from: {', '.join(FIELD_PROFILES)}"
+        )
+    return FIELD_PROFILES[profile]
+
+
+def estimate_profile_cost(profile: Optional[str] = None) -> float:
+    """Estimate seconds spent per place visit for a profile."""
+    return BASE_VISIT_COST + sum(FIELD_COSTS[f] for f in get_profile_fields(profile))
+
+
+def field_keys(field: str) -> tuple[str, ...]:
+    """Return the record keys a field is stored under."""
+    return ("latitude", "longitude") if field == "coordinates" else (field,)
+
+
+def fill_record_columns(records: list[dict]) -> list[dict]:
+    """Return the records with every RECORD_COLUMNS key, None where absent.
+
+    Records of different profiles carry different keys, and a CSV header
+    taken from one record would drop the others' columns.
+    """
+    return [{**dict.fromkeys(RECORD_COLUMNS), **record} for record in records]
+
+
+def missing_profile_fields(record: dict, profile: Optional[str] = None) -> list[str]:
+    """Return fields of `profile` that were never extracted for `record`.
+
+    A field is missing when its key is absent, which is how records from a
+    cheaper profile look. Fields extracted but empty (None) are not reported.
+    """
+    missing = []
+    for field in get_profile_fields(profile):
+        if any(key not in record for key in field_keys(field)):
+            missing.append(field)
+    return missing
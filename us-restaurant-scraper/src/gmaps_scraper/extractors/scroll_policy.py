@@ -0,0 +1,125 @@
+"""Scroll budgets planned from the yield history of completed searches.
+
+History is kept per (query type, area) and per query type in
+checkpoints/scroll_history.json.
+"""
+
+import json
+import os
+from typing import Optional
+
+from gmaps_scraper.config import Config
+
+
+def policy_keys(search_data: dict) -> tuple[str, str]:
+    """Return the (area, query type) history keys for a query."""
+    query_type = search_data.get("type") or "unknown"
+    zip_code = str(search_data.get("zip_code") or "")
+    area = zip_code[:3] if zip_code else (search_data.get("state") or "*")
+    return f"{query_type}|{area}", f"{query_type}|*"
+
+
+def predicted_gain(expected: Optional[list[float]], next_index: int) -> Optional[float]:
+    """Predicted new links from scroll `next_index` onward, or None without history."""
+    if not expected:
+        return None
+    return sum(expected[next_index:])
+
+
+class ScrollPolicy:
+    """Per-area scroll yield history and the budgets planned from it."""
+
+    def __init__(self, checkpoint_dir: str = "checkpoints"):
+        self.checkpoint_dir = checkpoint_dir
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        self._history_file = os.path.join(checkpoint_dir, "scroll_history.json")
+        self._history: dict[str, dict] = self._load()
+
+    def _load(self) -> dict[str, dict]:
+        """Load yield history from disk."""
+        if os.path.exists(self._history_file):
+            try:
+                with open(self._history_file, "r") as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, IOError):
+                pass
+        return {}
+
+    def save(self) -> None:
+        """Persist yield history to disk."""
+        try:
+            with open(self._history_file, "w") as f:
+                json.dump(self._history, f)
+        except IOError as e:
+            print(f"Warning: Could not save scroll history: {e}")
+
+    def _stats_for(self, search_data: dict) -> tuple[Optional[dict], str]:
+        """Pick the most specific history with enough samples."""
+        for key in policy_keys(search_data):
+            stats = self._history.get(key)
+            if stats and stats["searches"] >= Config.SCROLL_POLICY_MIN_SAMPLES:
+                return stats, key
+        return None, "default"
+
+    def plan(self, search_data: dict) -> dict:
+        """
+        Plan the scroll budget for a query and log the decision.
+
+        Returns:
+            Dict with 'scroll_budget' (max scrolls) and 'scroll_expected'
+            (mean new links per scroll index, index 0 = initial page load)
+        """
+        stats, basis = self._stats_for(search_data)
+        query = search_data.get("query", "")
+
+        if stats is None:
+            print(f"  Scroll plan {query}: budget {Config.MAX_SCROLLS} (no history)")
+            return {"scroll_budget": Config.MAX_SCROLLS, "scroll_expected": []}
+
+        expected = [
+            round(total / reached, 2) if reached else 0.0
+            for total, reached in zip(stats["yield"], stats["reached"])
+        ]
+        capped_rate = stats["capped"] / stats["searches"]
+        tried = len(expected) - 1  # scrolls after the initial load
+
+        if capped_rate >= Config.SCROLL_EXTEND_RATE:
+            budget = min(Config.MAX_SCROLLS_EXTENDED, tried + Config.SCROLL_EXTEND_STEP)
+            reason = f"extended, {capped_rate:.0%} still yielding at cap"
+        else:
+            productive = [
+                i for i, mean in enumerate(expected)
+                if i > 0 and mean >= Config.SCROLL_MIN_MARGINAL_LINKS
+            ]
+            budget = min(Config.MAX_SCROLLS_EXTENDED, (max(productive) + 1) if productive else 1)
+            reason = "trimmed to last productive scroll" if budget < tried else "history"
+
+        print(f"  Scroll plan {query}: budget {budget} ({reason}; {basis}, "
+              f"{stats['searches']} searches)")
+        return {"scroll_budget": budget, "scroll_expected": expected}
+
+    def record(self, search_data: dict, trace: dict) -> None:
+        """Add a finished search's per-scroll yields to its history keys.
+
+        Args:
+            search_data: The query dict (with its planned scroll_budget)
+            trace: Scroll trace from the search result: 'yields' per scroll
+                index, plus 'capped' if the budget ran out while links were
+                still arriving
+        """
+        yields = trace.get("yields") or []
+        if not yields:
+            return
+
+        for key in policy_keys(search_data):
+            stats = self._history.setdefault(
+                key, {"searches": 0, "capped": 0, "reached": [], "yield": []}
+            )
+            stats["searches"] += 1
+            stats["capped"] += 1 if trace.get("capped") else 0
+            for i, count in enumerate(yields):
+                if i == len(stats["reached"]):
+                    stats["reached"].append(0)
+                    stats["yield"].append(0)
+                stats["reached"][i] += 1
+                stats["yield"][i] += count
@@ -1,11 +1,18 @@
 """Search scraper for Google Maps - collects place links from search results."""
 
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 from botasaurus.browser import browser, Driver
 from botasaurus import bt
 
 from gmaps_scraper.config import Config
+from gmaps_scraper.extractors.cards import CARD_HARVEST_JS, parse_card, place_id_from_link
+from gmaps_scraper.extractors.feed_collector import FeedCollector
+from gmaps_scraper.extractors.scroll_policy import predicted_gain
+from gmaps_scraper.extractors.http_client import KeepAliveClient
+from gmaps_scraper.extractors.http_search import SEARCH_BACKENDS, fetch_search_results
 
 
 def _handle_cookie_consent(driver: Driver) -> None:
@@ -19,13 +26,134 @@ def _handle_cookie_consent(driver: Driver) -> None:
             print(f"Warning: Could not accept cookies: {e}")
 
 
+def _search_url(search_data: dict) -> str:
+    """Build the Maps search URL: free text, or a search term over a viewport."""
+    viewport = search_data.get("viewport")
+    if viewport:
+        term = urllib.parse.quote_plus(search_data.get("search_term") or "restaurants")
+        return (f"https://www.google.com/maps/search/{term}/"
+                f"@{viewport['lat']},{viewport['lng']},{viewport['zoom']}z")
+    encoded_query = urllib.parse.quote_plus(search_data.get("query", ""))
+    return f"https://www.google.com/maps/search/{encoded_query}"
+
+
 def _scroll_and_collect_links(
+    driver: Driver,
+    max_scrolls: int | None = None,
+    expected_yields: Optional[list[float]] = None,
+    resume_depth: int = 0,
+    trace: Optional[dict] = None,
+) -> tuple[list[str], dict]:
+    """
+    Scroll through the search results feed until end is reached.
+
+    Uses the injected FeedCollector, so each scroll is one round-trip that
+    returns only new links and waits only as long as cards take to arrive.
+    Falls back to re-reading the feed after every scroll if the collector
+    script cannot run.
+
+    Args:
+        driver: Botasaurus driver on a search results page
+        max_scrolls: Scroll budget (defaults to Config.MAX_SCROLLS)
+        expected_yields: Mean new links per scroll index from the scroll
+            policy; an empty scroll stops the search when the predicted
+            remaining gain is below Config.SCROLL_MIN_MARGINAL_LINKS
+        resume_depth: Scroll depth an earlier, interrupted attempt reached;
+            the budget is added on top of it so this attempt goes deeper
+        trace: Dict filled in as scrolling progresses ('links', 'yields',
+            'depth'), so a caller can salvage links if a later step raises
+
+    Returns:
+        (unique place URLs, scroll trace with per-scroll 'yields', 'depth',
+        'ended', 'capped', 'partial' and the 'stop' reason)
+    """
+    if max_scrolls is None:
+        max_scrolls = Config.MAX_SCROLLS
+    if resume_depth:
+        print(f"Resuming from scroll depth {resume_depth}")
+        max_scrolls += resume_depth
+    if trace is None:
+        trace = {}
+
+    # Wait for feed to load
+    driver.sleep(1)
+
+    collector = FeedCollector(driver)
+    try:
+        if not collector.install():
+            print("Warning: Feed not found on page")
+            return [], {"yields": [], "stop": "no feed"}
+        first = collector.step(scroll=False)
+    except Exception as e:
+        print(f"Warning: Feed collector unavailable ({e}), re-reading feed per scroll")
+        return _scroll_and_reread_links(driver, max_scrolls), {"yields": [], "stop": "fallback scroller"}
+
+    collected_links: list[str] = list(first.links) if first else []
+    yields = [len(collected_links)]
+    trace.update(links=collected_links, yields=yields, depth=0)
+    ended = bool(first and first.ended)
+    stop = "end of list" if ended else "budget"
+    scroll_count = 0
+    no_new_links_count = 0
+
+    while scroll_count < max_scrolls and not ended:
+        try:
+            delta = collector.step()
+        except Exception as e:
+            print(f"Warning: Scroll failed: {e}")
+            stop = "scroll error"
+            break
+        if delta is None:
+            print("Warning: Feed collector lost (page navigated), stopping")
+            stop = "collector lost"
+            break
+
+        scroll_count += 1
+        collected_links.extend(delta.links)
+        yields.append(len(delta.links))
+        trace["depth"] = scroll_count
+
+        if delta.ended:
+            ended = True
+            stop = "end of list"
+            break
+
+        if delta.links:
+            no_new_links_count = 0
+        else:
+            # Each empty step already waited Config.SCROLL_MAX_WAIT for cards
+            no_new_links_count += 1
+            # History describes fresh searches, so it only applies past the resumed depth
+            gain = predicted_gain(expected_yields, scroll_count - resume_depth + 1)
+            if scroll_count > resume_depth and gain is not None and gain < Config.SCROLL_MIN_MARGINAL_LINKS:
+                stop = f"empty scroll, predicted gain {gain:.1f} links"
+                break
+            if no_new_links_count >= Config.MAX_EMPTY_SCROLLS:
+                stop = f"{no_new_links_count} empty scrolls"
+                break
+
+        # Progress logging
+        if scroll_count % 10 == 0:
+            print(f"Scroll {scroll_count}: {len(collected_links)} links collected")
+
+    capped = stop == "budget" and yields[-1] > 0
+    partial = stop in ("scroll error", "collector lost")
+    print(f"Finished scrolling after {scroll_count}/{max_scrolls} scrolls "
+          f"(stop: {stop}{', still yielding' if capped else ''}). "
+          f"Total links: {len(collected_links)}")
+    trace.update(ended=ended, capped=capped, partial=partial, stop=stop)
+    return collected_links, trace
+
+
+def _scroll_and_reread_links(
     driver: Driver,
     max_scrolls: int | None = None,
     scroll_delay: float | None = None,
 ) -> list[str]:
     """
-    Scroll through the search results feed until end is reached.
+    Scroll the feed, re-reading every link after each fixed-delay scroll.
+
+    Fallback for pages where the FeedCollector script cannot run.
 
     Returns list of unique place URLs.
     """
@@ -42,9 +170,6 @@ def _scroll_and_collect_links(
     end_indicator = "p.fontBodyMedium > span > span"
     link_selector = '[role="feed"] > div > div > a'
 
-    # Wait for feed to load
-    driver.sleep(1)
-
     # Check if feed exists
     if not driver.is_element_present(feed_selector):
         print("Warning: Feed not found on page")
@@ -97,6 +222,33 @@ def _scroll_and_collect_links(
     return list(collected_links)
 
 
+def _harvest_cards(driver: Driver, place_links: list[str]) -> dict[str, dict]:
+    """
+    Parse the feed cards into partial records, keyed by the collected links.
+
+    Cards are matched to links by place id, so differences in URL
+    parameters between the two reads do not matter.
+    """
+    try:
+        raw_cards = driver.run_js(CARD_HARVEST_JS) or []
+    except Exception as e:
+        print(f"Warning: Could not harvest search cards: {e}")
+        return {}
+
+    by_place_id = {}
+    for raw in raw_cards:
+        place_id = place_id_from_link(raw.get("href") or "")
+        if place_id:
+            by_place_id[place_id] = parse_card(raw)
+
+    cards = {}
+    for link in place_links:
+        card = by_place_id.get(place_id_from_link(link))
+        if card:
+            cards[link] = card
+    return cards
+
+
 @browser(
     block_images=True,
     cache=False,  # Disabled - was causing stale cached results
@@ -114,7 +266,9 @@ def scrape_search_results(driver: Driver, search_data: dict) -> dict:
         search_data: Dict containing 'query' and optional metadata
 
     Returns:
-        Dict with search_data, place_links, count, and error
+        Dict with search_data, place_links, count, and error. If the search
+        broke off mid-scroll, the links collected so far are returned with
+        partial=True and the scroll_depth reached.
     """
     query = search_data.get("query", "")
     if not query:
@@ -129,9 +283,8 @@ def scrape_search_results(driver: Driver, search_data: dict) -> dict:
     print(f"Searching: {query}")
     print(f"{'='*50}")
 
-    # Build search URL
-    encoded_query = urllib.parse.quote_plus(query)
-    url = f"https://www.google.com/maps/search/{encoded_query}"
+    url = _search_url(search_data)
+    scroll_trace: dict = {}
 
     try:
         # Navigate to search page
@@ -146,18 +299,45 @@ def scrape_search_results(driver: Driver, search_data: dict) -> dict:
             driver.get(url)
             driver.sleep(1)
 
-        # Scroll and collect links
-        place_links = _scroll_and_collect_links(driver)
-
-        return {
+        # Scroll within the planned budget, then read the cards the links came from
+        place_links, scroll_trace = _scroll_and_collect_links(
+            driver,
+            max_scrolls=search_data.get("scroll_budget"),
+            expected_yields=search_data.get("scroll_expected"),
+            resume_depth=search_data.get("resume_depth", 0),
+            trace=scroll_trace,
+        )
+        place_cards = _harvest_cards(driver, place_links)
+
+        result = {
             "search_data": search_data,
             "place_links": place_links,
+            "place_cards": place_cards,
+            "scroll_trace": scroll_trace,
             "count": len(place_links),
             "error": None,
         }
+        if scroll_trace.get("partial"):
+            result.update(
+                partial=True,
+                scroll_depth=scroll_trace.get("depth", 0),
+                error=f"interrupted mid-scroll ({scroll_trace['stop']})",
+            )
+        return result
 
     except Exception as e:
         print(f"Error scraping search results: {e}")
+        salvaged = list(scroll_trace.get("links") or [])
+        if salvaged:
+            print(f"  Salvaged {len(salvaged)} links from scroll depth {scroll_trace.get('depth', 0)}")
+            return {
+                "search_data": search_data,
+                "place_links": salvaged,
+                "count": len(salvaged),
+                "partial": True,
+                "scroll_depth": scroll_trace.get("depth", 0),
+                "error": str(e),
+            }
         return {
             "search_data": search_data,
             "place_links": [],
@@ -173,7 +353,7 @@ def scrape_search_results(driver: Driver, search_data: dict) -> dict:
     retry_wait=10,
     headless=True,
     close_on_crash=True,
-    parallel=Config.MAX_PARALLEL_BROWSERS,
+    parallel=Config.SEARCH_PARALLEL_BROWSERS or Config.MAX_PARALLEL_BROWSERS,
     reuse_driver=False,  # Disabled to prevent stale driver connections
 )
 def _scrape_search_results_parallel(driver: Driver, search_data: dict) -> dict:
@@ -181,17 +361,66 @@ def _scrape_search_results_parallel(driver: Driver, search_data: dict) -> dict:
     return scrape_search_results.__wrapped__(driver, search_data)
 
 
-def scrape_searches(queries: list[dict], parallel: bool = False) -> list[dict]:
+_http_client: Optional[KeepAliveClient] = None
+
+
+def _scrape_searches_http(queries: list[dict]) -> tuple[list[Optional[dict]], list[int]]:
+    """
+    Run queries over the HTTP search backend.
+
+    Returns:
+        (results aligned with queries, indices of queries to retry in the browser)
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = KeepAliveClient()
+
+    results: list[Optional[dict]] = [None] * len(queries)
+    fallback: list[int] = []
+    with ThreadPoolExecutor(max_workers=Config.HTTP_WORKERS) as executor:
+        fetched = executor.map(lambda q: fetch_search_results(_http_client, q), queries)
+        for index, (result, reason) in enumerate(fetched):
+            if result is None:
+                print(f"  {queries[index].get('query', '')}: HTTP search failed ({reason}), using browser")
+                fallback.append(index)
+            results[index] = result
+
+    print(f"  HTTP search: {len(queries) - len(fallback)}/{len(queries)} queries, "
+          f"{len(fallback)} sent to the browser")
+    return results, fallback
+
+
+def scrape_searches(
+    queries: list[dict],
+    parallel: bool = False,
+    backend: Optional[str] = None,
+) -> list[dict]:
     """
     Scrape multiple search queries.
 
     Args:
         queries: List of query dicts
         parallel: Whether to run in parallel
+        backend: "browser" (scroll the results feed) or "http" (page the
+            search data directly, falling back to the browser per query);
+            defaults to Config.SEARCH_BACKEND
 
     Returns:
         List of results
     """
+    if backend is None:
+        backend = Config.SEARCH_BACKEND
+    if backend not in SEARCH_BACKENDS:
+        raise ValueError(f"Unknown search backend '{backend}'. Choose from: {', '.join(SEARCH_BACKENDS)}")
+
+    if backend == "http":
+        results, fallback = _scrape_searches_http(queries)
+        if fallback:
+            browser_results = scrape_searches([queries[i] for i in fallback], parallel, "browser")
+            for index, result in zip(fallback, browser_results):
+                results[index] = result
+        return results
+
     if parallel:
         return _scrape_search_results_parallel(queries)
 
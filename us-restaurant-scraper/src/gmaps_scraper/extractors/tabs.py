@@ -0,0 +1,300 @@
+"""Multi-tab page loading within one Chrome: TabMultiplexer and the ordered PrefetchPipeline."""
+
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from botasaurus.browser import Driver
+
+from gmaps_scraper.config import Config
+
+
+class LoadingTab:
+    """A place page loading in its own browser tab."""
+
+    def __init__(self, driver: Driver, index: int, item: Any, url: str):
+        self.index = index
+        self.item = item
+        self.url = url
+        self.started_at = time.time()
+        self.complete_at: Optional[float] = None
+        self.tab = driver._browser.get(url, new_tab=True)
+
+    @property
+    def age(self) -> float:
+        """Seconds since navigation started."""
+        return time.time() - self.started_at
+
+    def is_settled(self, settle_seconds: float) -> bool:
+        """Check whether the document is complete and has had time to render."""
+        if self.complete_at is None:
+            try:
+                if self.tab.evaluate("document.readyState === 'complete'", await_promise=False):
+                    self.complete_at = time.time()
+            except Exception:
+                return False
+        return self.complete_at is not None and time.time() - self.complete_at >= settle_seconds
+
+    def close(self) -> None:
+        """Close the tab, ignoring errors from tabs that already died."""
+        try:
+            self.tab.close()
+        except Exception:
+            pass
+
+
+class WorkQueue:
+    """
+    Thread-safe queue of (index, item) pairs shared by the workers of a batch.
+
+    Besides taking the next item, a worker can claim a specific URL, which is
+    how a page prefetched at the end of one batch is matched to its item in
+    the next batch.
+    """
+
+    def __init__(self, items: list, url_of: Callable[[Any], str]):
+        self.url_of = url_of
+        self._pending: list[tuple[int, Any]] = list(enumerate(items))
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[tuple[int, Any]]:
+        """Take the next pending item, or None if the queue is drained."""
+        with self._lock:
+            return self._pending.pop(0) if self._pending else None
+
+    def claim_url(self, url: str) -> Optional[tuple[int, Any]]:
+        """Take the pending item for a URL, or None if it is not queued."""
+        with self._lock:
+            for position, (_, item) in enumerate(self._pending):
+                if self.url_of(item) == url:
+                    return self._pending.pop(position)
+        return None
+
+    def put_back(self, index: int, item: Any) -> None:
+        """Return an unfinished item to the front of the queue."""
+        with self._lock:
+            self._pending.insert(0, (index, item))
+
+    def empty(self) -> bool:
+        with self._lock:
+            return not self._pending
+
+
+class TabMultiplexer:
+    """
+    Loads several work items concurrently in tabs of one driver.
+
+    Items are pulled from a shared queue (so several multiplexers, one per
+    pooled browser, can drain the same batch). Results are written into a
+    shared list at each item's index.
+    """
+
+    def __init__(
+        self,
+        driver: Driver,
+        extract_fn: Callable[[Driver, Any], Any],
+        url_of: Callable[[Any], str],
+        max_tabs: int,
+        hang_timeout: Optional[float] = None,
+        settle_seconds: Optional[float] = None,
+    ):
+        self.driver = driver
+        self.extract_fn = extract_fn
+        self.url_of = url_of
+        self.max_tabs = max(1, max_tabs)
+        self.hang_timeout = hang_timeout if hang_timeout is not None else Config.TAB_HANG_TIMEOUT
+        self.settle_seconds = (
+            settle_seconds if settle_seconds is not None else Config.PLACE_SETTLE_SECONDS
+        )
+        self.in_flight: list[LoadingTab] = []
+        self.pages = 0
+
+    def _fill(self, work: WorkQueue) -> None:
+        """Open tabs for queued items until max_tabs are in flight."""
+        while len(self.in_flight) < self.max_tabs:
+            claimed = work.get()
+            if claimed is None:
+                return
+            index, item = claimed
+            try:
+                self.in_flight.append(LoadingTab(self.driver, index, item, self.url_of(item)))
+            except Exception:
+                work.put_back(index, item)
+                raise
+
+    def _drop_hung_tabs(self, results: list) -> None:
+        """Close tabs still loading after the hang timeout.
+
+        Tabs that finished loading are kept however long they have waited
+        for extraction, which runs one tab at a time.
+        """
+        for loading in list(self.in_flight):
+            if loading.age <= self.hang_timeout:
+                continue
+            loading.is_settled(self.settle_seconds)  # records completion if it was not polled yet
+            if loading.complete_at is None:
+                print(f"  Tab hung for {loading.age:.0f}s, dropping: {loading.url[:80]}")
+                loading.close()
+                self.in_flight.remove(loading)
+                results[loading.index] = None
+
+    def requeue_in_flight(self, work: WorkQueue) -> None:
+        """Put unfinished items back on the queue (used when the browser dies)."""
+        for loading in self.in_flight:
+            work.put_back(loading.index, loading.item)
+            loading.close()
+        self.in_flight.clear()
+
+    def run(self, work: WorkQueue, results: list) -> None:
+        """Drain the work queue, extracting from tabs as they settle.
+
+        Raises connection errors from the driver after requeueing every
+        in-flight item, so the caller can relaunch the browser.
+        """
+        try:
+            while True:
+                self._fill(work)
+                if not self.in_flight:
+                    return
+
+                self._drop_hung_tabs(results)
+                ready = next(
+                    (t for t in self.in_flight if t.is_settled(self.settle_seconds)), None
+                )
+                if ready is None:
+                    time.sleep(0.1)
+                    continue
+
+                # Still in flight if the switch fails, so it is requeued
+                self.driver.switch_to_tab(ready.tab)
+                self.in_flight.remove(ready)
+                try:
+                    results[ready.index] = self.extract_fn(self.driver, ready.item)
+                except Exception as e:
+                    print(f"  Tab extraction error: {e}")
+                    results[ready.index] = None
+                finally:
+                    ready.close()
+                    self.driver.switch_to_tab(None)
+                    self.pages += 1
+        except Exception:
+            self.requeue_in_flight(work)
+            raise
+
+
+class PrefetchPipeline:
+    """
+    Extracts work items in order while the next one loads in the background.
+
+    The next URL always comes from the shared work queue, so the pipeline
+    never prefetches a page another worker will also load. When the queue
+    runs dry, one URL from `lookahead` (the head of the next batch) is
+    prefetched instead and handed back to the caller as `carried`, to be
+    claimed at the start of the next run.
+    """
+
+    def __init__(
+        self,
+        driver: Driver,
+        extract_fn: Callable[[Driver, Any], Any],
+        url_of: Callable[[Any], str],
+        hang_timeout: Optional[float] = None,
+        settle_seconds: Optional[float] = None,
+        carried: Optional[LoadingTab] = None,
+    ):
+        self.driver = driver
+        self.extract_fn = extract_fn
+        self.url_of = url_of
+        self.hang_timeout = hang_timeout if hang_timeout is not None else Config.TAB_HANG_TIMEOUT
+        self.settle_seconds = (
+            settle_seconds if settle_seconds is not None else Config.PLACE_SETTLE_SECONDS
+        )
+        self.carried = carried
+        self.current: Optional[LoadingTab] = None
+        self.next: Optional[LoadingTab] = None
+        self.pages = 0
+        self.prefetch_hits = 0
+
+    def _open(self, work: WorkQueue) -> Optional[LoadingTab]:
+        """Start loading the next queued item in a background tab."""
+        claimed = work.get()
+        if claimed is None:
+            return None
+        index, item = claimed
+        try:
+            return LoadingTab(self.driver, index, item, self.url_of(item))
+        except Exception:
+            work.put_back(index, item)
+            raise
+
+    def _adopt_carried(self, work: WorkQueue) -> Optional[LoadingTab]:
+        """Match the tab prefetched by the previous run to an item of this run."""
+        carried, self.carried = self.carried, None
+        if carried is None:
+            return None
+        claimed = work.claim_url(carried.url)
+        if claimed is None:
+            carried.close()
+            return None
+        carried.index, carried.item = claimed
+        self.prefetch_hits += 1
+        return carried
+
+    def _prefetch_lookahead(self, lookahead: Optional[WorkQueue]) -> None:
+        """Start loading the head of the next batch once this one is drained."""
+        if lookahead is None:
+            return
+        claimed = lookahead.get()
+        if claimed is not None:
+            index, item = claimed
+            self.carried = LoadingTab(self.driver, index, item, self.url_of(item))
+
+    def _extract(self, loading: LoadingTab, results: list) -> None:
+        """Wait for a tab to settle (or hang), then extract from it."""
+        while not loading.is_settled(self.settle_seconds):
+            if loading.age > self.hang_timeout:
+                print(f"  Tab hung for {loading.age:.0f}s, dropping: {loading.url[:80]}")
+                loading.close()
+                results[loading.index] = None
+                return
+            time.sleep(0.05)
+
+        self.driver.switch_to_tab(loading.tab)
+        try:
+            results[loading.index] = self.extract_fn(self.driver, loading.item)
+        except Exception as e:
+            print(f"  Tab extraction error: {e}")
+            results[loading.index] = None
+        finally:
+            loading.close()
+            self.driver.switch_to_tab(None)
+            self.pages += 1
+
+    def requeue_in_flight(self, work: WorkQueue) -> None:
+        """Put unfinished items back on the queue (used when the browser dies)."""
+        for loading in (self.next, self.current):
+            if loading is not None:
+                work.put_back(loading.index, loading.item)
+                loading.close()
+        self.current = self.next = None
+        if self.carried is not None:
+            self.carried.close()
+            self.carried = None
+
+    def run(self, work: WorkQueue, results: list, lookahead: Optional[WorkQueue] = None) -> None:
+        """Drain the work queue with one page loading ahead of extraction.
+
+        Raises connection errors from the driver after requeueing the
+        in-flight items, so the caller can relaunch the browser.
+        """
+        try:
+            self.current = self._adopt_carried(work) or self._open(work)
+            while self.current is not None:
+                self.next = self._open(work)
+                if self.next is None:
+                    self._prefetch_lookahead(lookahead)
+                self._extract(self.current, results)
+                self.current, self.next = self.next, None
+        except Exception:
+            self.requeue_in_flight(work)
+            raise
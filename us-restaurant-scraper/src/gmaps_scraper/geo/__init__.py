@@ -10,6 +10,7 @@ from gmaps_scraper.geo.locations import (
     get_all_queries,
     get_test_queries,
 )
+from gmaps_scraper.geo.tiles import plan_tile_queries, subdivide_if_saturated
 
 __all__ = [
     "US_STATES",
@@ -20,4 +21,6 @@ __all__ = [
     "generate_zip_queries",
     "get_all_queries",
     "get_test_queries",
+    "plan_tile_queries",
+    "subdivide_if_saturated",
 ]
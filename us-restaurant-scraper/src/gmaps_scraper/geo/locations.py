@@ -2,11 +2,15 @@
 
 import csv
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
 
 from gmaps_scraper.config import Config
 from gmaps_scraper.cuisines import CUISINE_TYPES
 
+if TYPE_CHECKING:
+    from gmaps_scraper.cuisine_vocab import CuisineVocabulary
+    from gmaps_scraper.geo.zip_cover import ZipCover
+
 # Major US cities for testing (top 50 by population)
 TEST_CITIES = [
     {"city": "Garden Grove", "state": "CA", "state_name": "California"},
@@ -164,6 +168,19 @@ def load_zip_codes_from_csv(filepath: str) -> list[dict]:
     return zip_codes
 
 
+def load_zip_centroids(filepath: Optional[str]) -> dict[str, tuple[float, float]]:
+    """Load {zip_code: (lat, lng)} from a zip codes CSV, skipping rows without coordinates."""
+    centroids = {}
+    if not filepath:
+        return centroids
+    for zc in load_zip_codes_from_csv(filepath):
+        try:
+            centroids[zc["zip_code"]] = (float(zc["lat"]), float(zc["lng"]))
+        except (TypeError, ValueError):
+            continue
+    return centroids
+
+
 def generate_city_queries(
     cities: Optional[list[dict]] = None,
     business_type: str = "restaurants",
@@ -211,6 +228,7 @@ def generate_zip_queries(
             "type": "zip",
             "lat": zc.get("lat"),
             "lng": zc.get("lng"),
+            "centroid": "zip",
         })
 
     return queries
@@ -234,11 +252,43 @@ def _select_evenly_spaced(items: list, count: int) -> list:
     return [items[int(i * step)] for i in range(count)]
 
 
+def _zip_query(
+    zip_code: str,
+    city: dict,
+    query_type: str,
+    business_type: str,
+    zip_cover: Optional["ZipCover"] = None,
+) -> dict:
+    """Build a zip query, centred on the zip's centroid when the cover knows it.
+
+    Otherwise the query carries the city's centre, and says so in 'centroid'
+    so that refinement does not search sub-areas around the wrong point.
+    """
+    lat, lng, centroid = city.get("lat"), city.get("lng"), "city"
+    if zip_cover is not None and zip_code in zip_cover.centroids:
+        (lat, lng), centroid = zip_cover.centroids[zip_code], "zip"
+    return {
+        "query": f"{business_type} near {zip_code}",
+        "zip_code": zip_code,
+        "city": city.get("city", ""),
+        "state": city.get("state", ""),
+        "type": query_type,
+        "lat": lat,
+        "lng": lng,
+        "centroid": centroid,
+    }
+
+
 def generate_zip_queries_from_cities(
     cities: list[dict],
     business_type: str = "restaurants",
+    zip_cover: Optional["ZipCover"] = None,
 ) -> list[dict]:
-    """Generate zip code queries for large cities using population-tiered caps."""
+    """Generate zip code queries for large cities using population-tiered caps.
+
+    With a zip cover (geo/zip_cover.py), each city's zips are the covering
+    set for its area (at most the tier cap) instead of an even spread.
+    """
     queries = []
     for city in cities:
         population = city.get("population", 0)
@@ -250,21 +300,25 @@ def generate_zip_queries_from_cities(
         if not zips:
             continue
 
-        selected = _select_evenly_spaced(zips, cap)
+        if zip_cover is not None:
+            selected = zip_cover.select(zips)[:cap]
+        else:
+            selected = _select_evenly_spaced(zips, cap)
         for zip_code in selected:
-            queries.append({
-                "query": f"{business_type} near {zip_code}",
-                "zip_code": zip_code,
-                "city": city.get("city", ""),
-                "state": city.get("state", ""),
-                "type": "zip",
-                "lat": city.get("lat"),
-                "lng": city.get("lng"),
-            })
+            queries.append(_zip_query(zip_code, city, "zip", business_type, zip_cover))
 
     return queries
 
 
+def default_cities_csv() -> Optional[str]:
+    """Path of the bundled data/uscities.csv, or None if it is missing."""
+    default_csv = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+        "data", "uscities.csv",
+    )
+    return default_csv if os.path.exists(default_csv) else None
+
+
 def get_all_queries(
     cities_csv: Optional[str] = None,
     zip_codes_csv: Optional[str] = None,
@@ -272,6 +326,7 @@ def get_all_queries(
     business_type: str = "restaurants",
     test_mode: bool = False,
     test_limit: int = 5,
+    zip_cover: Optional["ZipCover"] = None,
 ) -> list[dict]:
     """
     Get all search queries for the scraper.
@@ -283,18 +338,14 @@ def get_all_queries(
         business_type: Type of business to search for
         test_mode: If True, only return a limited number of queries
         test_limit: Number of queries to return in test mode
+        zip_cover: Pick each city's zips by spatial set cover (see geo/zip_cover.py)
 
     Returns:
         List of query dicts with metadata
     """
     # Default to bundled data file
     if cities_csv is None:
-        default_csv = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
-            "data", "uscities.csv",
-        )
-        if os.path.exists(default_csv):
-            cities_csv = default_csv
+        cities_csv = default_cities_csv()
 
     # Load cities
     if cities_csv and os.path.exists(cities_csv):
@@ -307,7 +358,9 @@ def get_all_queries(
 
     # Add zip code queries if requested
     if include_zip_codes:
-        if zip_codes_csv:
+        if zip_cover is not None:
+            queries.extend(generate_zip_queries_from_cities(cities, business_type, zip_cover))
+        elif zip_codes_csv:
             zip_codes = load_zip_codes_from_csv(zip_codes_csv)
             queries.extend(generate_zip_queries(zip_codes, business_type))
         else:
@@ -320,60 +373,62 @@ def get_all_queries(
     return queries
 
 
-def generate_remaining_zip_queries(
+def iter_remaining_zip_queries(
     completed_searches: set[str],
     cities_csv: str | None = None,
     business_type: str = "restaurants",
     min_population: int = 50_000,
-) -> list[dict]:
-    """Generate queries for all zip codes not yet searched.
+    zip_cover: Optional["ZipCover"] = None,
+) -> Iterator[dict]:
+    """Yield queries for all zip codes not yet searched, city by city.
 
     Used by --fill-gaps mode to exhaustively search every zip code
     in cities >= min_population that wasn't covered in previous runs.
+    With a zip cover, only each city's covering set of zips is searched.
     """
     if cities_csv is None:
-        default_csv = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
-            "data", "uscities.csv",
-        )
-        if os.path.exists(default_csv):
-            cities_csv = default_csv
+        cities_csv = default_cities_csv()
 
     if not cities_csv or not os.path.exists(cities_csv):
         print("Error: No cities CSV found for fill-gaps mode")
-        return []
+        return
 
     cities = load_cities_from_csv(cities_csv, min_population)
-    queries = []
     seen_zips: set[str] = set()
 
     for city in cities:
         zips = city.get("zips", [])
+        if zip_cover is not None:
+            zips = zip_cover.select(zips)
         for zip_code in zips:
             if zip_code in seen_zips:
                 continue
             seen_zips.add(zip_code)
             query_str = f"{business_type} near {zip_code}"
             if query_str not in completed_searches:
-                queries.append({
-                    "query": query_str,
-                    "zip_code": zip_code,
-                    "city": city.get("city", ""),
-                    "state": city.get("state", ""),
-                    "type": "zip_fill",
-                    "lat": city.get("lat"),
-                    "lng": city.get("lng"),
-                })
+                yield _zip_query(zip_code, city, "zip_fill", business_type, zip_cover)
 
-    return queries
+
+def generate_remaining_zip_queries(
+    completed_searches: set[str],
+    cities_csv: str | None = None,
+    business_type: str = "restaurants",
+    min_population: int = 50_000,
+    zip_cover: Optional["ZipCover"] = None,
+) -> list[dict]:
+    """List form of iter_remaining_zip_queries."""
+    return list(iter_remaining_zip_queries(completed_searches, cities_csv, business_type, min_population, zip_cover))
 
 
-def generate_cuisine_queries(
-    cities: list[dict],
+def iter_cuisine_queries(
+    cities: Iterable[dict],
     completed_searches: set[str],
     min_population: int = 100_000,
-) -> list[dict]:
-    """Generate cuisine-specific queries for high-population zip codes.
+    zip_codes: Optional[set[str]] = None,
+    vocabulary: Optional["CuisineVocabulary"] = None,
+    zip_centroids: Optional[dict[str, tuple[float, float]]] = None,
+) -> Iterator[dict]:
+    """Yield cuisine-specific queries for high-population zip codes.
 
     For each zip code in cities >= min_population, generates queries like:
     - "Thai restaurants near 11201"
@@ -381,16 +436,23 @@ def generate_cuisine_queries(
     - etc.
 
     This surfaces restaurants that don't rank highly in generic searches.
+    With a vocabulary learned from earlier results, each zip gets only the
+    cuisines common in its region, best first and capped per zip; without
+    one, every cuisine in CUISINE_TYPES.
 
     Args:
         cities: List of city dicts with 'population' and 'zips' fields
-        completed_searches: Set of already-completed query strings
+        completed_searches: Already-completed searches (the checkpoint's key
+            set matches them under any spelling)
         min_population: Only expand cuisines for cities >= this population
+        zip_codes: Only expand these zip codes (all zips of the cities if None)
+        vocabulary: Per-region cuisine vocabulary (see cuisine_vocab.py)
+        zip_centroids: {zip_code: (lat, lng)} (see load_zip_centroids); zips
+            without one carry the city's centre
 
-    Returns:
-        List of query dicts with metadata
+    Yields:
+        Query dicts with metadata, zip by zip in city order
     """
-    queries = []
     seen_zips: set[str] = set()
 
     for city in cities:
@@ -398,25 +460,50 @@ def generate_cuisine_queries(
             continue
 
         for zip_code in city.get("zips", []):
-            if zip_code in seen_zips:
+            if zip_code in seen_zips or (zip_codes is not None and zip_code not in zip_codes):
                 continue
             seen_zips.add(zip_code)
 
-            for cuisine in CUISINE_TYPES:
+            if vocabulary is not None:
+                cuisines = vocabulary.rank(zip_code, city.get("state"))
+            else:
+                cuisines = [(cuisine, None) for cuisine in CUISINE_TYPES]
+
+            lat, lng, centroid = city.get("lat"), city.get("lng"), "city"
+            if zip_centroids and zip_code in zip_centroids:
+                (lat, lng), centroid = zip_centroids[zip_code], "zip"
+
+            for cuisine, expected_share in cuisines:
                 query_str = f"{cuisine} restaurants near {zip_code}"
                 if query_str not in completed_searches:
-                    queries.append({
+                    query = {
                         "query": query_str,
                         "zip_code": zip_code,
                         "city": city.get("city", ""),
                         "state": city.get("state", ""),
                         "type": "cuisine_zip",
                         "cuisine": cuisine,
-                        "lat": city.get("lat"),
-                        "lng": city.get("lng"),
-                    })
+                        "lat": lat,
+                        "lng": lng,
+                        "centroid": centroid,
+                    }
+                    if expected_share is not None:
+                        query["expected_share"] = expected_share
+                    yield query
 
-    return queries
+
+def generate_cuisine_queries(
+    cities: list[dict],
+    completed_searches: set[str],
+    min_population: int = 100_000,
+    zip_codes: Optional[set[str]] = None,
+    vocabulary: Optional["CuisineVocabulary"] = None,
+    zip_centroids: Optional[dict[str, tuple[float, float]]] = None,
+) -> list[dict]:
+    """List form of iter_cuisine_queries."""
+    return list(iter_cuisine_queries(
+        cities, completed_searches, min_population, zip_codes, vocabulary, zip_centroids,
+    ))
 
 
 def get_test_queries(limit: int = 5) -> list[dict]:
@@ -0,0 +1,289 @@
+"""Compact 64-bit keys for search queries.
+
+Key layout:
+    kind (4 bits) | term (8 bits) | payload (52 bits)
+
+- kind: near a zip, in a city, a viewport, or a 60-bit text hash
+- term: 0 = "restaurants", i = "<CUISINE_TYPES[i-1]> restaurants", so
+  CUISINE_TYPES must only ever be appended to
+- payload: the zip code, an index into the append-only location table, or
+  the tile z/x/y of a viewport query
+"""
+
+import hashlib
+import json
+import os
+import re
+from array import array
+from typing import Iterable, Iterator, Optional
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.cuisines import CUISINE_TYPES
+from gmaps_scraper.geo.tiles import tile_for, tile_query
+
+KIND_NEAR = 1
+KIND_IN = 2
+KIND_VIEWPORT = 3
+KIND_TEXT = 15
+
+_KIND_SHIFT = 60
+_TERM_SHIFT = 52
+_PAYLOAD_MASK = (1 << _TERM_SHIFT) - 1
+_TEXT_MASK = (1 << _KIND_SHIFT) - 1
+
+_NEAR_RE = re.compile(r"^(?P<term>.+) near (?P<zip>\d{5})$", re.IGNORECASE)
+_IN_RE = re.compile(r"^(?P<term>.+?) in (?P<place>.+)$", re.IGNORECASE)
+_VIEWPORT_RE = re.compile(
+    r"^(?P<term>.+) @(?P<lat>-?\d+\.\d+),(?P<lng>-?\d+\.\d+),(?P<zoom>\d+)z$", re.IGNORECASE
+)
+
+_UNKNOWN_LOCATION = -1
+
+_TERMS = ["restaurants"] + [f"{cuisine} restaurants" for cuisine in CUISINE_TYPES]
+_TERM_CODES = {term.casefold(): code for code, term in enumerate(_TERMS) if code < 256}
+
+
+def normalize_query(query: str) -> str:
+    """Whitespace-collapsed, casefolded query text: two strings for one search normalize alike."""
+    return " ".join(query.split()).casefold()
+
+
+class LocationTable:
+    """
+    Append-only "City, State" table for city query keys.
+
+    Args:
+        path: JSON file the table is kept in (in-memory only if None)
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.names: list[str] = []
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    self.names = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Warning: Could not load query location table: {e}")
+        self._index: dict[str, int] = {}
+        for i, name in enumerate(self.names):
+            self._index.setdefault(name.casefold(), i)
+        self._dirty = False
+
+    def lookup(self, name: str) -> Optional[int]:
+        """Index of a location (case-insensitive), or None if it was never interned."""
+        return self._index.get(name.casefold())
+
+    def intern(self, name: str) -> int:
+        """Index of a location, adding it (with this spelling) if new."""
+        index = self._index.get(name.casefold())
+        if index is None:
+            index = self._index[name.casefold()] = len(self.names)
+            self.names.append(name)
+            self._dirty = True
+        return index
+
+    def save(self) -> None:
+        """Persist the table if locations were added."""
+        if not self.path or not self._dirty:
+            return
+        try:
+            with open(self.path, "w") as f:
+                json.dump(self.names, f)
+            self._dirty = False
+        except IOError as e:
+            print(f"Warning: Could not save query location table: {e}")
+
+
+def _pack(kind: int, term: int, payload: int) -> int:
+    return kind << _KIND_SHIFT | term << _TERM_SHIFT | payload
+
+
+def text_key(query: str) -> int:
+    """Fallback key: a 60-bit hash of the normalized query text."""
+    digest = int.from_bytes(hashlib.blake2b(normalize_query(query).encode(), digest_size=8).digest(), "big")
+    return _pack(KIND_TEXT, 0, 0) | digest & _TEXT_MASK
+
+
+class QueryCodec:
+    """
+    Converts between query text and 64-bit keys.
+
+    Args:
+        locations: Location table for city queries (in-memory if None)
+    """
+
+    def __init__(self, locations: Optional[LocationTable] = None):
+        self.locations = locations if locations is not None else LocationTable()
+
+    def _structured_key(self, query: str, intern: bool) -> Optional[int]:
+        """Key of a query with a known shape, before the round-trip check (None: no known shape)."""
+        query = " ".join(query.split())
+
+        match = _NEAR_RE.match(query)
+        term = match and _TERM_CODES.get(match.group("term").casefold())
+        if term is not None:
+            return _pack(KIND_NEAR, term, int(match.group("zip")))
+
+        match = _VIEWPORT_RE.match(query)
+        term = match and _TERM_CODES.get(match.group("term").casefold())
+        if term is not None:
+            zoom = int(match.group("zoom")) - Config.TILE_VIEWPORT_ZOOM_OFFSET
+            if 0 <= zoom <= 23:
+                zoom, x, y = tile_for(float(match.group("lat")), float(match.group("lng")), zoom)
+                return _pack(KIND_VIEWPORT, term, zoom << 46 | x << 23 | y)
+
+        match = _IN_RE.match(query)
+        term = match and _TERM_CODES.get(match.group("term").casefold())
+        if term is not None:
+            place = match.group("place")
+            index = self.locations.intern(place) if intern else self.locations.lookup(place)
+            if index is None:
+                return _UNKNOWN_LOCATION
+            return _pack(KIND_IN, term, index)
+        return None
+
+    def key(self, query: str, intern: bool = True) -> Optional[int]:
+        """
+        Key of a query string.
+
+        Args:
+            query: Query text
+            intern: Add unknown city locations to the table; with False, a
+                city query whose location was never interned has no key
+                (it cannot have been searched)
+
+        Returns:
+            The 64-bit key, or None (see intern)
+        """
+        key = self._structured_key(query, intern)
+        if key == _UNKNOWN_LOCATION:
+            return None
+        if key is None:
+            return text_key(query)
+        # Keys must decode to this search; anything else is hashed
+        rendered = self.render(key)
+        return key if rendered is not None and normalize_query(rendered) == normalize_query(query) else text_key(query)
+
+    def canonical(self, query: str) -> str:
+        """The one spelling of a search (its key rendered, or the normalized text for hashed keys)."""
+        return self.render(self.key(query)) or " ".join(query.split())
+
+    def render(self, key: int) -> Optional[str]:
+        """Query text of a key (None for hashed keys, which cannot be decoded)."""
+        kind = key >> _KIND_SHIFT
+        term_code = key >> _TERM_SHIFT & 0xFF
+        payload = key & _PAYLOAD_MASK
+        if kind == KIND_TEXT or term_code >= len(_TERMS):
+            return None
+        term = _TERMS[term_code]
+        if kind == KIND_NEAR:
+            return f"{term} near {payload:05d}"
+        if kind == KIND_IN:
+            if payload >= len(self.locations.names):
+                return None
+            return f"{term} in {self.locations.names[payload]}"
+        if kind == KIND_VIEWPORT:
+            zoom, x, y = payload >> 46, payload >> 23 & 0x7FFFFF, payload & 0x7FFFFF
+            return tile_query(zoom, x, y, search_term=term)["query"]
+        return None
+
+
+def unique_queries(queries: Iterable[dict], codec: QueryCodec) -> Iterator[dict]:
+    """Drop queries whose search an earlier query in the stream already makes (same key)."""
+    seen: set[int] = set()
+    for query in queries:
+        key = codec.key(query.get("query", ""))
+        if key not in seen:
+            seen.add(key)
+            yield query
+
+
+class QueryKeySet:
+    """
+    Set of query keys answering membership by query text.
+
+    Iterating yields the decodable query texts; hashed keys only count
+    towards len() and membership. Keys in `shared` (searches completed by
+    other runs, e.g. recovery) count for membership only.
+    """
+
+    def __init__(self, codec: QueryCodec, keys: Iterable[int] = (), shared: Iterable[int] = ()):
+        self.codec = codec
+        self.keys: set[int] = set(keys)
+        self.shared: set[int] = set(shared)
+
+    def add(self, query: str) -> None:
+        self.keys.add(self.codec.key(query))
+
+    def __contains__(self, query: object) -> bool:
+        if not isinstance(query, str):
+            return False
+        key = self.codec.key(query, intern=False)
+        return key is not None and (key in self.keys or key in self.shared)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.keys:
+            query = self.codec.render(key)
+            if query is not None:
+                yield query
+
+
+def write_keys(path: str, keys: Iterable[int]) -> None:
+    """Write keys as a sorted u64 array (atomically)."""
+    data = array("Q", sorted(keys))
+    tmp_file = f"{path}.tmp"
+    with open(tmp_file, "wb") as f:
+        data.tofile(f)
+    os.replace(tmp_file, path)
+
+
+def read_keys(path: str) -> array:
+    """Read a key file written by write_keys."""
+    keys = array("Q")
+    with open(path, "rb") as f:
+        keys.frombytes(f.read())
+    return keys
+
+
+def write_key_counts(path: str, counts: dict[int, int]) -> None:
+    """Write key counts as a sorted u64 key array followed by a u32 count array (atomically)."""
+    keys = sorted(counts)
+    tmp_file = f"{path}.tmp"
+    with open(tmp_file, "wb") as f:
+        array("Q", keys).tofile(f)
+        array("I", (min(counts[key], 0xFFFFFFFF) for key in keys)).tofile(f)
+    os.replace(tmp_file, path)
+
+
+def read_key_counts(path: str) -> dict[int, int]:
+    """Read a key count file written by write_key_counts."""
+    with open(path, "rb") as f:
+        data = f.read()
+    size = len(data) // 12
+    keys, counts = array("Q"), array("I")
+    keys.frombytes(data[:size * 8])
+    counts.frombytes(data[size * 8:size * 12])
+    return dict(zip(keys, counts))
+
+
+def convert_query_file(source: str, destination: str, codec: QueryCodec) -> int:
+    """
+    Convert a JSON list of query strings to a key file, keeping file order.
+
+    Returns:
+        Number of queries converted
+    """
+    with open(source, "r") as f:
+        queries = json.load(f)
+    keys = array("Q", (codec.key(q) for q in queries))
+    tmp_file = f"{destination}.tmp"
+    with open(tmp_file, "wb") as f:
+        keys.tofile(f)
+    os.replace(tmp_file, destination)
+    codec.locations.save()
+    return len(keys)
+
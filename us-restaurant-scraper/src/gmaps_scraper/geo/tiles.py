@@ -0,0 +1,156 @@
+"""Quadtree search planner over map viewports (web-map tiles)."""
+
+import math
+import os
+from typing import Optional
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.geo.locations import load_cities_from_csv, load_zip_codes_from_csv
+
+EARTH_CIRCUMFERENCE_M = 40_075_016.686
+VIEWPORT_WIDTH_PX = 1024  # Matches the viewport the browser and HTTP searches use
+
+
+def tile_for(lat: float, lng: float, zoom: int) -> tuple[int, int, int]:
+    """Return the (zoom, x, y) tile containing a point."""
+    n = 2 ** zoom
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = int((lng + 180.0) / 360.0 * n)
+    lat_rad = math.radians(lat)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return zoom, min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_center(zoom: int, x: int, y: int) -> tuple[float, float]:
+    """Return the (lat, lng) centre of a tile."""
+    n = 2 ** zoom
+    lng = (x + 0.5) / n * 360.0 - 180.0
+    lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 0.5) / n))))
+    return lat, lng
+
+
+def viewport_span_m(viewport: dict) -> float:
+    """Approximate width in metres of a viewport at its centre latitude."""
+    metres_per_px = (
+        EARTH_CIRCUMFERENCE_M * math.cos(math.radians(viewport["lat"])) / (256 * 2 ** viewport["zoom"])
+    )
+    return metres_per_px * VIEWPORT_WIDTH_PX
+
+
+def tile_query(
+    zoom: int,
+    x: int,
+    y: int,
+    search_term: str = "restaurants",
+    city: str = "",
+    state: str = "",
+) -> dict:
+    """Build the search query dict for one tile."""
+    lat, lng = tile_center(zoom, x, y)
+    # A 1024px viewport shows four 256px tiles across, so zoom in two levels
+    viewport_zoom = zoom + Config.TILE_VIEWPORT_ZOOM_OFFSET
+    return {
+        "query": f"{search_term} @{lat:.5f},{lng:.5f},{viewport_zoom}z",
+        "search_term": search_term,
+        "tile": f"{zoom}/{x}/{y}",
+        "viewport": {"lat": round(lat, 5), "lng": round(lng, 5), "zoom": viewport_zoom},
+        "city": city,
+        "state": state,
+        "type": "tile",
+        "lat": round(lat, 5),
+        "lng": round(lng, 5),
+    }
+
+
+def _seed_points(
+    cities_csv: Optional[str],
+    zip_codes_csv: Optional[str],
+    min_population: int,
+) -> list[dict]:
+    """City centroids (and zip centroids if a zip CSV is given) with coordinates."""
+    points = []
+    if cities_csv and os.path.exists(cities_csv):
+        points.extend(load_cities_from_csv(cities_csv, min_population))
+    if zip_codes_csv:
+        points.extend(load_zip_codes_from_csv(zip_codes_csv))
+    return [p for p in points if p.get("lat") not in (None, "") and p.get("lng") not in (None, "")]
+
+
+def plan_tile_queries(
+    cities_csv: Optional[str] = None,
+    zip_codes_csv: Optional[str] = None,
+    search_term: str = "restaurants",
+    base_zoom: Optional[int] = None,
+    min_population: Optional[int] = None,
+) -> list[dict]:
+    """
+    Plan the seed viewport searches: one per base-zoom tile with a centroid in it.
+
+    Args:
+        cities_csv: Path to the cities CSV (uscities.csv)
+        zip_codes_csv: Optional zip codes CSV with lat/lng per zip
+        search_term: What to search for in each viewport
+        base_zoom: Seed tile zoom level (defaults to Config.TILE_BASE_ZOOM)
+        min_population: Skip smaller cities (defaults to Config.TILE_MIN_POPULATION)
+
+    Returns:
+        List of tile query dicts, most populous tiles first
+    """
+    # Default to bundled data file
+    if cities_csv is None:
+        default_csv = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+            "data", "uscities.csv",
+        )
+        if os.path.exists(default_csv):
+            cities_csv = default_csv
+
+    if base_zoom is None:
+        base_zoom = Config.TILE_BASE_ZOOM
+    if min_population is None:
+        min_population = Config.TILE_MIN_POPULATION
+
+    tiles: dict[tuple[int, int, int], dict] = {}
+    for point in _seed_points(cities_csv, zip_codes_csv, min_population):
+        key = tile_for(float(point["lat"]), float(point["lng"]), base_zoom)
+        seed = tiles.setdefault(key, {"population": 0, "city": point.get("city", ""),
+                                      "state": point.get("state", "")})
+        seed["population"] += point.get("population", 0) or 0
+
+    ordered = sorted(tiles.items(), key=lambda item: -item[1]["population"])
+    return [
+        tile_query(*key, search_term=search_term, city=seed["city"], state=seed["state"])
+        for key, seed in ordered
+    ]
+
+
+def subdivide_if_saturated(search_data: dict, result_count: int) -> list[dict]:
+    """
+    Split a tile search into its four children if it hit the result cap.
+
+    Args:
+        search_data: The tile query dict that was searched
+        result_count: Number of place links the search returned
+
+    Returns:
+        The four child tile queries, or [] if the tile was not saturated,
+        is already at Config.TILE_MAX_ZOOM, or is not a tile query
+    """
+    tile = search_data.get("tile")
+    if not tile or result_count < Config.TILE_SPLIT_AT:
+        return []
+
+    zoom, x, y = (int(part) for part in tile.split("/"))
+    if zoom >= Config.TILE_MAX_ZOOM:
+        return []
+
+    return [
+        tile_query(
+            zoom + 1, 2 * x + dx, 2 * y + dy,
+            search_term=search_data.get("search_term", "restaurants"),
+            city=search_data.get("city", ""),
+            state=search_data.get("state", ""),
+        )
+        for dy in (0, 1)
+        for dx in (0, 1)
+    ]
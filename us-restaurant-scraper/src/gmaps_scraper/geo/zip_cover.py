@@ -0,0 +1,149 @@
+"""Coverage-driven zip selection: the fewest zip searches that cover a city."""
+
+import json
+import math
+import os
+from collections import Counter
+from typing import Optional
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.geo.locations import load_zip_centroids
+
+ZIP_SELECTIONS = ("spread", "cover")
+KM_PER_DEGREE = 111.32
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in kilometres."""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * 6371.0 * math.asin(math.sqrt(a))
+
+
+class GridIndex:
+    """
+    Uniform lat/lng grid over named points for radius queries.
+
+    Args:
+        points: {name: (lat, lng)}
+        cell_km: Grid cell size (about the typical query radius)
+    """
+
+    def __init__(self, points: dict[str, tuple[float, float]], cell_km: float):
+        self.points = points
+        self.cell_deg = cell_km / KM_PER_DEGREE
+        self._cells: dict[tuple[int, int], list[str]] = {}
+        for name, (lat, lng) in points.items():
+            self._cells.setdefault(self._cell(lat, lng), []).append(name)
+
+    def _cell(self, lat: float, lng: float) -> tuple[int, int]:
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lng / self.cell_deg))
+
+    def within(self, lat: float, lng: float, radius_km: float) -> list[str]:
+        """Names of the points within radius_km of (lat, lng)."""
+        lat_cells = int(math.ceil(radius_km / KM_PER_DEGREE / self.cell_deg))
+        lng_span = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+        lng_cells = int(math.ceil(lng_span / self.cell_deg))
+        row, col = self._cell(lat, lng)
+
+        found = []
+        for r in range(row - lat_cells, row + lat_cells + 1):
+            for c in range(col - lng_cells, col + lng_cells + 1):
+                for name in self._cells.get((r, c), ()):
+                    p_lat, p_lng = self.points[name]
+                    if haversine_km(lat, lng, p_lat, p_lng) <= radius_km:
+                        found.append(name)
+        return found
+
+
+class ZipCover:
+    """
+    Picks covering zip sets from zip centroids and earlier restaurant counts.
+
+    Args:
+        centroids: {zip_code: (lat, lng)}
+        densities: {zip_code: restaurants saved there in earlier runs}
+        radius_km: Assumed search radius (defaults to Config.ZIP_SEARCH_RADIUS_KM)
+    """
+
+    def __init__(
+        self,
+        centroids: dict[str, tuple[float, float]],
+        densities: Optional[dict[str, int]] = None,
+        radius_km: Optional[float] = None,
+    ):
+        self.centroids = centroids
+        self.densities = densities or {}
+        self.radius_km = radius_km if radius_km is not None else Config.ZIP_SEARCH_RADIUS_KM
+        self.index = GridIndex(centroids, self.radius_km)
+
+    def search_radius(self, zip_code: str) -> float:
+        """Radius one search around a zip is assumed to cover (smaller where dense)."""
+        seen = self.densities.get(zip_code, 0)
+        cap = Config.HTTP_SEARCH_MAX_RESULTS
+        if seen <= cap:
+            return self.radius_km
+        return self.radius_km * math.sqrt(cap / seen)
+
+    def select(self, zip_codes: list[str]) -> list[str]:
+        """
+        Greedy weighted set cover of a city's zips.
+
+        Args:
+            zip_codes: The city's zip codes
+
+        Returns:
+            Zips to search, in order of the demand each newly covers. Zips
+            without a known centroid are always kept.
+        """
+        known = [z for z in dict.fromkeys(zip_codes) if z in self.centroids]
+        unknown = [z for z in dict.fromkeys(zip_codes) if z not in self.centroids]
+        members = set(known)
+        weight = {z: max(1, self.densities.get(z, 0)) for z in known}
+
+        covers = {}
+        for z in known:
+            lat, lng = self.centroids[z]
+            covers[z] = {n for n in self.index.within(lat, lng, self.search_radius(z)) if n in members}
+
+        uncovered = set(known)
+        selected = []
+        while uncovered:
+            best = max(known, key=lambda z: sum(weight[n] for n in covers[z] & uncovered))
+            gained = covers[best] & uncovered
+            if not gained:
+                break
+            selected.append(best)
+            uncovered -= gained
+        return selected + unknown
+
+
+def load_zip_densities(output_dir: Optional[str] = None) -> dict[str, int]:
+    """Count saved restaurants per zip code in output/all_restaurants.json."""
+    if output_dir is None:
+        output_dir = Config.OUTPUT_DIR
+    results_file = os.path.join(output_dir, "all_restaurants.json")
+    if not os.path.exists(results_file):
+        return {}
+    try:
+        with open(results_file) as f:
+            records = json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Warning: Could not load results for zip densities: {e}")
+        return {}
+    return dict(Counter(r.get("zip_code") for r in records if isinstance(r, dict) and r.get("zip_code")))
+
+
+def load_zip_cover(zip_codes_csv: Optional[str], output_dir: Optional[str] = None) -> Optional[ZipCover]:
+    """Build a ZipCover from a zip centroid CSV (None if the CSV has no usable centroids)."""
+    if not zip_codes_csv:
+        print("Warning: Zip cover selection needs --zip-codes-csv with zip centroids")
+        return None
+
+    centroids = load_zip_centroids(zip_codes_csv)
+    if not centroids:
+        return None
+
+    densities = load_zip_densities(output_dir)
+    print(f"Zip cover: {len(centroids):,} zip centroids, densities for {len(densities):,} zips")
+    return ZipCover(centroids, densities)
@@ -0,0 +1,252 @@
+"""Machine profiling: size browser parallelism to the host at startup.
+
+host_profiles/<host>.json overrides chosen values by lowercase Config name
+(e.g. {"max_parallel_browsers": 5}); "auto": false skips measuring.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from gmaps_scraper.config import Config
+
+# Settings a profile chooses (Config attribute names, lowercase)
+SIZED_SETTINGS = (
+    "max_parallel_browsers",
+    "search_parallel_browsers",
+    "search_batch_size",
+    "details_batch_size",
+    "max_healthy_chrome",
+)
+
+# Config values before any profile was applied: batch sizes scale from these
+_BASELINE = {name: getattr(Config, name.upper()) for name in SIZED_SETTINGS}
+
+
+def host_name() -> str:
+    """Name host profiles are looked up by ($GMAPS_HOST_PROFILE, else the short hostname)."""
+    return os.environ.get("GMAPS_HOST_PROFILE") or socket.gethostname().split(".")[0].lower()
+
+
+def load_host_profile(host: str, profile_dir: Optional[str] = None) -> dict:
+    """Overrides from <profile_dir>/<host>.json (empty if there is no such file)."""
+    path = os.path.join(profile_dir or Config.HOST_PROFILE_DIR, f"{host}.json")
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            overrides = json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Warning: Could not load host profile {path}: {e}")
+        return {}
+    unknown = set(overrides) - set(SIZED_SETTINGS) - {"auto"}
+    if unknown:
+        print(f"Warning: Ignoring unknown host profile keys in {path}: {', '.join(sorted(unknown))}")
+    return {key: value for key, value in overrides.items() if key not in unknown}
+
+
+def _memory_mb() -> tuple[Optional[int], Optional[int]]:
+    """Total and available RAM in MB (None where the platform does not say)."""
+    if os.path.exists("/proc/meminfo"):
+        info = {}
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                info[name] = int(value.split()[0]) // 1024
+        return info.get("MemTotal"), info.get("MemAvailable", info.get("MemFree"))
+    if sys.platform == "darwin":
+        try:
+            total = int(subprocess.run(
+                ["sysctl", "-n", "hw.memsize"], capture_output=True, text=True, timeout=5,
+            ).stdout) // (1024 * 1024)
+            vm_stat = subprocess.run(["vm_stat"], capture_output=True, text=True, timeout=5).stdout
+        except (OSError, ValueError, subprocess.SubprocessError):
+            return None, None
+        page_size = 4096
+        pages = {}
+        for line in vm_stat.splitlines():
+            if "page size of" in line:
+                page_size = int(line.split("page size of")[1].split()[0])
+            name, _, value = line.partition(":")
+            if value.strip().rstrip(".").isdigit():
+                pages[name.strip()] = int(value.strip().rstrip("."))
+        free_pages = sum(pages.get(name, 0) for name in ("Pages free", "Pages inactive", "Pages speculative"))
+        return total, free_pages * page_size // (1024 * 1024)
+    return None, None
+
+
+def measure_host() -> dict:
+    """CPU cores, load and RAM of this machine."""
+    try:
+        load = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        load = 0.0
+    total_mb, available_mb = _memory_mb()
+    return {
+        "cpu_cores": os.cpu_count() or 1,
+        "load_1m": round(load, 2),
+        "ram_total_mb": total_mb,
+        "ram_available_mb": available_mb,
+    }
+
+
+def _rss_mb(pids: set[int]) -> Optional[int]:
+    """Summed resident memory of processes, in MB."""
+    if not pids:
+        return None
+    try:
+        result = subprocess.run(
+            ["ps", "-o", "rss=", "-p", ",".join(str(pid) for pid in pids)],
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return sum(int(line) for line in result.stdout.split() if line.isdigit()) // 1024
+
+
+def sample_chrome() -> Optional[dict]:
+    """
+    Launch one Chrome the way the scraper does and measure it.
+
+    Returns:
+        launch_seconds, processes and rss_mb of the sample, or None if
+        Chrome could not be started
+    """
+    # Imported here: botasaurus is only needed when a sample is taken
+    from gmaps_scraper.extractors.browser_pool import PooledBrowser
+
+    browser = PooledBrowser(block_images=False, headless=Config.HEADLESS)
+    try:
+        started = time.time()
+        browser.start()
+        launch_seconds = time.time() - started
+        time.sleep(1)  # let helper processes come up
+        browser.refresh_pids()
+        return {
+            "launch_seconds": round(launch_seconds, 2),
+            "processes": len(browser.pids),
+            "rss_mb": _rss_mb(browser.pids),
+            "measured_at": datetime.now().isoformat(),
+        }
+    except Exception as e:
+        print(f"Warning: Could not sample Chrome: {e}")
+        return None
+    finally:
+        browser.close()
+
+
+def _reusable_chrome_sample(previous: Optional[dict], host: str) -> Optional[dict]:
+    """The Chrome sample of an earlier profile of this host, if recent enough."""
+    sample = ((previous or {}).get("measured") or {}).get("chrome")
+    if not sample or previous.get("host") != host:
+        return None
+    try:
+        age = datetime.now() - datetime.fromisoformat(sample["measured_at"])
+    except (KeyError, ValueError):
+        return None
+    return sample if age < timedelta(hours=Config.CHROME_SAMPLE_MAX_AGE_HOURS) else None
+
+
+def size_for_machine(measured: dict) -> dict:
+    """
+    Pick parallelism, batch sizes and the Chrome health threshold from measurements.
+
+    Args:
+        measured: measure_host() output, with the Chrome sample under "chrome"
+            (None if there is none)
+
+    Returns:
+        A value per SIZED_SETTINGS name
+    """
+    chrome = measured.get("chrome") or {}
+    per_browser_mb = (chrome.get("rss_mb") or Config.CHROME_DEFAULT_RSS_MB) * Config.CHROME_PAGE_RSS_FACTOR
+
+    by_cpu = max(1.0, measured["cpu_cores"] - measured.get("load_1m", 0.0))
+    available_mb = measured.get("ram_available_mb")
+    by_ram = (available_mb - Config.MACHINE_RESERVE_MB) / per_browser_mb if available_mb else by_cpu
+    browsers = min(by_cpu, by_ram)
+
+    # A slow launch means disk or CPU contention that core counts do not show
+    launch_seconds = chrome.get("launch_seconds")
+    if launch_seconds and launch_seconds > Config.CHROME_SLOW_LAUNCH_SECONDS:
+        browsers *= Config.CHROME_SLOW_LAUNCH_SECONDS / launch_seconds
+    browsers = max(1, min(int(browsers), Config.MAX_AUTO_BROWSERS))
+
+    share = browsers / _BASELINE["max_parallel_browsers"]
+    processes = max(chrome.get("processes") or 0, Config.CHROME_PROCESSES_PER_BROWSER)
+    return {
+        "max_parallel_browsers": browsers,
+        "search_parallel_browsers": browsers,
+        "search_batch_size": max(browsers, round(_BASELINE["search_batch_size"] * share)),
+        "details_batch_size": max(browsers, round(_BASELINE["details_batch_size"] * share)),
+        "max_healthy_chrome": browsers * processes + Config.CHROME_PROCESS_BUFFER,
+    }
+
+
+def profile_machine(previous: Optional[dict] = None, auto: Optional[bool] = None) -> dict:
+    """
+    Measure this machine and choose its settings, applying host profile overrides.
+
+    Args:
+        previous: The profile recorded by an earlier run (progress.json
+            "machine"), whose Chrome sample is reused while recent
+        auto: Measure and auto-size (defaults to Config.AUTO_SIZE); without
+            it the Config values are kept, overrides still apply
+
+    Returns:
+        host, profiled_at, measured (if auto), chosen and overrides
+    """
+    if auto is None:
+        auto = Config.AUTO_SIZE
+    host = host_name()
+    overrides = load_host_profile(host)
+    auto = auto and overrides.get("auto", True)
+
+    profile: dict = {"host": host, "profiled_at": datetime.now().isoformat()}
+    if auto:
+        measured = measure_host()
+        measured["chrome"] = _reusable_chrome_sample(previous, host) or sample_chrome()
+        profile["measured"] = measured
+        chosen = size_for_machine(measured)
+    else:
+        chosen = {name: getattr(Config, name.upper()) for name in SIZED_SETTINGS}
+
+    applied = {name: overrides[name] for name in SIZED_SETTINGS if name in overrides}
+    chosen.update(applied)
+    profile["chosen"] = chosen
+    profile["overrides"] = sorted(applied)
+    return profile
+
+
+def apply_machine_profile(profile: dict) -> None:
+    """Write a profile's chosen values to Config (before the browser extractors are imported)."""
+    for name, value in profile["chosen"].items():
+        setattr(Config, name.upper(), value)
+
+
+def describe_machine_profile(profile: dict) -> str:
+    """One-line summary of a profile for the startup banner."""
+    chosen = profile["chosen"]
+    measured = profile.get("measured")
+    parts = [f"host {profile['host']}"]
+    if measured:
+        parts.append(f"{measured['cpu_cores']} cores, load {measured['load_1m']}")
+        if measured.get("ram_available_mb") is not None:
+            parts.append(f"{measured['ram_available_mb']:,} MB free")
+        chrome = measured.get("chrome")
+        if chrome:
+            parts.append(f"Chrome {chrome['rss_mb']} MB / {chrome['launch_seconds']}s launch")
+    summary = (
+        f"{chosen['max_parallel_browsers']} details / "
+        f"{chosen['search_parallel_browsers'] or chosen['max_parallel_browsers']} search browsers, "
+        f"batches {chosen['search_batch_size']}/{chosen['details_batch_size']}, "
+        f"max healthy Chrome {chosen['max_healthy_chrome']}"
+    )
+    if profile["overrides"]:
+        summary += f" (host profile: {', '.join(profile['overrides'])})"
+    return f"{summary} [{'; '.join(parts)}]"
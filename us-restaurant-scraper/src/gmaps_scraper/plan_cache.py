@@ -0,0 +1,460 @@
+"""Compiled query plans cached across restarts, with a completion bitmap.
+
+Plan file layout (query_plan_<mode>_<key>.bin, completion bitmap in .bin.done):
+    b"GMQPLAN2" | u32 header length | header JSON (key, count, fields)
+    | zlib( u32 table length | value table JSON | u32 offsets | u32 cells )
+
+A query is a run of cells (field index << 24 | value table index) starting
+at its offset, so a plan holds at most 2^24 distinct values and 2^8 fields.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import struct
+import zlib
+from array import array
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, Optional
+
+from gmaps_scraper.checkpoint import CheckpointManager
+from gmaps_scraper.config import Config
+from gmaps_scraper.cuisine_vocab import load_cuisine_vocabulary
+from gmaps_scraper.cuisines import CUISINE_TYPES
+from gmaps_scraper.geo.locations import (
+    default_cities_csv,
+    get_all_queries,
+    iter_cuisine_queries,
+    iter_remaining_zip_queries,
+    load_cities_from_csv,
+    load_zip_centroids,
+)
+from gmaps_scraper.geo.query_codec import QueryCodec, unique_queries
+from gmaps_scraper.geo.zip_cover import load_zip_cover
+
+_MAGIC = b"GMQPLAN2"
+_FIELD_SHIFT = 24
+_VALUE_MASK = (1 << _FIELD_SHIFT) - 1
+_MAX_FIELDS = 1 << (32 - _FIELD_SHIFT)
+
+
+def plan_fingerprint(mode: str, input_files: Iterable[Optional[str]], params: dict) -> str:
+    """Hash the inputs a plan is built from into a short cache key."""
+    digest = hashlib.sha256()
+    digest.update(mode.encode())
+    for path in input_files:
+        digest.update(b"\0file:")
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+    settings = {
+        "params": params,
+        "zip_tiers": sorted(Config.ZIP_TIERS.items()),
+        "cuisines": CUISINE_TYPES,
+    }
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+class PlanRows:
+    """
+    Queries packed into a value table and u32 arrays.
+
+    Rows are appended from a query stream and read back as dicts one at a
+    time, so neither building nor scanning a plan holds its query dicts.
+    """
+
+    def __init__(self):
+        self.fields: list[str] = []
+        self.table: list = [None]  # index 0 is unused
+        self.offsets = array("I", [0])
+        self.cells = array("I")
+        self._field_index: dict[str, int] = {}
+        self._value_index: Optional[dict[str, int]] = {}
+
+    @classmethod
+    def from_queries(cls, queries: Iterable[dict]) -> "PlanRows":
+        """Pack a query stream."""
+        rows = cls()
+        for query in queries:
+            rows.append(query)
+        rows._value_index = None  # only needed while building
+        return rows
+
+    def append(self, query: dict) -> None:
+        """
+        Pack one query.
+
+        Raises:
+            ValueError: If the plan outgrows the cell encoding (2^24 distinct
+                values or 2^8 fields)
+        """
+        for field, value in query.items():
+            field_index = self._field_index.get(field)
+            if field_index is None:
+                if len(self.fields) == _MAX_FIELDS:
+                    raise ValueError(f"Query plan has more than {_MAX_FIELDS} fields")
+                field_index = self._field_index[field] = len(self.fields)
+                self.fields.append(field)
+            encoded = json.dumps(value)
+            value_index = self._value_index.get(encoded)
+            if value_index is None:
+                value_index = len(self.table)
+                if value_index > _VALUE_MASK:
+                    raise ValueError(f"Query plan has more than {_VALUE_MASK:,} distinct values")
+                self._value_index[encoded] = value_index
+                self.table.append(value)
+            self.cells.append(field_index << _FIELD_SHIFT | value_index)
+        self.offsets.append(len(self.cells))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position: int) -> dict:
+        cells = self.cells[self.offsets[position]:self.offsets[position + 1]]
+        return {self.fields[c >> _FIELD_SHIFT]: self.table[c & _VALUE_MASK] for c in cells}
+
+    def __iter__(self) -> Iterator[dict]:
+        for position in range(len(self)):
+            yield self[position]
+
+    def query_string(self, position: int) -> str:
+        """The 'query' field of a row, without building the row's dict."""
+        query_field = self.fields.index("query") if "query" in self.fields else -1
+        for cell in self.cells[self.offsets[position]:self.offsets[position + 1]]:
+            if cell >> _FIELD_SHIFT == query_field:
+                return self.table[cell & _VALUE_MASK]
+        return ""
+
+
+def _encode_plan(key: str, rows: PlanRows) -> bytes:
+    """Serialize packed rows to the binary plan format."""
+    header = json.dumps({
+        "key": key,
+        "count": len(rows),
+        "fields": rows.fields,
+        "created_at": datetime.now().isoformat(),
+    }).encode()
+    table_bytes = json.dumps(rows.table).encode()
+    body = zlib.compress(
+        struct.pack("<I", len(table_bytes)) + table_bytes + rows.offsets.tobytes() + rows.cells.tobytes()
+    )
+    return _MAGIC + struct.pack("<I", len(header)) + header + body
+
+
+def _decode_plan(data: bytes) -> tuple[dict, PlanRows]:
+    """Deserialize a binary plan into (header, rows)."""
+    if not data.startswith(_MAGIC):
+        raise ValueError("not a query plan file (or an older format)")
+    offset = len(_MAGIC)
+    (header_len,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    header = json.loads(data[offset:offset + header_len])
+    body = zlib.decompress(data[offset + header_len:])
+
+    (table_len,) = struct.unpack_from("<I", body, 0)
+    rows = PlanRows()
+    rows.fields = header["fields"]
+    rows.table = json.loads(body[4:4 + table_len])
+    rows._value_index = None
+    offsets_end = 4 + table_len + 4 * (header["count"] + 1)
+    rows.offsets = array("I")
+    rows.offsets.frombytes(body[4 + table_len:offsets_end])
+    rows.cells.frombytes(body[offsets_end:])
+    if len(rows) != header["count"]:
+        raise ValueError("truncated query plan")
+    return header, rows
+
+
+class QueryPlan:
+    """
+    A compiled query list with its completion bitmap.
+
+    Args:
+        path: Plan file path (the bitmap lives next to it as <path>.done)
+        queries: Packed queries in plan order
+    """
+
+    def __init__(self, path: str, queries: PlanRows):
+        self.path = path
+        self.queries = queries
+        self._bitmap_file = f"{path}.done"
+        self._in_flight: dict[str, int] = {}  # yielded, not yet marked complete
+        self._done = bytearray((len(queries) + 7) // 8)
+        if os.path.exists(self._bitmap_file):
+            with open(self._bitmap_file, "rb") as f:
+                stored = f.read()
+            self._done[: len(stored)] = stored[: len(self._done)]
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def is_done(self, position: int) -> bool:
+        """Check the completion bit of the query at a plan position."""
+        return bool(self._done[position >> 3] & (1 << (position & 7)))
+
+    def _set_done(self, position: int) -> None:
+        self._done[position >> 3] |= 1 << (position & 7)
+
+    def done_count(self) -> int:
+        """Number of plan queries marked complete."""
+        return sum(bin(byte).count("1") for byte in self._done)
+
+    def mark_completed(self, queries: Iterable[str]) -> None:
+        """Set the completion bits of query strings yielded by iter_remaining (others are ignored)."""
+        for query in queries:
+            position = self._in_flight.pop(query, None)
+            if position is not None:
+                self._set_done(position)
+
+    def sync(self, completed_searches: set[str]) -> int:
+        """
+        Catch the bitmap up with the checkpoint.
+
+        Sets the bits of queries completed by another phase or mode, reading
+        only the query strings of unset positions.
+
+        Args:
+            completed_searches: Completed query strings from the checkpoint
+
+        Returns:
+            Number of bits newly set
+        """
+        caught_up = 0
+        for position in range(len(self.queries)):
+            if not self.is_done(position) and self.queries.query_string(position) in completed_searches:
+                self._set_done(position)
+                caught_up += 1
+        if caught_up:
+            self.save_completion()
+        return caught_up
+
+    def iter_remaining(self) -> Iterator[dict]:
+        """Yield queries whose bit is unset, in plan order, building each dict on demand."""
+        for position in range(len(self.queries)):
+            if not self.is_done(position):
+                query = self.queries[position]
+                self._in_flight[query.get("query", "")] = position
+                yield query
+
+    def remaining(self, completed_searches: Optional[set[str]] = None) -> list[dict]:
+        """
+        Scan the bitmap for queries still to run.
+
+        Args:
+            completed_searches: Completed query strings from the checkpoint
+                (see sync)
+
+        Returns:
+            Remaining queries in plan order
+        """
+        if completed_searches:
+            self.sync(completed_searches)
+        return list(self.iter_remaining())
+
+    def save_completion(self) -> None:
+        """Persist the completion bitmap (atomically)."""
+        tmp_file = f"{self._bitmap_file}.tmp"
+        try:
+            with open(tmp_file, "wb") as f:
+                f.write(self._done)
+            os.replace(tmp_file, self._bitmap_file)
+        except IOError as e:
+            print(f"Warning: Could not save plan completion bitmap: {e}")
+
+
+class QueryPlanCache:
+    """
+    Loads compiled plans from checkpoints/, building and storing them on a miss.
+
+    Args:
+        checkpoint_dir: Directory the plans are stored in
+        codec: Query key codec; with one, a search is planned once however
+            many generators (or spellings) produce it
+    """
+
+    def __init__(self, checkpoint_dir: str = "checkpoints", codec: Optional[QueryCodec] = None):
+        self.checkpoint_dir = checkpoint_dir
+        self.codec = codec
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    def _plan_file(self, mode: str, key: str) -> str:
+        return os.path.join(self.checkpoint_dir, f"query_plan_{mode}_{key}.bin")
+
+    def summaries(self) -> list[dict]:
+        """
+        Size and progress of every cached plan, from plan headers and bitmaps only.
+
+        Returns:
+            One dict per plan file: file, mode, queries, done
+        """
+        summaries = []
+        for plan_file in sorted(glob.glob(self._plan_file("*", "*"))):
+            try:
+                with open(plan_file, "rb") as f:
+                    prefix = f.read(len(_MAGIC) + 4)
+                    if not prefix.startswith(_MAGIC):
+                        continue
+                    (header_len,) = struct.unpack_from("<I", prefix, len(_MAGIC))
+                    header = json.loads(f.read(header_len))
+            except (IOError, struct.error, json.JSONDecodeError):
+                continue
+            count = header.get("count", 0)
+            done = 0
+            if os.path.exists(f"{plan_file}.done"):
+                with open(f"{plan_file}.done", "rb") as f:
+                    bitmap = f.read((count + 7) // 8)
+                done = sum(bin(byte).count("1") for byte in bitmap)
+            name = os.path.basename(plan_file)[len("query_plan_"):-len(".bin")]
+            summaries.append({
+                "file": plan_file,
+                "mode": name.rsplit("_", 1)[0],
+                "queries": count,
+                "done": done,
+            })
+        return summaries
+
+    def load_or_build(
+        self,
+        mode: str,
+        input_files: Iterable[Optional[str]],
+        params: dict,
+        build: Callable[[], Iterable[dict]],
+        rebuild: bool = False,
+    ) -> QueryPlan:
+        """
+        Return the cached plan for these inputs, building it on a miss.
+
+        Args:
+            mode: Plan name (production, fill_gaps, cuisine, ...)
+            input_files: Files the plan is generated from (hashed into the key)
+            params: Generation parameters (hashed into the key)
+            build: Generates the full plan (no completion filtering); a
+                generator is packed as it yields, without a list of dicts
+            rebuild: Ignore a cached plan and build a fresh one
+
+        Returns:
+            The QueryPlan
+        """
+        key = plan_fingerprint(mode, input_files, {**params, "unique": self.codec is not None})
+        plan_file = self._plan_file(mode, key)
+
+        if os.path.exists(plan_file) and not rebuild:
+            try:
+                with open(plan_file, "rb") as f:
+                    header, queries = _decode_plan(f.read())
+                if header.get("key") == key:
+                    print(f"Query plan: {len(queries):,} queries from cache ({os.path.basename(plan_file)})")
+                    return QueryPlan(plan_file, queries)
+            except (ValueError, KeyError, struct.error, zlib.error, json.JSONDecodeError) as e:
+                print(f"Warning: Could not read cached query plan, rebuilding: {e}")
+
+        stream = build()
+        if self.codec is not None:
+            stream = unique_queries(stream, self.codec)
+        queries = PlanRows.from_queries(stream)
+        # Older plans of this mode (other inputs) are stale, bitmaps included
+        for stale in glob.glob(self._plan_file(mode, "*")) + glob.glob(self._plan_file(mode, "*") + ".done"):
+            if not stale.startswith(plan_file):
+                os.remove(stale)
+        if rebuild and os.path.exists(f"{plan_file}.done"):
+            os.remove(f"{plan_file}.done")
+
+        tmp_file = f"{plan_file}.tmp"
+        try:
+            with open(tmp_file, "wb") as f:
+                f.write(_encode_plan(key, queries))
+            os.replace(tmp_file, plan_file)
+            print(f"Query plan: built {len(queries):,} queries, cached as {os.path.basename(plan_file)}")
+        except IOError as e:
+            print(f"Warning: Could not cache query plan: {e}")
+        return QueryPlan(plan_file, queries)
+
+
+def load_query_plan(
+    checkpoint: CheckpointManager,
+    fill_gaps: bool,
+    cuisine_expansion: bool,
+    cuisine_min_population: int,
+    cities_csv: Optional[str],
+    zip_codes_csv: Optional[str],
+    zip_selection: str,
+    refine: bool,
+    rebuild: bool = False,
+) -> QueryPlan:
+    """
+    Load the compiled query plan for the selected mode, building it on a cache miss.
+
+    Plans are generated without filtering completed searches; the plan's
+    completion bitmap answers which queries remain. A search produced twice
+    (under any spelling) is planned once.
+    """
+    cities_csv = cities_csv or default_cities_csv()
+    cache = QueryPlanCache(checkpoint.checkpoint_dir, codec=checkpoint.get_query_codec())
+
+    def zip_cover():
+        return load_zip_cover(zip_codes_csv) if zip_selection == "cover" else None
+
+    if fill_gaps:
+        return cache.load_or_build(
+            "fill_gaps", [cities_csv, zip_codes_csv], {"zip_selection": zip_selection},
+            lambda: iter_remaining_zip_queries(set(), cities_csv=cities_csv, zip_cover=zip_cover()),
+            rebuild=rebuild,
+        )
+
+    if cuisine_expansion:
+        # Zips searched before result counts were recorded get their region's cuisines
+        uncounted_zips = {
+            query[len("restaurants near "):]
+            for query in checkpoint.get_completed_searches()
+            if query.startswith("restaurants near ") and checkpoint.get_search_count(query) is None
+        } if refine else set()
+
+        def build_cuisine_plan() -> Iterator[dict]:
+            cities = load_cities_from_csv(cities_csv, min_population=cuisine_min_population)
+            # Cuisines ranked per region from earlier results (None: the fixed list)
+            vocabulary = load_cuisine_vocabulary()
+            zip_centroids = load_zip_centroids(zip_codes_csv)
+            if not refine:
+                yield from iter_cuisine_queries(
+                    cities, set(), cuisine_min_population, vocabulary=vocabulary, zip_centroids=zip_centroids,
+                )
+                return
+            # Demand-driven: search each zip generically and refine only saturated ones
+            yield from iter_remaining_zip_queries(
+                set(), cities_csv=cities_csv, min_population=cuisine_min_population, zip_cover=zip_cover(),
+            )
+            yield from iter_cuisine_queries(
+                cities, set(), cuisine_min_population, zip_codes=uncounted_zips, vocabulary=vocabulary,
+                zip_centroids=zip_centroids,
+            )
+
+        return cache.load_or_build(
+            "cuisine", [cities_csv, zip_codes_csv],
+            {
+                "refine": refine,
+                "min_population": cuisine_min_population,
+                "zip_selection": zip_selection,
+                "learned_cuisines": Config.LEARNED_CUISINES,
+                "cuisines_per_zip": Config.CUISINES_PER_ZIP,
+                "uncounted_zips": sorted(uncounted_zips),
+            },
+            build_cuisine_plan,
+            rebuild=rebuild,
+        )
+
+    return cache.load_or_build(
+        "production", [cities_csv, zip_codes_csv],
+        {"include_zip_codes": Config.INCLUDE_ZIP_CODES, "zip_selection": zip_selection,
+         "min_population": Config.MIN_POPULATION},
+        lambda: get_all_queries(
+            cities_csv=cities_csv,
+            zip_codes_csv=zip_codes_csv,
+            include_zip_codes=Config.INCLUDE_ZIP_CODES,
+            business_type="restaurants",
+            zip_cover=zip_cover(),
+        ),
+        rebuild=rebuild,
+    )
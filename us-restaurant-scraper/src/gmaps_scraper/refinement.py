@@ -0,0 +1,166 @@
+"""Query refinement for searches that hit the result cap."""
+
+import heapq
+from typing import Iterable, Iterator, Optional
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.cuisine_vocab import CuisineVocabulary
+from gmaps_scraper.cuisines import CUISINE_TYPES
+from gmaps_scraper.geo.tiles import subdivide_if_saturated, tile_for, tile_query
+
+
+def is_saturated(result_count: int) -> bool:
+    """Check whether a result count means the result cap truncated the search."""
+    return result_count >= Config.REFINE_SATURATION_AT
+
+
+def _cuisine_queries(search_data: dict, vocabulary: Optional[CuisineVocabulary] = None) -> list[dict]:
+    """Cuisine variants of a generic city or zip query (the region's top cuisines with a vocabulary)."""
+    zip_code = search_data.get("zip_code")
+    city = search_data.get("city", "")
+    state = search_data.get("state", "")
+    if vocabulary is not None:
+        cuisines = [term for term, _ in vocabulary.rank(zip_code, state)]
+    else:
+        cuisines = CUISINE_TYPES
+    queries = []
+    for cuisine in cuisines:
+        if zip_code:
+            query = {"query": f"{cuisine} restaurants near {zip_code}", "zip_code": zip_code, "type": "cuisine_zip"}
+        else:
+            query = {"query": f"{cuisine} restaurants in {city}, {state}", "type": "cuisine_city"}
+        query.update({
+            "city": city,
+            "state": state,
+            "cuisine": cuisine,
+            "lat": search_data.get("lat"),
+            "lng": search_data.get("lng"),
+        })
+        if search_data.get("centroid"):
+            query["centroid"] = search_data["centroid"]
+        queries.append(query)
+    return queries
+
+
+def _sub_area_queries(search_data: dict) -> list[dict]:
+    """A cuisine query over the four quadrants of a tile around its area centre.
+
+    Zip queries only carrying their city's centre are not split: every zip
+    of the city would refine to the same tiles around the city centre.
+    """
+    lat, lng = search_data.get("lat"), search_data.get("lng")
+    if lat in (None, "") or lng in (None, ""):
+        return []
+    if search_data.get("zip_code") and search_data.get("centroid") != "zip":
+        return []
+
+    zoom, x, y = tile_for(float(lat), float(lng), Config.REFINE_SUB_AREA_ZOOM)
+    search_term = f"{search_data['cuisine']} restaurants"
+    queries = []
+    for dy in (0, 1):
+        for dx in (0, 1):
+            query = tile_query(
+                zoom + 1, 2 * x + dx, 2 * y + dy,
+                search_term=search_term,
+                city=search_data.get("city", ""),
+                state=search_data.get("state", ""),
+            )
+            query["cuisine"] = search_data["cuisine"]
+            if search_data.get("zip_code"):
+                query["zip_code"] = search_data["zip_code"]
+            queries.append(query)
+    return queries
+
+
+def refine_query(
+    search_data: dict,
+    result_count: int,
+    vocabulary: Optional[CuisineVocabulary] = None,
+) -> list[dict]:
+    """
+    Generate finer follow-up queries for a search that hit the result cap.
+
+    Args:
+        search_data: The query dict that was searched
+        result_count: Number of place links it returned
+        vocabulary: Per-region cuisine vocabulary; without one, cuisine
+            refinement uses every cuisine in CUISINE_TYPES
+
+    Returns:
+        Follow-up query dicts annotated with 'refine_depth', 'parent_count'
+        and 'refined_from', or [] if the search was not saturated or cannot
+        be refined further
+    """
+    if search_data.get("type") == "tile":
+        children = subdivide_if_saturated(search_data, result_count)
+    elif not is_saturated(result_count) or search_data.get("refine_depth", 0) >= Config.REFINE_MAX_DEPTH:
+        children = []
+    elif search_data.get("cuisine"):
+        children = _sub_area_queries(search_data)
+    else:
+        children = _cuisine_queries(search_data, vocabulary)
+
+    depth = search_data.get("refine_depth", 0) + 1
+    for child in children:
+        child.update(refine_depth=depth, parent_count=result_count, refined_from=search_data.get("query", ""))
+    return children
+
+
+class RefinementQueue:
+    """
+    Priority queue of pending searches.
+
+    Seed queries keep their original order and run first, taken from the
+    seed stream as batches are popped; refinements follow by depth (cuisine
+    before sub-area), and within a depth the children of the most saturated
+    parents come first.
+    """
+
+    def __init__(self, queries: Iterable[dict] = ()):
+        self._heap: list[tuple[int, int, int, dict]] = []
+        self._seq = 0
+        self._seeds: Iterator[dict] = iter(queries)
+        self._next_seed: Optional[dict] = None
+
+    @staticmethod
+    def _priority(query: dict) -> tuple[int, int]:
+        return query.get("refine_depth", 0), -query.get("parent_count", 0)
+
+    def push(self, query: dict) -> None:
+        """Add a query at its priority."""
+        heapq.heappush(self._heap, (*self._priority(query), self._seq, query))
+        self._seq += 1
+
+    def extend(self, queries: Iterable[dict]) -> None:
+        """Add several queries."""
+        for query in queries:
+            self.push(query)
+
+    def _peek_seed(self) -> Optional[dict]:
+        """Next seed from the stream (kept until popped), or None when drained."""
+        if self._next_seed is None and self._seeds is not None:
+            self._next_seed = next(self._seeds, None)
+            if self._next_seed is None:
+                self._seeds = None
+        return self._next_seed
+
+    def pop_batch(self, size: int) -> list[dict]:
+        """Remove and return up to `size` queries, highest priority first."""
+        batch = []
+        while len(batch) < size:
+            seed = self._peek_seed()
+            if seed is not None and (not self._heap or self._priority(seed) <= self._heap[0][:2]):
+                batch.append(seed)
+                self._next_seed = None
+            elif self._heap:
+                batch.append(heapq.heappop(self._heap)[-1])
+            else:
+                break
+        return batch
+
+    def __len__(self) -> int:
+        """Queued refinements (seeds still in the stream are not counted)."""
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap) or self._peek_seed() is not None
@@ -0,0 +1,295 @@
+"""Columnar summary index over the saved restaurants, behind `gmaps-scraper stats`.
+
+File layout (output/results_index.bin):
+    b"GMRIDX01" | u32 header length | header JSON (count, source, dictionaries)
+    | zlib( state | city | cuisine | rating | fields columns )
+
+Columns hold one row per restaurant: state (u16), city (u32) and cuisine
+(u32) codes into the header dictionaries, rating in tenths of a star (u8,
+0 = unrated) and a u16 bitmask of the INDEXED_FIELDS with a value. `source`
+is the size and mtime of all_restaurants.json when the index was synced.
+"""
+
+import json
+import os
+import struct
+import zlib
+from array import array
+from collections import Counter
+from typing import Iterable, Iterator, Optional
+
+from gmaps_scraper.config import Config
+
+INDEXED_FIELDS = (
+    "cuisine_type",
+    "address",
+    "city",
+    "state",
+    "zip_code",
+    "latitude",
+    "phone",
+    "website",
+    "review_count",
+    "price_level",
+    "hours_of_operation",
+    "primary_photo_url",
+)
+
+# Column name -> array typecode, in file order
+_COLUMNS = {"state": "H", "city": "I", "cuisine": "I", "rating": "B", "fields": "H"}
+_DIMENSIONS = ("state", "city", "cuisine")
+
+_MAGIC = b"GMRIDX01"
+
+# Half-star buckets of the rating column (tenths), best first
+RATING_BUCKETS = (
+    ("4.5-5.0", 45, 50),
+    ("4.0-4.4", 40, 44),
+    ("3.5-3.9", 35, 39),
+    ("3.0-3.4", 30, 34),
+    ("<3.0", 1, 29),
+    ("unrated", 0, 0),
+)
+
+
+def results_index_path(output_dir: Optional[str] = None) -> str:
+    """Path of the index for an output directory."""
+    return os.path.join(output_dir or Config.OUTPUT_DIR, "results_index.bin")
+
+
+def _file_stamp(path: Optional[str]) -> Optional[list[int]]:
+    """Size and mtime of a file (None if it does not exist)."""
+    if not path or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _has_value(value) -> bool:
+    return value is not None and value != "" and value != [] and value != {}
+
+
+class ResultsIndex:
+    """
+    Dictionary-encoded columns over saved restaurant records.
+
+    Args:
+        path: File the index is persisted to
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.source: Optional[list[int]] = None
+        self.columns = {name: array(typecode) for name, typecode in _COLUMNS.items()}
+        self.values: dict[str, list[str]] = {name: [""] for name in _DIMENSIONS}  # code 0 = unknown
+        self._codes: dict[str, dict[str, int]] = {name: {} for name in _DIMENSIONS}
+
+    @classmethod
+    def build(cls, path: str, records: Iterable[dict]) -> "ResultsIndex":
+        """Index a list of records from scratch."""
+        index = cls(path)
+        index.extend(records)
+        return index
+
+    @classmethod
+    def load(cls, path: str) -> Optional["ResultsIndex"]:
+        """Load a persisted index (None if missing or unreadable)."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            if not data.startswith(_MAGIC):
+                return None
+            offset = len(_MAGIC)
+            (header_len,) = struct.unpack_from("<I", data, offset)
+            offset += 4
+            header = json.loads(data[offset:offset + header_len])
+            body = zlib.decompress(data[offset + header_len:])
+        except (IOError, struct.error, zlib.error, json.JSONDecodeError) as e:
+            print(f"Warning: Could not read results index: {e}")
+            return None
+
+        index = cls(path)
+        index.source = header.get("source")
+        index.values = header["values"]
+        for name in _DIMENSIONS:
+            index._codes[name] = {value: code for code, value in enumerate(index.values[name]) if code}
+        start = 0
+        for name, column in index.columns.items():
+            end = start + header["count"] * column.itemsize
+            column.frombytes(body[start:end])
+            start = end
+        if any(len(column) != header["count"] for column in index.columns.values()):
+            print("Warning: Truncated results index")
+            return None
+        return index
+
+    def __len__(self) -> int:
+        return len(self.columns["rating"])
+
+    def _code(self, dimension: str, value: Optional[str]) -> int:
+        if not value:
+            return 0
+        code = self._codes[dimension].get(value)
+        if code is None:
+            code = self._codes[dimension][value] = len(self.values[dimension])
+            self.values[dimension].append(value)
+        return code
+
+    def append(self, record: dict) -> None:
+        """Add a row for one record."""
+        state = record.get("state")
+        city = record.get("city")
+        self.columns["state"].append(self._code("state", state))
+        self.columns["city"].append(self._code("city", f"{city}, {state}" if city and state else city))
+        self.columns["cuisine"].append(self._code("cuisine", record.get("cuisine_type")))
+        rating = record.get("rating")
+        tenths = round(rating * 10) if isinstance(rating, (int, float)) else 0
+        self.columns["rating"].append(min(max(tenths, 0), 50))
+        mask = 0
+        for bit, field in enumerate(INDEXED_FIELDS):
+            if _has_value(record.get(field)):
+                mask |= 1 << bit
+        self.columns["fields"].append(mask)
+
+    def extend(self, records: Iterable[dict]) -> None:
+        """Add a row per record."""
+        for record in records:
+            self.append(record)
+
+    def save(self, source_file: Optional[str] = None) -> None:
+        """
+        Persist the index (atomically).
+
+        Args:
+            source_file: all_restaurants.json, when the index has just been
+                synced with it (records its size and mtime)
+        """
+        if source_file is not None:
+            self.source = _file_stamp(source_file)
+        header = json.dumps({"count": len(self), "source": self.source, "values": self.values}).encode()
+        body = zlib.compress(b"".join(column.tobytes() for column in self.columns.values()), 1)
+        tmp_file = f"{self.path}.tmp"
+        try:
+            with open(tmp_file, "wb") as f:
+                f.write(_MAGIC + struct.pack("<I", len(header)) + header + body)
+            os.replace(tmp_file, self.path)
+        except IOError as e:
+            print(f"Warning: Could not save results index: {e}")
+
+    def _matching_codes(self, dimension: str, text: str) -> set[int]:
+        """Dictionary codes whose value contains text (case-insensitive)."""
+        needle = text.casefold()
+        return {code for code, value in enumerate(self.values[dimension]) if code and needle in value.casefold()}
+
+    def rows(
+        self,
+        state: Optional[str] = None,
+        city: Optional[str] = None,
+        cuisine: Optional[str] = None,
+        min_rating: Optional[float] = None,
+        missing: Optional[str] = None,
+    ) -> Iterator[int]:
+        """
+        Yield the row numbers of records matching every given filter.
+
+        Args:
+            state: State abbreviation (exact, case-insensitive)
+            city: Substring of "City, ST"
+            cuisine: Substring of cuisine_type ("thai" matches "Thai restaurant")
+            min_rating: Minimum rating
+            missing: A field of INDEXED_FIELDS the record has no value for
+
+        Raises:
+            ValueError: If missing is not an indexed field
+        """
+        checks = []
+        if state:
+            codes = {code for code, value in enumerate(self.values["state"]) if code and value.upper() == state.upper()}
+            checks.append((self.columns["state"], codes.__contains__))
+        if city:
+            checks.append((self.columns["city"], self._matching_codes("city", city).__contains__))
+        if cuisine:
+            checks.append((self.columns["cuisine"], self._matching_codes("cuisine", cuisine).__contains__))
+        if min_rating is not None:
+            threshold = round(min_rating * 10)
+            checks.append((self.columns["rating"], lambda tenths: tenths >= threshold))
+        if missing:
+            if missing not in INDEXED_FIELDS:
+                raise ValueError(f"Unknown field '{missing}'. Choose from: {', '.join(INDEXED_FIELDS)}")
+            bit = 1 << INDEXED_FIELDS.index(missing)
+            checks.append((self.columns["fields"], lambda mask: not mask & bit))
+
+        if not checks:
+            yield from range(len(self))
+            return
+        # Most selective column first: later checks only see its survivors
+        column, check = checks[0]
+        candidates = [row for row, value in enumerate(column) if check(value)]
+        for column, check in checks[1:]:
+            candidates = [row for row in candidates if check(column[row])]
+        yield from candidates
+
+    def count(self, **filters) -> int:
+        """Number of records matching the filters (see rows)."""
+        if not any(value is not None for value in filters.values()):
+            return len(self)
+        return sum(1 for _ in self.rows(**filters))
+
+    def counts_by(self, dimension: str, rows: Optional[list[int]] = None) -> Counter:
+        """Record counts per value of state, city or cuisine ("" = unknown)."""
+        column = self.columns[dimension]
+        codes = Counter(column) if rows is None else Counter(column[row] for row in rows)
+        return Counter({self.values[dimension][code]: count for code, count in codes.items()})
+
+    def rating_buckets(self, rows: Optional[list[int]] = None) -> dict[str, int]:
+        """Record counts per half-star rating bucket."""
+        column = self.columns["rating"]
+        tenths = Counter(column) if rows is None else Counter(column[row] for row in rows)
+        return {
+            label: sum(count for value, count in tenths.items() if low <= value <= high)
+            for label, low, high in RATING_BUCKETS
+        }
+
+    def completeness(self, rows: Optional[list[int]] = None) -> dict[str, int]:
+        """Number of records with a value, per indexed field."""
+        column = self.columns["fields"]
+        masks = Counter(column) if rows is None else Counter(column[row] for row in rows)
+        return {
+            field: sum(count for mask, count in masks.items() if mask & 1 << bit)
+            for bit, field in enumerate(INDEXED_FIELDS)
+        }
+
+
+def load_results_index(output_dir: Optional[str] = None, rebuild: bool = False) -> ResultsIndex:
+    """
+    Load the results index, rebuilding it from all_restaurants.json if stale.
+
+    The index is stale when all_restaurants.json changed since it was last
+    synced (rewritten by another tool) or when there is no index yet.
+
+    Args:
+        output_dir: Output directory (defaults to Config.OUTPUT_DIR)
+        rebuild: Rebuild even if the index is current
+
+    Returns:
+        The ResultsIndex (empty if there are no results)
+    """
+    output_dir = output_dir or Config.OUTPUT_DIR
+    path = results_index_path(output_dir)
+    results_file = os.path.join(output_dir, "all_restaurants.json")
+
+    index = None if rebuild else ResultsIndex.load(path)
+    if index is not None and index.source == _file_stamp(results_file):
+        return index
+
+    records = []
+    if os.path.exists(results_file):
+        print(f"Indexing {results_file}...")
+        with open(results_file, "r") as f:
+            records = json.load(f)
+    index = ResultsIndex.build(path, records)
+    if os.path.isdir(output_dir):
+        index.save(source_file=results_file)
+    return index
@@ -1,99 +1,203 @@
 """Main scraper orchestration for Google Maps restaurant data."""
 
-import json
+import itertools
 import os
 import time
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Optional
 
 from botasaurus import bt
 
 from gmaps_scraper.config import Config
 from gmaps_scraper.checkpoint import CheckpointManager
+from gmaps_scraper.coverage import CoverageEstimator
 from gmaps_scraper.deduplication import DeduplicationManager
-from gmaps_scraper.geo import get_all_queries, get_test_queries
-from gmaps_scraper.geo.locations import (
-    generate_remaining_zip_queries,
-    generate_cuisine_queries,
-    load_cities_from_csv,
+from gmaps_scraper.enrichment import EnrichmentQueue, merge_enrichment_batches
+from gmaps_scraper.geo import get_test_queries, plan_tile_queries
+from gmaps_scraper.geo.zip_cover import ZIP_SELECTIONS
+from gmaps_scraper.extractors import (
+    close_details_pool,
+    enrich_places,
+    scrape_search_results,
+    scrape_searches,
+    scrape_places,
 )
-from gmaps_scraper.extractors import scrape_search_results, scrape_searches, scrape_places
+from gmaps_scraper.extractors.details import validate_browser_settings
+from gmaps_scraper.extractors.cards import card_rejection_reason, card_to_record
+from gmaps_scraper.extractors.profiles import estimate_profile_cost, fill_record_columns
+from gmaps_scraper.extractors.scroll_policy import ScrollPolicy
+from gmaps_scraper.cuisine_vocab import CuisineVocabulary, load_cuisine_vocabulary
+from gmaps_scraper.plan_cache import QueryPlan, load_query_plan
+from gmaps_scraper.refinement import RefinementQueue, refine_query
+from gmaps_scraper.sinks import ResultsSink
+
+
+def _queue_followups(
+    checkpoint: CheckpointManager,
+    result: dict,
+    vocabulary: Optional[CuisineVocabulary] = None,
+) -> list[dict]:
+    """Persist and return the refinements of a search that hit the result cap."""
+    children = refine_query(result.get("search_data", {}), result.get("count", 0), vocabulary)
+    if not children:
+        return []
+    added = checkpoint.add_followup_queries(children)
+    if added:
+        print(f"  {result['search_data'].get('query', '')}: at result cap ({result.get('count', 0)}), "
+              f"refined into {len(added)} queries")
+    return added
 
 
 def run_search_phase(
     checkpoint: CheckpointManager,
     dedup: DeduplicationManager,
-    queries: list[dict],
+    queries: Iterable[dict],
     batch_size: Optional[int] = None,
+    search_backend: Optional[str] = None,
+    refine: Optional[bool] = None,
+    plan: Optional[QueryPlan] = None,
 ) -> None:
     """
     Phase 1: Run searches and collect place links.
 
+    Searches that hit the result cap are refined (cuisine, then sub-area,
+    see refinement.py); the follow-up queries join this run's priority
+    queue behind the seed queries and are persisted for resumes. Queries
+    for a zip whose estimated coverage (coverage.py) has passed
+    Config.COVERAGE_STOP_THRESHOLD are not issued.
+
+    Queries may be a lazy stream (a generator or a plan's iter_remaining);
+    batches are taken from it as they run, so the plan is never held in
+    memory as a list.
+
     Args:
         checkpoint: CheckpointManager instance
         dedup: DeduplicationManager instance
-        queries: List of search queries
+        queries: Search queries, a list or a stream in scheduling order
         batch_size: Number of searches per batch
+        search_backend: "browser" or "http" (defaults to Config.SEARCH_BACKEND)
+        refine: Refine searches that hit the result cap (defaults to Config.REFINE_SEARCHES)
+        plan: Cached query plan whose completion bitmap is updated per batch
     """
     if batch_size is None:
         batch_size = Config.SEARCH_BATCH_SIZE
-
-    remaining = checkpoint.get_remaining_searches(queries)
-    total_queries = len(queries)
-    completed = total_queries - len(remaining)
+    if refine is None:
+        refine = Config.REFINE_SEARCHES
+    vocabulary = load_cuisine_vocabulary() if refine else None
 
     print(f"\n{'='*60}")
     print("PHASE 1: Search Collection")
     print(f"{'='*60}")
-    print(f"Total queries: {total_queries}")
-    print(f"Already completed: {completed}")
-    print(f"Remaining: {len(remaining)}")
+    if isinstance(queries, list):
+        completed_searches = checkpoint.get_completed_searches()
+        completed = sum(1 for q in queries if q.get("query") in completed_searches)
+        print(f"Total queries: {len(queries)}")
+        print(f"Already completed: {completed}")
+        print(f"Remaining: {len(queries) - completed}")
+    else:
+        print("Queries: streamed in plan order")
     print(f"{'='*60}\n")
 
-    if not remaining:
+    # The queue grows as saturated results are refined, so batches are counted as we go
+    queue = RefinementQueue(checkpoint.iter_remaining_searches(queries))
+    if not queue:
         print("All searches already completed!")
         return
 
-    for i in range(0, len(remaining), batch_size):
-        batch = remaining[i : i + batch_size]
-        batch_num = (i // batch_size) + 1
-        total_batches = (len(remaining) + batch_size - 1) // batch_size
+    scroll_policy = ScrollPolicy(checkpoint.checkpoint_dir)
+    coverage = CoverageEstimator(checkpoint.checkpoint_dir)
+    skipped_covered = 0
 
-        print(f"\n--- Search Batch {batch_num}/{total_batches} ({len(batch)} queries) ---")
+    batch_num = 0
+    while queue:
+        batch = queue.pop_batch(batch_size)
+        batch_num += 1
+
+        print(f"\n--- Search Batch {batch_num} ({len(batch)} queries, {len(queue)} refinements queued) ---")
 
         # Filter out already completed queries
         pending_queries = [q for q in batch if not checkpoint.is_search_completed(q.get("query", ""))]
 
+        # Stop issuing queries for zips whose estimated coverage is high enough
+        uncovered = [q for q in pending_queries if not coverage.is_covered(q.get("zip_code"))]
+        if len(uncovered) < len(pending_queries):
+            skipped_covered += len(pending_queries) - len(uncovered)
+            print(f"  Skipping {len(pending_queries) - len(uncovered)} queries for zips past "
+                  f"{Config.COVERAGE_STOP_THRESHOLD:.0%} estimated coverage")
+        pending_queries = uncovered
+
         if not pending_queries:
-            print("  All queries in batch already completed, skipping...")
+            print("  All queries in batch already completed or covered, skipping...")
             continue
 
+        # Plan each query's scroll budget from the yield history of its area,
+        # resuming past the depth an earlier interrupted attempt reached
+        originals = {q.get("query", ""): q for q in pending_queries}
+        planned = []
+        for q in pending_queries:
+            scroll_plan = scroll_policy.plan(q)
+            partial = checkpoint.get_partial_search(q.get("query", ""))
+            if partial:
+                scroll_plan["resume_depth"] = partial["depth"]
+            planned.append({**q, **scroll_plan})
+        pending_queries = planned
+
         # Run searches in parallel
         try:
-            results = scrape_searches(pending_queries, parallel=True)
+            results = scrape_searches(pending_queries, parallel=True, backend=search_backend)
         except Exception as e:
             print(f"  Batch error: {e}")
             for q in pending_queries:
-                checkpoint.record_failure(q, str(e))
+                checkpoint.record_failure(originals[q.get("query", "")], str(e))
             continue
 
         batch_links = []
+        batch_cards = {}
         for result in results:
             query = result.get("search_data", {}).get("query", "")
+            # Interrupted scrolls would read as sparse areas, so keep them out of the history
+            if result.get("scroll_trace") and not result.get("partial"):
+                scroll_policy.record(result["search_data"], result["scroll_trace"])
 
             if result and result.get("place_links"):
                 links = result["place_links"]
                 new_links = dedup.filter_unseen_links(links)
                 batch_links.extend(new_links)
+                cards = result.get("place_cards") or {}
+                batch_cards.update({link: cards[link] for link in new_links if link in cards})
                 print(f"  {query}: {len(links)} links ({len(new_links)} new)")
             else:
                 error = result.get("error") if result else "No result"
                 print(f"  {query}: No links found ({error})")
 
+            if refine:
+                queue.extend(_queue_followups(checkpoint, result, vocabulary))
+
+            if result.get("partial"):
+                # Keep the salvaged links, but leave the search open for a deeper retry
+                print(f"  {query}: Interrupted at scroll depth {result.get('scroll_depth', 0)}, queued for retry")
+                checkpoint.mark_search_partial(
+                    query, result.get("scroll_depth", 0), len(result.get("place_links") or []), result.get("error")
+                )
+                checkpoint.record_failure(originals.get(query, result["search_data"]), result.get("error"))
+                continue
+
             checkpoint.mark_search_completed(query)
+            checkpoint.record_search_count(query, result.get("count", 0))
+            checkpoint.clear_partial_search(query)
+
+            zip_code = result["search_data"].get("zip_code")
+            was_covered = coverage.is_covered(zip_code)
+            coverage.record(result["search_data"], result.get("place_links") or [])
+            if zip_code and not was_covered and coverage.is_covered(zip_code):
+                estimate = coverage.estimate(zip_code)
+                print(f"  Zip {zip_code}: {estimate['observed']} of ~{estimate['estimated_total']:.0f} "
+                      f"restaurants found ({estimate['coverage']:.0%}, {estimate['method']}), "
+                      f"no further queries")
 
         if batch_links:
             added = checkpoint.add_pending_links(batch_links)
+            checkpoint.add_link_cards(batch_cards)
             print(f"\nBatch complete: Added {added} new links to pending queue")
 
         progress = checkpoint.get_progress()
@@ -102,19 +206,55 @@ def run_search_phase(
         checkpoint.save_progress(progress)
         checkpoint.save_all()
         dedup.save_checkpoint()
+        scroll_policy.save()
+        coverage.save()
+        if plan is not None:
+            plan.mark_completed(q.get("query", "") for q in batch if checkpoint.is_search_completed(q.get("query", "")))
+            plan.save_completion()
 
-        if i + batch_size < len(remaining):
+        if queue:
             print(f"Waiting {Config.BATCH_DELAY} seconds before next batch...")
             time.sleep(Config.BATCH_DELAY)
 
+    if skipped_covered:
+        print(f"\nSkipped {skipped_covered} queries for zips with sufficient estimated coverage")
     print(f"\nSearch phase complete! Total pending links: {checkpoint.get_pending_links_count()}")
 
 
+def skip_card_rejected_links(checkpoint: CheckpointManager) -> int:
+    """
+    Drop pending links whose search card already fails the details filters.
+
+    A card showing a rating below Config.MIN_RATING or a non-restaurant
+    category would be rejected after a full page visit, so the visit is
+    skipped. Links without a card are kept.
+
+    Returns:
+        Number of links removed from pending
+    """
+    rejected = [
+        link for link in checkpoint.get_pending_links()
+        if card_rejection_reason(checkpoint.get_link_card(link))
+    ]
+    if rejected:
+        checkpoint.remove_processed_links(rejected)
+        progress = checkpoint.get_progress()
+        progress["skipped_by_card"] = progress.get("skipped_by_card", 0) + len(rejected)
+        checkpoint.save_progress(progress)
+        print(f"Skipped {len(rejected)} links rejected by their search card (rating/category)")
+    return len(rejected)
+
+
 def run_details_phase(
     checkpoint: CheckpointManager,
     dedup: DeduplicationManager,
     batch_size: Optional[int] = None,
     output_dir: Optional[str] = None,
+    profile: Optional[str] = None,
+    browser_pool: Optional[bool] = None,
+    tabs_per_browser: Optional[int] = None,
+    prefetch: Optional[bool] = None,
+    http_first: Optional[bool] = None,
 ) -> None:
     """
     Phase 2: Scrape details from place links.
@@ -124,14 +264,28 @@ def run_details_phase(
         dedup: DeduplicationManager instance
         batch_size: Number of places per batch
         output_dir: Directory for output files
+        profile: Extraction profile name (defaults to Config.DETAILS_PROFILE)
+        browser_pool: Reuse health-checked drivers (defaults to Config.USE_BROWSER_POOL)
+        tabs_per_browser: Places loaded concurrently per pooled Chrome
+            (defaults to Config.TABS_PER_BROWSER)
+        prefetch: Load the next pending place while extracting the current one
+            (defaults to Config.PREFETCH_NEXT_PLACE)
+        http_first: Fetch place pages over HTTP, using the browser only as a
+            fallback (defaults to Config.DETAILS_HTTP_FIRST)
     """
     if batch_size is None:
         batch_size = Config.DETAILS_BATCH_SIZE
     if output_dir is None:
         output_dir = Config.OUTPUT_DIR
+    if profile is None:
+        profile = Config.DETAILS_PROFILE
+    if prefetch is None:
+        prefetch = Config.PREFETCH_NEXT_PLACE
 
     os.makedirs(output_dir, exist_ok=True)
 
+    if Config.CARD_PREFILTER:
+        skip_card_rejected_links(checkpoint)
     pending_count = checkpoint.get_pending_links_count()
 
     print(f"\n{'='*60}")
@@ -139,26 +293,21 @@ def run_details_phase(
     print(f"{'='*60}")
     print(f"Pending links: {pending_count}")
     print(f"Batch size: {batch_size}")
+    print(f"Extraction profile: {profile} (~{estimate_profile_cost(profile):.1f}s per place)")
     print(f"{'='*60}\n")
 
     if pending_count == 0:
         print("No pending links to process!")
         return
 
-    # Load existing results to merge with (preserves previous scrape data)
-    final_json = os.path.join(output_dir, "all_restaurants.json")
-    all_restaurants = []
-    if os.path.exists(final_json):
-        try:
-            with open(final_json) as f:
-                existing = json.load(f)
-            if isinstance(existing, list):
-                all_restaurants = existing
-                for r in all_restaurants:
-                    dedup.mark_seen(r)
-                print(f"Loaded {len(all_restaurants)} existing restaurants from {final_json}")
-        except Exception as e:
-            print(f"Warning: Could not load existing results: {e}")
+    # Existing results (plus batches journaled by an interrupted run) to merge with
+    sink = ResultsSink(output_dir)
+    final_json = sink.path
+    if sink.records:
+        for r in sink.records:
+            dedup.mark_seen(r)
+        print(f"Loaded {len(sink)} existing restaurants from {final_json}"
+              + (f" ({len(sink.replayed)} from an unmerged journal)" if sink.replayed else ""))
 
     # Find the max existing batch number to avoid overwriting previous batch files
     existing_batches = [
@@ -168,6 +317,7 @@ def run_details_phase(
     ] if os.path.exists(output_dir) else []
     batch_num = max(existing_batches) if existing_batches else 0
     progress = checkpoint.get_progress()
+    enrichment_queue = EnrichmentQueue(checkpoint.checkpoint_dir)
     consecutive_empty_batches = 0
     MAX_CONSECUTIVE_EMPTY = 5  # halt after 5 batches with 0 results
 
@@ -179,29 +329,49 @@ def run_details_phase(
         batch_num += 1
         print(f"\n--- Detail Batch {batch_num} ({len(batch)} places) ---")
 
+        # Head of the next batch, prefetched by idle workers as this one drains
+        lookahead = None
+        if prefetch:
+            lookahead = checkpoint.get_pending_links()[
+                len(batch): len(batch) + (Config.MAX_PARALLEL_BROWSERS or 4)
+            ]
+
         try:
-            results = scrape_places(batch, parallel=True)
+            results = scrape_places(
+                batch,
+                parallel=True,
+                profile=profile,
+                use_pool=browser_pool,
+                tabs_per_browser=tabs_per_browser,
+                prefetch=prefetch,
+                lookahead=lookahead,
+                http_first=http_first,
+                aligned=True,
+            )
 
             # Separate successful results from failures
-            # scrape_places returns None for failed extractions
+            # scrape_places keeps None for failed extractions, so results[i] corresponds to batch[i]
             successful = [r for r in results if r is not None]
             failed_count = len(batch) - len(successful)
 
             unique_results = dedup.filter_unique(successful)
 
             if unique_results:
-                all_restaurants.extend(unique_results)
+                sink.add(unique_results)
 
                 batch_file = os.path.join(output_dir, f"restaurants_batch_{batch_num}.json")
                 bt.write_json(unique_results, batch_file)
 
                 print(f"Saved {len(unique_results)} unique restaurants (batch {batch_num})")
 
+                queued = enrichment_queue.queue_incomplete(unique_results)
+                enrichment_queue.save()
+                if queued:
+                    print(f"  Queued {queued} places with missing fields for enrichment")
+
             # Only remove links that were successfully processed (got a result)
             # Failed links stay in pending for retry
             if successful:
-                # Build set of successfully processed URLs by matching batch order
-                # results[i] corresponds to batch[i]
                 processed_links = [
                     batch[i] for i, r in enumerate(results) if r is not None
                 ]
@@ -221,14 +391,14 @@ def run_details_phase(
                     print(f"\n  HALTING: {MAX_CONSECUTIVE_EMPTY} consecutive batches with 0 results.")
                     print("  Browser connections are likely failing. Check cache/reuse_driver settings.")
                     progress["completed_details"] = progress.get("completed_details", 0) + len(batch)
-                    progress["total_restaurants_saved"] = len(all_restaurants)
+                    progress["total_restaurants_saved"] = len(sink)
                     checkpoint.save_progress(progress)
                     break
             else:
                 consecutive_empty_batches = 0
 
             progress["completed_details"] = progress.get("completed_details", 0) + len(batch)
-            progress["total_restaurants_saved"] = len(all_restaurants)
+            progress["total_restaurants_saved"] = len(sink)
             checkpoint.save_progress(progress)
             dedup.save_checkpoint()
 
@@ -239,31 +409,192 @@ def run_details_phase(
             # Don't remove links on exception - keep for retry
 
         remaining = checkpoint.get_pending_links_count()
-        print(f"Progress: {len(all_restaurants)} restaurants saved, {remaining} links remaining")
+        print(f"Progress: {len(sink)} restaurants saved, {remaining} links remaining")
 
         if remaining > 0:
             time.sleep(Config.BATCH_DELAY)
 
-    if all_restaurants:
+    close_details_pool()
+
+    if sink.records:
         final_csv = os.path.join(output_dir, "all_restaurants.csv")
 
-        bt.write_json(all_restaurants, final_json)
-        bt.write_csv(all_restaurants, final_csv)
+        sink.close()
+        bt.write_csv(fill_record_columns(sink.records), final_csv)
 
         print(f"\n{'='*60}")
         print("DETAIL SCRAPING COMPLETE")
         print(f"{'='*60}")
-        print(f"Total unique restaurants: {len(all_restaurants)}")
+        print(f"Total unique restaurants: {len(sink)}")
         print(f"Output files:")
         print(f"  - {final_json}")
         print(f"  - {final_csv}")
         print(f"{'='*60}")
 
 
+def run_light_phase(
+    checkpoint: CheckpointManager,
+    output_dir: Optional[str] = None,
+) -> None:
+    """
+    Light run: emit card-level records for pending links without visiting them.
+
+    Records carry only what the search card showed (name, rating, review
+    count, category, price, address snippet). Pending links are left in
+    place so a later full run can still visit them.
+
+    Args:
+        checkpoint: CheckpointManager instance
+        output_dir: Directory for output files
+    """
+    if output_dir is None:
+        output_dir = Config.OUTPUT_DIR
+    os.makedirs(output_dir, exist_ok=True)
+
+    pending = checkpoint.get_pending_links()
+
+    print(f"\n{'='*60}")
+    print("PHASE 2 (light): Card Records")
+    print(f"{'='*60}")
+    print(f"Pending links: {len(pending)}")
+    print(f"{'='*60}\n")
+
+    records: dict[str, dict] = {}
+    no_card = rejected = 0
+    for link in pending:
+        card = checkpoint.get_link_card(link)
+        if not card:
+            no_card += 1
+            continue
+        if card_rejection_reason(card):
+            rejected += 1
+            continue
+        record = card_to_record(link, card)
+        records[record["place_id"] or link] = record
+
+    light_json = os.path.join(output_dir, "light_restaurants.json")
+    light_csv = os.path.join(output_dir, "light_restaurants.csv")
+    if records:
+        bt.write_json(list(records.values()), light_json)
+        bt.write_csv(list(records.values()), light_csv)
+
+    print(f"Card records: {len(records)} (rejected by card: {rejected}, without a card: {no_card})")
+    if records:
+        print(f"Output files:")
+        print(f"  - {light_json}")
+        print(f"  - {light_csv}")
+
+
+def run_enrichment_phase(
+    checkpoint: CheckpointManager,
+    batch_size: Optional[int] = None,
+    output_dir: Optional[str] = None,
+) -> None:
+    """
+    Phase 4: Revisit places with missing or partial fields and merge results.
+
+    Runs after the main pass with its own browser budget
+    (Config.ENRICHMENT_PARALLEL_BROWSERS). Results are saved per batch and
+    merged back into all_restaurants.json by place_id, including records
+    still in the results journal.
+
+    Args:
+        checkpoint: CheckpointManager instance
+        batch_size: Number of places per batch
+        output_dir: Directory for output files
+    """
+    if batch_size is None:
+        batch_size = Config.ENRICHMENT_BATCH_SIZE
+    if output_dir is None:
+        output_dir = Config.OUTPUT_DIR
+
+    # Replays records journaled by a details run that was not merged yet
+    sink = ResultsSink(output_dir)
+    if not sink.records:
+        print("No saved restaurants to enrich!")
+        return
+    all_restaurants = sink.records
+
+    # Fold in batches saved by an interrupted previous run first, so places
+    # they already filled are not queued again
+    merged, merged_files = merge_enrichment_batches(output_dir, all_restaurants)
+
+    queue = EnrichmentQueue(checkpoint.checkpoint_dir)
+    queued = queue.queue_incomplete(all_restaurants)
+    queue.save()
+
+    stats = queue.get_stats()
+    print(f"\n{'='*60}")
+    print("PHASE 4: Field Enrichment")
+    print(f"{'='*60}")
+    print(f"Places queued: {stats['pending']} ({queued} newly queued)")
+    for field, count in sorted(stats["by_field"].items()):
+        print(f"  - {field}: {count}")
+    print(f"Exhausted (max attempts reached): {stats['exhausted']}")
+    print(f"Parallel browsers: {Config.ENRICHMENT_PARALLEL_BROWSERS}")
+    print(f"{'='*60}\n")
+
+    existing_batches = [
+        int(f.split("_")[-1].split(".")[0])
+        for f in os.listdir(output_dir)
+        if f.startswith("enrichment_batch_") and f.endswith(".json")
+    ]
+    batch_num = max(existing_batches) if existing_batches else 0
+    run_batch_files = []
+
+    while True:
+        batch = queue.get_batch(batch_size)
+        if not batch:
+            break
+
+        batch_num += 1
+        print(f"\n--- Enrichment Batch {batch_num} ({len(batch)} places) ---")
+
+        try:
+            results = enrich_places(batch, parallel=True)
+        except Exception as e:
+            print(f"Error processing enrichment batch: {e}")
+            results = [None] * len(batch)
+
+        enriched = [r for r in results if r]
+        if enriched:
+            batch_file = os.path.join(output_dir, f"enrichment_batch_{batch_num}.json")
+            bt.write_json(enriched, batch_file)
+            run_batch_files.append(batch_file)
+
+        for task, result in zip(batch, results):
+            queue.record_result(task["place_id"], result)
+        queue.save()
+
+        print(f"Enriched {len(enriched)}/{len(batch)} places, {queue.pending_count} remaining")
+
+        if queue.pending_count > 0:
+            time.sleep(Config.BATCH_DELAY)
+
+    updated, batch_files = merge_enrichment_batches(output_dir, all_restaurants, run_batch_files)
+    merged += updated
+    merged_files += batch_files
+
+    if merged:
+        sink.reindex()
+    sink.close()
+    if merged:
+        bt.write_csv(fill_record_columns(all_restaurants), os.path.join(output_dir, "all_restaurants.csv"))
+
+    for batch_file in merged_files:
+        try:
+            os.remove(batch_file)
+        except IOError:
+            pass
+
+    print(f"\nEnrichment phase complete! Updated {merged} restaurants in {sink.path}")
+
+
 def run_retry_phase(
     checkpoint: CheckpointManager,
     dedup: DeduplicationManager,
     batch_size: Optional[int] = None,
+    refine: Optional[bool] = None,
 ) -> None:
     """
     Phase 3: Retry failed search queries.
@@ -272,9 +603,13 @@ def run_retry_phase(
         checkpoint: CheckpointManager instance
         dedup: DeduplicationManager instance
         batch_size: Number of searches per batch
+        refine: Refine searches that hit the result cap (defaults to Config.REFINE_SEARCHES)
     """
     if batch_size is None:
         batch_size = Config.SEARCH_BATCH_SIZE
+    if refine is None:
+        refine = Config.REFINE_SEARCHES
+    vocabulary = load_cuisine_vocabulary() if refine else None
 
     failures = checkpoint.get_failures()
     # Filter to only search failures (those with 'query' field indicating a search query)
@@ -303,6 +638,7 @@ def run_retry_phase(
         print(f"\n--- Retry Batch {batch_num}/{total_batches} ({len(batch)} queries) ---")
 
         batch_links = []
+        batch_cards = {}
         for query_data in batch:
             query = query_data.get("query", "")
 
@@ -312,18 +648,37 @@ def run_retry_phase(
                 continue
 
             try:
-                result = scrape_search_results(query_data)
+                # Resume past the depth an earlier interrupted attempt reached
+                partial = checkpoint.get_partial_search(query)
+                search_data = {**query_data, "resume_depth": partial["depth"]} if partial else query_data
+                result = scrape_search_results(search_data)
 
                 if result and result.get("place_links"):
                     links = result["place_links"]
                     new_links = dedup.filter_unseen_links(links)
                     batch_links.extend(new_links)
+                    cards = result.get("place_cards") or {}
+                    batch_cards.update({link: cards[link] for link in new_links if link in cards})
                     print(f"  {query}: {len(links)} links ({len(new_links)} new)")
                 else:
                     error = result.get("error") if result else "No result"
                     print(f"  {query}: No links found ({error})")
 
+                if result and refine:
+                    # Refinements are picked up by the next search phase
+                    _queue_followups(checkpoint, result, vocabulary)
+
+                if result and result.get("partial"):
+                    # Salvaged links are queued; the failure stays for the next retry
+                    print(f"  {query}: Interrupted again at scroll depth {result.get('scroll_depth', 0)}")
+                    checkpoint.mark_search_partial(
+                        query, result.get("scroll_depth", 0), len(result.get("place_links") or []), result.get("error")
+                    )
+                    continue
+
                 checkpoint.mark_search_completed(query)
+                checkpoint.record_search_count(query, result.get("count", 0) if result else 0)
+                checkpoint.clear_partial_search(query)
                 retried_queries.append(query_data)
 
             except Exception as e:
@@ -331,6 +686,7 @@ def run_retry_phase(
 
         if batch_links:
             added = checkpoint.add_pending_links(batch_links)
+            checkpoint.add_link_cards(batch_cards)
             print(f"\nBatch complete: Added {added} new links to pending queue")
 
         progress = checkpoint.get_progress()
@@ -370,6 +726,19 @@ def run_scraper(
     dry_run: bool = False,
     cuisine_expansion: bool = False,
     cuisine_min_population: int = 100_000,
+    profile: Optional[str] = None,
+    enrich: bool = False,
+    browser_pool: Optional[bool] = None,
+    tabs_per_browser: Optional[int] = None,
+    prefetch: Optional[bool] = None,
+    http_first: Optional[bool] = None,
+    search_backend: Optional[str] = None,
+    light: bool = False,
+    tiles: bool = False,
+    refine: Optional[bool] = None,
+    zip_selection: Optional[str] = None,
+    rebuild_plan: bool = False,
+    machine_profile: Optional[dict] = None,
 ) -> None:
     """
     Main scraper orchestration function.
@@ -385,101 +754,167 @@ def run_scraper(
         dry_run: Only show query counts, don't scrape
         cuisine_expansion: Enable cuisine-specific queries for comprehensive coverage
         cuisine_min_population: Min city population for cuisine expansion
+        profile: Details extraction profile (core, full, hours-only)
+        enrich: Revisit places with missing fields after the main pass
+        browser_pool: Reuse health-checked Chrome drivers in the details phase
+            (defaults to Config.USE_BROWSER_POOL)
+        tabs_per_browser: Places loaded concurrently per pooled Chrome
+        prefetch: Load the next pending place in a background tab while extracting
+        http_first: Fetch place pages over HTTP with the browser as fallback
+        search_backend: Search backend for Phase 1 ("browser" or "http")
+        light: Emit card-level records from search results instead of
+            visiting place pages (implies skip_details)
+        tiles: Search map viewports over a quadtree of tiles instead of
+            city / zip text queries
+        refine: Refine searches that hit the result cap into cuisine and
+            sub-area queries (defaults to Config.REFINE_SEARCHES)
+        zip_selection: "spread" (evenly by list position / every zip) or
+            "cover" (fewest zips covering each city, needs zip_codes_csv);
+            defaults to Config.ZIP_SELECTION
+        rebuild_plan: Rebuild the cached query plan even if its inputs are unchanged
+        machine_profile: Host measurements and the settings chosen from them
+            (machine.profile_machine), recorded in progress.json
     """
+    if zip_selection is None:
+        zip_selection = Config.ZIP_SELECTION
+    if zip_selection not in ZIP_SELECTIONS:
+        raise ValueError(f"Unknown zip selection '{zip_selection}'. Choose from: {', '.join(ZIP_SELECTIONS)}")
+
     print(f"\n{'#'*60}")
     print("US RESTAURANT SCRAPER")
     print(f"{'#'*60}")
     print(f"Started at: {datetime.now().isoformat()}")
     print(f"Test mode: {test_mode}")
     print(f"Min rating filter: {Config.MIN_RATING} stars")
+    print(f"Extraction profile: {profile or Config.DETAILS_PROFILE}")
     print(f"{'#'*60}\n")
 
     checkpoint = CheckpointManager(Config.CHECKPOINT_DIR)
     dedup = DeduplicationManager(os.path.join(Config.CHECKPOINT_DIR, "seen_places.json"))
 
+    if machine_profile is not None:
+        progress = checkpoint.get_progress()
+        progress["machine"] = machine_profile
+        checkpoint.save_progress(progress)
+
+    # Light runs never visit place pages
+    if light:
+        skip_details = True
+    if refine is None:
+        refine = Config.REFINE_SEARCHES
+
     stats = checkpoint.get_stats()
     print("Resume stats:")
     print(f"  - Completed searches: {stats['completed_searches']}")
+    print(f"  - Partial searches to resume: {stats['partial_searches']}")
     print(f"  - Pending links: {stats['pending_links']}")
     print(f"  - Restaurants saved: {stats['total_restaurants_saved']}")
     print(f"  - Dedup count: {dedup.count}")
 
-    if fill_gaps:
-        completed_searches = set(checkpoint.get_completed_searches())
-        queries = generate_remaining_zip_queries(
-            completed_searches=completed_searches,
+    plan = None
+    if fill_gaps or cuisine_expansion or not (tiles or test_mode):
+        plan = load_query_plan(
+            checkpoint,
+            fill_gaps=fill_gaps,
+            cuisine_expansion=cuisine_expansion,
+            cuisine_min_population=cuisine_min_population,
             cities_csv=cities_csv,
+            zip_codes_csv=zip_codes_csv,
+            zip_selection=zip_selection,
+            refine=refine,
+            rebuild=rebuild_plan,
         )
-        print(f"\nFill-gaps mode: {len(queries)} remaining zip queries")
+        plan.sync(checkpoint.get_completed_searches())
+        remaining_count = len(plan) - plan.done_count()
+        # Streamed from the plan; query dicts are built as batches are scheduled
+        queries = plan.iter_remaining()
+        if fill_gaps:
+            print(f"\nFill-gaps mode: {remaining_count} remaining zip queries")
+        elif cuisine_expansion:
+            print(f"\nCuisine expansion mode: {remaining_count} remaining "
+                  f"{'seed' if refine else 'cuisine-specific'} queries")
+            print(f"  (for cities >= {cuisine_min_population:,} population)")
+        else:
+            print(f"\nProduction mode: {len(plan)} total queries ({remaining_count} remaining)")
         if dry_run:
             print("\nDry run -- no scraping performed.")
             return
-    elif cuisine_expansion:
-        # Cuisine expansion mode: generate cuisine-specific queries
-        completed_searches = set(checkpoint.get_completed_searches())
-        # Use default CSV path if not provided
-        import os as _os
-        csv_path = cities_csv
-        if csv_path is None:
-            default_csv = _os.path.join(
-                _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__)))),
-                "data", "uscities.csv",
-            )
-            if _os.path.exists(default_csv):
-                csv_path = default_csv
-        cities = load_cities_from_csv(csv_path, min_population=cuisine_min_population)
-        queries = generate_cuisine_queries(
-            cities=cities,
-            completed_searches=completed_searches,
-            min_population=cuisine_min_population,
-        )
-        print(f"\nCuisine expansion mode: {len(queries)} cuisine-specific queries")
-        print(f"  (for cities >= {cuisine_min_population:,} population)")
+    elif tiles:
+        queries = plan_tile_queries(cities_csv=cities_csv, zip_codes_csv=zip_codes_csv)
+        if test_mode:
+            queries = queries[:test_limit]
+        print(f"\nTile mode: {len(queries)} seed viewport queries")
         if dry_run:
             print("\nDry run -- no scraping performed.")
             return
-    elif test_mode:
+    else:
         queries = get_test_queries(test_limit)
         print(f"\nTest mode: Using {len(queries)} test queries")
-    else:
-        queries = get_all_queries(
-            cities_csv=cities_csv,
-            zip_codes_csv=zip_codes_csv,
-            include_zip_codes=Config.INCLUDE_ZIP_CODES,
-            business_type="restaurants",
-        )
-        print(f"\nProduction mode: {len(queries)} total queries")
-        if dry_run:
-            print("\nDry run -- no scraping performed.")
-            return
+
+    # Refinements planned from saturated results in earlier runs
+    followups = checkpoint.get_remaining_searches(checkpoint.get_followup_queries()) if refine else []
+    if followups:
+        print(f"Refinement queries from earlier runs: {len(followups)}")
+        queries = itertools.chain(queries, followups)
+
+    # Fail fast on unsafe browser decorator settings before any scraping starts
+    validate_browser_settings()
 
     # Phase 1: Search
     if not skip_search:
         progress = checkpoint.get_progress()
         progress["phase"] = "search"
         checkpoint.save_progress(progress)
-        run_search_phase(checkpoint, dedup, queries)
+        run_search_phase(checkpoint, dedup, queries, search_backend=search_backend, refine=refine, plan=plan)
 
     # Phase 2: Details
     if not skip_details:
         progress = checkpoint.get_progress()
         progress["phase"] = "details"
         checkpoint.save_progress(progress)
-        run_details_phase(checkpoint, dedup)
+        run_details_phase(
+            checkpoint, dedup,
+            profile=profile,
+            browser_pool=browser_pool,
+            tabs_per_browser=tabs_per_browser,
+            prefetch=prefetch,
+            http_first=http_first,
+        )
 
     # Phase 3: Retry failed searches
     if not skip_search and checkpoint.get_failures():
         progress = checkpoint.get_progress()
         progress["phase"] = "retry"
         checkpoint.save_progress(progress)
-        run_retry_phase(checkpoint, dedup)
+        run_retry_phase(checkpoint, dedup, refine=refine)
 
         # Run details again if retries found new links
         if not skip_details and checkpoint.get_pending_links_count() > 0:
             progress = checkpoint.get_progress()
             progress["phase"] = "details"
             checkpoint.save_progress(progress)
-            run_details_phase(checkpoint, dedup)
+            run_details_phase(
+                checkpoint, dedup,
+                profile=profile,
+                browser_pool=browser_pool,
+                tabs_per_browser=tabs_per_browser,
+                prefetch=prefetch,
+                http_first=http_first,
+            )
+
+    # Light run: card-level records for everything pending
+    if light:
+        progress = checkpoint.get_progress()
+        progress["phase"] = "light"
+        checkpoint.save_progress(progress)
+        run_light_phase(checkpoint)
+
+    # Phase 4: Fill missing fields
+    if enrich and not skip_details:
+        progress = checkpoint.get_progress()
+        progress["phase"] = "enrichment"
+        checkpoint.save_progress(progress)
+        run_enrichment_phase(checkpoint)
 
     # Mark complete
     progress = checkpoint.get_progress()
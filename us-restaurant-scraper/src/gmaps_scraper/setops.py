@@ -0,0 +1,298 @@
+"""Streaming set operations over the place ids in checkpoint and output files.
+
+Sources, by file name:
+    *.pk                 a place key file (already sorted)
+    pending_links.json   links, plus the changes in pending_links.journal
+    *restaurants*.json   saved records' "place_id" fields, plus the
+                         unmerged <name>.jsonl sink journal
+    anything else        every "0x..:0x.." id in the file
+
+Place key file layout (*.pk, accepted by `worklist --place-ids`):
+    b"GMPKEY01" | u32 header length | header JSON (op, sources)
+    | sorted 16-byte keys (the two 64-bit halves of "0x<hex>:0x<hex>", big-endian)
+"""
+
+import heapq
+import itertools
+import json
+import os
+import re
+import struct
+import tempfile
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+from gmaps_scraper.config import Config
+
+PLACE_KEY_SIZE = 16
+SET_OPERATIONS = ("diff", "intersect", "union")
+
+_MAGIC = b"GMPKEY01"
+_ID_PATTERN = r"0x[0-9a-f]{1,16}:0x[0-9a-f]{1,16}(?![0-9a-f])"
+_PLACE_ID = re.compile(_ID_PATTERN)
+_RECORD_PLACE_ID = re.compile(r'"place_id":\s*"(' + _ID_PATTERN + r')"')
+_CHUNK_SIZE = 1 << 20
+_CHUNK_OVERLAP = 256  # Longer than any match, so one cut off at a chunk end is found in the next
+_READ_KEYS = 4096  # Keys per read from a key file
+
+
+def place_key(place_id: str) -> Optional[bytes]:
+    """16-byte key of a "0x<hex>:0x<hex>" place id (None for other forms)."""
+    if not _PLACE_ID.fullmatch(place_id):
+        return None
+    high, low = place_id.split(":")
+    return int(high, 16).to_bytes(8, "big") + int(low, 16).to_bytes(8, "big")
+
+
+def place_id_for_key(key: bytes) -> str:
+    """The place id a key was made from."""
+    return f"0x{int.from_bytes(key[:8], 'big'):x}:0x{int.from_bytes(key[8:], 'big'):x}"
+
+
+def _scan(path: str, pattern: re.Pattern) -> Iterator[str]:
+    """Matches of a pattern in a text file (group 1 if it has one), read in chunks."""
+    group = 1 if pattern.groups else 0
+    with open(path, "r", encoding="utf-8") as f:
+        tail = ""
+        while True:
+            chunk = f.read(_CHUNK_SIZE)
+            text = tail + chunk
+            # At EOF every match is complete; otherwise leave the end for the next chunk
+            cut = len(text) if not chunk else max(len(text) - _CHUNK_OVERLAP, 0)
+            for match in pattern.finditer(text):
+                if match.start() >= cut:
+                    break
+                yield match.group(group)
+            if not chunk:
+                return
+            tail = text[cut:]
+
+
+def _pending_place_ids(path: str) -> Iterator[str]:
+    """Place ids of a checkpoint's pending links, with its journaled changes applied."""
+    last_change: dict[str, str] = {}
+    journal = os.path.splitext(path)[0] + ".journal"
+    if os.path.exists(journal):
+        with open(journal, "r") as f:
+            for line in f:
+                match = _PLACE_ID.search(line)
+                if match and line.endswith("\n"):
+                    last_change[match.group(0)] = line[0]
+    if os.path.exists(path):
+        for place_id in _scan(path, _PLACE_ID):
+            if last_change.get(place_id) != "-":
+                yield place_id
+    for place_id, op in last_change.items():
+        if op == "+":
+            yield place_id
+
+
+def iter_place_ids(path: str) -> Iterator[str]:
+    """
+    Stream the place ids of a source file (see the module docstring for the kinds).
+
+    Raises:
+        FileNotFoundError: If the source does not exist
+    """
+    name = os.path.basename(path)
+    if name.endswith(".pk"):
+        return (place_id_for_key(key) for key in read_place_keys(path))
+    if name == "pending_links.json":
+        if not os.path.exists(path) and not os.path.exists(os.path.splitext(path)[0] + ".journal"):
+            raise FileNotFoundError(path)
+        return _pending_place_ids(path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    if "restaurants" in name and name.endswith(".json"):
+        journal = os.path.splitext(path)[0] + ".jsonl"
+        sources = [path] + ([journal] if os.path.exists(journal) else [])
+        return itertools.chain.from_iterable(_scan(source, _RECORD_PLACE_ID) for source in sources)
+    return _scan(path, _PLACE_ID)
+
+
+def _iter_key_file(f) -> Iterator[bytes]:
+    while True:
+        block = f.read(PLACE_KEY_SIZE * _READ_KEYS)
+        if not block:
+            return
+        for start in range(0, len(block), PLACE_KEY_SIZE):
+            yield block[start:start + PLACE_KEY_SIZE]
+
+
+def read_place_keys(path: str) -> Iterator[bytes]:
+    """
+    Stream the keys of a place key file.
+
+    Raises:
+        ValueError: If the file is not a place key file
+    """
+    with open(path, "rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"{path} is not a place key file")
+        (header_len,) = struct.unpack("<I", f.read(4))
+        f.seek(header_len, os.SEEK_CUR)
+        yield from _iter_key_file(f)
+
+
+def read_place_key_header(path: str) -> dict:
+    """Header of a place key file, with its key count."""
+    with open(path, "rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"{path} is not a place key file")
+        (header_len,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_len))
+    body = os.path.getsize(path) - len(_MAGIC) - 4 - header_len
+    header["count"] = body // PLACE_KEY_SIZE
+    return header
+
+
+def write_place_keys(path: str, keys: Iterable[bytes], header: Optional[dict] = None) -> int:
+    """
+    Write sorted keys to a place key file (atomically).
+
+    Returns:
+        Number of keys written
+    """
+    header_bytes = json.dumps(header or {}).encode()
+    count = 0
+    tmp_file = f"{path}.tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(_MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes)
+        for key in keys:
+            f.write(key)
+            count += 1
+    os.replace(tmp_file, path)
+    return count
+
+
+def _spill_runs(place_ids: Iterable[str], run_dir: str, run_keys: int) -> list[str]:
+    """Sort place keys in runs of run_keys, each written to a file in run_dir."""
+    keys = (key for key in map(place_key, place_ids) if key is not None)
+    runs = []
+    while True:
+        run = sorted(set(itertools.islice(keys, run_keys)))
+        if not run:
+            return runs
+        fd, run_file = tempfile.mkstemp(suffix=".run", dir=run_dir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"".join(run))
+        runs.append(run_file)
+
+
+def _read_run(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        yield from _iter_key_file(f)
+
+
+def _unique(keys: Iterable[bytes]) -> Iterator[bytes]:
+    previous = None
+    for key in keys:
+        if key != previous:
+            yield key
+            previous = key
+
+
+def sorted_place_keys(path: str, run_dir: str, run_keys: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Sorted, unique place keys of a source, by an external merge sort.
+
+    Args:
+        path: Source file (see iter_place_ids)
+        run_dir: Directory for the sorted runs
+        run_keys: Keys sorted in memory per run (defaults to Config.SETOPS_RUN_KEYS)
+    """
+    if path.endswith(".pk"):
+        read_place_key_header(path)  # fails now, not midway through a merge
+        return read_place_keys(path)
+    runs = _spill_runs(iter_place_ids(path), run_dir, run_keys or Config.SETOPS_RUN_KEYS)
+    return _unique(heapq.merge(*(_read_run(run) for run in runs)))
+
+
+def _tag(keys: Iterator[bytes], bit: int) -> Iterator[tuple[bytes, int]]:
+    for key in keys:
+        yield key, bit
+
+
+def merge_place_keys(op: str, streams: list[Iterator[bytes]]) -> Iterator[bytes]:
+    """
+    Combine sorted, unique key streams.
+
+    Args:
+        op: "diff" (in the first stream and none of the others), "intersect"
+            (in every stream) or "union" (in any)
+        streams: Sorted, unique key streams
+
+    Raises:
+        ValueError: If op is unknown
+    """
+    if op not in SET_OPERATIONS:
+        raise ValueError(f"Unknown set operation '{op}'. Choose from: {', '.join(SET_OPERATIONS)}")
+    merged = heapq.merge(*(_tag(stream, 1 << i) for i, stream in enumerate(streams)))
+    every = (1 << len(streams)) - 1
+    for key, tagged in itertools.groupby(merged, key=lambda item: item[0]):
+        members = 0
+        for _, bit in tagged:
+            members |= bit
+        if op == "union" or (op == "diff" and members == 1) or (op == "intersect" and members == every):
+            yield key
+
+
+def place_key_set_operation(
+    op: str,
+    sources: list[str],
+    output: Optional[str] = None,
+    run_keys: Optional[int] = None,
+) -> int:
+    """
+    Compute a difference, intersection or union of the place ids in source files.
+
+    Args:
+        op: "diff" (first source minus the others), "intersect" or "union"
+        sources: Source files (see iter_place_ids)
+        output: Result file: a place key file (.pk) or a JSON list of
+            place ids (.json); without it the result is only counted
+        run_keys: Keys sorted in memory per run (defaults to Config.SETOPS_RUN_KEYS)
+
+    Returns:
+        Number of place ids in the result
+
+    Raises:
+        ValueError: If op is unknown
+        FileNotFoundError: If a source does not exist
+    """
+    if op not in SET_OPERATIONS:
+        raise ValueError(f"Unknown set operation '{op}'. Choose from: {', '.join(SET_OPERATIONS)}")
+    with tempfile.TemporaryDirectory(prefix="gmaps_setops_") as run_dir:
+        # Every source is checked (and spilled) before anything is written
+        streams = []
+        for source in sources:
+            streams.append(sorted_place_keys(source, run_dir, run_keys))
+        result = merge_place_keys(op, streams)
+
+        if output is None:
+            return sum(1 for _ in result)
+        if output.endswith(".json"):
+            count = 0
+            tmp_file = f"{output}.tmp"
+            with open(tmp_file, "w") as f:
+                f.write("[")
+                for key in result:
+                    f.write(("" if count == 0 else ", ") + json.dumps(place_id_for_key(key)))
+                    count += 1
+                f.write("]")
+            os.replace(tmp_file, output)
+            return count
+        header = {
+            "op": op,
+            "sources": [os.path.abspath(source) for source in sources],
+            "created_at": datetime.now().isoformat(),
+        }
+        return write_place_keys(output, result, header)
+
+
+def load_place_ids(path: str) -> list[str]:
+    """Place ids of a work list file: a place key file (.pk) or a JSON list."""
+    if path.endswith(".pk"):
+        return [place_id_for_key(key) for key in read_place_keys(path)]
+    with open(path, "r") as f:
+        return json.load(f)
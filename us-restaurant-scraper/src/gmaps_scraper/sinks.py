@@ -0,0 +1,136 @@
+"""Streaming sink for saved restaurants.
+
+    output/<name>.json    merged results, rewritten once by close()
+    output/<name>.jsonl   records saved since the last merge, one per line
+"""
+
+import json
+import os
+from typing import Iterable, Optional
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.results_index import ResultsIndex, results_index_path
+
+
+class ResultsSink:
+    """
+    Append-only results journal merged into one JSON file.
+
+    Args:
+        output_dir: Output directory (defaults to Config.OUTPUT_DIR)
+        name: Results file name without extension
+    """
+
+    def __init__(self, output_dir: Optional[str] = None, name: str = "all_restaurants"):
+        self.output_dir = output_dir or Config.OUTPUT_DIR
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.path = os.path.join(self.output_dir, f"{name}.json")
+        self.journal_path = os.path.join(self.output_dir, f"{name}.jsonl")
+
+        self.records: list[dict] = []
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    existing = json.load(f)
+                if isinstance(existing, list):
+                    self.records = existing
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Warning: Could not load existing results {self.path}: {e}")
+        self._place_ids = {r["place_id"] for r in self.records if r.get("place_id")}
+        self.replayed = self._keep_new(self._read_journal())
+        self.records.extend(self.replayed)
+
+        self.index: Optional[ResultsIndex] = None
+        if name == "all_restaurants":
+            self.index = ResultsIndex.build(results_index_path(self.output_dir), self.records)
+            self.index.save(source_file=self.path)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _read_journal(self) -> list[dict]:
+        """Records journaled since the last merge.
+
+        A torn last line (a run killed mid-append) is cut off the journal, so
+        the next append starts on a line of its own. A last record that was
+        written whole but without its newline is kept and its line ended.
+        """
+        if not os.path.exists(self.journal_path):
+            return []
+        records = []
+        complete = 0  # bytes up to the end of the last complete line
+        tail = b""
+        with open(self.journal_path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    tail = line
+                    break
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    print(f"Warning: Skipping an unreadable line in {self.journal_path}")
+                complete += len(line)
+        if tail:
+            try:
+                records.append(json.loads(tail))
+                with open(self.journal_path, "ab") as f:
+                    f.write(b"\n")
+            except json.JSONDecodeError:
+                print(f"Warning: Dropping a truncated last line of {self.journal_path}")
+                os.truncate(self.journal_path, complete)
+        return records
+
+    def _keep_new(self, records: Iterable[dict]) -> list[dict]:
+        """Records whose place_id is not in the sink yet (records without one are kept)."""
+        new = []
+        for record in records:
+            place_id = record.get("place_id")
+            if place_id:
+                if place_id in self._place_ids:
+                    continue
+                self._place_ids.add(place_id)
+            new.append(record)
+        return new
+
+    def add(self, records: Iterable[dict]) -> list[dict]:
+        """
+        Journal a batch of records.
+
+        Returns:
+            The records that were new to the sink
+        """
+        new = self._keep_new(records)
+        if not new:
+            return new
+        try:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(record) + "\n" for record in new)
+        except IOError as e:
+            print(f"Warning: Could not journal results: {e}")
+        self.records.extend(new)
+        if self.index is not None:
+            self.index.extend(new)
+            self.index.save()
+        return new
+
+    def reindex(self) -> None:
+        """Rebuild the results index after records were updated in place."""
+        if self.index is not None:
+            self.index = ResultsIndex.build(results_index_path(self.output_dir), self.records)
+
+    def close(self) -> None:
+        """Merge the journal into the results file (atomically) and clear it."""
+        if not self.records and not os.path.exists(self.journal_path):
+            return
+        tmp_file = f"{self.path}.tmp"
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self.records, f, indent=4)
+            os.replace(tmp_file, self.path)
+        except IOError as e:
+            print(f"Warning: Could not save results {self.path}: {e}")
+            return
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        if self.index is not None:
+            self.index.save(source_file=self.path)
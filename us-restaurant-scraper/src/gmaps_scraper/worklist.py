@@ -0,0 +1,406 @@
+"""Work-list runner: search and scrape an explicit list of queries, links or place ids.
+
+Each work list keeps its own checkpoint directory; the results go to a
+ResultsSink.
+"""
+
+import json
+import os
+import re
+import subprocess
+import time
+from typing import Callable, Optional
+
+from gmaps_scraper import extractors
+from gmaps_scraper.checkpoint import CheckpointManager
+from gmaps_scraper.config import Config
+from gmaps_scraper.deduplication import DeduplicationManager
+from gmaps_scraper.enrichment import PLACE_URL_TEMPLATE
+from gmaps_scraper.geo.query_codec import QueryCodec, convert_query_file, read_keys
+from gmaps_scraper.setops import load_place_ids
+from gmaps_scraper.sinks import ResultsSink
+
+# Chrome processes started by botasaurus
+CHROME_PROCESS_PATTERN = "Google Chrome.*bota"
+
+
+def count_chrome_processes() -> int:
+    """Count running Chrome processes spawned by botasaurus."""
+    try:
+        result = subprocess.run(
+            ["pgrep", "-f", CHROME_PROCESS_PATTERN],
+            capture_output=True, text=True, timeout=5,
+        )
+        return len(result.stdout.split())
+    except (OSError, subprocess.SubprocessError):
+        return 0
+
+
+def kill_stale_chrome() -> None:
+    """Kill all botasaurus Chrome processes."""
+    try:
+        subprocess.run(["pkill", "-9", "-f", CHROME_PROCESS_PATTERN], capture_output=True, timeout=10)
+        time.sleep(2)
+        print(f"  Chrome cleanup: {count_chrome_processes()} processes remaining")
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"  Chrome cleanup error: {e}")
+
+
+def check_chrome_health() -> bool:
+    """Clean up leaked Chrome processes above Config.MAX_HEALTHY_CHROME. Returns False if it had to."""
+    count = count_chrome_processes()
+    if count > Config.MAX_HEALTHY_CHROME:
+        print(f"\n  WARNING: {count} Chrome processes (max healthy: {Config.MAX_HEALTHY_CHROME}). Cleaning up...")
+        kill_stale_chrome()
+        return False
+    return True
+
+
+def load_query_keys(query_file: str, codec: QueryCodec) -> tuple[list[int], dict[int, str]]:
+    """
+    Load a query list as keys, plus the text of any keys that cannot be rendered.
+
+    A JSON query list is converted to a .keys file next to it on first use
+    (unless some of its queries only have hashed keys, which need their text).
+    """
+    if query_file.endswith(".keys"):
+        return list(read_keys(query_file)), {}
+
+    with open(query_file, "r") as f:
+        query_strings = json.load(f)
+    texts = {}
+    for query in query_strings:
+        key = codec.key(query)
+        if codec.render(key) is None:
+            texts[key] = query
+    if texts:
+        return [codec.key(q) for q in query_strings], texts
+
+    keys_file = os.path.splitext(query_file)[0] + ".keys"
+    count = convert_query_file(query_file, keys_file, codec)
+    print(f"Converted {count:,} queries to {keys_file} "
+          f"({os.path.getsize(query_file):,} -> {os.path.getsize(keys_file):,} bytes)")
+    return list(read_keys(keys_file)), {}
+
+
+def _query_dict(query: str) -> dict:
+    """Query dict for a query string ('Chinese restaurants near 11229')."""
+    zip_match = re.search(r"near\s+(\d{5})$", query)
+    cuisine_match = re.match(r"^(.+?)\s+restaurants\s+near", query)
+    return {
+        "query": query,
+        "zip_code": zip_match.group(1) if zip_match else "",
+        "type": "cuisine_zip",
+        "cuisine": cuisine_match.group(1) if cuisine_match else "",
+    }
+
+
+class _BadBatchCounter:
+    """Consecutive batches in which most items failed; a run halts at Config.WORKLIST_MAX_BAD_BATCHES."""
+
+    def __init__(self, items: str):
+        self.items = items
+        self.consecutive = 0
+
+    def record(self, failed: int, total: int) -> bool:
+        """Record a batch. Returns True if the run should halt."""
+        rate = failed / total if total else 0.0
+        if rate < Config.WORKLIST_ERROR_RATE:
+            self.consecutive = 0
+            return False
+        self.consecutive += 1
+        print(f"  WARNING: {failed}/{total} {self.items} failed ({rate:.0%}) "
+              f"({self.consecutive}/{Config.WORKLIST_MAX_BAD_BATCHES} consecutive)")
+        if self.consecutive < Config.WORKLIST_MAX_BAD_BATCHES:
+            return False
+        print(f"\n  HALTING: {self.consecutive} consecutive batches with "
+              f"{Config.WORKLIST_ERROR_RATE:.0%}+ failed {self.items}.")
+        print("  Browser connections are likely failing. Check Chrome and the network.")
+        return True
+
+
+def _between_batches(batch_num: int) -> None:
+    """Periodic Chrome cleanup and the delay between batches."""
+    if batch_num % Config.CHROME_HEALTH_CHECK_BATCHES == 0:
+        check_chrome_health()
+    time.sleep(Config.BATCH_DELAY)
+
+
+def _queue_file(
+    checkpoint: CheckpointManager,
+    progress: dict,
+    path: str,
+    to_link: Callable[[str], str],
+) -> None:
+    """Queue the links of a links / place ids file, once per version of the file."""
+    stat = os.stat(path)
+    stamp = [stat.st_size, stat.st_mtime_ns]
+    queued_files = progress.setdefault("queued_files", {})
+    if queued_files.get(os.path.abspath(path)) == stamp:
+        return
+    items = load_place_ids(path)
+    added = checkpoint.add_pending_links([to_link(item) for item in items])
+    queued_files[os.path.abspath(path)] = stamp
+    progress["pending_links"] = checkpoint.get_pending_links_count()
+    checkpoint.save_progress(progress)
+    print(f"Queued {added:,} of {len(items):,} links from {path}")
+
+
+def _search_phase(
+    checkpoint: CheckpointManager,
+    progress: dict,
+    query_file: str,
+    dedup: Optional[DeduplicationManager],
+) -> bool:
+    """Search the work list's queries, queueing their unseen links. Returns True if halted."""
+    codec = checkpoint.get_query_codec()
+    query_keys, texts = load_query_keys(query_file, codec)
+    completed = checkpoint.get_completed_searches()
+
+    # Searches the main run already completed are not repeated
+    main_completed_file = os.path.join(Config.CHECKPOINT_DIR, "completed_searches.keys")
+    main_completed: set[int] = set()
+    if os.path.abspath(checkpoint.checkpoint_dir) != os.path.abspath(Config.CHECKPOINT_DIR) \
+            and os.path.exists(main_completed_file):
+        main_completed = set(read_keys(main_completed_file))
+    done_in_main = sum(1 for k in query_keys if k not in completed.keys and k in main_completed)
+    remaining = [k for k in query_keys if k not in completed.keys and k not in main_completed]
+
+    print(f"\n{'='*60}")
+    print("WORK LIST: Search")
+    print(f"{'='*60}")
+    print(f"Queries: {len(query_keys):,}")
+    print(f"Already completed: {len(query_keys) - len(remaining) - done_in_main:,}")
+    print(f"Completed by the main run: {done_in_main:,}")
+    print(f"Remaining: {len(remaining):,}")
+    print(f"Pending links: {checkpoint.get_pending_links_count():,}")
+    print(f"{'='*60}\n")
+
+    progress["total_queries"] = len(query_keys)
+    if not remaining:
+        print("All work list searches already completed!")
+        return False
+
+    progress["phase"] = "search"
+    batch_size = Config.SEARCH_BATCH_SIZE
+    total_batches = (len(remaining) + batch_size - 1) // batch_size
+    failures = _BadBatchCounter("searches")
+    start_time = time.time()
+
+    for start in range(0, len(remaining), batch_size):
+        batch_num = start // batch_size + 1
+        batch = [_query_dict(texts.get(k) or codec.render(k)) for k in remaining[start:start + batch_size]]
+        print(f"\n--- Search Batch {batch_num}/{total_batches} ({len(batch)} queries) ---")
+
+        try:
+            results = extractors.scrape_searches(batch, parallel=True)
+        except Exception as e:
+            print(f"  Batch error: {e}")
+            if failures.record(len(batch), len(batch)):
+                return True
+            continue
+
+        batch_new = 0
+        failed = 0
+        for result in results:
+            result = result or {}
+            query = result.get("search_data", {}).get("query", "")
+            links = result.get("place_links") or []
+            if links:
+                new_links = dedup.filter_unseen_links(links) if dedup is not None else links
+                batch_new += checkpoint.add_pending_links(new_links)
+                if new_links:
+                    print(f"  {query}: {len(links)} links ({len(new_links)} unseen)")
+            else:
+                error = result.get("error") or "No result"
+                print(f"  {query}: 0 links ({error})")
+                if not result or result.get("error"):
+                    failed += 1
+            # An interrupted scroll is searched again next run
+            if query and not result.get("partial"):
+                checkpoint.mark_search_completed(query)
+
+        checkpoint.save_all()
+        progress["completed_searches"] = progress["completed_searches_count"] = len(completed)
+        progress["total_new_links"] = progress.get("total_new_links", 0) + batch_new
+        progress["pending_links"] = checkpoint.get_pending_links_count()
+        checkpoint.save_progress(progress)
+
+        searched = start + len(batch)
+        rate = searched / max((time.time() - start_time) / 60, 1e-6)
+        eta_hours = (len(remaining) - searched) / rate / 60
+        print(f"\n  Batch {batch_num}: +{batch_new} new links | "
+              f"Pending: {progress['pending_links']:,} | "
+              f"Searches done: {len(completed):,}/{len(query_keys):,} | "
+              f"Rate: {rate:.1f} q/min | ETA: {eta_hours:.1f} hrs")
+
+        if failures.record(failed, len(batch)):
+            return True
+        if searched < len(remaining):
+            _between_batches(batch_num)
+
+    print(f"\nWork list searches complete: {len(completed):,} searched, "
+          f"{progress.get('total_new_links', 0):,} new links")
+    return False
+
+
+def _details_phase(
+    checkpoint: CheckpointManager,
+    progress: dict,
+    sink: ResultsSink,
+    dedup: Optional[DeduplicationManager],
+    count_empty: bool = True,
+) -> bool:
+    """Scrape the pending links into the sink. Returns True if halted.
+
+    With count_empty False, places that returned nothing do not count toward
+    the halt (re-scraping rejected places expects mostly rejections); only
+    batch errors do.
+    """
+    print(f"\n{'='*60}")
+    print("WORK LIST: Details")
+    print(f"{'='*60}")
+    print(f"Pending links: {checkpoint.get_pending_links_count():,}")
+    print(f"Results: {sink.path} ({len(sink):,} saved)")
+    print(f"{'='*60}\n")
+
+    progress["phase"] = "details"
+    batch_size = Config.DETAILS_BATCH_SIZE
+    failures = _BadBatchCounter("places")
+    batch_num = 0
+
+    while True:
+        batch = checkpoint.get_next_batch(batch_size)
+        if not batch:
+            return False
+        batch_num += 1
+        print(f"\n--- Detail Batch {batch_num} ({len(batch)} places) ---")
+
+        try:
+            results = extractors.scrape_places(batch, parallel=True)
+        except Exception as e:
+            # Links stay pending for the next batch
+            print(f"  Batch error: {e}")
+            for link in batch:
+                checkpoint.record_failure(link, str(e))
+            if failures.record(len(batch), len(batch)):
+                return True
+            continue
+
+        # None: failed, or filtered (no name, rating below Config.MIN_RATING, not a restaurant)
+        valid = [r for r in results if r is not None]
+        saved = sink.add(dedup.filter_unique(valid) if dedup is not None else valid)
+        checkpoint.remove_processed_links(batch)
+        if dedup is not None:
+            dedup.save_checkpoint()
+
+        progress["completed_details"] = progress.get("completed_details", 0) + len(batch)
+        progress["pending_links"] = checkpoint.get_pending_links_count()
+        progress["total_restaurants_saved"] = len(sink)
+        checkpoint.save_progress(progress)
+        print(f"  Saved {len(saved)} restaurants (total: {len(sink):,}) | "
+              f"{len(batch) - len(valid)}/{len(batch)} returned nothing | "
+              f"Remaining: {progress['pending_links']:,} links")
+
+        if failures.record(len(batch) - len(valid) if count_empty else 0, len(batch)):
+            return True
+        if progress["pending_links"]:
+            _between_batches(batch_num)
+
+
+def _write_food_trucks(sink: ResultsSink) -> None:
+    """Write the food trucks among the results to food_trucks.json as a convenience subset."""
+    food_trucks = [r for r in sink.records if r.get("business_type") == "food_truck"]
+    path = os.path.join(sink.output_dir, "food_trucks.json")
+    with open(path, "w") as f:
+        json.dump(food_trucks, f)
+    print(f"Food trucks: {len(food_trucks):,} ({path})")
+
+
+def run_worklist(
+    query_file: Optional[str] = None,
+    links_file: Optional[str] = None,
+    place_ids_file: Optional[str] = None,
+    checkpoint_dir: Optional[str] = None,
+    output_name: str = "all_restaurants",
+    search: bool = True,
+    details: bool = True,
+    food_trucks: bool = False,
+    machine_profile: Optional[dict] = None,
+) -> None:
+    """
+    Search and scrape a work list.
+
+    Args:
+        query_file: JSON list of query strings or .keys file to search
+        links_file: JSON list of place URLs to queue
+        place_ids_file: JSON list or place key file of place ids to visit
+            (not with query_file)
+        checkpoint_dir: Checkpoint directory of the work list (defaults to
+            Config.WORKLIST_CHECKPOINT_DIR, Config.RESCRAPE_CHECKPOINT_DIR
+            for place ids)
+        output_name: Results file in Config.OUTPUT_DIR, without extension;
+            results are merged into it by place_id
+        search: Run the searches of query_file
+        details: Scrape the pending links
+        food_trucks: Also write food_trucks.json from the results
+        machine_profile: Machine profile the browsers were sized with
+            (recorded in progress.json)
+
+    Raises:
+        ValueError: If both query_file and place_ids_file are given
+    """
+    if query_file and place_ids_file:
+        raise ValueError("A work list takes queries or place ids, not both")
+    if checkpoint_dir is None:
+        checkpoint_dir = Config.RESCRAPE_CHECKPOINT_DIR if place_ids_file else Config.WORKLIST_CHECKPOINT_DIR
+
+    # Query keys of city searches index the main checkpoint's location table
+    checkpoint = CheckpointManager(
+        checkpoint_dir,
+        query_locations_file=os.path.join(Config.CHECKPOINT_DIR, "query_locations.json"),
+    )
+    progress = checkpoint.get_progress()
+    if machine_profile:
+        progress["machine"] = machine_profile
+
+    # A work list keeps the dedup mode it was started with (so draining it needs no input files)
+    dedup = None
+    if progress.setdefault("seen_dedup", not place_ids_file):
+        dedup = DeduplicationManager(os.path.join(Config.CHECKPOINT_DIR, "seen_places.json"))
+        print(f"Dedup loaded: {dedup.place_id_count} place_ids, {len(dedup.seen_hashes)} hashes")
+
+    if links_file:
+        _queue_file(checkpoint, progress, links_file, lambda link: link)
+    if place_ids_file:
+        _queue_file(checkpoint, progress, place_ids_file, PLACE_URL_TEMPLATE.format)
+
+    halted = False
+    if search and query_file:
+        halted = _search_phase(checkpoint, progress, query_file, dedup)
+
+    if details and not halted:
+        sink = ResultsSink(name=output_name)
+        if sink.replayed:
+            print(f"Recovered {len(sink.replayed):,} results journaled by an interrupted run")
+        if dedup is not None:
+            for record in sink.records:
+                dedup.mark_seen(record)
+        try:
+            # A place ids work list (no dedup) re-visits places that were mostly rejected
+            halted = _details_phase(checkpoint, progress, sink, dedup,
+                                    count_empty=progress["seen_dedup"])
+        finally:
+            extractors.close_details_pool()
+            sink.close()
+        if food_trucks:
+            _write_food_trucks(sink)
+        print(f"\nResults: {len(sink):,} restaurants in {sink.path}")
+
+    # Without the search phase, unsearched queries may remain
+    if not halted and (search or not query_file) and not checkpoint.get_pending_links_count():
+        progress["phase"] = "complete"
+    progress["pending_links"] = checkpoint.get_pending_links_count()
+    checkpoint.save_progress(progress)
+    print(f"\nWork list {'halted' if halted else progress['phase']}: "
+          f"{progress['pending_links']:,} links pending ({checkpoint_dir})")
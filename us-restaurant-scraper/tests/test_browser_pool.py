@@ -0,0 +1,110 @@
+"""Tests for the browser pool, with fake drivers in place of Chrome."""
+
+import pytest
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.extractors import browser_pool
+from gmaps_scraper.extractors.browser_pool import BrowserPool, is_connection_error
+
+
+class FakeBrowser:
+    stopped = False
+    _process_pid = None
+
+
+class FakeDriver:
+    """Stands in for a botasaurus Driver: answers the liveness probe until killed."""
+
+    def __init__(self):
+        self._browser = FakeBrowser()
+        self.closed = False
+
+    def run_js(self, script, timeout=None):
+        if self._browser.stopped:
+            raise ConnectionRefusedError("connection refused")
+        return 1
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    """Every driver the pool launches, in launch order."""
+    launched = []
+
+    def fake_driver(**kwargs):
+        launched.append(FakeDriver())
+        return launched[-1]
+
+    monkeypatch.setattr(browser_pool, "Driver", fake_driver)
+    return launched
+
+
+@pytest.mark.parametrize("error, expected", [
+    (ConnectionRefusedError("refused"), True),
+    (BrokenPipeError(), True),
+    (RuntimeError("WebSocket connection closed: no close frame received"), True),
+    (RuntimeError("Browser has disconnected"), True),
+    (ValueError("could not parse rating"), False),
+    (TimeoutError("element not found"), False),
+])
+def test_is_connection_error(error, expected):
+    assert is_connection_error(error) is expected
+
+
+def test_map_reuses_one_driver_across_calls(drivers):
+    pool = BrowserPool(size=1)
+    assert pool.map(lambda driver, item: item * 2, [1, 2]) == [2, 4]
+    assert pool.map(lambda driver, item: item * 2, [3]) == [6]
+    assert len(drivers) == 1
+    assert pool.get_stats()["tasks"] == 3
+    pool.close()
+    assert drivers[0].closed
+
+
+def test_connection_error_retries_on_a_fresh_driver(drivers):
+    def scrape(driver, item):
+        if driver is drivers[0]:
+            driver._browser.stopped = True
+            raise ConnectionResetError("connection reset by peer")
+        return item
+
+    pool = BrowserPool(size=1)
+    assert pool.map(scrape, ["a", "b"]) == ["a", "b"]
+    assert len(drivers) == 2
+    assert pool.get_stats()["stale_detected"] == 1
+
+
+def test_empty_result_from_a_dead_driver_is_retried(drivers):
+    def scrape(driver, item):
+        if driver is drivers[0]:
+            driver._browser.stopped = True  # swallowed its own error
+            return None
+        return item
+
+    pool = BrowserPool(size=1)
+    assert pool.map(scrape, ["a"]) == ["a"]
+    assert len(drivers) == 2
+
+
+def test_page_errors_are_not_retried(drivers):
+    calls = []
+
+    def scrape(driver, item):
+        calls.append(item)
+        raise ValueError("unexpected page")
+
+    pool = BrowserPool(size=1)
+    assert pool.map(scrape, ["a"]) == [None]
+    assert calls == ["a"]
+    assert len(drivers) == 1
+
+
+def test_driver_is_recycled_after_its_page_budget(drivers, monkeypatch):
+    monkeypatch.setattr(Config, "BROWSER_POOL_MAX_PAGES", 2)
+    pool = BrowserPool(size=1)
+    pool.map(lambda driver, item: item, [1, 2, 3])
+    assert len(drivers) == 2
+    assert drivers[0].closed
+    assert pool.get_stats()["recycled"] == 1
@@ -0,0 +1,55 @@
+"""Tests for search result card parsing."""
+
+from gmaps_scraper.extractors.cards import card_rejection_reason, card_to_record, parse_card
+
+LINK = "https://www.google.com/maps/place/Taqueria/data=!4m7!3m6!1s0x8644b5:0x2f1d5c!8m2"
+
+
+def test_parse_card_reads_every_field():
+    card = parse_card({
+        "name": "Taqueria‎  Arandas",
+        "rating_text": "4.5",
+        "reviews_text": "(1,234)",
+        "info_rows": ["Mexican · $$ · 123 Main St", "Open ⋅ Closes 10 PM"],
+    })
+    assert card == {
+        "name": "Taqueria Arandas",
+        "rating": 4.5,
+        "review_count": 1234,
+        "category": "Mexican",
+        "price_level": "$$",
+        "address_snippet": "123 Main St",
+    }
+
+
+def test_parse_card_falls_back_to_the_rating_label():
+    card = parse_card({
+        "name": "Pho 88",
+        "rating_label": "4,2 stars 87 Reviews",
+        "info_rows": ["Vietnamese · $10–20 · 9 Oak Ave"],
+    })
+    assert (card["rating"], card["review_count"]) == (4.2, 87)
+    assert card["price_level"] is None
+    assert card["address_snippet"] == "9 Oak Ave"
+
+
+def test_parse_card_without_details():
+    assert parse_card({"name": ""}) == {
+        "name": None, "rating": None, "review_count": None,
+        "category": None, "price_level": None, "address_snippet": None,
+    }
+
+
+def test_card_rejection_reason():
+    assert card_rejection_reason(None) is None
+    assert card_rejection_reason({"rating": None, "category": "Diner"}) is None
+    assert card_rejection_reason({"rating": 4.1, "category": "Diner"}) is None
+    assert card_rejection_reason({"rating": 2.4, "category": "Diner"}).startswith("rating 2.4")
+    assert card_rejection_reason({"rating": 4.8, "category": "Park"}) == "non-restaurant (Park)"
+
+
+def test_card_to_record_marks_food_trucks():
+    record = card_to_record(LINK, {"name": "Tacos Al Carbon", "category": "Food truck", "rating": 4.6})
+    assert record["place_id"] == "0x8644b5:0x2f1d5c"
+    assert record["business_type"] == "food_truck"
+    assert record["extraction_profile"] == "card"
@@ -0,0 +1,82 @@
+"""Tests for checkpoint persistence."""
+
+import json
+
+from gmaps_scraper.checkpoint import CheckpointManager
+from gmaps_scraper.config import Config
+
+
+def test_processed_link_cards_are_written_with_the_next_fold(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "PENDING_JOURNAL_MIN_ENTRIES", 4)
+    cards_file = tmp_path / "link_cards.json"
+    checkpoint = CheckpointManager(str(tmp_path))
+    checkpoint.add_pending_links(["a", "b", "c"])
+    checkpoint.add_link_cards({"a": {"rating": 4.0}, "b": {"rating": 2.0}, "c": {"rating": 4.5}})
+
+    checkpoint.remove_processed_links(["b"])
+    assert checkpoint.get_link_card("b") is None
+    assert set(json.loads(cards_file.read_text())) == {"a", "b", "c"}
+
+    checkpoint.remove_processed_links(["a"])  # folds the pending journal
+    assert set(json.loads(cards_file.read_text())) == {"c"}
+
+
+def test_compact_drops_cards_of_links_no_longer_pending(tmp_path):
+    checkpoint = CheckpointManager(str(tmp_path))
+    checkpoint.add_pending_links(["a"])
+    checkpoint.add_link_cards({"a": {}, "gone": {}})
+    checkpoint.remove_processed_links(["a"])
+
+    dropped = CheckpointManager(str(tmp_path)).compact()
+    assert dropped["link_cards"] == 2
+    assert json.loads((tmp_path / "link_cards.json").read_text()) == {}
+
+
+def test_partial_search_keeps_its_deepest_depth(tmp_path):
+    checkpoint = CheckpointManager(str(tmp_path))
+    checkpoint.mark_search_partial("tacos in austin", depth=5, links_found=40, error="driver died")
+    checkpoint.mark_search_partial("tacos in austin", depth=3, links_found=10, error="timeout")
+
+    partial = CheckpointManager(str(tmp_path)).get_partial_search("tacos in austin")
+    assert (partial["depth"], partial["links_found"], partial["attempts"]) == (5, 50, 2)
+    assert partial["error"] == "timeout"
+
+    checkpoint.clear_partial_search("tacos in austin")
+    assert CheckpointManager(str(tmp_path)).get_partial_searches() == {}
+
+
+def test_repeated_failures_keep_one_entry(tmp_path):
+    checkpoint = CheckpointManager(str(tmp_path))
+    query = {"query": "tacos in austin", "type": "city"}
+    checkpoint.record_failure(query, "driver died")
+    checkpoint.record_failure("https://maps/place/1", "timeout")
+    checkpoint.record_failure(dict(query), "timeout")
+
+    failures = checkpoint.get_failures()
+    assert [f["item"] for f in failures] == [query, "https://maps/place/1"]
+    assert (failures[0]["attempts"], failures[0]["error"]) == (2, "timeout")
+
+
+def test_search_counts_are_keyed_by_query_key(tmp_path):
+    # Written before query keys: a legacy file keyed by one spelling of the search
+    (tmp_path / "search_counts.json").write_text(json.dumps({"soul food  restaurants near 10001": 45}))
+    checkpoint = CheckpointManager(str(tmp_path))
+    assert checkpoint.get_search_count("Soul food restaurants near 10001") == 45
+    assert (tmp_path / "search_counts.json.migrated").exists()
+
+    checkpoint.record_search_count("restaurants in Austin, TX", 120)
+    checkpoint.save_all()
+    reloaded = CheckpointManager(str(tmp_path))
+    assert reloaded.get_search_count("restaurants in  austin, tx") == 120
+    assert reloaded.get_search_count("restaurants in Boise, ID") is None
+
+
+def test_partial_searches_are_keyed_by_query_key(tmp_path):
+    (tmp_path / "partial_searches.json").write_text(json.dumps({"restaurants near 10001": {"depth": 4}}))
+    checkpoint = CheckpointManager(str(tmp_path))
+    assert checkpoint.get_partial_search("Restaurants  near 10001")["depth"] == 4
+
+    checkpoint.mark_search_partial("Thai restaurants near 11201", 2, 10, "timeout")
+    stored = json.loads((tmp_path / "partial_searches.json").read_text())
+    assert all(key.isdigit() for key in stored)
+    assert CheckpointManager(str(tmp_path)).get_partial_search("thai restaurants near 11201")["depth"] == 2
@@ -0,0 +1,33 @@
+"""Tests for the lightweight CLI subcommands."""
+
+import json
+import subprocess
+import sys
+
+from gmaps_scraper.checkpoint import CheckpointManager
+
+
+def test_cli_import_does_not_load_browser_stack():
+    code = "import sys, gmaps_scraper.cli; print(any(m.startswith('botasaurus') for m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "False"
+
+
+def test_compact_drops_redundant_entries(tmp_path):
+    (tmp_path / "pending_links.json").write_text(json.dumps(["a", "b", "a"]))
+    checkpoint = CheckpointManager(str(tmp_path))
+    checkpoint.add_link_cards({"a": {"name": "A"}, "gone": {"name": "Gone"}})
+    checkpoint.mark_search_partial("restaurants near 10001", 2, 40, "timeout")
+    checkpoint.add_followup_queries([{"query": "Thai restaurants near 10001"}])
+    checkpoint.mark_search_completed("restaurants near 10001")
+    checkpoint.mark_search_completed("Thai restaurants near 10001")
+
+    dropped = checkpoint.compact()
+    assert dropped == {"pending_links": 1, "link_cards": 1, "partial_searches": 1, "followup_queries": 1}
+
+    reloaded = CheckpointManager(str(tmp_path))
+    assert reloaded.get_pending_links() == ["a", "b"]
+    assert list(reloaded.get_link_cards()) == ["a"]
+    assert reloaded.get_partial_searches() == {}
+    assert reloaded.get_followup_queries() == []
+    assert reloaded.get_completed_searches_count() == 2
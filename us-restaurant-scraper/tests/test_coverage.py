@@ -0,0 +1,49 @@
+"""Tests for the capture-recapture coverage estimator."""
+
+import pytest
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.coverage import CoverageEstimator, estimate_total
+
+
+def _link(n: int) -> str:
+    return f"https://www.google.com/maps/place/P{n}/data=!4m5!3m4!1s0x{n:x}:0x{n:x}!8m2"
+
+
+def test_needs_two_samples():
+    assert estimate_total([]) is None
+    assert estimate_total([{"a", "b"}]) is None
+
+
+def test_lincoln_petersen_for_two_queries():
+    # 40 and 50 places with 20 in common -> Chapman estimate (41*51/21)-1 ~ 98.6
+    first = {f"p{i}" for i in range(40)}
+    second = {f"p{i}" for i in range(20, 70)}
+    result = estimate_total([first, second])
+    assert result["method"] == "chapman"
+    assert result["observed"] == 70
+    assert result["estimated_total"] == pytest.approx(98.6, abs=0.1)
+
+
+def test_heavy_overlap_means_high_coverage():
+    places = {f"p{i}" for i in range(60)}
+    result = estimate_total([places, places, places - {"p0"}])
+    assert result["method"] == "chao2"
+    assert result["coverage"] == 1.0
+
+
+def test_zip_stops_once_coverage_passes_threshold(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "COVERAGE_STOP_THRESHOLD", 0.9)
+    monkeypatch.setattr(Config, "COVERAGE_MIN_QUERIES", 3)
+    coverage = CoverageEstimator(str(tmp_path))
+
+    coverage.record({"query": "restaurants near 11201", "zip_code": "11201"}, [_link(i) for i in range(50)])
+    coverage.record({"query": "Thai restaurants near 11201", "zip_code": "11201"}, [_link(i) for i in range(45)])
+    assert not coverage.is_covered("11201")  # only two queries so far
+
+    coverage.record({"query": "Pizza restaurants near 11201", "zip_code": "11201"}, [_link(i) for i in range(5, 50)])
+    assert coverage.is_covered("11201")
+    assert not coverage.is_covered("10001")
+
+    coverage.save()
+    assert CoverageEstimator(str(tmp_path)).estimate("11201")["queries"] == 3
@@ -0,0 +1,49 @@
+"""Tests for the per-region cuisine vocabulary."""
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.cuisine_vocab import CuisineVocabulary, cuisine_term
+from gmaps_scraper.geo.locations import generate_cuisine_queries
+
+
+def _records():
+    seattle = [("Thai restaurant", 30), ("Sushi restaurant", 25), ("Coffee shop", 20), ("Pho restaurant", 15)]
+    new_orleans = [("Cajun restaurant", 40), ("Seafood restaurant", 30), ("Restaurant", 50)]
+    records = []
+    for category, count in seattle:
+        records += [{"cuisine_type": category, "zip_code": "98101", "state": "WA"}] * count
+    for category, count in new_orleans:
+        records += [{"cuisine_type": category, "zip_code": "70112", "state": "LA"}] * count
+    return records
+
+
+def test_cuisine_term():
+    assert cuisine_term("Italian restaurant") == "Italian"
+    assert cuisine_term("Coffee shop") == "Coffee shop"
+    assert cuisine_term("Restaurant") is None
+    assert cuisine_term("Park") is None
+
+
+def test_ranking_follows_the_region(monkeypatch):
+    monkeypatch.setattr(Config, "CUISINE_VOCAB_MIN_PLACES", 50)
+    vocabulary = CuisineVocabulary.from_records(_records())
+
+    seattle = [term for term, _ in vocabulary.rank("98109", "WA", limit=3)]
+    assert seattle == ["Thai", "Sushi", "Coffee shop"]
+
+    new_orleans = [term for term, _ in vocabulary.rank("70115", "LA", limit=2)]
+    assert new_orleans == ["Cajun", "Seafood"]
+
+
+def test_cuisine_queries_are_capped_per_zip(monkeypatch):
+    monkeypatch.setattr(Config, "CUISINE_VOCAB_MIN_PLACES", 50)
+    monkeypatch.setattr(Config, "CUISINES_PER_ZIP", 2)
+    vocabulary = CuisineVocabulary.from_records(_records())
+    cities = [{"city": "Seattle", "state": "WA", "population": 750_000, "zips": ["98101", "98109"]}]
+
+    queries = generate_cuisine_queries(cities, {"Thai restaurants near 98109"}, vocabulary=vocabulary)
+
+    assert [q["query"] for q in queries] == [
+        "Thai restaurants near 98101",
+        "Sushi restaurants near 98101",
+        "Sushi restaurants near 98109",
+    ]
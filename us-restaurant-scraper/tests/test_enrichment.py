@@ -0,0 +1,145 @@
+"""Tests for the enrichment queue and batch merging."""
+
+import json
+
+from gmaps_scraper import scraper
+from gmaps_scraper.checkpoint import CheckpointManager
+from gmaps_scraper.config import Config
+from gmaps_scraper.enrichment import (
+    EnrichmentQueue,
+    find_enrichable_fields,
+    merge_enrichment,
+    merge_enrichment_batches,
+)
+from gmaps_scraper.results_index import ResultsIndex, results_index_path
+
+WEEK = {day: "9AM-5PM" for day in ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")}
+
+
+def test_merge_keeps_the_fuller_hours_table():
+    record = {"place_id": "a", "hours_of_operation": WEEK, "review_count": None}
+    changed = merge_enrichment(record, {"place_id": "a", "hours_of_operation": {"Mon": "9AM-5PM"},
+                                        "review_count": 12, "enriched_at": "t"})
+    assert changed
+    assert record["hours_of_operation"] == WEEK
+    assert record["review_count"] == 12
+    assert record["enriched_at"] == "t"
+    assert not merge_enrichment(record, {"place_id": "a", "review_count": None})
+
+
+def test_filled_coordinates_clear_the_entry(tmp_path):
+    queue = EnrichmentQueue(str(tmp_path))
+    record = {"place_id": "a", "name": "Taqueria"}
+    assert "coordinates" in find_enrichable_fields(record)
+    queue.add("a", ["coordinates", "review_count"])
+
+    queue.record_result("a", {"place_id": "a", "latitude": 30.1, "longitude": -97.7})
+    assert queue.get_batch(10)[0]["fields"] == ["review_count"]
+    queue.record_result("a", {"place_id": "a", "review_count": 40})
+    assert queue.pending_count == 0
+
+
+def test_unfilled_entry_is_exhausted_after_max_attempts(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "ENRICHMENT_MAX_ATTEMPTS", 2)
+    queue = EnrichmentQueue(str(tmp_path))
+    queue.add("a", ["review_count"])
+    queue.record_result("a", None)
+    assert queue.pending_count == 1
+    queue.record_result("a", {"place_id": "a", "review_count": None})
+    queue.save()
+
+    reloaded = EnrichmentQueue(str(tmp_path))
+    assert reloaded.get_stats() == {"pending": 0, "exhausted": 1, "by_field": {}}
+    assert not reloaded.add("a", ["review_count"])
+
+
+def test_merge_batches_only_given_files(tmp_path):
+    records = [{"place_id": "a"}, {"place_id": "b"}]
+    for num, place_id in ((1, "a"), (2, "b")):
+        (tmp_path / f"enrichment_batch_{num}.json").write_text(
+            json.dumps([{"place_id": place_id, "phone": "555"}]))
+
+    updated, files = merge_enrichment_batches(str(tmp_path), records,
+                                              [str(tmp_path / "enrichment_batch_2.json")])
+    assert (updated, [r.get("phone") for r in records]) == (1, [None, "555"])
+    assert files == [str(tmp_path / "enrichment_batch_2.json")]
+
+    updated, files = merge_enrichment_batches(str(tmp_path), records)
+    assert updated == 1
+    assert len(files) == 2
+
+
+def test_enrichment_phase_merges_each_batch_once(tmp_path, monkeypatch):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    full = {"cuisine_type": "Mexican", "address": "1 Main St", "latitude": 30.1, "longitude": -97.7,
+            "website": None, "phone": None, "hours_of_operation": WEEK, "price_level": None,
+            "primary_photo_url": None, "review_count": None}
+    records = [dict(full, place_id="a"), dict(full, place_id="b")]
+    assert find_enrichable_fields(records[0]) == ["review_count"]
+    (output_dir / "all_restaurants.json").write_text(json.dumps(records))
+    # Left by an interrupted run: "a" is already filled
+    (output_dir / "enrichment_batch_1.json").write_text(
+        json.dumps([{"place_id": "a", "review_count": 7}]))
+
+    visited = []
+
+    def fake_enrich(tasks, parallel=True):
+        visited.extend(task["place_id"] for task in tasks)
+        return [{"place_id": task["place_id"], "review_count": 9} for task in tasks]
+
+    monkeypatch.setattr(scraper, "enrich_places", fake_enrich)
+    monkeypatch.setattr(Config, "BATCH_DELAY", 0)
+
+    checkpoint = CheckpointManager(str(tmp_path / "checkpoints"))
+    scraper.run_enrichment_phase(checkpoint, output_dir=str(output_dir))
+
+    assert visited == ["b"]
+    saved = json.loads((output_dir / "all_restaurants.json").read_text())
+    assert [r["review_count"] for r in saved] == [7, 9]
+    assert not list(output_dir.glob("enrichment_batch_*.json"))
+
+
+def test_enrichment_phase_covers_journaled_results(tmp_path, monkeypatch):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    (output_dir / "all_restaurants.json").write_text(json.dumps([{"place_id": "a", "name": "A"}]))
+    # Saved by a details run that was killed before merging
+    (output_dir / "all_restaurants.jsonl").write_text(json.dumps({"place_id": "b", "name": "B"}) + "\n")
+
+    monkeypatch.setattr(scraper, "enrich_places", lambda tasks, parallel=True: [
+        {"place_id": task["place_id"], "review_count": 9} for task in tasks])
+    monkeypatch.setattr(Config, "BATCH_DELAY", 0)
+    scraper.run_enrichment_phase(CheckpointManager(str(tmp_path / "checkpoints")), output_dir=str(output_dir))
+
+    saved = json.loads((output_dir / "all_restaurants.json").read_text())
+    assert [(r["place_id"], r["review_count"]) for r in saved] == [("a", 9), ("b", 9)]
+    assert not (output_dir / "all_restaurants.jsonl").exists()
+    index = ResultsIndex.load(results_index_path(str(output_dir)))
+    assert len(index) == 2 and index.completeness()["review_count"] == 2
+
+
+def test_queue_changes_are_journaled(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "ENRICHMENT_JOURNAL_MIN_ENTRIES", 3)
+    queue = EnrichmentQueue(str(tmp_path))
+    queue.add("a", ["review_count"])
+    queue.add("b", ["review_count"])
+    queue.save()
+    assert not (tmp_path / "enrichment_queue.json").exists()
+    assert EnrichmentQueue(str(tmp_path)).pending_count == 2
+
+    # The journal outgrows the queue: folded into the JSON file
+    queue.record_result("a", {"place_id": "a", "review_count": 3})
+    queue.record_result("b", None)
+    queue.save()
+    assert not (tmp_path / "enrichment_queue.journal").exists()
+    assert list(json.loads((tmp_path / "enrichment_queue.json").read_text())) == ["b"]
+
+    # A torn last line is dropped
+    queue.add("c", ["phone"])
+    queue.save()
+    with open(tmp_path / "enrichment_queue.journal", "a") as f:
+        f.write('["d", {"fie')
+    reloaded = EnrichmentQueue(str(tmp_path))
+    assert [task["place_id"] for task in reloaded.get_batch(10)] == ["b", "c"]
+    assert not (tmp_path / "enrichment_queue.journal").exists()
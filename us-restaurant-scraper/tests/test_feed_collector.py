@@ -0,0 +1,67 @@
+"""Tests for the in-page feed collector, with a fake driver scripting its payloads."""
+
+import pytest
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.extractors.feed_collector import FeedCollector, FeedDelta
+from gmaps_scraper.extractors.search import _scroll_and_collect_links
+
+
+class FakeDriver:
+    """Answers the install script with `installed`, then each step with the next payload."""
+
+    def __init__(self, steps, installed=True):
+        self.steps = list(steps)
+        self.installed = installed
+        self.scripts = []
+
+    def run_js(self, script, timeout=None):
+        self.scripts.append(script)
+        if "__feedCollector = state" in script:
+            return self.installed
+        return self.steps.pop(0)
+
+    def sleep(self, seconds):
+        pass
+
+
+def step(links, ended=False, total=0):
+    return {"links": links, "ended": ended, "total": total, "waited_ms": 120}
+
+
+def test_step_returns_the_delta():
+    driver = FakeDriver([step(["a", "b"], total=2)])
+    collector = FeedCollector(driver, max_wait=1.5, settle=0.25)
+    assert collector.install()
+    assert collector.step() == FeedDelta(links=["a", "b"], ended=False, total=2, waited_ms=120)
+
+    script = driver.scripts[-1]
+    assert "feed && true" in script
+    assert "1500" in script and "250" in script
+
+
+def test_missing_feed_and_lost_collector():
+    assert not FeedCollector(FakeDriver([], installed=False)).install()
+    assert FeedCollector(FakeDriver([None])).step(scroll=False) is None
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    monkeypatch.setattr(Config, "MAX_SCROLLS", 10)
+    monkeypatch.setattr(Config, "MAX_EMPTY_SCROLLS", 3)
+
+
+def test_scrolling_stops_at_the_end_of_the_list(budget):
+    driver = FakeDriver([step(["a"]), step(["b", "c"]), step(["d"], ended=True), step(["never"])])
+    links, trace = _scroll_and_collect_links(driver)
+    assert links == ["a", "b", "c", "d"]
+    assert trace["yields"] == [1, 2, 1]
+    assert (trace["ended"], trace["partial"], trace["stop"], trace["depth"]) == (True, False, "end of list", 2)
+    assert driver.steps == [step(["never"])]
+
+
+def test_lost_collector_marks_the_search_partial(budget):
+    driver = FakeDriver([step(["a"]), step(["b"]), None])
+    links, trace = _scroll_and_collect_links(driver)
+    assert links == ["a", "b"]
+    assert (trace["partial"], trace["stop"], trace["depth"]) == (True, "collector lost", 1)
@@ -0,0 +1,147 @@
+"""Tests for the HTTP fast path, against a local stand-in for Google Maps."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.extractors import details
+from gmaps_scraper.extractors.http_client import KeepAliveClient
+from gmaps_scraper.extractors.http_details import fetch_place_page
+
+PLACE_PAGE = (Path(__file__).parent / "fixtures" / "place_page.html").read_bytes()
+PLACE_URL = "https://www.google.com/maps/place/data=!4m2!3m1!1s0x8644b509d4b3f7a1:0x2f1d5c3e9a7b6c40"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves the recorded place page, a consent redirect, a 429 and an empty page."""
+
+    protocol_version = "HTTP/1.1"
+    requests = 0
+
+    def send_body(self, status: int, body: bytes = b"") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        type(self).requests += 1
+        if "!1s0xlimited" in self.path:
+            self.send_body(429)
+            return
+        if "!1s0xconsent" in self.path:
+            self.send_response(302)
+            self.send_header("Location", "https://consent.google.com/ml?continue=x")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = PLACE_PAGE if "/maps/place/" in self.path and "!1s0xempty" not in self.path else b"<html></html>"
+        self.send_body(200, body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(handler_class):
+    """Run a stand-in server on a free port, yielding its base URL."""
+    handler_class.requests = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def stand_in_server():
+    yield from serve(StandInHandler)
+
+
+def test_parses_recorded_place_page(stand_in_server):
+    client = KeepAliveClient(base_url=stand_in_server)
+    page, reason = fetch_place_page(client, PLACE_URL)
+
+    assert reason is None
+    assert page["name"] == "Lucia's Trattoria"
+    assert page["rating"] == 4.6
+    assert page["review_count"] == 1287
+    assert page["cuisine_type"] == "Italian restaurant"
+    assert page["website"] == "https://www.lucias-trattoria.com/"
+    assert (page["latitude"], page["longitude"]) == (30.2672, -97.7431)
+    assert page["hours_text"]["monday"] == "Closed"
+
+
+def test_connection_is_kept_alive(stand_in_server):
+    client = KeepAliveClient(base_url=stand_in_server)
+    for _ in range(3):
+        fetch_place_page(client, PLACE_URL)
+    assert client.connections_opened == 1
+
+
+def test_consent_and_unparseable_pages_fall_back(stand_in_server):
+    client = KeepAliveClient(base_url=stand_in_server)
+
+    page, reason = fetch_place_page(client, PLACE_URL.replace("!1s0x", "!1s0xconsent"))
+    assert page is None and "consent.google.com" in reason
+
+    page, reason = fetch_place_page(client, PLACE_URL.replace("!1s0x", "!1s0xempty"))
+    assert page is None and reason == "no embedded place data"
+
+
+def test_http_record_matches_browser_record_shape(stand_in_server, monkeypatch):
+    monkeypatch.setattr(Config, "HTTP_BASE_URL", stand_in_server)
+    monkeypatch.setattr(details, "_http_client", None)
+
+    results, fallback = details._scrape_places_http(
+        [PLACE_URL, PLACE_URL.replace("!1s0x", "!1s0xempty")]
+    )
+
+    assert fallback == [1]
+    record = results[0]
+    assert record["place_id"] == "0x8644b509d4b3f7a1:0x2f1d5c3e9a7b6c40"
+    assert record["zip_code"] == "78704"
+    assert record["price_level"] == "$$"
+    assert record["hours_of_operation"]["friday"] == {"open": "11:00", "close": "22:30"}
+    assert record["extraction_profile"] == Config.DETAILS_PROFILE
+
+
+def test_rate_limits_pause_the_fast_path(stand_in_server, monkeypatch):
+    monkeypatch.setattr(Config, "HTTP_BASE_URL", stand_in_server)
+    monkeypatch.setattr(Config, "HTTP_CHALLENGE_LIMIT", 2)
+    monkeypatch.setattr(Config, "HTTP_WORKERS", 1)
+    monkeypatch.setattr(details, "_http_client", None)
+
+    limited = [PLACE_URL.replace("!1s0x", f"!1s0xlimited{i}") for i in range(6)]
+    results, fallback = details._scrape_places_http(limited)
+
+    assert results == [None] * 6
+    assert fallback == list(range(6))
+    # Only the fetches up to the limit reached the server
+    assert StandInHandler.requests == 2
+
+
+def test_non_restaurants_are_filtered_without_cuisine_in_the_profile():
+    page = {"name": "Zilker Park", "rating": 4.8, "cuisine_type": "Park", "hours_text": {}}
+    assert details._record_from_http_page(page, PLACE_URL, "hours-only") == (None, False)
+
+    page["cuisine_type"] = "Italian restaurant"
+    record, _ = details._record_from_http_page(page, PLACE_URL, "hours-only")
+    assert "cuisine_type" not in record
+
+
+def test_browser_fallback_results_stay_aligned_with_the_places(stand_in_server, monkeypatch):
+    monkeypatch.setattr(Config, "HTTP_BASE_URL", stand_in_server)
+    monkeypatch.setattr(details, "_http_client", None)
+    monkeypatch.setattr(details, "_scrape_place_details_parallel",
+                        lambda tasks: [{"place_id": "browser"} if "0xempty" in task else None for task in tasks])
+
+    urls = [PLACE_URL.replace("!1s0x", "!1s0xconsent"), PLACE_URL, PLACE_URL.replace("!1s0x", "!1s0xempty")]
+    results = details.scrape_places(urls, use_pool=False, tabs_per_browser=1, prefetch=False,
+                                    http_first=True, aligned=True)
+    assert [r and r["place_id"] for r in results] == [None, "0x8644b509d4b3f7a1:0x2f1d5c3e9a7b6c40", "browser"]
@@ -0,0 +1,115 @@
+"""Tests for the HTTP search backend, against a local stand-in for tbm=map."""
+
+import json
+import re
+import urllib.parse
+
+import pytest
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.extractors.http_client import KeepAliveClient
+from gmaps_scraper.extractors.http_search import fetch_search_results, parse_search_page
+from tests.test_http_details import StandInHandler, serve
+
+# Results each stand-in query has
+QUERY_RESULTS = {"tacos": 45, "flaky": 45, "noodles": 3}
+
+
+def search_place(i: int) -> list:
+    """A place array laid out like the tbm=map payload (see http_details._PLACE_PATHS)."""
+    place = [None] * 40
+    place[4] = [None, None, "$$", None, None, None, None, 4.0 + i % 10 / 10, 100 + i]
+    place[9] = [None, None, 30.0 + i / 1000, -97.0]
+    place[10] = f"0x{i + 1:x}:0x{i + 100:x}"
+    place[11] = f"Place {i}"
+    place[13] = ["Mexican restaurant"]
+    place[39] = f"{i} Main St"
+    return place
+
+
+def search_page(start: int, stop: int) -> str:
+    entries = [[None] * 14 + [search_place(i)] for i in range(start, stop)]
+    return ")]}'\n" + json.dumps([[None, entries]])
+
+
+class SearchStandInHandler(StandInHandler):
+    """Serves paged tbm=map results; "blocked" is rate limited, "flaky" fails after page one."""
+
+    def do_GET(self):
+        if not self.path.startswith("/search"):
+            return super().do_GET()
+        type(self).requests += 1
+        params = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        query = params["q"][0]
+        page_size = int(re.search(r"!7i(\d+)", params["pb"][0]).group(1))
+        offset = int(re.search(r"!8i(\d+)", params["pb"][0]).group(1))
+
+        if query == "blocked":
+            self.send_body(429)
+        elif query == "garbage":
+            self.send_body(200, b"<html>not json</html>")
+        elif query == "flaky" and offset > 0:
+            self.send_body(500)
+        else:
+            total = QUERY_RESULTS.get(query, 0)
+            page = search_page(offset, min(offset + page_size, total))
+            # The web app wraps the payload in {"d": ...}
+            self.send_body(200, (json.dumps({"d": page}) + '/*""*/').encode())
+
+
+@pytest.fixture
+def search_server(monkeypatch):
+    monkeypatch.setattr(Config, "HTTP_SEARCH_PAGE_SIZE", 20)
+    yield from serve(SearchStandInHandler)
+
+
+def test_parse_search_page_reads_links_and_cards():
+    cards = parse_search_page(search_page(0, 2))
+    link, card = next(iter(cards.items()))
+    assert len(cards) == 2
+    assert "!1s0x1:0x64!" in link and link.startswith("https://www.google.com/maps/place/Place+0/")
+    assert card == {"name": "Place 0", "rating": 4.0, "review_count": 100,
+                    "category": "Mexican restaurant", "price_level": "$$",
+                    "address_snippet": "0 Main St"}
+
+
+def test_parse_search_page_end_and_garbage():
+    assert parse_search_page(")]}'\n[[null]]") == {}
+    assert parse_search_page("<html></html>") is None
+
+
+def test_fetch_pages_through_all_results(search_server):
+    client = KeepAliveClient(base_url=search_server)
+    result, reason = fetch_search_results(client, {"query": "tacos"})
+
+    assert reason is None
+    assert result["count"] == 45
+    assert len(set(result["place_links"])) == 45
+    assert set(result["place_cards"]) == set(result["place_links"])
+    assert SearchStandInHandler.requests == 3
+    assert client.connections_opened == 1
+
+
+def test_fetch_stops_at_max_results(search_server):
+    client = KeepAliveClient(base_url=search_server)
+    result, _ = fetch_search_results(client, {"query": "tacos"}, max_results=20)
+    assert result["count"] == 20
+    assert SearchStandInHandler.requests == 1
+
+
+def test_short_first_page_is_the_last(search_server):
+    client = KeepAliveClient(base_url=search_server)
+    result, _ = fetch_search_results(client, {"query": "noodles"})
+    assert result["count"] == 3
+    assert SearchStandInHandler.requests == 1
+
+
+def test_failed_first_page_falls_back_to_the_browser(search_server):
+    client = KeepAliveClient(base_url=search_server)
+    assert fetch_search_results(client, {"query": "blocked"}) == (None, "rate limited (429)")
+    assert fetch_search_results(client, {"query": "garbage"}) == (None, "no parseable results")
+
+
+def test_failed_later_page_falls_back_to_the_browser(search_server):
+    client = KeepAliveClient(base_url=search_server)
+    assert fetch_search_results(client, {"query": "flaky"}) == (None, "HTTP 500 at offset 20")
@@ -0,0 +1,34 @@
+"""Tests for hardware-aware sizing of browser parallelism."""
+
+import json
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.machine import profile_machine, size_for_machine
+
+
+def test_sizing_follows_cores_ram_and_launch_time():
+    big = size_for_machine({"cpu_cores": 10, "load_1m": 1.0, "ram_available_mb": 16_000,
+                            "chrome": {"rss_mb": 300, "processes": 8, "launch_seconds": 1.5}})
+    assert big["max_parallel_browsers"] == 9
+    assert big["max_healthy_chrome"] == 9 * Config.CHROME_PROCESSES_PER_BROWSER + Config.CHROME_PROCESS_BUFFER
+
+    # RAM-bound: (6000 - 2048) / (400 * 2.0) -> 4 browsers, batches scale down with them
+    small = size_for_machine({"cpu_cores": 10, "load_1m": 0.0, "ram_available_mb": 6_000, "chrome": None})
+    assert small["max_parallel_browsers"] == 4
+    assert small["details_batch_size"] < Config.DETAILS_BATCH_SIZE
+
+    slow = size_for_machine({"cpu_cores": 10, "load_1m": 1.0, "ram_available_mb": 16_000,
+                             "chrome": {"rss_mb": 300, "processes": 8, "launch_seconds": 10.0}})
+    assert slow["max_parallel_browsers"] == 4
+
+
+def test_host_profile_overrides(tmp_path, monkeypatch):
+    (tmp_path / "m1.json").write_text(json.dumps({"auto": False, "max_parallel_browsers": 5}))
+    monkeypatch.setattr(Config, "HOST_PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("GMAPS_HOST_PROFILE", "m1")
+
+    profile = profile_machine()
+    assert "measured" not in profile
+    assert profile["chosen"]["max_parallel_browsers"] == 5
+    assert profile["chosen"]["details_batch_size"] == Config.DETAILS_BATCH_SIZE
+    assert profile["overrides"] == ["max_parallel_browsers"]
@@ -0,0 +1,64 @@
+"""Tests for the cached query plan and its completion bitmap."""
+
+import pytest
+
+from gmaps_scraper import plan_cache
+from gmaps_scraper.plan_cache import PlanRows, QueryPlan, QueryPlanCache, _decode_plan, _encode_plan
+
+QUERIES = [
+    {"query": "restaurants in Austin, TX", "city": "Austin", "state": "TX", "type": "city"},
+    {"query": "restaurants near 78701", "city": "Austin", "state": "TX", "zip_code": "78701", "type": "zip"},
+    {"query": "Thai restaurants near 78701", "city": "Austin", "state": "TX", "zip_code": "78701",
+     "cuisine": "Thai", "type": "cuisine_zip", "expected_share": 0.05},
+]
+
+
+def test_encode_decode_round_trip():
+    header, queries = _decode_plan(_encode_plan("abc", PlanRows.from_queries(QUERIES)))
+    assert header["key"] == "abc"
+    assert list(queries) == QUERIES
+    assert queries.query_string(2) == "Thai restaurants near 78701"
+
+
+def test_value_table_overflow_is_an_error(monkeypatch):
+    monkeypatch.setattr(plan_cache, "_VALUE_MASK", 8)
+    rows = PlanRows()
+    rows.append(QUERIES[0])
+    with pytest.raises(ValueError, match="distinct values"):
+        rows.append(QUERIES[2])
+
+
+def test_cache_hit_skips_build(tmp_path):
+    cache = QueryPlanCache(str(tmp_path))
+    builds = []
+
+    def build():
+        builds.append(1)
+        return list(QUERIES)
+
+    first = cache.load_or_build("production", [], {"a": 1}, build)
+    second = cache.load_or_build("production", [], {"a": 1}, build)
+    assert len(builds) == 1
+    assert list(second.queries) == list(first.queries)
+
+    # Changed parameters build a new plan and drop the stale one
+    cache.load_or_build("production", [], {"a": 2}, build)
+    assert len(builds) == 2
+    assert len(list(tmp_path.glob("query_plan_production_*.bin"))) == 1
+
+
+def test_bitmap_tracks_completion_across_loads(tmp_path):
+    # Plans build from a generator without a list of query dicts
+    plan = QueryPlanCache(str(tmp_path)).load_or_build("cuisine", [], {}, lambda: iter(QUERIES))
+    stream = plan.iter_remaining()
+    first = next(stream)
+    plan.mark_completed([first["query"], "not in the plan"])
+    plan.save_completion()
+
+    reloaded = QueryPlan(plan.path, plan.queries)
+    assert reloaded.is_done(0)
+    assert reloaded.done_count() == 1
+    # Searches completed elsewhere (checkpoint) are folded into the bitmap
+    assert reloaded.sync({"Thai restaurants near 78701"}) == 1
+    assert [q["query"] for q in reloaded.iter_remaining()] == ["restaurants near 78701"]
+    assert QueryPlan(plan.path, plan.queries).is_done(2)
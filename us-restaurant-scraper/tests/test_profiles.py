@@ -0,0 +1,41 @@
+"""Tests for details extraction profiles."""
+
+import pytest
+
+from gmaps_scraper.extractors.profiles import (
+    FIELD_COSTS,
+    FIELD_PROFILES,
+    RECORD_COLUMNS,
+    estimate_profile_cost,
+    fill_record_columns,
+    get_profile_fields,
+    missing_profile_fields,
+)
+
+
+def test_full_profile_covers_every_registered_field():
+    assert set(FIELD_PROFILES["full"]) == set(FIELD_COSTS)
+
+
+def test_core_profile_is_cheaper_than_full():
+    assert estimate_profile_cost("core") < estimate_profile_cost("full")
+    assert "hours_of_operation" not in get_profile_fields("core")
+
+
+def test_unknown_profile_raises():
+    with pytest.raises(ValueError):
+        get_profile_fields("everything")
+
+
+def test_missing_fields_ignores_extracted_nones():
+    record = {"name": "Taqueria", "cuisine_type": None, "address": "1 Main St",
+              "latitude": 1.0, "longitude": 2.0}
+    assert missing_profile_fields(record, "core") == []
+    assert "hours_of_operation" in missing_profile_fields(record, "full")
+
+
+def test_filled_records_share_every_column():
+    filled = fill_record_columns([{"name": "Taqueria", "hours_of_operation": {}}, {"name": "Pho 88", "extra": 1}])
+    assert list(filled[0]) == list(RECORD_COLUMNS)
+    assert list(filled[1]) == list(RECORD_COLUMNS) + ["extra"]
+    assert filled[1]["hours_of_operation"] is None
@@ -0,0 +1,68 @@
+"""Tests for canonical 64-bit query keys and the completed-search checkpoint built on them."""
+
+import json
+
+from gmaps_scraper.checkpoint import CheckpointManager
+from gmaps_scraper.config import Config
+from gmaps_scraper.geo.query_codec import KIND_TEXT, QueryCodec, unique_queries, write_keys
+from gmaps_scraper.geo.tiles import tile_query
+
+
+def test_structured_queries_round_trip():
+    codec = QueryCodec()
+    queries = [
+        "restaurants near 02129",
+        "Thai restaurants near 11201",
+        "restaurants in Garden Grove, California",
+        tile_query(12, 1205, 1539, search_term="Thai restaurants")["query"],
+    ]
+    for query in queries:
+        key = codec.key(query)
+        assert key >> 60 != KIND_TEXT
+        assert key < 2 ** 64
+        assert codec.render(key) == query
+
+
+def test_unstructured_queries_fall_back_to_hash():
+    codec = QueryCodec()
+    key = codec.key("cafes near 10001")
+    assert key >> 60 == KIND_TEXT
+    assert codec.render(key) is None
+    assert codec.key("cafes near 10001") == key
+
+
+def test_checkpoint_migrates_query_text(tmp_path):
+    legacy = ["restaurants near 11201", "restaurants in Austin, Texas", "cafes near 10001"]
+    (tmp_path / "completed_searches.json").write_text(json.dumps(legacy))
+
+    checkpoint = CheckpointManager(str(tmp_path))
+    assert all(checkpoint.is_search_completed(q) for q in legacy)
+    assert not checkpoint.is_search_completed("restaurants in Dallas, Texas")
+    assert (tmp_path / "completed_searches.keys").stat().st_size == 8 * len(legacy)
+    assert not (tmp_path / "completed_searches.json").exists()
+
+    checkpoint.mark_search_completed("Thai restaurants near 11201")
+    checkpoint.save_all()
+    reloaded = CheckpointManager(str(tmp_path))
+    assert reloaded.get_completed_searches_count() == 4
+    assert "restaurants in Austin, Texas" in set(reloaded.get_completed_searches())
+
+
+def test_one_key_per_search_across_modes_and_spellings(tmp_path, monkeypatch):
+    codec = QueryCodec()
+    zip_query = {"query": "restaurants near 10001", "zip_code": "10001", "type": "zip"}
+    fill_query = {"query": "restaurants near 10001", "zip_code": "10001", "type": "zip_fill"}
+    assert codec.key("soul food  restaurants near 10001") == codec.key("Soul food restaurants near 10001")
+    assert codec.canonical("SOUL FOOD restaurants near 10001") == "Soul food restaurants near 10001"
+    assert codec.key("Poke restaurants near 10001") == codec.key("poke restaurants near 10001")
+    assert len(list(unique_queries([zip_query, fill_query], codec))) == 1
+
+    # A search completed by the recovery run is never repeated by the main run
+    shared = tmp_path / "recovery.keys"
+    write_keys(str(shared), [codec.key("Thai restaurants near 10001")])
+    monkeypatch.setattr(Config, "SHARED_COMPLETED_SEARCHES", [str(shared)])
+    checkpoint = CheckpointManager(str(tmp_path / "checkpoints"))
+    checkpoint.mark_search_completed("soul food restaurants near 10001")
+    assert checkpoint.is_search_completed("Soul food restaurants near 10001")
+    assert checkpoint.is_search_completed("thai restaurants near 10001")
+    assert checkpoint.get_completed_searches_count() == 1
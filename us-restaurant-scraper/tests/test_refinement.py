@@ -0,0 +1,83 @@
+"""Tests for cap-triggered query refinement."""
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.cuisines import CUISINE_TYPES
+from gmaps_scraper.geo.locations import iter_cuisine_queries
+from gmaps_scraper.refinement import RefinementQueue, refine_query
+
+ZIP_QUERY = {
+    "query": "restaurants near 11201",
+    "zip_code": "11201",
+    "city": "Brooklyn",
+    "state": "NY",
+    "type": "zip",
+    "lat": "40.6501",
+    "lng": "-73.9496",
+    "centroid": "zip",
+}
+
+
+def test_unsaturated_search_is_not_refined():
+    assert refine_query(ZIP_QUERY, 15) == []
+
+
+def test_saturated_search_refines_by_cuisine_then_sub_area():
+    cuisines = refine_query(ZIP_QUERY, Config.REFINE_SATURATION_AT)
+    assert len(cuisines) == len(CUISINE_TYPES)
+    assert cuisines[0]["query"] == f"{CUISINE_TYPES[0]} restaurants near 11201"
+    assert cuisines[0]["refine_depth"] == 1
+
+    sub_areas = refine_query(cuisines[0], 120)
+    assert len(sub_areas) == 4
+    assert all(q["type"] == "tile" and q["cuisine"] == CUISINE_TYPES[0] for q in sub_areas)
+    assert sub_areas[0]["search_term"] == f"{CUISINE_TYPES[0]} restaurants"
+    assert sub_areas[0]["refined_from"] == cuisines[0]["query"]
+
+
+def test_zips_with_their_own_centroids_refine_to_their_own_sub_areas():
+    brooklyn = {"city": "Brooklyn", "state": "NY", "population": 2_500_000, "lat": "40.6501",
+                "lng": "-73.9496", "zips": ["11201", "11224", "11237"]}
+    centroids = {"11201": (40.6940, -73.9903), "11224": (40.5773, -73.9888)}
+    queries = [q for q in iter_cuisine_queries([brooklyn], set(), zip_centroids=centroids)
+               if q["cuisine"] == CUISINE_TYPES[0]]
+    assert [q["centroid"] for q in queries] == ["zip", "zip", "city"]
+
+    tiles = [refine_query(q, 120) for q in queries]
+    assert tiles[0] and tiles[1]
+    assert {q["query"] for q in tiles[0]}.isdisjoint(q["query"] for q in tiles[1])
+    # 11237 only knows the city centre, which other zips' searches would share
+    assert tiles[2] == []
+
+
+def test_city_cuisine_query_refines_around_the_city_centre():
+    city_query = {"query": "restaurants in Brooklyn, NY", "city": "Brooklyn", "state": "NY",
+                  "type": "city", "lat": "40.6501", "lng": "-73.9496"}
+    cuisine = refine_query(city_query, 120)[0]
+    assert len(refine_query(cuisine, 120)) == 4
+
+
+def test_queue_runs_seeds_first_then_most_saturated_parents():
+    seeds = [{"query": "a"}, {"query": "b"}]
+    queue = RefinementQueue(seeds)
+    queue.push({"query": "child of 100", "refine_depth": 1, "parent_count": 100})
+    queue.push({"query": "child of 120", "refine_depth": 1, "parent_count": 120})
+    queue.push({"query": "c"})
+
+    order = [q["query"] for q in queue.pop_batch(10)]
+    assert order == ["a", "b", "c", "child of 120", "child of 100"]
+    assert len(queue) == 0
+    assert not queue
+
+
+def test_queue_draws_seeds_lazily():
+    drawn = []
+
+    def seeds():
+        for i in range(1000):
+            drawn.append(i)
+            yield {"query": f"seed {i}"}
+
+    queue = RefinementQueue(seeds())
+    assert [q["query"] for q in queue.pop_batch(3)] == ["seed 0", "seed 1", "seed 2"]
+    assert len(drawn) <= 4
+    assert queue
@@ -0,0 +1,43 @@
+"""Tests for the columnar results index behind `gmaps-scraper stats`."""
+
+import json
+
+from gmaps_scraper.results_index import ResultsIndex, load_results_index, results_index_path
+
+RECORDS = [
+    {"place_id": "1", "state": "TX", "city": "Austin", "cuisine_type": "Thai restaurant", "rating": 4.6,
+     "hours_of_operation": {"Monday": "9-5"}},
+    {"place_id": "2", "state": "TX", "city": "Dallas", "cuisine_type": "Thai restaurant", "rating": 4.2},
+    {"place_id": "3", "state": "CA", "city": "Los Angeles", "cuisine_type": "Taco restaurant", "rating": 4.8,
+     "hours_of_operation": {}},
+    {"place_id": "4", "name": "No address", "rating": None},
+]
+
+
+def test_filters_and_counts():
+    index = ResultsIndex.build("unused.bin", RECORDS)
+    assert index.count(state="tx", cuisine="thai", min_rating=4.5) == 1
+    assert index.count(missing="hours_of_operation") == 3
+    assert index.count(city="austin, tx") == 1
+
+    texas = list(index.rows(state="TX"))
+    assert index.counts_by("city", texas) == {"Austin, TX": 1, "Dallas, TX": 1}
+    assert index.rating_buckets()["4.5-5.0"] == 2
+    assert index.rating_buckets()["unrated"] == 1
+    assert index.completeness()["state"] == 3
+
+
+def test_incremental_updates_survive_reload(tmp_path):
+    results_file = tmp_path / "all_restaurants.json"
+    results_file.write_text(json.dumps(RECORDS[:2]))
+
+    index = ResultsIndex.build(results_index_path(str(tmp_path)), RECORDS[:2])
+    index.save(source_file=str(results_file))
+    # A batch saved before all_restaurants.json is rewritten is still counted
+    index.extend(RECORDS[2:])
+    index.save()
+    assert load_results_index(str(tmp_path)).count() == 4
+
+    # all_restaurants.json rewritten by another tool: the index is rebuilt from it
+    results_file.write_text(json.dumps(RECORDS[:1]))
+    assert load_results_index(str(tmp_path)).count() == 1
@@ -0,0 +1,64 @@
+"""Tests for scroll budgets planned from yield history."""
+
+import pytest
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.extractors.scroll_policy import ScrollPolicy, policy_keys, predicted_gain
+
+ZIP_QUERY = {"query": "restaurants in 78704", "type": "zip", "zip_code": "78704", "state": "TX"}
+
+
+@pytest.fixture
+def policy(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "SCROLL_POLICY_MIN_SAMPLES", 3)
+    monkeypatch.setattr(Config, "MAX_SCROLLS", 7)
+    monkeypatch.setattr(Config, "SCROLL_EXTEND_RATE", 0.5)
+    monkeypatch.setattr(Config, "SCROLL_EXTEND_STEP", 3)
+    monkeypatch.setattr(Config, "MAX_SCROLLS_EXTENDED", 12)
+    monkeypatch.setattr(Config, "SCROLL_MIN_MARGINAL_LINKS", 1.0)
+    return ScrollPolicy(str(tmp_path))
+
+
+def test_policy_keys():
+    assert policy_keys(ZIP_QUERY) == ("zip|787", "zip|*")
+    assert policy_keys({"type": "city", "state": "TX"}) == ("city|TX", "city|*")
+    assert policy_keys({}) == ("unknown|*", "unknown|*")
+
+
+def test_no_history_uses_the_default_budget(policy):
+    policy.record(ZIP_QUERY, {"yields": [20, 10]})
+    assert policy.plan(ZIP_QUERY) == {"scroll_budget": 7, "scroll_expected": []}
+
+
+def test_saturated_searches_are_cut_at_the_last_productive_scroll(policy):
+    for _ in range(3):
+        policy.record(ZIP_QUERY, {"yields": [20, 8, 2, 0, 0, 0, 0, 0]})
+    plan = policy.plan(ZIP_QUERY)
+    assert plan["scroll_budget"] == 3
+    assert plan["scroll_expected"][:4] == [20.0, 8.0, 2.0, 0.0]
+    assert predicted_gain(plan["scroll_expected"], 3) == 0.0
+
+
+def test_budget_grows_while_searches_still_yield_at_the_cap(policy):
+    for _ in range(3):
+        policy.record(ZIP_QUERY, {"yields": [20] + [5] * 7, "capped": True})
+    assert policy.plan(ZIP_QUERY)["scroll_budget"] == 10
+
+    # The next round tried 10 scrolls and still hit the cap: grow to the ceiling
+    for _ in range(6):
+        policy.record(ZIP_QUERY, {"yields": [20] + [5] * 10, "capped": True})
+    assert policy.plan(ZIP_QUERY)["scroll_budget"] == 12
+
+
+def test_area_history_falls_back_to_the_query_type(policy):
+    for _ in range(3):
+        policy.record(ZIP_QUERY, {"yields": [20, 8, 0]})
+    other_area = dict(ZIP_QUERY, zip_code="10001")
+    assert policy.plan(other_area)["scroll_budget"] == 2
+
+
+def test_history_is_persisted(policy, tmp_path):
+    for _ in range(3):
+        policy.record(ZIP_QUERY, {"yields": [20, 8, 0]})
+    policy.save()
+    assert ScrollPolicy(str(tmp_path)).plan(ZIP_QUERY)["scroll_budget"] == 2
@@ -0,0 +1,61 @@
+"""Tests for the search phase's handling of interrupted searches."""
+
+import pytest
+
+from gmaps_scraper import scraper
+from gmaps_scraper.checkpoint import CheckpointManager
+from gmaps_scraper.config import Config
+from gmaps_scraper.deduplication import DeduplicationManager
+
+QUERY = {"query": "restaurants in 78704", "type": "zip", "zip_code": "78704", "state": "TX"}
+
+
+@pytest.fixture
+def searches(monkeypatch):
+    """Queue of fake search outcomes; each call records the query dicts it was given."""
+    outcomes = []
+    calls = []
+
+    def fake_scrape_searches(queries, parallel=True, backend=None):
+        calls.append(queries)
+        depth, links = outcomes.pop(0)
+        return [{
+            "search_data": q,
+            "place_links": links,
+            "count": len(links),
+            "partial": depth is not None,
+            "scroll_depth": depth or 0,
+            "error": "driver died" if depth is not None else None,
+        } for q in queries]
+
+    monkeypatch.setattr(scraper, "scrape_searches", fake_scrape_searches)
+    monkeypatch.setattr(Config, "BATCH_DELAY", 0)
+    return outcomes, calls
+
+
+def test_partial_search_is_resumed_deeper_and_failed_once(tmp_path, searches):
+    outcomes, calls = searches
+    checkpoint = CheckpointManager(str(tmp_path))
+    dedup = DeduplicationManager(str(tmp_path / "seen_places.json"))
+
+    def run():
+        scraper.run_search_phase(checkpoint, dedup, [dict(QUERY)], refine=False)
+
+    outcomes.append((3, ["https://maps/place/a"]))
+    run()
+    assert "resume_depth" not in calls[0][0]
+    assert checkpoint.get_pending_links() == ["https://maps/place/a"]
+    assert not checkpoint.is_search_completed(QUERY["query"])
+
+    outcomes.append((5, ["https://maps/place/a", "https://maps/place/b"]))
+    run()
+    assert calls[1][0]["resume_depth"] == 3
+    failures = checkpoint.get_failures()
+    assert len(failures) == 1 and failures[0]["attempts"] == 2
+
+    outcomes.append((None, ["https://maps/place/c"]))
+    run()
+    assert calls[2][0]["resume_depth"] == 5
+    assert checkpoint.is_search_completed(QUERY["query"])
+    assert checkpoint.get_partial_searches() == {}
+    assert checkpoint.get_pending_links() == [f"https://maps/place/{x}" for x in "abc"]
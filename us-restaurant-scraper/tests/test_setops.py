@@ -0,0 +1,44 @@
+"""Tests for the streaming place id set operations."""
+
+import json
+
+from gmaps_scraper import setops
+from gmaps_scraper.checkpoint import CheckpointManager
+from gmaps_scraper.cli import main as cli_main
+from gmaps_scraper.setops import load_place_ids, place_id_for_key, place_key, place_key_set_operation
+
+A, B, C, D = "0x89c259a1:0x1f", "0x89c259a2:0x2e", "0x80dc2b7f:0xabc", "0x1:0xffffffffffffffff"
+
+
+def test_place_keys_round_trip_and_sort_numerically():
+    assert place_id_for_key(place_key(D)) == D
+    assert place_key("ChIJ-not-a-hex-id") is None
+    assert sorted([A, C, D], key=place_key) == [D, C, A]
+
+
+def test_rejected_places_by_external_merge(tmp_path, monkeypatch):
+    # Tiny chunks and runs, so ids straddle chunk ends and every source spills several runs
+    monkeypatch.setattr(setops, "_CHUNK_SIZE", 64)
+    (tmp_path / "seen_places.json").write_text(json.dumps({"place_ids": [A, B, C, D], "hashes": ["0a1b"]}))
+    (tmp_path / "all_restaurants.json").write_text(json.dumps([
+        {"place_id": A, "google_maps_url": f"https://www.google.com/maps/place/data=!1s{B}"},
+    ]))
+    checkpoint = CheckpointManager(str(tmp_path))
+    checkpoint.add_pending_links([f"https://www.google.com/maps/place/x/data=!4m2!3m1!1s{C}"])
+
+    sources = [str(tmp_path / name) for name in ("seen_places.json", "all_restaurants.json", "pending_links.json")]
+    output = str(tmp_path / "rejected.pk")
+    assert place_key_set_operation("diff", sources, output=output, run_keys=2) == 2
+    assert load_place_ids(output) == [D, B]
+
+    assert place_key_set_operation("intersect", [output, sources[0]], run_keys=2) == 2
+    assert place_key_set_operation("union", [output, sources[1]], output=str(tmp_path / "u.json")) == 3
+    assert json.loads((tmp_path / "u.json").read_text()) == [D, A, B]
+
+
+def test_setops_cli_reports_bad_sources(tmp_path, capsys):
+    fake = tmp_path / "fake.pk"
+    fake.write_text("[]")
+    assert cli_main(["setops", "union", str(fake)]) == 1
+    assert cli_main(["setops", "union", str(tmp_path / "missing.json")]) == 1
+    assert "is not a place key file" in capsys.readouterr().out
@@ -0,0 +1,45 @@
+"""Tests for the streaming results sink."""
+
+import json
+
+from gmaps_scraper.results_index import load_results_index
+from gmaps_scraper.sinks import ResultsSink
+
+
+def test_journal_survives_an_interrupted_run(tmp_path):
+    (tmp_path / "all_restaurants.json").write_text(json.dumps([{"place_id": "a", "state": "TX"}]))
+
+    sink = ResultsSink(str(tmp_path))
+    added = sink.add([{"place_id": "a"}, {"place_id": "b", "state": "CA"}])
+    assert [r["place_id"] for r in added] == ["b"]
+    # Killed before close(): the results file is untouched, the batch is journaled
+    assert len(json.loads((tmp_path / "all_restaurants.json").read_text())) == 1
+    assert load_results_index(str(tmp_path)).count() == 2
+
+    reopened = ResultsSink(str(tmp_path))
+    assert [r["place_id"] for r in reopened.replayed] == ["b"]
+    reopened.add([{"place_id": "c"}])
+    reopened.close()
+
+    merged = json.loads((tmp_path / "all_restaurants.json").read_text())
+    assert [r["place_id"] for r in merged] == ["a", "b", "c"]
+    assert not (tmp_path / "all_restaurants.jsonl").exists()
+    assert load_results_index(str(tmp_path)).count() == 3
+
+
+def test_torn_journal_line_is_cut_before_the_next_append(tmp_path):
+    journal = tmp_path / "all_restaurants.jsonl"
+    journal.write_text(json.dumps({"place_id": "a"}) + "\n" + '{"place_id": "b", "na')
+
+    sink = ResultsSink(str(tmp_path))
+    assert [r["place_id"] for r in sink.replayed] == ["a"]
+    sink.add([{"place_id": "c"}])
+
+    reopened = ResultsSink(str(tmp_path))
+    assert [r["place_id"] for r in reopened.replayed] == ["a", "c"]
+
+
+def test_whole_last_record_without_newline_is_kept(tmp_path):
+    (tmp_path / "all_restaurants.jsonl").write_text(json.dumps({"place_id": "a"}))
+    ResultsSink(str(tmp_path)).add([{"place_id": "b"}])
+    assert [r["place_id"] for r in ResultsSink(str(tmp_path)).replayed] == ["a", "b"]
@@ -0,0 +1,147 @@
+"""Tests for tab multiplexing, with a fake driver in place of Chrome."""
+
+import time
+
+import pytest
+
+from gmaps_scraper.extractors.tabs import PrefetchPipeline, TabMultiplexer, WorkQueue
+
+
+class FakeTab:
+    """A tab whose document completes `load_seconds` after it was opened (never if None)."""
+
+    def __init__(self, url, load_seconds):
+        self.url = url
+        self.opened_at = time.time()
+        self.load_seconds = load_seconds
+        self.closed = False
+
+    def evaluate(self, script, await_promise=False):
+        return self.load_seconds is not None and time.time() - self.opened_at >= self.load_seconds
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, load_seconds):
+        self.load_seconds = load_seconds
+        self.tabs = []
+
+    def get(self, url, new_tab=False):
+        self.tabs.append(FakeTab(url, self.load_seconds.get(url, 0)))
+        return self.tabs[-1]
+
+
+class FakeDriver:
+    def __init__(self, load_seconds=None):
+        self._browser = FakeBrowser(load_seconds or {})
+        self.current_tab = None
+
+    def switch_to_tab(self, tab):
+        self.current_tab = tab
+
+
+def extract_url(driver, item):
+    return driver.current_tab.url
+
+
+def test_work_queue_claims_and_puts_back():
+    work = WorkQueue(["a", "b", "c"], url_of=str.upper)
+    assert work.claim_url("B") == (1, "b")
+    assert work.claim_url("X") is None
+    assert work.get() == (0, "a")
+    work.put_back(0, "a")
+    assert [work.get(), work.get(), work.get()] == [(0, "a"), (2, "c"), None]
+    assert work.empty()
+
+
+def test_multiplexer_extracts_every_item():
+    driver = FakeDriver()
+    work = WorkQueue(["a", "b", "c", "d", "e"], url_of=str.upper)
+    results = [None] * 5
+    mux = TabMultiplexer(driver, extract_url, str.upper, max_tabs=2, settle_seconds=0)
+    mux.run(work, results)
+    assert results == ["A", "B", "C", "D", "E"]
+    assert mux.pages == 5
+    assert all(tab.closed for tab in driver._browser.tabs)
+
+
+def test_loaded_tabs_waiting_for_extraction_are_not_dropped():
+    def slow_extract(driver, item):
+        time.sleep(0.15)
+        return extract_url(driver, item)
+
+    driver = FakeDriver()
+    work = WorkQueue(["a", "b", "c"], url_of=str.upper)
+    results = [None] * 3
+    mux = TabMultiplexer(driver, slow_extract, str.upper, max_tabs=3,
+                         hang_timeout=0.1, settle_seconds=0)
+    mux.run(work, results)
+    assert results == ["A", "B", "C"]
+
+
+def test_hung_tab_only_loses_its_own_item():
+    driver = FakeDriver({"B": None})
+    work = WorkQueue(["a", "b", "c"], url_of=str.upper)
+    results = [None] * 3
+    mux = TabMultiplexer(driver, extract_url, str.upper, max_tabs=3,
+                         hang_timeout=0.1, settle_seconds=0)
+    mux.run(work, results)
+    assert results == ["A", None, "C"]
+    assert work.empty()
+
+
+def test_lost_browser_requeues_in_flight_items():
+    driver = FakeDriver()
+
+    def dead_switch(tab):
+        raise ConnectionRefusedError("connection refused")
+
+    driver.switch_to_tab = dead_switch
+    work = WorkQueue(["a", "b"], url_of=str.upper)
+    mux = TabMultiplexer(driver, extract_url, str.upper, max_tabs=2, settle_seconds=0)
+    with pytest.raises(ConnectionRefusedError):
+        mux.run(work, [None, None])
+    assert sorted(item for _, item in [work.get(), work.get()]) == ["a", "b"]
+
+
+def test_prefetch_loads_the_next_item_before_extracting():
+    driver = FakeDriver()
+    opened_before_extract = []
+
+    def extract(driver, item):
+        opened_before_extract.append(len(driver._browser.tabs))
+        return extract_url(driver, item)
+
+    work = WorkQueue(["a", "b", "c"], url_of=str.upper)
+    results = [None] * 3
+    pipeline = PrefetchPipeline(driver, extract, str.upper, settle_seconds=0)
+    pipeline.run(work, results)
+    assert results == ["A", "B", "C"]
+    # "b" is already loading while "a" is extracted, "c" while "b" is
+    assert opened_before_extract == [2, 3, 3]
+    assert pipeline.carried is None
+
+
+def test_prefetched_lookahead_is_carried_into_the_next_batch():
+    driver = FakeDriver()
+    first = PrefetchPipeline(driver, extract_url, str.upper, settle_seconds=0)
+    first.run(WorkQueue(["a"], url_of=str.upper), [None], WorkQueue(["b", "c"], url_of=str.upper))
+    assert first.carried.url == "B"
+
+    results = [None, None]
+    second = PrefetchPipeline(driver, extract_url, str.upper, settle_seconds=0, carried=first.carried)
+    second.run(WorkQueue(["c", "b"], url_of=str.upper), results)
+    assert results == ["C", "B"]
+    assert second.prefetch_hits == 1
+    # "b" was not loaded a second time
+    assert [tab.url for tab in driver._browser.tabs] == ["A", "B", "C"]
+
+
+def test_prefetch_drops_a_hung_tab():
+    driver = FakeDriver({"A": None})
+    results = [None, None]
+    pipeline = PrefetchPipeline(driver, extract_url, str.upper, hang_timeout=0.1, settle_seconds=0)
+    pipeline.run(WorkQueue(["a", "b"], url_of=str.upper), results)
+    assert results == [None, "B"]
@@ -0,0 +1,43 @@
+"""Tests for the viewport tile planner."""
+
+from gmaps_scraper.config import Config
+from gmaps_scraper.extractors.search import _search_url
+from gmaps_scraper.geo.tiles import plan_tile_queries, subdivide_if_saturated, tile_center, tile_for
+
+CITIES_CSV = """city,city_ascii,state_id,state_name,county_fips,county_name,lat,lng,population,zips
+Manhattan,Manhattan,NY,New York,36061,New York,40.7834,-73.9662,1628706,10001 10002
+Brooklyn,Brooklyn,NY,New York,36047,Kings,40.6501,-73.9496,2576771,11201
+Marfa,Marfa,TX,Texas,48377,Presidio,30.3095,-104.0206,1788,79843
+"""
+
+
+def test_tile_center_lies_in_its_tile():
+    for zoom in (4, 10, 15):
+        tile = tile_for(40.7834, -73.9662, zoom)
+        assert tile_for(*tile_center(*tile), zoom) == tile
+
+
+def test_seed_tiles_merge_nearby_cities(tmp_path):
+    cities_csv = tmp_path / "uscities.csv"
+    cities_csv.write_text(CITIES_CSV)
+
+    queries = plan_tile_queries(cities_csv=str(cities_csv), base_zoom=9, min_population=1000)
+
+    # Manhattan and Brooklyn share a zoom-9 tile; Marfa gets its own
+    assert len(queries) == 2
+    assert queries[0]["state"] == "NY"
+    assert queries[0]["type"] == "tile"
+    assert _search_url(queries[0]).startswith("https://www.google.com/maps/search/restaurants/@")
+
+
+def test_only_saturated_tiles_split():
+    parent = {"tile": "10/301/384", "search_term": "restaurants", "state": "NY"}
+
+    assert subdivide_if_saturated(parent, Config.TILE_SPLIT_AT - 1) == []
+
+    children = subdivide_if_saturated(parent, Config.TILE_SPLIT_AT)
+    assert [c["tile"] for c in children] == ["11/602/768", "11/603/768", "11/602/769", "11/603/769"]
+    assert all(c["state"] == "NY" for c in children)
+
+    deepest = {"tile": f"{Config.TILE_MAX_ZOOM}/0/0"}
+    assert subdivide_if_saturated(deepest, 120) == []
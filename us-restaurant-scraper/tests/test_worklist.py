@@ -0,0 +1,83 @@
+"""Tests for the work-list runner and its journaled pending links."""
+
+import json
+
+import pytest
+
+from gmaps_scraper import extractors
+from gmaps_scraper.checkpoint import CheckpointManager
+from gmaps_scraper.config import Config
+from gmaps_scraper.worklist import run_worklist
+
+
+def test_pending_links_are_journaled(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "PENDING_JOURNAL_MIN_ENTRIES", 4)
+    checkpoint = CheckpointManager(str(tmp_path))
+    assert checkpoint.add_pending_links(["a", "b", "c", "b"]) == 3
+    checkpoint.remove_processed_links(["b", "x"])
+    assert not (tmp_path / "pending_links.json").exists()
+    assert CheckpointManager(str(tmp_path)).get_pending_links() == ["a", "c"]
+
+    # Once the journal outgrows the pending links it is folded into the JSON file
+    checkpoint.remove_processed_links(["a"])
+    assert not (tmp_path / "pending_links.journal").exists()
+    assert json.loads((tmp_path / "pending_links.json").read_text()) == ["c"]
+    assert CheckpointManager(str(tmp_path)).get_pending_links() == ["c"]
+
+
+def test_place_ids_file_is_queued_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    place_ids = tmp_path / "place_ids.json"
+    place_ids.write_text(json.dumps(["0x1:0x2", "0x3:0x4"]))
+
+    run_worklist(place_ids_file=str(place_ids), checkpoint_dir="work", details=False)
+    checkpoint = CheckpointManager("work")
+    assert checkpoint.get_pending_links() == [
+        "https://www.google.com/maps/place/data=!4m2!3m1!1s0x1:0x2",
+        "https://www.google.com/maps/place/data=!4m2!3m1!1s0x3:0x4",
+    ]
+    checkpoint.remove_processed_links(checkpoint.get_pending_links()[:1])
+
+    # A restart with the same file does not queue the visited place again
+    run_worklist(place_ids_file=str(place_ids), checkpoint_dir="work", details=False)
+    progress = CheckpointManager("work").get_progress()
+    assert progress["pending_links"] == 1
+    assert progress["seen_dedup"] is False
+
+
+@pytest.fixture
+def details_loop(tmp_path, monkeypatch):
+    """Runs the details loop one link per batch; only the first place passes the filters."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Config, "DETAILS_BATCH_SIZE", 1)
+    monkeypatch.setattr(Config, "WORKLIST_MAX_BAD_BATCHES", 2)
+    monkeypatch.setattr(Config, "BATCH_DELAY", 0)
+    monkeypatch.setattr(Config, "CHROME_HEALTH_CHECK_BATCHES", 100)
+
+    def scrape_places(batch, parallel=False):
+        return [{"place_id": link.rsplit("1s", 1)[1], "name": "Taqueria"} if link.endswith("0x1:0x1")
+                else None for link in batch]
+
+    monkeypatch.setattr(extractors, "scrape_places", scrape_places)
+    ids = tmp_path / "place_ids.json"
+    ids.write_text(json.dumps([f"0x{i}:0x{i}" for i in range(1, 6)]))
+    return ids
+
+
+def test_rejected_places_do_not_halt_a_place_ids_run(details_loop):
+    run_worklist(place_ids_file=str(details_loop), checkpoint_dir="work")
+    progress = CheckpointManager("work").get_progress()
+    assert (progress["phase"], progress["pending_links"]) == ("complete", 0)
+    saved = json.loads(open("output/all_restaurants.json").read())
+    assert [r["place_id"] for r in saved] == ["0x1:0x1"]
+
+
+def test_empty_batches_halt_a_links_run(details_loop):
+    place_ids = json.loads(details_loop.read_text())
+    links = [f"https://www.google.com/maps/place/data=!4m2!3m1!1s{i}" for i in place_ids]
+    links_file = details_loop.with_name("links.json")
+    links_file.write_text(json.dumps(links))
+
+    run_worklist(links_file=str(links_file), checkpoint_dir="work")
+    # Batches two and three returned nothing
+    assert CheckpointManager("work").get_progress()["pending_links"] == 2
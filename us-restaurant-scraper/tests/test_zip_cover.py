@@ -0,0 +1,44 @@
+"""Tests for coverage-driven zip selection."""
+
+from gmaps_scraper.geo.locations import generate_remaining_zip_queries
+from gmaps_scraper.geo.zip_cover import GridIndex, ZipCover
+
+# Three zips within ~1 km of each other and one ~10 km away
+CENTROIDS = {
+    "10001": (40.7500, -73.9970),
+    "10002": (40.7580, -73.9930),
+    "10003": (40.7520, -73.9880),
+    "10301": (40.6400, -74.0800),
+}
+
+
+def test_grid_index_radius_query():
+    index = GridIndex(CENTROIDS, cell_km=3.0)
+    assert sorted(index.within(40.7500, -73.9970, 2.0)) == ["10001", "10002", "10003"]
+    assert index.within(40.6400, -74.0800, 2.0) == ["10301"]
+
+
+def test_cover_picks_one_zip_per_cluster():
+    cover = ZipCover(CENTROIDS, radius_km=3.0)
+    selected = cover.select(["10001", "10002", "10003", "10301", "99999"])
+    assert len(selected) == 3
+    assert "10301" in selected
+    assert selected[-1] == "99999"  # no centroid, always kept
+
+
+def test_dense_zips_shrink_the_search_radius():
+    cover = ZipCover(CENTROIDS, densities={"10001": 480, "10002": 480, "10003": 480}, radius_km=1.5)
+    selected = cover.select(["10001", "10002", "10003"])
+    assert sorted(selected) == ["10001", "10002", "10003"]
+
+
+def test_fill_gaps_uses_covering_zips(tmp_path):
+    cities_csv = tmp_path / "uscities.csv"
+    cities_csv.write_text(
+        "city,state_id,state_name,lat,lng,population,zips\n"
+        "New York,NY,New York,40.71,-74.0,8000000,10001 10002 10003 10301\n"
+    )
+    cover = ZipCover(CENTROIDS, radius_km=3.0)
+    queries = generate_remaining_zip_queries(set(), cities_csv=str(cities_csv), zip_cover=cover)
+    assert len(queries) == 2
+    assert all(q["lat"] == CENTROIDS[q["zip_code"]][0] for q in queries)
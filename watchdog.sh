@@ -56,7 +56,7 @@ get_checkpoint() {
     local scraper_type="$1"
     case "$scraper_type" in
         recovery) echo "$SCRAPER_DIR/checkpoints_recovery/progress.json" ;;
-        rescrape) echo "$SCRAPER_DIR/checkpoints/rescrape_done.json" ;;
+        rescrape) echo "$SCRAPER_DIR/checkpoints_rescrape/progress.json" ;;
         main)     echo "$SCRAPER_DIR/checkpoints/progress.json" ;;
     esac
 }
@@ -103,6 +103,8 @@ restart_scraper() {
     local scraper_type="$1"
     local machine
     machine=$(detect_machine)
+    # Selects us-restaurant-scraper/host_profiles/<machine>.json overrides, if any
+    export GMAPS_HOST_PROFILE="${GMAPS_HOST_PROFILE:-$machine}"
 
     # Prevent rapid restart loops: min 10 min between restarts
     if [ -f "$LAST_RESTART_FILE" ]; then